@@ -3,22 +3,304 @@ FHL Bible MCP Server - Entry Point
 
 This module provides the entry point for running the MCP server via:
     python -m fhl_bible_mcp
+
+Maintenance subcommands:
+    python -m fhl_bible_mcp migrate-cache [--source DIR] [--include-expired] [--delete-source]
+    python -m fhl_bible_mcp snapshot [VERSION ...] [--dir DIR]
+    python -m fhl_bible_mcp concordance [--source tagged|qp] [--version VERSION] [--dir DIR]
+    python -m fhl_bible_mcp warm [--manifest FILE] [--versions VERSION ...] [--top-chapters N]
+                                 [--strongs G1-500 ...] [--concurrency N] [--restart]
 """
 
+import argparse
 import asyncio
 import sys
+from pathlib import Path
+from typing import List, Optional
 
-from fhl_bible_mcp.server import main
 
+def build_parser() -> argparse.ArgumentParser:
+    """建立命令列參數解析器"""
+    parser = argparse.ArgumentParser(
+        prog="python -m fhl_bible_mcp",
+        description="FHL Bible MCP Server (預設啟動 MCP 伺服器)"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("serve", help="啟動 MCP 伺服器 (預設)")
+
+    migrate = subparsers.add_parser(
+        "migrate-cache",
+        help="將舊的 JSON 檔案快取匯入 SQLite 快取 (離線執行)"
+    )
+    migrate.add_argument(
+        "--source",
+        help="JSON 快取檔案所在目錄 (預設: config 的 cache.directory)"
+    )
+    migrate.add_argument(
+        "--target",
+        help="SQLite 快取目錄 (預設: 與 --source 相同)"
+    )
+    migrate.add_argument(
+        "--include-expired",
+        action="store_true",
+        help="一併匯入已過期的項目"
+    )
+    migrate.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="匯入成功後刪除原本的 JSON 檔案"
+    )
+
+    snapshot = subparsers.add_parser(
+        "snapshot",
+        help="下載整本聖經版本為本地快照 (之後查詢經文不需要網路)"
+    )
+    snapshot.add_argument(
+        "versions",
+        nargs="*",
+        default=["unv"],
+        help="版本代碼 (預設: unv)，例如 unv kjv cbol"
+    )
+    snapshot.add_argument(
+        "--dir",
+        help="快照目錄 (預設: config 的 corpus.directory)"
+    )
+    snapshot.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="同時下載的書卷數 (預設: 4)"
+    )
+
+    concordance = subparsers.add_parser(
+        "concordance",
+        help="建立 Strong's 原文編號經文彙編 (出現次數、書卷分布、出現位置)"
+    )
+    concordance.add_argument(
+        "--source",
+        choices=["tagged", "qp"],
+        default="tagged",
+        help="資料來源: tagged = qb.php Strong's 標記經文 (每章一個請求)，"
+             "qp = qp.php 逐節原文分析 (需要版本快照，請求較多)"
+    )
+    concordance.add_argument(
+        "--version",
+        default="unv",
+        help="標記經文 / 列出經節所用的版本 (預設: unv)"
+    )
+    concordance.add_argument(
+        "--dir",
+        help="輸出目錄 (預設: config 的 corpus.directory)"
+    )
+    concordance.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="同時處理的書卷數 (預設: 4)"
+    )
+
+    warm = subparsers.add_parser(
+        "warm",
+        help="預熱快取 (書卷 / 版本 / 註釋書列表、熱門章節、Strong's 字典)，可中斷後續傳"
+    )
+    warm.add_argument(
+        "--manifest",
+        help="JSON 清單檔案 (欄位見 utils/warmup.py)；命令列參數覆寫檔案中的值"
+    )
+    warm.add_argument(
+        "--versions",
+        nargs="+",
+        help="預熱章節的版本 (預設: unv)"
+    )
+    warm.add_argument(
+        "--top-chapters",
+        type=int,
+        help="每個版本預熱的熱門章節數 (預設: 50)"
+    )
+    warm.add_argument(
+        "--strongs",
+        nargs="*",
+        help="Strong's 字典編號範圍，例如 G1-500 H1-500 (預設: G1-100 H1-100)"
+    )
+    warm.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="同時執行的請求數 (預設: 4)"
+    )
+    warm.add_argument(
+        "--restart",
+        action="store_true",
+        help="忽略先前中斷留下的進度，全部重新預熱"
+    )
+
+    return parser
+
+
+def migrate_cache(args: argparse.Namespace) -> int:
+    """執行 migrate-cache 子命令"""
+    from fhl_bible_mcp.config import get_config
+    from fhl_bible_mcp.utils.cache import SQLiteBackend, migrate_file_cache
+
+    source = Path(args.source or get_config().cache.directory)
+    target = Path(args.target) if args.target else source
+
+    if not source.is_dir():
+        print(f"Cache directory not found: {source}", file=sys.stderr)
+        return 1
+
+    target.mkdir(parents=True, exist_ok=True)
+    backend = SQLiteBackend(target / SQLiteBackend.DB_FILENAME)
+    try:
+        result = migrate_file_cache(
+            str(source),
+            backend,
+            include_expired=args.include_expired,
+            delete_source=args.delete_source
+        )
+    finally:
+        backend.close()
+
+    print(
+        f"Migrated {result['migrated']} entries into {backend.db_path} "
+        f"(skipped {result['skipped_expired']} expired, {result['errors']} errors)"
+    )
+    return 0 if result["errors"] == 0 else 1
+
+
+async def build_snapshots(args: argparse.Namespace) -> int:
+    """執行 snapshot 子命令"""
+    from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+    from fhl_bible_mcp.config import get_config
+    from fhl_bible_mcp.utils.corpus import build_snapshot
+
+    directory = args.dir or get_config().corpus.directory
+    failed = 0
+
+    async with FHLAPIEndpoints(use_cache=False) as api:
+        for version in args.versions:
+            try:
+                result = await build_snapshot(
+                    api, version, directory, concurrency=args.concurrency
+                )
+            except Exception as e:
+                print(f"Snapshot {version} failed: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            print(
+                f"Snapshot {version}: {result['verses']} verses, "
+                f"{result['chapters']} chapters -> {result['path']}"
+            )
+
+    return 0 if failed == 0 else 1
+
+
+async def build_concordance_index(args: argparse.Namespace) -> int:
+    """執行 concordance 子命令"""
+    from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+    from fhl_bible_mcp.config import get_config
+    from fhl_bible_mcp.utils.concordance import build_concordance
+
+    directory = args.dir or get_config().corpus.directory
+
+    async with FHLAPIEndpoints(use_cache=False) as api:
+        try:
+            result = await build_concordance(
+                api,
+                directory,
+                source=args.source,
+                version=args.version,
+                concurrency=args.concurrency
+            )
+        except Exception as e:
+            print(f"Concordance failed: {e}", file=sys.stderr)
+            return 1
+
+    print(
+        f"Concordance ({result['source']}): {result['numbers']} Strong's numbers, "
+        f"{result['occurrences']} occurrences -> {result['path']}"
+    )
+    return 0
+
+
+async def warm_up_cache(args: argparse.Namespace) -> int:
+    """執行 warm 子命令"""
+    from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+    from fhl_bible_mcp.config import get_config
+    from fhl_bible_mcp.utils.warmup import PROGRESS_FILENAME, build_manifest, load_manifest, warm_cache
+
+    overrides = {
+        "versions": args.versions,
+        "top_chapters": args.top_chapters,
+        "strongs": args.strongs,
+    }
+    try:
+        if args.manifest:
+            tasks = load_manifest(args.manifest, **overrides)
+        else:
+            tasks = build_manifest(**{k: v for k, v in overrides.items() if v is not None})
+    except (OSError, ValueError) as e:
+        print(f"Invalid manifest: {e}", file=sys.stderr)
+        return 1
+
+    config = get_config()
+    if not config.cache.enabled:
+        print("Cache is disabled (cache.enabled = false); nothing to warm", file=sys.stderr)
+        return 1
+
+    progress_path = Path(config.cache.directory) / PROGRESS_FILENAME
+    if args.restart and progress_path.exists():
+        progress_path.unlink()
+
+    def report(done: int, total: int, task: dict, error: Optional[Exception]) -> None:
+        status = f"failed: {error}" if error else "ok"
+        print(f"[{done}/{total}] {task['key']} {status}", file=sys.stderr)
+
+    async with FHLAPIEndpoints() as api:
+        result = await warm_cache(
+            api,
+            tasks,
+            concurrency=args.concurrency,
+            progress_path=progress_path,
+            on_progress=report
+        )
+
+    print(
+        f"Warmed {result['warmed']} of {result['total']} items in {result['seconds']}s "
+        f"({result['skipped']} already done, {result['failed']} failed)"
+    )
+    if result["failed"]:
+        print("Run the command again to retry the failed items", file=sys.stderr)
+    return 0 if result["failed"] == 0 else 1
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """解析命令列並執行對應的子命令"""
+    args = build_parser().parse_args(argv)
+
+    if args.command == "migrate-cache":
+        return migrate_cache(args)
+    if args.command == "snapshot":
+        return asyncio.run(build_snapshots(args))
+    if args.command == "concordance":
+        return asyncio.run(build_concordance_index(args))
+    if args.command == "warm":
+        return asyncio.run(warm_up_cache(args))
+
+    from fhl_bible_mcp.server import main
 
-if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\nServer stopped by user", file=sys.stderr)
-        sys.exit(0)
     except Exception as e:
         print(f"\nFatal error: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
-        sys.exit(1)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,6 +1,17 @@
 """API client package for FHL Bible API."""
 
 from fhl_bible_mcp.api.client import FHLAPIClient
-from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.api.endpoints import (
+    FHLAPIEndpoints,
+    close_endpoints,
+    get_endpoints,
+    set_endpoints,
+)
 
-__all__ = ["FHLAPIClient", "FHLAPIEndpoints"]
+__all__ = [
+    "FHLAPIClient",
+    "FHLAPIEndpoints",
+    "get_endpoints",
+    "set_endpoints",
+    "close_endpoints",
+]
@@ -6,9 +6,13 @@ retry mechanism, and logging.
 """
 
 import asyncio
+import contextlib
+import json
 import logging
-from typing import Any
-from urllib.parse import urlencode
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator
+from urllib.parse import urlencode, urlparse
 
 import httpx
 
@@ -20,17 +24,46 @@ from fhl_bible_mcp.utils.errors import (
     NetworkError,
     RateLimitError,
 )
+from fhl_bible_mcp.utils.jsonstream import RecordStream
+from fhl_bible_mcp.utils.metrics import get_metrics
+from fhl_bible_mcp.utils.resilience import CircuitBreaker, HostGuard, backoff_delay
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_retry_after(value: str | None, default: int = 60) -> int:
+    """Parse a Retry-After header (delay in seconds or an HTTP date)."""
+    if value is None:
+        return default
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+    try:
+        return max(0, int(parsedate_to_datetime(value).timestamp() - time.time()))
+    except (TypeError, ValueError):
+        return default
+
+
+def _http2_available() -> bool:
+    """Check whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
 class FHLAPIClient:
     """
     Client for interacting with the FHL Bible API.
     
     This client handles:
     - HTTP requests with proper headers
-    - Automatic retry with exponential backoff
+    - Automatic retry with jittered exponential backoff, limited by a retry budget
+    - Per-host circuit breaker and latency-aware adaptive timeouts
+    - Per-host token-bucket rate limiting and per-endpoint concurrency limits;
+      429 responses pause the host for ``Retry-After`` seconds and are retried
     - Error handling and logging
     - Response validation
     
@@ -38,6 +71,7 @@ class FHLAPIClient:
         base_url: Base URL for the FHL API
         timeout: Request timeout in seconds
         max_retries: Maximum number of retry attempts
+        http2: Whether HTTP/2 is actually enabled on the connection pool
     """
 
     def __init__(
@@ -46,6 +80,20 @@ class FHLAPIClient:
         timeout: int = 30,
         max_retries: int = 3,
         gb: int = 0,  # 0 for Traditional Chinese, 1 for Simplified Chinese
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        adaptive_timeout: bool = True,
+        min_timeout: float = 5.0,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        retry_budget_ratio: float = 0.2,
+        retry_jitter: bool = True,
+        rate_limit: float = 10.0,
+        rate_burst: int = 20,
+        max_concurrency_per_endpoint: int = 8,
+        max_retry_after: float = 30.0,
     ) -> None:
         """
         Initialize the FHL API client.
@@ -55,16 +103,59 @@ class FHLAPIClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             gb: Chinese variant (0=Traditional, 1=Simplified)
+            max_connections: Maximum number of pooled connections
+            max_keepalive_connections: Maximum number of idle keep-alive connections
+            keepalive_expiry: Seconds an idle keep-alive connection is kept open
+            http2: Enable HTTP/2 (requires the optional ``h2`` package)
+            adaptive_timeout: Derive per-request timeouts from observed latency
+            min_timeout: Lower bound for adaptive timeouts (``timeout`` is the upper bound)
+            breaker_failure_threshold: Consecutive failures that open a host's circuit breaker (0 disables)
+            breaker_reset_timeout: Seconds an open breaker waits before letting a probe through
+            retry_budget_ratio: Retries allowed per request on average (retry budget)
+            retry_jitter: Randomise backoff delays to avoid synchronised retries
+            rate_limit: Requests per second per host (0 disables rate limiting)
+            rate_burst: Requests that may be sent at once before rate limiting applies
+            max_concurrency_per_endpoint: Simultaneous requests per endpoint (0 = unlimited)
+            max_retry_after: Longest ``Retry-After`` (seconds) to wait for; longer
+                values raise RateLimitError
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
         self.gb = gb
+        self.http2 = http2 and _http2_available()
+        self.retry_jitter = retry_jitter
+        self.max_retry_after = max_retry_after
+        self.max_concurrency_per_endpoint = max_concurrency_per_endpoint
+        self._endpoint_slots: dict[str, asyncio.Semaphore] = {}
         
-        # Create async HTTP client
+        # 每個上游主機一組斷路器 / 自適應逾時 / 重試預算
+        self._guard_settings = {
+            "timeout": float(timeout),
+            "min_timeout": min_timeout,
+            "adaptive_timeout": adaptive_timeout,
+            "failure_threshold": breaker_failure_threshold,
+            "reset_timeout": breaker_reset_timeout,
+            "retry_budget_ratio": retry_budget_ratio,
+            "rate_limit": rate_limit,
+            "rate_burst": rate_burst,
+        }
+        self._guards: dict[str, HostGuard] = {}
+        self.guard = self.get_host_guard(urlparse(self.base_url).netloc or self.base_url)
+        
+        if http2 and not self.http2:
+            logger.debug("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        
+        # Create async HTTP client (connections are pooled and reused across requests)
         self._client = httpx.AsyncClient(
             timeout=timeout,
             follow_redirects=True,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
             headers={
                 "User-Agent": "FHL-Bible-MCP-Server/0.1.0",
                 "Accept": "application/json, text/html",
@@ -73,7 +164,8 @@ class FHLAPIClient:
         
         logger.info(
             f"FHL API Client initialized: base_url={base_url}, "
-            f"timeout={timeout}s, max_retries={max_retries}"
+            f"timeout={timeout}s, max_retries={max_retries}, "
+            f"max_connections={max_connections}, http2={self.http2}"
         )
 
     async def __aenter__(self) -> "FHLAPIClient":
@@ -89,6 +181,37 @@ class FHLAPIClient:
         await self._client.aclose()
         logger.debug("FHL API Client closed")
 
+    @property
+    def is_closed(self) -> bool:
+        """Whether the underlying HTTP client has been closed."""
+        return self._client.is_closed
+
+    def get_host_guard(self, host: str) -> HostGuard:
+        """Get (or create) the circuit breaker / timeout / retry budget state for a host."""
+        guard = self._guards.get(host)
+        if guard is None:
+            guard = self._guards[host] = HostGuard(host, **self._guard_settings)
+        return guard
+
+    def get_upstream_info(self) -> dict[str, Any]:
+        """Circuit breaker, adaptive timeout, retry budget and rate limit state per upstream host."""
+        return {host: guard.get_info() for host, guard in sorted(self._guards.items())}
+
+    def _endpoint_slot(self, endpoint: str) -> Any:
+        """Concurrency limit for one endpoint (a no-op context when unlimited)."""
+        if self.max_concurrency_per_endpoint <= 0:
+            return contextlib.nullcontext()
+        slot = self._endpoint_slots.get(endpoint)
+        if slot is None:
+            slot = self._endpoint_slots[endpoint] = asyncio.Semaphore(self.max_concurrency_per_endpoint)
+        return slot
+
+    def _target(self, endpoint: str) -> tuple[str, HostGuard]:
+        """URL and host guard for an endpoint (or an absolute URL on another FHL host)."""
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint, self.get_host_guard(urlparse(endpoint).netloc)
+        return f"{self.base_url}/{endpoint}", self.guard
+
     async def _make_request(
         self,
         endpoint: str,
@@ -99,7 +222,9 @@ class FHLAPIClient:
         Make an HTTP request to the FHL API with retry logic.
         
         Args:
-            endpoint: API endpoint (e.g., "qb.php")
+            endpoint: API endpoint (e.g., "qb.php"), or an absolute URL for
+                another FHL host (e.g. the www.fhl.net articles API); each
+                host has its own circuit breaker, timeouts and rate limit
             params: Query parameters
             retry_count: Current retry attempt number
             
@@ -107,7 +232,8 @@ class FHLAPIClient:
             Parsed JSON response or raw text
             
         Raises:
-            NetworkError: When network connection fails
+            NetworkError: When network connection fails (CircuitOpenError when
+                the host's circuit breaker is open)
             APIResponseError: When API returns an error
             RateLimitError: When rate limit is exceeded
         """
@@ -118,12 +244,45 @@ class FHLAPIClient:
         if "gb" not in params:
             params["gb"] = self.gb
         
-        url = f"{self.base_url}/{endpoint}"
+        url, guard = self._target(endpoint)
+        if retry_count == 0:
+            guard.budget.deposit()
+        
+        # 斷路器開啟時直接失敗 (不等待逾時與退避)
+        guard.check()
+        
+        # 限速：超過速率或 Retry-After 暫停期間排隊等待
+        await guard.limiter.acquire()
+        
+        timeout = guard.timeout.current(retry_count)
+        metrics = get_metrics()
+        responded = False
         
         try:
-            logger.debug(f"Making request to {url} with params: {params}")
+            logger.debug(f"Making request to {url} with params: {params} (timeout={timeout:.1f}s)")
             
-            response = await self._client.get(url, params=params)
+            async with self._endpoint_slot(endpoint):
+                started = time.perf_counter()
+                response = await self._client.get(url, params=params, timeout=timeout)
+                elapsed = time.perf_counter() - started
+            responded = True
+            
+            if response.status_code >= 500:
+                guard.breaker.record_failure()
+            else:
+                guard.breaker.record_success()
+                guard.timeout.observe(elapsed)
+                if response.status_code != 429:
+                    guard.limiter.record_success()
+            
+            if metrics.enabled:
+                metrics.observe_upstream(
+                    endpoint,
+                    elapsed,
+                    response.status_code,
+                    bytes_in=len(response.content),
+                    bytes_out=len(url) + 1 + len(urlencode(params)),
+                )
             
             # Log response details
             logger.debug(
@@ -131,9 +290,10 @@ class FHLAPIClient:
                 f"content-type: {response.headers.get('content-type', 'unknown')}"
             )
             
-            # Handle rate limiting (if implemented by API)
+            # Handle rate limiting: pause this host for Retry-After seconds
             if response.status_code == 429:
-                retry_after = int(response.headers.get("Retry-After", 60))
+                retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                guard.limiter.pause(retry_after)
                 raise RateLimitError(retry_after=retry_after)
             
             # Handle client/server errors
@@ -172,25 +332,29 @@ class FHLAPIClient:
                 return response.text
         
         except httpx.TimeoutException as e:
-            error_msg = f"Request timeout after {self.timeout}s"
+            error_msg = f"Request timeout after {timeout:g}s"
             logger.warning(f"{error_msg}: {url}")
+            guard.breaker.record_failure()
+            if metrics.enabled:
+                metrics.observe_upstream(endpoint, time.perf_counter() - started, "timeout")
             
-            if retry_count < self.max_retries:
-                return await self._retry_request(endpoint, params, retry_count, error_msg)
-            
-            raise NetworkError(f"{error_msg} (max retries exceeded)")
+            return await self._retry_or_raise(guard, endpoint, params, retry_count, error_msg)
         
         except httpx.NetworkError as e:
             error_msg = f"Network error: {str(e)}"
             logger.warning(f"{error_msg}: {url}")
+            guard.breaker.record_failure()
+            if metrics.enabled:
+                metrics.observe_upstream(endpoint, time.perf_counter() - started, "network_error")
             
-            if retry_count < self.max_retries:
-                return await self._retry_request(endpoint, params, retry_count, error_msg)
-            
-            raise NetworkError(f"{error_msg} (max retries exceeded)")
+            return await self._retry_or_raise(guard, endpoint, params, retry_count, error_msg)
         
-        except RateLimitError:
-            # Re-raise rate limit errors without retry
+        except RateLimitError as e:
+            # 短暫的 Retry-After：排隊等待後重試 (等待由限速器處理，不另外退避)
+            retry_after = e.retry_after or 0
+            if retry_count < self.max_retries and retry_after <= self.max_retry_after:
+                logger.warning(f"Rate limited by {guard.host}; retrying after {retry_after}s: {url}")
+                return await self._make_request(endpoint, params, retry_count + 1)
             raise
         
         except APIResponseError:
@@ -198,9 +362,182 @@ class FHLAPIClient:
             raise
         
         except Exception as e:
+            if not responded:
+                guard.breaker.record_failure()
             logger.error(f"Unexpected error in API request: {str(e)}")
             raise FHLAPIError(f"Unexpected error: {str(e)}")
 
+    async def _stream_records(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        stream: RecordStream | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Stream the records of a JSON response as they are received.
+        
+        Uses the same host guard, rate limit and endpoint slot as
+        ``_make_request``, but parses the body incrementally from
+        ``response.aiter_bytes()`` instead of buffering it. Closing the
+        generator (e.g. after enough records) stops reading the response.
+        
+        Failures before the response body starts (timeouts, network errors,
+        5xx, short 429s) are retried like ``_make_request``; errors while
+        reading the body are raised. A 5xx that is still failing when the
+        retries run out is raised as ``APIResponseError`` with its
+        ``status_code``, the same error ``_make_request`` raises.
+        
+        Args:
+            endpoint: API endpoint or absolute URL
+            params: Query parameters
+            stream: Parser to use; after iteration its ``meta`` holds the
+                fields other than the record array (default: ``"record"``)
+            
+        Yields:
+            Elements of the record array, in order
+            
+        Raises:
+            NetworkError: When the connection fails
+            APIResponseError: When the API returns an error (4xx, or 5xx
+                after the retries run out)
+            DataParseError: When the body is not the expected JSON object
+            RateLimitError: When rate limited for longer than ``max_retry_after``
+        """
+        if params is None:
+            params = {}
+        if "gb" not in params:
+            params["gb"] = self.gb
+        if stream is None:
+            stream = RecordStream()
+        
+        url, guard = self._target(endpoint)
+        guard.budget.deposit()
+        metrics = get_metrics()
+        retry_count = 0
+        
+        while True:
+            guard.check()
+            await guard.limiter.acquire()
+            timeout = guard.timeout.current(retry_count)
+            error_msg = ""
+            server_error = None
+            
+            async with self._endpoint_slot(endpoint):
+                started = time.perf_counter()
+                try:
+                    async with self._client.stream("GET", url, params=params, timeout=timeout) as response:
+                        elapsed = time.perf_counter() - started
+                        if response.status_code >= 500:
+                            guard.breaker.record_failure()
+                            error_msg = f"Server error {response.status_code}"
+                            body = await response.aread()
+                            server_error = APIResponseError(
+                                message="API request failed",
+                                status_code=response.status_code,
+                                response_text=body[:500].decode("utf-8", "replace"),
+                            )
+                        elif response.status_code == 429:
+                            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                            guard.limiter.pause(retry_after)
+                            if retry_count >= self.max_retries or retry_after > self.max_retry_after:
+                                raise RateLimitError(retry_after=retry_after)
+                            retry_count += 1
+                            logger.warning(f"Rate limited by {guard.host}; retrying after {retry_after}s: {url}")
+                            continue
+                        else:
+                            guard.breaker.record_success()
+                            guard.timeout.observe(elapsed)
+                            guard.limiter.record_success()
+                            if response.status_code >= 400:
+                                body = await response.aread()
+                                raise APIResponseError(
+                                    message="API request failed",
+                                    status_code=response.status_code,
+                                    response_text=body[:500].decode("utf-8", "replace"),
+                                )
+                            
+                            # 逐段解析；呼叫端停止迭代時不再讀取剩餘內容
+                            bytes_in = 0
+                            try:
+                                async for chunk in response.aiter_bytes():
+                                    bytes_in += len(chunk)
+                                    for record in stream.feed(chunk):
+                                        yield record
+                                for record in stream.close():
+                                    yield record
+                            except json.JSONDecodeError as e:
+                                raise DataParseError(
+                                    message=f"Failed to parse JSON response: {e}",
+                                    raw_data=e.doc[max(0, e.pos - 100):e.pos + 100],
+                                )
+                            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                                guard.breaker.record_failure()
+                                raise NetworkError(f"Connection lost while reading response: {e}")
+                            finally:
+                                if metrics.enabled:
+                                    metrics.observe_upstream(
+                                        endpoint,
+                                        time.perf_counter() - started,
+                                        response.status_code,
+                                        bytes_in=bytes_in,
+                                        bytes_out=len(url) + 1 + len(urlencode(params)),
+                                    )
+                            
+                            if stream.meta.get("status") == "error":
+                                raise APIResponseError(
+                                    message=f"API returned error: {stream.meta.get('message', 'Unknown error')}",
+                                    status_code=response.status_code,
+                                )
+                            return
+                except httpx.TimeoutException:
+                    guard.breaker.record_failure()
+                    error_msg = f"Request timeout after {timeout:g}s"
+                except httpx.NetworkError as e:
+                    guard.breaker.record_failure()
+                    error_msg = f"Network error: {e}"
+            
+            # 尚未開始讀取內容的失敗：與 _make_request 相同的重試條件
+            logger.warning(f"{error_msg}: {url}")
+            if retry_count >= self.max_retries:
+                reason = "max retries exceeded"
+            elif guard.breaker.state != CircuitBreaker.CLOSED:
+                reason = "circuit breaker open"
+            elif not guard.budget.withdraw():
+                reason = "retry budget exhausted"
+            else:
+                reason = None
+            if reason is not None:
+                # 5xx 與 _make_request 相同，以帶 status_code 的 APIResponseError 回報
+                if server_error is not None:
+                    raise server_error
+                raise NetworkError(f"{error_msg} ({reason})")
+            retry_count += 1
+            if metrics.enabled:
+                metrics.count_retry(endpoint)
+            await asyncio.sleep(backoff_delay(retry_count, jitter=self.retry_jitter))
+
+    async def _retry_or_raise(
+        self,
+        guard: HostGuard,
+        endpoint: str,
+        params: dict[str, Any],
+        retry_count: int,
+        error_msg: str,
+    ) -> dict[str, Any] | str:
+        """
+        Retry a failed request if allowed, otherwise raise NetworkError.
+        
+        A retry needs a remaining attempt, a closed circuit breaker and a
+        token from the host's retry budget.
+        """
+        if retry_count >= self.max_retries:
+            raise NetworkError(f"{error_msg} (max retries exceeded)")
+        if guard.breaker.state != CircuitBreaker.CLOSED:
+            raise NetworkError(f"{error_msg} (circuit breaker open)")
+        if not guard.budget.withdraw():
+            raise NetworkError(f"{error_msg} (retry budget exhausted)")
+        return await self._retry_request(endpoint, params, retry_count, error_msg)
+
     async def _retry_request(
         self,
         endpoint: str,
@@ -209,7 +546,7 @@ class FHLAPIClient:
         error_msg: str,
     ) -> dict[str, Any] | str:
         """
-        Retry a failed request with exponential backoff.
+        Retry a failed request with jittered exponential backoff.
         
         Args:
             endpoint: API endpoint
@@ -221,13 +558,18 @@ class FHLAPIClient:
             API response
         """
         retry_count += 1
-        wait_time = 2**retry_count  # Exponential backoff: 2, 4, 8 seconds
+        # Exponential backoff: 2, 4, 8 seconds (jitter: 1-2, 2-4, 4-8 seconds)
+        wait_time = backoff_delay(retry_count, jitter=self.retry_jitter)
         
         logger.info(
             f"Retrying request (attempt {retry_count}/{self.max_retries}) "
-            f"after {wait_time}s: {error_msg}"
+            f"after {wait_time:.2f}s: {error_msg}"
         )
         
+        metrics = get_metrics()
+        if metrics.enabled:
+            metrics.count_retry(endpoint)
+        
         await asyncio.sleep(wait_time)
         return await self._make_request(endpoint, params, retry_count)
 
@@ -5,19 +5,39 @@ Implements specific API endpoint methods for the FHL Bible API.
 Each method corresponds to a specific API endpoint documented in the planning document.
 """
 
-import logging
-import hashlib
+import asyncio
 import json
-import httpx
-from typing import Any, Optional
+import logging
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
 
 from fhl_bible_mcp.api.client import FHLAPIClient
 from fhl_bible_mcp.config import Config, get_config
-from fhl_bible_mcp.utils.errors import InvalidParameterError
-from fhl_bible_mcp.utils.cache import get_cache
+from fhl_bible_mcp.utils.errors import APIResponseError, BookNotFoundError, InvalidParameterError, NetworkError
+from fhl_bible_mcp.utils.cache import get_cache, make_cache_key
+from fhl_bible_mcp.utils.article_index import ArticleIndex, article_preview
+from fhl_bible_mcp.utils.citations import (
+    VerseSpan,
+    chapter_fetches,
+    parse_citations,
+    verse_spans,
+    verse_spec,
+)
+from fhl_bible_mcp.utils.corpus import get_corpus, parse_verse_spec, slice_chapter
+from fhl_bible_mcp.utils.jsonstream import RecordStream
+from fhl_bible_mcp.utils.metrics import get_metrics
+from fhl_bible_mcp.utils.result_window import ResultWindow, ResultWindows
 
 logger = logging.getLogger(__name__)
 
+# 信望愛站文章 API (與 bible.fhl.net 不同主機)
+ARTICLES_API_URL = "https://www.fhl.net/api/json.php"
+
+# 次經 (qsub.php) 與使徒教父 (qaf.php) 固定使用的版本 (本地快照的版本名稱)
+APOCRYPHA_VERSION = "c1933"
+APOSTOLIC_FATHERS_VERSION = "afhuang"
+
 
 class FHLAPIEndpoints(FHLAPIClient):
     """
@@ -62,75 +82,472 @@ class FHLAPIEndpoints(FHLAPIClient):
         _use_cache = use_cache if use_cache is not None else self.config.cache.enabled
         _cache_dir = cache_dir or self.config.cache.directory
         
-        # 初始化父類別
-        super().__init__(base_url=_base_url, timeout=_timeout, max_retries=_max_retries)
+        # 初始化父類別 (連線池設定來自 config.api)
+        super().__init__(
+            base_url=_base_url,
+            timeout=_timeout,
+            max_retries=_max_retries,
+            max_connections=self.config.api.max_connections,
+            max_keepalive_connections=self.config.api.max_keepalive_connections,
+            keepalive_expiry=self.config.api.keepalive_expiry,
+            http2=self.config.api.http2,
+            adaptive_timeout=self.config.api.adaptive_timeout,
+            min_timeout=self.config.api.min_timeout,
+            breaker_failure_threshold=self.config.api.breaker_failure_threshold,
+            breaker_reset_timeout=self.config.api.breaker_reset_timeout,
+            retry_budget_ratio=self.config.api.retry_budget_ratio,
+            retry_jitter=self.config.api.retry_jitter,
+            rate_limit=self.config.api.rate_limit,
+            rate_burst=self.config.api.rate_burst,
+            max_concurrency_per_endpoint=self.config.api.max_concurrency_per_endpoint,
+            max_retry_after=self.config.api.max_retry_after,
+        )
         
         # 設定快取
         self.use_cache = _use_cache
-        self.cache = get_cache(cache_dir=_cache_dir) if _use_cache else None
+        self.cache = get_cache(
+            cache_dir=_cache_dir,
+            memory_max_entries=self.config.cache.memory_max_entries,
+            memory_max_bytes=self.config.cache.memory_max_bytes,
+            backend=self.config.cache.backend,
+        ) if _use_cache else None
+        
+        # 本地經文快照 (有快照的版本不需要呼叫 qb.php)
+        self.corpus = (
+            get_corpus(directory=self.config.corpus.directory)
+            if self.config.corpus.enabled else None
+        )
+        
+        # 文章中繼資料索引 (與快取共用目錄；第一次搜尋文章時才開啟)
+        self._article_index_path = (
+            Path(_cache_dir) / ArticleIndex.FILENAME if _use_cache else None
+        )
+        self.article_index: Optional[ArticleIndex] = None
+        
+        # 搜尋結果區塊 (分頁從記憶體切片)
+        self.result_windows = ResultWindows(ttl=self.config.cache.result_window_ttl)
+        
+        # 執行期指標 (config.metrics.enabled 控制是否記錄)
+        get_metrics(enabled=self.config.metrics.enabled)
+        
+        # 進行中的上游請求 (single-flight): cache key -> Task
+        self._inflight: dict[str, asyncio.Task] = {}
+        
+        # 背景更新中的過期項目 (stale-while-revalidate)
+        self._refreshing: set[asyncio.Task] = set()
+        
+        # 請求統計
+        self.request_stats = {
+            "upstream": 0,           # 實際送往上游的請求數
+            "coalesced": 0,          # 合併到進行中請求的呼叫數
+            "refreshes": 0,          # 先返回過期資料、背景更新的次數
+            "refreshes_skipped": 0,  # 背景更新已達上限而略過的次數
+            "stale_on_error": 0,     # 上游失敗時改用過期資料的次數
+        }
         
         if self.use_cache:
             logger.info(f"Cache enabled: {_cache_dir}")
             
-            # 如果設定為啟動時清理,則清理過期快取
+            # 如果設定為啟動時清理,則清理過期快取 (保留 stale_if_error 期限內的項目)
             if self.config.cache.cleanup_on_start:
-                cleanup_count = self.cache.cleanup_expired()
+                cleanup_count = self.cache.cleanup_expired(
+                    grace_seconds=self.config.cache.stale_if_error
+                )
                 if cleanup_count > 0:
                     logger.info(f"Cleaned up {cleanup_count} expired cache entries")
     
-    def _make_cache_key(self, **kwargs) -> str:
+    async def _cached_request(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        namespace: str,
+        strategy: str
+    ) -> Any:
         """
-        Generate a cache key from parameters.
+        Make a cached API request.
+        
+        Identical concurrent requests (same cache key) are coalesced: only the
+        first caller hits the upstream API, the others await the same result.
+        
+        An expired entry that is at most ``cache.max_stale`` seconds past its
+        TTL is returned immediately while a background task refreshes it
+        (stale-while-revalidate). Older entries, up to ``cache.stale_if_error``
+        seconds past their TTL, are kept as a fallback and returned with
+        ``"stale": True`` when the upstream times out or returns 5xx.
         
         Args:
-            **kwargs: Parameters to hash
+            endpoint: API endpoint
+            params: Request parameters
+            namespace: Cache namespace
+            strategy: Cache strategy name
             
         Returns:
-            Cache key string
+            API response (from cache or fresh request)
         """
-        # 將參數排序後轉成 JSON 字串
-        params_str = json.dumps(kwargs, sort_keys=True, ensure_ascii=False)
-        return hashlib.md5(params_str.encode()).hexdigest()
+        # 生成快取鍵
+        cache_key = make_cache_key(endpoint, params)
+        
+        fallback = None
+        
+        if self.use_cache and self.cache is not None:
+            # 嘗試從快取讀取 (包含尚未超過保留期限的過期項目)
+            max_stale = self.config.cache.max_stale
+            entry = self.cache.get_entry(
+                namespace, cache_key, max_stale=max(max_stale, self.config.cache.stale_if_error)
+            )
+            if entry is not None:
+                if entry.is_valid():
+                    logger.debug(f"Cache hit: {namespace}:{cache_key[:8]}...")
+                    return entry.data
+                if entry.is_servable(max_stale):
+                    self._schedule_refresh(cache_key, endpoint, params, namespace, strategy)
+                    logger.debug(f"Cache hit (stale): {namespace}:{cache_key[:8]}...")
+                    return entry.data
+                # 過期太久：先向上游查詢，失敗時才使用
+                fallback = entry
+            
+            logger.debug(f"Cache miss: {namespace}:{cache_key[:8]}...")
+        
+        try:
+            return await self._coalesced_request(cache_key, endpoint, params, namespace, strategy)
+        except (NetworkError, APIResponseError) as e:
+            if fallback is None or not self._is_upstream_outage(e):
+                raise
+            self.request_stats["stale_on_error"] += 1
+            logger.warning(f"Upstream unavailable, serving stale {namespace}:{cache_key[:8]}...: {e}")
+            return self._mark_stale(fallback.data)
     
-    async def _cached_request(
+    @staticmethod
+    def _is_upstream_outage(error: Exception) -> bool:
+        """Whether an error means the upstream is unavailable (timeout, network error or 5xx)."""
+        if isinstance(error, APIResponseError):
+            return error.status_code is not None and error.status_code >= 500
+        return isinstance(error, NetworkError)
+    
+    @staticmethod
+    def _mark_stale(data: Any) -> Any:
+        """Return a copy of cached data marked with ``"stale": True`` (cached data is shared)."""
+        if isinstance(data, dict):
+            return {**data, "stale": True}
+        return data
+    
+    def _start_upstream(
+        self,
+        cache_key: str,
+        endpoint: str,
+        params: dict[str, Any],
+        namespace: str,
+        strategy: str
+    ) -> asyncio.Task:
+        """Start an upstream fetch and register it in the in-flight table."""
+        task = asyncio.ensure_future(
+            self._fetch_and_cache(endpoint, params, namespace, cache_key, strategy)
+        )
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda t: self._finish_inflight(cache_key, t))
+        return task
+    
+    def _schedule_refresh(
         self,
+        cache_key: str,
+        endpoint: str,
+        params: dict[str, Any],
+        namespace: str,
+        strategy: str
+    ) -> None:
+        """
+        Refresh an expired cache entry in the background.
+        
+        Skipped when the same key is already being fetched, or when
+        ``cache.max_background_refreshes`` refreshes are already running
+        (a later request for the key will try again).
+        """
+        if cache_key in self._inflight:
+            return
+        
+        if len(self._refreshing) >= self.config.cache.max_background_refreshes:
+            self.request_stats["refreshes_skipped"] += 1
+            logger.debug(f"Background refresh skipped (limit reached): {namespace}:{cache_key[:8]}...")
+            return
+        
+        self.request_stats["refreshes"] += 1
+        logger.debug(f"Serving stale entry, refreshing in background: {namespace}:{cache_key[:8]}...")
+        
+        task = self._start_upstream(cache_key, endpoint, params, namespace, strategy)
+        self._refreshing.add(task)
+        task.add_done_callback(self._refreshing.discard)
+    
+    async def _coalesced_request(
+        self,
+        cache_key: str,
         endpoint: str,
         params: dict[str, Any],
         namespace: str,
         strategy: str
     ) -> Any:
         """
-        Make a cached API request.
+        Send an upstream request, sharing it with identical in-flight callers.
+        
+        The upstream call runs in its own task so that a cancelled caller does
+        not cancel the request for the other callers waiting on it.
         
         Args:
+            cache_key: Cache key identifying the request
             endpoint: API endpoint
             params: Request parameters
             namespace: Cache namespace
             strategy: Cache strategy name
             
         Returns:
-            API response (from cache or fresh request)
+            API response
         """
-        if not self.use_cache or self.cache is None:
-            return await self._make_request(endpoint, params=params)
+        task = self._inflight.get(cache_key)
         
-        # 生成快取鍵
-        cache_key = self._make_cache_key(endpoint=endpoint, **params)
+        if task is None:
+            task = self._start_upstream(cache_key, endpoint, params, namespace, strategy)
+        else:
+            self.request_stats["coalesced"] += 1
+            logger.debug(f"Coalesced request: {namespace}:{cache_key[:8]}...")
         
-        # 嘗試從快取讀取
-        cached_data = self.cache.get(namespace, cache_key, strategy_name=strategy)
-        if cached_data is not None:
-            logger.debug(f"Cache hit: {namespace}:{cache_key[:8]}...")
-            return cached_data
+        return await asyncio.shield(task)
+    
+    def _finish_inflight(self, cache_key: str, task: asyncio.Task) -> None:
+        """Remove a finished upstream task from the in-flight table."""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # 標記例外已讀取,避免所有呼叫者都取消時出現 "exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None and task in self._refreshing:
+            logger.warning(f"Background refresh failed for {cache_key[:8]}...: {task.exception()}")
+    
+    async def _fetch_and_cache(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        namespace: str,
+        cache_key: str,
+        strategy: str
+    ) -> Any:
+        """
+        Fetch from the upstream API and store the result in the cache.
         
-        # 快取未命中,發送請求
-        logger.debug(f"Cache miss: {namespace}:{cache_key[:8]}...")
+        Args:
+            endpoint: API endpoint
+            params: Request parameters
+            namespace: Cache namespace
+            cache_key: Cache key
+            strategy: Cache strategy name
+            
+        Returns:
+            API response
+        """
+        self.request_stats["upstream"] += 1
         data = await self._make_request(endpoint, params=params)
         
         # 儲存到快取
-        self.cache.set(namespace, cache_key, data, strategy_name=strategy)
+        if self.use_cache and self.cache is not None:
+            self.cache.set(namespace, cache_key, data, strategy_name=strategy)
         
         return data
+    
+    async def iter_records(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        namespace: str,
+        strategy: str,
+        limit: int | None = None,
+        meta: dict[str, Any] | None = None,
+        key: str = "record"
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate the records of a (possibly large) response incrementally.
+        
+        A valid cache entry is iterated directly. Otherwise the upstream
+        response is parsed as it arrives (``_stream_records``) and reading
+        stops once ``limit`` records have been yielded. A response that was
+        read to the end is cached like ``_cached_request`` would; a truncated
+        one is not. Streamed requests are not coalesced.
+        
+        Args:
+            endpoint: API endpoint or absolute URL
+            params: Request parameters
+            namespace: Cache namespace
+            strategy: Cache strategy name
+            limit: Stop after this many records (None = all)
+            meta: Filled with the response fields other than ``key``
+                (fields after the record array are missing when stopped early)
+            key: Name of the record array
+            
+        Yields:
+            Records in upstream order (cached records are shared: copy
+            before modifying)
+        """
+        if meta is None:
+            meta = {}
+        cache_key = make_cache_key(endpoint, params)
+        
+        if self.use_cache and self.cache is not None:
+            data = self.cache.get(namespace, cache_key)
+            if isinstance(data, dict) and isinstance(data.get(key), list):
+                meta.update((k, v) for k, v in data.items() if k != key)
+                for record in data[key][:limit]:
+                    yield record
+                return
+        
+        self.request_stats["upstream"] += 1
+        stream = RecordStream(key)
+        records: list[Any] = []
+        complete = True
+        
+        async with aclosing(self._stream_records(endpoint, dict(params), stream)) as upstream:
+            async for record in upstream:
+                if limit is not None and len(records) >= limit:
+                    complete = False
+                    break
+                records.append(record)
+                if len(records) == 1:
+                    # 陣列之前的欄位 (status, record_count ...) 已解析
+                    meta.update(stream.meta)
+                yield record
+        meta.update(stream.meta)
+        
+        if complete and self.use_cache and self.cache is not None:
+            self.cache.set(namespace, cache_key, {**stream.meta, key: records}, strategy_name=strategy)
+    
+    async def _windowed_request(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        namespace: str,
+        strategy: str,
+        limit: int | None = None,
+        offset: int = 0,
+        paged: bool = True
+    ) -> dict[str, Any]:
+        """
+        Serve one page of a search from server-side result windows.
+        
+        Instead of one upstream request (and cache entry) per page, results
+        are fetched in blocks of ``cache.result_window_size`` records
+        (``offset``/``limit`` sent upstream) and each page is sliced from the
+        blocks kept in ``self.result_windows``. A page starting at a block
+        boundary loads the block through ``_cached_request`` (so expiry,
+        stale-while-revalidate and stale-on-error apply as usual); later pages
+        of the block are sliced from memory.
+        
+        Without a ``limit`` all remaining results are wanted, so a paged
+        endpoint gets one unpaged request (``offset`` only) instead of
+        walking every block in sequence.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters without offset/limit
+            namespace: Cache namespace
+            strategy: Cache strategy name
+            limit: Page size (None = all remaining results, in one request)
+            offset: Number of results to skip
+            paged: False when the endpoint has no offset/limit and returns
+                every result at once (one window holds the whole response)
+        
+        Returns:
+            Response fields of the block (record_count etc.) with ``record``
+            replaced by the requested page
+        """
+        position = max(0, offset)
+        if paged and limit is None:
+            return await self._fetch_block(
+                endpoint, {**params, "offset": position}, namespace, strategy
+            )
+        
+        size = max(1, self.config.cache.result_window_size)
+        query_key = make_cache_key(endpoint, params)
+        records: list[Any] = []
+        meta: dict[str, Any] = {}
+        
+        while limit is None or len(records) < limit:
+            block_start = position // size * size if paged else 0
+            window_key = f"{query_key}:{block_start}"
+            # 從區塊起點開始的頁面經由快取重新驗證區塊 (過期時背景更新)，
+            # 之後的頁面直接從記憶體中的區塊切片
+            window = self.result_windows.get(window_key) if position > block_start else None
+            if window is None:
+                block_params = {**params, "offset": block_start, "limit": size} if paged else params
+                data = await self._fetch_block(endpoint, block_params, namespace, strategy)
+                if not isinstance(data, dict) or not isinstance(data.get("record"), list):
+                    # 錯誤或沒有結果列表的回應原樣返回
+                    return data
+                window = ResultWindow(
+                    start=block_start,
+                    records=data["record"],
+                    meta={k: v for k, v in data.items() if k != "record"},
+                    complete=not paged or len(data["record"]) < size,
+                )
+                # 過期的備援資料不保存為區塊
+                if not data.get("stale"):
+                    self.result_windows.put(window_key, window)
+            
+            meta = window.meta
+            wanted = None if limit is None else limit - len(records)
+            page = window.records[position - window.start:]
+            if wanted is not None:
+                page = page[:wanted]
+            records.extend(page)
+            position += len(page)
+            if window.complete or position < window.end:
+                break
+        
+        return {**meta, "record": records}
+    
+    async def _fetch_block(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        namespace: str,
+        strategy: str
+    ) -> Any:
+        """Fetch one search response through the cache (streamed when ``api.streaming`` is on)."""
+        if not self.config.api.streaming:
+            return await self._cached_request(
+                endpoint=endpoint,
+                params=params,
+                namespace=namespace,
+                strategy=strategy
+            )
+        meta: dict[str, Any] = {}
+        data: dict[str, Any] = {
+            "record": [
+                record async for record in self.iter_records(
+                    endpoint, params, namespace, strategy, meta=meta
+                )
+            ]
+        }
+        data.update(meta)
+        return data
+    
+    def get_request_stats(self) -> dict[str, int]:
+        """
+        Get upstream request statistics.
+        
+        Returns:
+            Dictionary with upstream/coalesced/refresh counts and the number
+            of requests currently in flight
+        """
+        return {**self.request_stats, "inflight": len(self._inflight)}
+    
+    async def close(self) -> None:
+        """Cancel pending background refreshes and close the HTTP client."""
+        for task in list(self._refreshing):
+            task.cancel()
+        if self.article_index is not None:
+            self.article_index.close()
+            self.article_index = None
+        await super().close()
+    
+    def _get_article_index(self) -> Optional[ArticleIndex]:
+        """Open the article metadata index on first use (None when caching is disabled)."""
+        if self.article_index is None and self._article_index_path is not None:
+            self.article_index = ArticleIndex(self._article_index_path)
+        return self.article_index
 
     # ========================================================================
     # 1. Basic Information APIs
@@ -175,6 +592,7 @@ class FHLAPIEndpoints(FHLAPIClient):
         Get list of all Bible books.
         
         API: listall.html
+        Cache: Permanent (namespace "books")
         
         Returns:
             CSV string with format: id,english_abbr,english_full,chinese_abbr,english_short
@@ -185,7 +603,12 @@ class FHLAPIEndpoints(FHLAPIClient):
             >>>     # Parse CSV to get book list
         """
         logger.info("Fetching book list")
-        return await self._make_request("listall.html")
+        return await self._cached_request(
+            endpoint="listall.html",
+            params={},
+            namespace="books",
+            strategy="books"
+        )
 
     # ========================================================================
     # 2. Verse Query APIs
@@ -202,7 +625,12 @@ class FHLAPIEndpoints(FHLAPIClient):
         """
         Query Bible verses.
         
-        API: qb.php
+        API: qb.php (answered from the local corpus snapshot when the version
+        has one and Strong's numbers are not requested)
+        
+        The whole chapter is fetched and cached once per (version, book,
+        chapter, strong); verse specs are sliced from it locally with
+        prev / next recomputed.
         
         Args:
             book: Book name (Chinese or English abbreviation) or book ID
@@ -251,27 +679,179 @@ class FHLAPIEndpoints(FHLAPIClient):
             from ..utils.errors import BookNotFoundError
             raise BookNotFoundError(book)
         
+        # 本地快照優先 (快照不含 Strong's Number)
+        if self.corpus is not None and not include_strong:
+            local = self.corpus.get_verse(version, book_id, chapter, verse)
+            if local is not None:
+                logger.debug(f"Verse served from local corpus: {version} {book_id} {chapter}")
+                return local
+        
         params: dict[str, Any] = {
             "bid": book_id,  # Use bid instead of chineses for accurate mapping
             "chap": chapter,
             "version": version,
             "strong": 1 if include_strong else 0,
         }
-        
-        if verse is not None:
+
+        # 快取以整章為單位：任何節數都查詢 (並快取) 整章再於本地切出，
+        # 同一章的不同節數共用一個快取項目與一次上游請求
+        wanted = parse_verse_spec(verse) if verse is not None else None
+        if verse is not None and wanted is None:
+            # 無法解析的節數格式交給上游處理
             params["sec"] = verse
-        
+
         logger.info(
             f"Fetching verse: {book} (bid={book_id}) {chapter}" + (f":{verse}" if verse else "")
         )
-        
-        return await self._cached_request(
+
+        data = await self._cached_request(
             endpoint="qb.php",
             params=params,
             namespace="verses",
             strategy="verses"  # 7 days TTL
         )
 
+        if wanted is None or not isinstance(data, dict) or data.get("status") != "success":
+            return data
+        return slice_chapter(data, wanted)
+
+    async def get_verses_batch(
+        self,
+        references: list[str | dict[str, Any]],
+        version: str = "unv",
+        include_strong: bool = False,
+        max_concurrency: int = 8,
+    ) -> list[dict[str, Any]]:
+        """
+        Query many verse references in one call.
+        
+        References are grouped by (book, chapter, version) so that each
+        chapter is fetched at most once (through get_verse, i.e. snapshot,
+        cache and request coalescing apply). Groups are fetched concurrently,
+        bounded by a semaphore.
+        
+        Args:
+            references: List of references, either citation strings such as
+                "約 3:16", "John 3:16-18", "羅 8" (whole chapter),
+                "創 1:1-2:3" or "約3:16;羅5:8;8:28" (see utils.citations), or
+                dicts with keys book, chapter, verse (optional) and version
+                (optional)
+            version: Default Bible version code
+            include_strong: Include Strong's numbers
+            max_concurrency: Maximum chapters fetched at the same time
+        
+        Returns:
+            One result per reference, in input order. Successful items have
+            status "success", book_id, chapter and verse (of the first
+            chapter), spans ([book_id, chapter, start, end] per segment),
+            version, v_name and record (qb.php verse objects, in citation
+            order); failed items have status "error" and error. A reference
+            fails when it cannot be parsed, when a chapter's response is an
+            error payload or has no record list, or when a chapter has none
+            of the requested verses.
+        """
+        from ..utils.booknames import BookNameConverter
+        
+        results: list[dict[str, Any]] = []
+        wanted: dict[int, dict[tuple[int, int], list[VerseSpan]]] = {}
+        groups: dict[tuple[int, int, str], None] = {}
+        
+        # 1. 解析引用 (VerseSpan) 並依 (書卷, 章, 版本) 分組
+        for position, reference in enumerate(references):
+            item: dict[str, Any] = {"reference": reference}
+            results.append(item)
+            
+            try:
+                if isinstance(reference, dict):
+                    book = str(reference.get("book", ""))
+                    book_id = int(book) if book.isdigit() else BookNameConverter.get_book_id(book)
+                    if not book_id:
+                        raise BookNotFoundError(book)
+                    chapter = reference.get("chapter")
+                    try:
+                        chapter = int(chapter)
+                    except (TypeError, ValueError):
+                        raise InvalidParameterError("chapter", chapter, "無效的章數") from None
+                    verse = reference.get("verse")
+                    spans = (
+                        verse_spans(book_id, chapter, str(verse)) if verse not in (None, "")
+                        else (VerseSpan(book_id, chapter),)
+                    )
+                    ref_version = reference.get("version") or version
+                else:
+                    # 字串引用可包含多段與跨章範圍 (如 "約3:16;羅5:8"、"創 1:1-2:3")
+                    spans = parse_citations(str(reference).strip())
+                    ref_version = version
+            except InvalidParameterError as e:
+                item.update(status="error", error=str(e))
+                continue
+            
+            chapters = chapter_fetches(spans)
+            first = spans[0]
+            item.update(
+                book_id=first.book_id,
+                chapter=first.chapter,
+                verse=verse_spec(chapters[(first.book_id, first.chapter)]),
+                version=ref_version,
+                spans=[list(span) for span in spans],
+            )
+            wanted[position] = chapters
+            for book_id, chapter in chapters:
+                groups[(book_id, chapter, ref_version)] = None
+        
+        # 2. 每章只查詢一次，並行但受 semaphore 限制
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        fetched: dict[tuple[int, int, str], Any] = {}
+        
+        async def fetch_chapter(key: tuple[int, int, str]) -> None:
+            book_id, chapter, ref_version = key
+            try:
+                async with semaphore:
+                    fetched[key] = await self.get_verse(
+                        book=str(book_id),
+                        chapter=chapter,
+                        version=ref_version,
+                        include_strong=include_strong,
+                    )
+            except Exception as e:
+                fetched[key] = e
+        
+        logger.info(f"Fetching verse batch: {len(references)} references in {len(groups)} chapters")
+        await asyncio.gather(*(fetch_chapter(key) for key in groups))
+        
+        # 3. 從整章資料切出每個引用需要的節 (快取資料共用，不修改原物件)
+        for position, chapters in wanted.items():
+            item = results[position]
+            records: list[dict[str, Any]] = []
+            for (book_id, chapter), spans in chapters.items():
+                data = fetched[(book_id, chapter, item["version"])]
+                if isinstance(data, Exception):
+                    item.update(status="error", error=str(data))
+                    break
+                if (
+                    not isinstance(data, dict)
+                    or data.get("status") != "success"
+                    or not isinstance(data.get("record"), list)
+                ):
+                    message = data.get("message") if isinstance(data, dict) else None
+                    item.update(
+                        status="error",
+                        error=f"書卷 {book_id} 第 {chapter} 章查詢失敗: {message or '上游沒有返回經文'}",
+                    )
+                    break
+                matched = [
+                    record for record in data["record"]
+                    if any(span.contains(int(record.get("sec", 0))) for span in spans)
+                ]
+                if not matched:
+                    item.update(status="error", error=f"書卷 {book_id} 第 {chapter} 章找不到指定的經文")
+                    break
+                records.extend(matched)
+            else:
+                item.update(status="success", v_name=data.get("v_name", ""), record=records)
+        
+        return results
+
     async def query_verse_citation(
         self,
         citation: str,
@@ -282,6 +862,7 @@ class FHLAPIEndpoints(FHLAPIClient):
         Query verses using citation format.
         
         API: qsb.php
+        Cache: 7 days (namespace "verses")
         
         Args:
             citation: Citation string (e.g., "太 10:1-3", "John 3:16")
@@ -302,7 +883,12 @@ class FHLAPIEndpoints(FHLAPIClient):
         }
         
         logger.info(f"Fetching verses by citation: {citation}")
-        return await self._make_request("qsb.php", params)
+        return await self._cached_request(
+            endpoint="qsb.php",
+            params=params,
+            namespace="verses",
+            strategy="verses"
+        )
 
     # ========================================================================
     # 3. Search APIs
@@ -324,7 +910,8 @@ class FHLAPIEndpoints(FHLAPIClient):
         """
         Search for keywords or Strong's numbers in the Bible.
         
-        API: se.php
+        API: se.php (answered locally when the version has a snapshot: keyword
+        searches from the inverted index, Strong's numbers from the concordance)
         
         Args:
             query: Search query (keyword or Strong's number)
@@ -396,7 +983,37 @@ class FHLAPIEndpoints(FHLAPIClient):
             params["range_bid"] = range_start
             params["range_eid"] = range_end
         
+        # 本地索引優先 (關鍵字用倒排索引，原文編號用經文彙編)
+        if self.corpus is not None and not index_only:
+            start_bid, end_bid = {
+                "all": (1, 66),
+                "ot": (1, 39),
+                "nt": (40, 66),
+            }.get(scope, (range_start, range_end))
+            local = None
+            if search_type == "keyword":
+                local = self.corpus.search(
+                    version, query, start_bid, end_bid,
+                    limit=limit, offset=offset, count_only=count_only
+                )
+            elif str(query).strip().isdigit():
+                key = ("H" if search_type == "hebrew_number" else "G") + str(int(query))
+                local = self.corpus.search_strongs(
+                    version, key, start_bid, end_bid,
+                    limit=limit, offset=offset, count_only=count_only
+                )
+            if local is not None:
+                logger.debug(f"Search served from local index: {version} '{query}'")
+                return local
+        
         logger.info(f"Searching Bible: query='{query}', type={search_type}, scope={scope}")
+        if not count_only and not index_only:
+            # 分頁從結果區塊切片 (翻頁不再各自查詢上游)
+            del params["offset"]
+            params.pop("limit", None)
+            return await self._windowed_request(
+                "se.php", params, "search", "search", limit=limit, offset=offset
+            )
         return await self._cached_request(
             endpoint="se.php",
             params=params,
@@ -415,6 +1032,7 @@ class FHLAPIEndpoints(FHLAPIClient):
         Get word-by-word analysis of a verse in original language.
         
         API: qp.php
+        Cache: 7 days (namespace "word_analysis")
         
         Args:
             book: Book name (English abbreviation preferred)
@@ -466,7 +1084,52 @@ class FHLAPIEndpoints(FHLAPIClient):
         params = {"bid": book_id, "chap": chapter, "sec": verse}
         
         logger.info(f"Fetching word analysis: {book} (bid={book_id}) {chapter}:{verse}")
-        return await self._make_request("qp.php", params)
+        return await self._cached_request(
+            endpoint="qp.php",
+            params=params,
+            namespace="word_analysis",
+            strategy="word_analysis"
+        )
+
+    async def get_strongs_concordance(
+        self,
+        number: int,
+        testament: str,
+        version: str = "unv",
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> Optional[dict[str, Any]]:
+        """
+        Get Strong's number occurrences from the local concordance.
+        
+        Args:
+            number: Strong's number
+            testament: "OT" (Hebrew) or "NT" (Greek)
+            version: Version used for the verse text
+            limit: Maximum verses to return
+            offset: Number of verses to skip
+        
+        Returns:
+            Dictionary with occurrence_count, verse_count, books (per-book
+            distribution) and record (se.php-style verses with word positions),
+            or None when no concordance/snapshot is available locally
+        """
+        if self.corpus is None:
+            return None
+        
+        key = ("H" if testament.upper() == "OT" else "G") + str(int(number))
+        distribution = self.corpus.strongs_distribution(key)
+        if distribution is None:
+            return None
+        
+        bounds = (1, 39) if key.startswith("H") else (40, 66)
+        verses = self.corpus.search_strongs(
+            version, key, *bounds, limit=limit, offset=offset
+        )
+        if verses is None:
+            return None
+        
+        return {**distribution, "record": verses["record"]}
 
     async def get_strongs_dictionary(
         self, number: int, testament: str
@@ -529,6 +1192,7 @@ class FHLAPIEndpoints(FHLAPIClient):
         List all available commentaries.
         
         API: sc.php?validbook=1
+        Cache: Permanent (namespace "commentaries")
         
         Returns:
             Dictionary with:
@@ -547,7 +1211,12 @@ class FHLAPIEndpoints(FHLAPIClient):
         params = {"validbook": "1"}
         
         logger.info("Fetching commentaries list")
-        return await self._make_request("sc.php", params)
+        return await self._cached_request(
+            endpoint="sc.php",
+            params=params,
+            namespace="commentaries",
+            strategy="commentaries"
+        )
 
     async def get_commentary(
         self,
@@ -560,6 +1229,7 @@ class FHLAPIEndpoints(FHLAPIClient):
         Get commentary for a specific verse.
         
         API: sc.php
+        Cache: 7 days (namespace "commentary")
         
         Args:
             book: Book name (English abbreviation)
@@ -606,19 +1276,34 @@ class FHLAPIEndpoints(FHLAPIClient):
             f"Fetching commentary: {book} (bid={book_id}) {chapter}:{verse}"
             + (f" (commentary #{commentary_id})" if commentary_id else "")
         )
-        return await self._make_request("sc.php", params)
+        return await self._cached_request(
+            endpoint="sc.php",
+            params=params,
+            namespace="commentary",
+            strategy="commentary"
+        )
 
     async def search_commentary(
-        self, keyword: str, commentary_id: int | None = None
+        self,
+        keyword: str,
+        commentary_id: int | None = None,
+        limit: int | None = None,
+        offset: int = 0,
     ) -> dict[str, Any]:
         """
         Search within commentaries.
         
         API: ssc.php
+        Cache: 1 day (namespace "search")
+        
+        ssc.php has no paging and returns every match; the response is kept
+        as one result window and pages are sliced from it.
         
         Args:
             keyword: Search keyword
             commentary_id: Commentary ID to search in (optional)
+            limit: Maximum results to return (None = all)
+            offset: Number of results to skip
         
         Returns:
             Dictionary with search results
@@ -633,7 +1318,9 @@ class FHLAPIEndpoints(FHLAPIClient):
             params["book"] = commentary_id
         
         logger.info(f"Searching commentary: keyword='{keyword}'")
-        return await self._make_request("ssc.php", params)
+        return await self._windowed_request(
+            "ssc.php", params, "search", "search", limit=limit, offset=offset, paged=False
+        )
 
     # ========================================================================
     # 6. Topical Study APIs
@@ -650,6 +1337,7 @@ class FHLAPIEndpoints(FHLAPIClient):
         Query topical Bible study resources.
         
         API: st.php
+        Cache: 7 days (namespace "topics")
         
         Args:
             keyword: Topic keyword (optional if topic_id provided)
@@ -701,7 +1389,12 @@ class FHLAPIEndpoints(FHLAPIClient):
             )
         
         logger.info(f"Fetching topic study: keyword='{keyword}', source={source}")
-        return await self._make_request("st.php", params)
+        return await self._cached_request(
+            endpoint="st.php",
+            params=params,
+            namespace="topics",
+            strategy="topics"
+        )
 
     # ========================================================================
     # 7. Audio Bible APIs
@@ -714,6 +1407,7 @@ class FHLAPIEndpoints(FHLAPIClient):
         Get audio Bible links.
         
         API: au.php
+        Cache: 7 days (namespace "audio")
         
         Args:
             book_id: Book ID (1-66)
@@ -740,7 +1434,12 @@ class FHLAPIEndpoints(FHLAPIClient):
         params = {"version": audio_version, "bid": book_id, "chap": chapter}
         
         logger.info(f"Fetching audio Bible: book_id={book_id}, chapter={chapter}")
-        return await self._make_request("au.php", params)
+        return await self._cached_request(
+            endpoint="au.php",
+            params=params,
+            namespace="audio",
+            strategy="audio"
+        )
 
     # ========================================================================
     # 8. Apocrypha (次經) APIs - Books 101-115
@@ -813,6 +1512,13 @@ class FHLAPIEndpoints(FHLAPIClient):
             from ..utils.errors import BookNotFoundError
             raise BookNotFoundError(f"Invalid Apocrypha book: {book}")
         
+        # 本地快照優先 (快照不含 Strong's Number)
+        if self.corpus is not None and not include_strong:
+            local = self.corpus.get_verse(APOCRYPHA_VERSION, book_id, chapter, verse)
+            if local is not None:
+                logger.debug(f"Verse served from local corpus: {APOCRYPHA_VERSION} {book_id} {chapter}")
+                return local
+        
         params: dict[str, Any] = {
             "bid": book_id,  # Use bid instead of chineses for accurate mapping
             "chap": chapter,
@@ -867,20 +1573,12 @@ class FHLAPIEndpoints(FHLAPIClient):
             >>>     results = await client.search_apocrypha("智慧", limit=10)
             >>>     print(f"Found {results['record_count']} verses")
         """
-        params: dict[str, Any] = {
-            "q": query,
-            "offset": offset,
-        }
-        
-        if limit is not None:
-            params["limit"] = limit
+        params: dict[str, Any] = {"q": query}
         
         logger.info(f"Searching apocrypha: query='{query}'")
-        return await self._cached_request(
-            endpoint="sesub.php",
-            params=params,
-            namespace="apocrypha_search",
-            strategy="search"  # 1 day TTL
+        # 分頁從結果區塊切片 (翻頁不再各自查詢上游)
+        return await self._windowed_request(
+            "sesub.php", params, "apocrypha_search", "search", limit=limit, offset=offset  # 1 day TTL
         )
 
     # ========================================================================
@@ -952,6 +1650,13 @@ class FHLAPIEndpoints(FHLAPIClient):
             from ..utils.errors import BookNotFoundError
             raise BookNotFoundError(f"Invalid Apostolic Fathers book: {book}")
         
+        # 本地快照優先 (快照不含 Strong's Number)
+        if self.corpus is not None and not include_strong:
+            local = self.corpus.get_verse(APOSTOLIC_FATHERS_VERSION, book_id, chapter, verse)
+            if local is not None:
+                logger.debug(f"Verse served from local corpus: {APOSTOLIC_FATHERS_VERSION} {book_id} {chapter}")
+                return local
+        
         params: dict[str, Any] = {
             "bid": book_id,  # Use bid instead of chineses for accurate mapping
             "chap": chapter,
@@ -1006,20 +1711,12 @@ class FHLAPIEndpoints(FHLAPIClient):
             >>>     results = await client.search_apostolic_fathers("教會", limit=10)
             >>>     print(f"Found {results['record_count']} verses")
         """
-        params: dict[str, Any] = {
-            "q": query,
-            "offset": offset,
-        }
-        
-        if limit is not None:
-            params["limit"] = limit
+        params: dict[str, Any] = {"q": query}
         
         logger.info(f"Searching apostolic fathers: query='{query}'")
-        return await self._cached_request(
-            endpoint="seaf.php",
-            params=params,
-            namespace="apostolic_fathers_search",
-            strategy="search"  # 1 day TTL
+        # 分頁從結果區塊切片 (翻頁不再各自查詢上游)
+        return await self._windowed_request(
+            "seaf.php", params, "apostolic_fathers_search", "search", limit=limit, offset=offset  # 1 day TTL
         )
 
     # ========================================================================
@@ -1111,7 +1808,8 @@ class FHLAPIEndpoints(FHLAPIClient):
         column: str | None = None,
         pub_date: str | None = None,
         use_simplified: bool = False,
-        limit: int = 50
+        limit: int = 50,
+        include_content: bool = True
     ) -> dict[str, Any]:
         """
         Search Faith Hope Love (信望愛) articles.
@@ -1134,6 +1832,10 @@ class FHLAPIEndpoints(FHLAPIClient):
             use_simplified: Use simplified Chinese (default: False)
             limit: Maximum number of results to return (client-side limit)
                    Range: 1-200, Default: 50
+            include_content: Include the full HTML content (txt). When False,
+                   each article carries a plain-text ``preview`` instead, and
+                   queries narrower than an earlier one are answered from the
+                   local article index without contacting the API
         
         Returns:
             Dictionary with:
@@ -1150,6 +1852,7 @@ class FHLAPIEndpoints(FHLAPIClient):
                     - abst: Abstract/summary
                     - txt: Full article content (HTML format)
                 - limited: True if results were limited (added by client)
+                - source: "index" when answered from the local article index
         
         Raises:
             InvalidParameterError: If no search parameters provided
@@ -1180,6 +1883,9 @@ class FHLAPIEndpoints(FHLAPIClient):
             - Contains tags like <pic>filename.jpg</pic>, <br/>, etc.
             - No sorting control (API returns in its own order)
             - Results are cached for 1 day (articles update weekly)
+            - The API has no pagination: each distinct query downloads every
+              matching article once; use include_content=False and refine
+              an earlier query to avoid further downloads
         """
         # Validate: at least one search parameter required
         if not any([title, author, content, abstract, column, pub_date]):
@@ -1189,45 +1895,127 @@ class FHLAPIEndpoints(FHLAPIClient):
                 "Must provide at least one search parameter (title, author, content, abstract, column, or pub_date)"
             )
         
-        # Build parameters
-        params: dict[str, str | int] = {
-            "gb": 1 if use_simplified else 0
+        # 正規化條件 (API 參數名稱)；空白條件不送出
+        filters = {
+            name: value.strip()
+            for name, value in (
+                ("title", title),
+                ("author", author),
+                ("txt", content),
+                ("abst", abstract),
+                ("ptab", column),
+                ("pubtime", pub_date),
+            )
+            if value and value.strip()
         }
-        
-        if title:
-            params["title"] = title
-        if author:
-            params["author"] = author
-        if content:
-            params["txt"] = content
-        if abstract:
-            params["abst"] = abstract
-        if column:
-            params["ptab"] = column
-        if pub_date:
-            params["pubtime"] = pub_date
+        gb = 1 if use_simplified else 0
         
         logger.info(
             f"Searching articles: title={title}, author={author}, "
             f"content={content}, column={column}, limit={limit}"
         )
         
-        # Make request to www.fhl.net/api/ (different base URL)
-        # Articles API is on www.fhl.net, not bible.fhl.net
-        url = "https://www.fhl.net/api/json.php"
+        article_index = self._get_article_index()
         
-        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        # 不需要內文時，先嘗試以本地索引回答 (較寬鬆的查詢已下載過)
+        if not include_content and article_index is not None:
+            records = article_index.lookup(filters, gb)
+            if records is not None:
+                logger.debug(f"Articles answered from local index: {filters}")
+                return self._limit_articles(
+                    {"status": 1, "record_count": len(records), "record": records, "source": "index"},
+                    limit,
+                )
         
-        # Apply client-side limit
-        if data.get("status") == 1 and "record" in data:
-            if isinstance(data["record"], list) and len(data["record"]) > limit:
-                data["record"] = data["record"][:limit]
-                data["record_count"] = limit
-                data["limited"] = True  # Flag to indicate results were limited
+        # 文章 API 在 www.fhl.net (不是 bible.fhl.net)；透過共用的連線池、
+        # 該主機的斷路器與速率限制，並使用一般的快取
+        params = {"gb": gb, **filters}
+        if self.config.api.streaming:
+            return await self._stream_articles(params, filters, gb, limit, include_content)
         
+        data = await self._cached_request(
+            endpoint=ARTICLES_API_URL,
+            params=params,
+            namespace="articles",
+            strategy="articles"
+        )
+        if isinstance(data, str):
+            # 上游的 content-type 不一定是 application/json
+            try:
+                data = json.loads(data)
+            except ValueError as e:
+                raise APIResponseError(message=f"Invalid articles response: {e}")
+        
+        if (
+            article_index is not None
+            and data.get("status") == 1
+            and isinstance(data.get("record"), list)
+            and not data.get("stale")
+        ):
+            article_index.record(filters, gb, data["record"])
+        
+        result = self._limit_articles(data, limit)
+        if not include_content and isinstance(result.get("record"), list):
+            result["record"] = [self._article_summary(article) for article in result["record"]]
+        return result
+    
+    async def _stream_articles(
+        self,
+        params: dict[str, Any],
+        filters: dict[str, str],
+        gb: int,
+        limit: int,
+        include_content: bool
+    ) -> dict[str, Any]:
+        """
+        Streaming variant of search_articles (``api.streaming``).
+        
+        Articles are parsed one at a time and reading stops after ``limit``
+        of them, so the full HTML of the remaining matches is never
+        downloaded. Without ``include_content`` each article's HTML is
+        dropped as soon as its preview is built.
+        """
+        meta: dict[str, Any] = {}
+        records: list[dict[str, Any]] = []
+        limited = False
+        
+        # 多讀一篇以判斷結果是否被截斷
+        async with aclosing(self.iter_records(
+            ARTICLES_API_URL, params, "articles", "articles", limit=limit + 1, meta=meta
+        )) as articles:
+            async for article in articles:
+                if len(records) >= limit:
+                    limited = True
+                    break
+                records.append(article if include_content else self._article_summary(article))
+        
+        result = {**meta, "record": records}
+        if limited:
+            result["record_count"] = limit
+            result["limited"] = True
+        else:
+            result.setdefault("record_count", len(records))
+            article_index = self._get_article_index()
+            if article_index is not None and meta.get("status") == 1:
+                article_index.record(filters, gb, records)
+        return result
+    
+    @staticmethod
+    def _article_summary(article: dict[str, Any]) -> dict[str, Any]:
+        """Article metadata with a plain-text ``preview`` instead of the HTML content."""
+        summary = {k: v for k, v in article.items() if k != "txt"}
+        summary["preview"] = article_preview(article.get("txt", ""))
+        return summary
+    
+    @staticmethod
+    def _limit_articles(data: dict[str, Any], limit: int) -> dict[str, Any]:
+        """Apply the client-side limit to a copy of an articles response (cached data is shared)."""
+        data = dict(data)
+        records = data.get("record")
+        if data.get("status") == 1 and isinstance(records, list) and len(records) > limit:
+            data["record"] = records[:limit]
+            data["record_count"] = limit
+            data["limited"] = True  # Flag to indicate results were limited
         return data
     
     def list_article_columns(self) -> list[dict[str, str]]:
@@ -1393,3 +2181,114 @@ class FHLAPIEndpoints(FHLAPIClient):
             "error_code": "API_LIMITATION",
             "recommendation": "Use search_articles() and cache the results"
         }
+
+
+# 全域共用 Endpoints 實例
+_shared_endpoints: Optional[FHLAPIEndpoints] = None
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# 關閉中的舊實例 (保留 task 參考直到完成)
+_closing: set[Any] = set()
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the running event loop, or None when called outside of one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _discard_endpoints(endpoints: FHLAPIEndpoints, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """
+    Close an instance that is being replaced because the event loop changed.
+    
+    The close runs on the instance's own loop when that loop is still running
+    (another thread); otherwise it is scheduled on the current loop. Connections
+    bound to a closed loop may fail to shut down cleanly, which is only logged:
+    the client is still dropped so its pool is released.
+    """
+    async def close() -> None:
+        try:
+            await endpoints.close()
+        except Exception as e:
+            logger.debug(f"Error closing stale FHLAPIEndpoints: {e}")
+    
+    # 舊迴圈已關閉時取消背景更新會失敗；先行清除
+    for task in list(endpoints._refreshing):
+        try:
+            task.cancel()
+        except RuntimeError:
+            pass
+    endpoints._refreshing.clear()
+    
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        future = asyncio.run_coroutine_threadsafe(close(), loop)
+    else:
+        future = asyncio.get_running_loop().create_task(close())
+    _closing.add(future)
+    future.add_done_callback(_closing.discard)
+
+
+def get_endpoints() -> FHLAPIEndpoints:
+    """
+    Get the process-wide shared FHLAPIEndpoints instance.
+    
+    All tools and resource handlers share one instance so that the config
+    lookup, cache setup and pooled HTTP connections (keep-alive, TLS sessions)
+    are reused across calls instead of being rebuilt per request.
+    
+    A new instance is created lazily when none exists, when the previous one
+    has been closed, or when it was bound to a different event loop (httpx
+    connections cannot be reused across loops); in the last case the stale
+    instance is closed so its connection pool and background tasks are
+    released.
+    
+    Returns:
+        Shared FHLAPIEndpoints instance
+    
+    Example:
+        >>> api = get_endpoints()
+        >>> verse = await api.get_verse("約", 3, "16")
+    """
+    global _shared_endpoints, _shared_loop
+    
+    loop = _current_loop()
+    if (
+        _shared_endpoints is None
+        or _shared_endpoints.is_closed
+        or (loop is not None and _shared_loop is not None and loop is not _shared_loop)
+    ):
+        if _shared_endpoints is not None and not _shared_endpoints.is_closed:
+            _discard_endpoints(_shared_endpoints, _shared_loop)
+        _shared_endpoints = FHLAPIEndpoints()
+        _shared_loop = loop
+    elif _shared_loop is None:
+        _shared_loop = loop
+    
+    return _shared_endpoints
+
+
+def set_endpoints(endpoints: FHLAPIEndpoints) -> None:
+    """
+    Register an existing FHLAPIEndpoints instance as the shared instance.
+    
+    Used by FHLBibleServer so that tools, resources and the server itself
+    all go through the same client.
+    
+    Args:
+        endpoints: Instance to share
+    """
+    global _shared_endpoints, _shared_loop
+    _shared_endpoints = endpoints
+    _shared_loop = _current_loop()
+
+
+async def close_endpoints() -> None:
+    """Close and discard the shared FHLAPIEndpoints instance (if any)."""
+    global _shared_endpoints, _shared_loop
+    
+    if _shared_endpoints is not None and not _shared_endpoints.is_closed:
+        await _shared_endpoints.close()
+    _shared_endpoints = None
+    _shared_loop = None
@@ -31,6 +31,21 @@ class APIConfig:
     base_url: str = "https://bible.fhl.net/api/"  # Updated to /api/ endpoint (Phase 1)
     timeout: int = 30
     max_retries: int = 3
+    max_connections: int = 20              # Connection pool size (shared client)
+    max_keepalive_connections: int = 10    # Idle connections kept alive for reuse
+    keepalive_expiry: float = 30.0         # Seconds before an idle connection is closed
+    http2: bool = False                    # Requires the optional 'h2' package (pip install fhl-bible-mcp[http2])
+    adaptive_timeout: bool = True          # Derive timeouts from observed latency (timeout is the cap)
+    min_timeout: float = 5.0               # Lower bound for adaptive timeouts
+    breaker_failure_threshold: int = 5     # Consecutive failures that open a host's circuit breaker (0 = off)
+    breaker_reset_timeout: float = 30.0    # Seconds before an open breaker lets a probe request through
+    retry_budget_ratio: float = 0.2        # Average retries allowed per request
+    retry_jitter: bool = True              # Randomise backoff delays
+    rate_limit: float = 10.0               # Requests per second per host (0 = unlimited)
+    rate_burst: int = 20                   # Requests allowed at once before rate limiting applies
+    max_concurrency_per_endpoint: int = 8  # Simultaneous requests per endpoint (0 = unlimited)
+    max_retry_after: float = 30.0          # Longest 429 Retry-After to queue for (longer ones fail)
+    streaming: bool = False                # Parse large responses (searches, articles) incrementally
 
 
 @dataclass
@@ -48,6 +63,34 @@ class CacheConfig:
     enabled: bool = True
     directory: str = ".cache"
     cleanup_on_start: bool = False
+    backend: str = "sqlite"                    # 持久層: "sqlite" 或 "file" (每鍵一個 JSON 檔)
+    memory_max_entries: int = 1024             # 記憶體層最多項目數 (0 = 停用)
+    memory_max_bytes: int = 32 * 1024 * 1024   # 記憶體層最多位元組數 (估計值)
+    max_stale: int = 24 * 3600                 # 過期後仍先返回並背景更新的秒數 (0 = 停用)
+    max_background_refreshes: int = 4          # 同時進行的背景更新上限
+    stale_if_error: int = 7 * 24 * 3600        # 上游失敗時仍可使用的過期秒數 (0 = 停用)
+    result_window_size: int = 500              # 搜尋一次向上游取得的結果數 (分頁由此區塊切片)
+    result_window_ttl: int = 600               # 搜尋結果區塊閒置多久後從記憶體淘汰 (秒)
+
+
+@dataclass
+class CorpusConfig:
+    """Offline corpus snapshot configuration"""
+    enabled: bool = True                       # 有快照的版本直接從本地回答
+    directory: str = ".corpus"                 # 快照目錄 (python -m fhl_bible_mcp snapshot)
+
+
+@dataclass
+class MetricsConfig:
+    """Runtime metrics configuration"""
+    enabled: bool = True                       # 記錄延遲、狀態碼與位元組數 (info://metrics)
+
+
+@dataclass
+class OutputConfig:
+    """Tool result output configuration"""
+    mode: str = "pretty"                       # "pretty" (縮排 JSON)、"compact" (精簡 JSON) 或 "table" (文字表格)
+    max_bytes: int = 0                         # 每次工具結果的位元組上限，超過時分頁 (0 = 不限制)
 
 
 @dataclass
@@ -73,6 +116,9 @@ class Config:
     api: APIConfig = field(default_factory=APIConfig)
     defaults: DefaultsConfig = field(default_factory=DefaultsConfig)
     cache: CacheConfig = field(default_factory=CacheConfig)
+    corpus: CorpusConfig = field(default_factory=CorpusConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    output: OutputConfig = field(default_factory=OutputConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
     
     # 追蹤設定來源
@@ -138,6 +184,12 @@ class Config:
                 self._update_section(self.defaults, data["defaults"], "file", "defaults")
             if "cache" in data:
                 self._update_section(self.cache, data["cache"], "file", "cache")
+            if "corpus" in data:
+                self._update_section(self.corpus, data["corpus"], "file", "corpus")
+            if "metrics" in data:
+                self._update_section(self.metrics, data["metrics"], "file", "metrics")
+            if "output" in data:
+                self._update_section(self.output, data["output"], "file", "output")
             if "logging" in data:
                 self._update_section(self.logging, data["logging"], "file", "logging")
             
@@ -160,6 +212,21 @@ class Config:
             f"{env_prefix}API_BASE_URL": ("api", "base_url"),
             f"{env_prefix}API_TIMEOUT": ("api", "timeout", int),
             f"{env_prefix}API_MAX_RETRIES": ("api", "max_retries", int),
+            f"{env_prefix}API_MAX_CONNECTIONS": ("api", "max_connections", int),
+            f"{env_prefix}API_MAX_KEEPALIVE": ("api", "max_keepalive_connections", int),
+            f"{env_prefix}API_KEEPALIVE_EXPIRY": ("api", "keepalive_expiry", float),
+            f"{env_prefix}API_HTTP2": ("api", "http2", bool),
+            f"{env_prefix}API_ADAPTIVE_TIMEOUT": ("api", "adaptive_timeout", bool),
+            f"{env_prefix}API_MIN_TIMEOUT": ("api", "min_timeout", float),
+            f"{env_prefix}API_BREAKER_THRESHOLD": ("api", "breaker_failure_threshold", int),
+            f"{env_prefix}API_BREAKER_RESET": ("api", "breaker_reset_timeout", float),
+            f"{env_prefix}API_RETRY_BUDGET": ("api", "retry_budget_ratio", float),
+            f"{env_prefix}API_RETRY_JITTER": ("api", "retry_jitter", bool),
+            f"{env_prefix}API_RATE_LIMIT": ("api", "rate_limit", float),
+            f"{env_prefix}API_RATE_BURST": ("api", "rate_burst", int),
+            f"{env_prefix}API_MAX_CONCURRENCY": ("api", "max_concurrency_per_endpoint", int),
+            f"{env_prefix}API_MAX_RETRY_AFTER": ("api", "max_retry_after", float),
+            f"{env_prefix}API_STREAMING": ("api", "streaming", bool),
             
             # Defaults
             f"{env_prefix}DEFAULT_VERSION": ("defaults", "bible_version"),
@@ -171,6 +238,25 @@ class Config:
             f"{env_prefix}CACHE_ENABLED": ("cache", "enabled", bool),
             f"{env_prefix}CACHE_DIR": ("cache", "directory"),
             f"{env_prefix}CACHE_CLEANUP_ON_START": ("cache", "cleanup_on_start", bool),
+            f"{env_prefix}CACHE_BACKEND": ("cache", "backend"),
+            f"{env_prefix}CACHE_MEMORY_MAX_ENTRIES": ("cache", "memory_max_entries", int),
+            f"{env_prefix}CACHE_MEMORY_MAX_BYTES": ("cache", "memory_max_bytes", int),
+            f"{env_prefix}CACHE_MAX_STALE": ("cache", "max_stale", int),
+            f"{env_prefix}CACHE_MAX_REFRESHES": ("cache", "max_background_refreshes", int),
+            f"{env_prefix}CACHE_STALE_IF_ERROR": ("cache", "stale_if_error", int),
+            f"{env_prefix}CACHE_WINDOW_SIZE": ("cache", "result_window_size", int),
+            f"{env_prefix}CACHE_WINDOW_TTL": ("cache", "result_window_ttl", int),
+            
+            # Corpus
+            f"{env_prefix}CORPUS_ENABLED": ("corpus", "enabled", bool),
+            f"{env_prefix}CORPUS_DIR": ("corpus", "directory"),
+            
+            # Metrics
+            f"{env_prefix}METRICS_ENABLED": ("metrics", "enabled", bool),
+            
+            # Output
+            f"{env_prefix}OUTPUT_MODE": ("output", "mode"),
+            f"{env_prefix}OUTPUT_MAX_BYTES": ("output", "max_bytes", int),
             
             # Logging
             f"{env_prefix}LOG_LEVEL": ("logging", "level"),
@@ -195,6 +281,8 @@ class Config:
                         converted_value = value.lower() in ('true', '1', 'yes', 'on')
                     elif converter == int:
                         converted_value = int(value)
+                    elif converter == float:
+                        converted_value = float(value)
                     else:
                         converted_value = value
                     
@@ -238,7 +326,7 @@ class Config:
         Update configuration at runtime.
         
         Args:
-            section: Section name (server, api, defaults, cache, logging)
+            section: Section name (server, api, defaults, cache, corpus, metrics, output, logging)
             key: Setting key
             value: New value
             validate: Whether to validate the value type
@@ -308,6 +396,9 @@ class Config:
             "api": asdict(self.api),
             "defaults": asdict(self.defaults),
             "cache": asdict(self.cache),
+            "corpus": asdict(self.corpus),
+            "metrics": asdict(self.metrics),
+            "output": asdict(self.output),
             "logging": asdict(self.logging),
         }
     
@@ -347,6 +438,9 @@ class Config:
             f"  api={self.api}\n"
             f"  defaults={self.defaults}\n"
             f"  cache={self.cache}\n"
+            f"  corpus={self.corpus}\n"
+            f"  metrics={self.metrics}\n"
+            f"  output={self.output}\n"
             f"  logging={self.logging}\n"
             f")"
         )
@@ -48,11 +48,12 @@ class AdvancedCrossReferencePrompt(PromptTemplate):
 
 ## 步驟 5: 建立經文網絡
 **執行**: 繪製經文關係圖
+- 以 get_bible_verses_batch 一次取得所有相關經文
 **輸出**: 經文網絡圖
 
 ## 步驟 6: 綜合解讀
 **執行**: 從多處經文理解真理
 **輸出**: 綜合解經
 
-💡 工具: search_bible, get_commentary
+💡 工具: search_bible, get_bible_verses_batch, get_commentary
 """
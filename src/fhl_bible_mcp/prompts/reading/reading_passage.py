@@ -68,6 +68,7 @@ class ReadingPassagePrompt(PromptTemplate):
 - 範圍: {book} {start_chapter}:{start_verse} 至 {end_chapter}:{end_verse}
 - 版本: {version}
 - 跨章: {'是' if is_cross_chapter else '否'}
+- 多段經文可用 get_bible_verses_batch 一次取得
 **輸出**: 完整經文內容
 
 ## 步驟 2: 分析背景
@@ -59,5 +59,5 @@ class SpecialTopicalChainPrompt(PromptTemplate):
 **執行**: 總結主題的聖經神學
 **輸出**: 神學摘要與應用
 
-💡 工具: search_bible, study_topic_deep
+💡 工具: search_bible, get_bible_verses_batch, study_topic_deep
 """
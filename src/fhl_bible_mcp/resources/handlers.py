@@ -11,6 +11,8 @@ FHL Bible MCP Server - Resource Handlers
 - info://versions
 - info://books
 - info://commentaries
+- info://metrics
+- info://upstream
 """
 
 from typing import Dict, Any
@@ -22,6 +24,7 @@ from ..tools.strongs import lookup_strongs
 from ..tools.commentary import get_commentary, list_commentaries
 from ..tools.info import list_bible_versions, get_book_list
 from ..utils.errors import FHLAPIError
+from ..utils.metrics import get_metrics
 
 
 class ResourceError(FHLAPIError):
@@ -288,6 +291,9 @@ class InfoResourceHandler(ResourceHandler):
             info://books
             info://books?testament=NT
             info://commentaries
+            info://metrics
+            info://metrics?format=prometheus
+            info://upstream
         """
         parsed = urlparse(uri)
         # info://versions 會被解析為 netloc=versions, path=''
@@ -305,9 +311,23 @@ class InfoResourceHandler(ResourceHandler):
         elif path == "commentaries":
             # 列出註釋書
             result = await list_commentaries(use_simplified=use_simplified)
+        elif path == "metrics":
+            # 執行期指標 (延遲分布、狀態碼、快取命中率、位元組數)
+            metrics = get_metrics()
+            request_stats = self.endpoints.get_request_stats()
+            if query_params.get("format", ["json"])[0] == "prometheus":
+                return {
+                    "uri": uri,
+                    "mimeType": "text/plain; version=0.0.4",
+                    "content": metrics.render_prometheus(self.endpoints.cache, request_stats)
+                }
+            result = metrics.snapshot(self.endpoints.cache, request_stats)
+        elif path == "upstream":
+            # 各上游主機的斷路器、自適應逾時與重試預算
+            result = self.endpoints.get_upstream_info()
         else:
             raise ResourceError(
-                f"不支援的 info:// 路徑: {path}。支援的路徑: versions, books, commentaries"
+                f"不支援的 info:// 路徑: {path}。支援的路徑: versions, books, commentaries, metrics, upstream"
             )
         
         return {
@@ -423,6 +443,16 @@ class ResourceRouter:
                     "uri": "info://commentaries",
                     "description": "列出所有註釋書",
                     "example": "info://commentaries"
+                },
+                {
+                    "uri": "info://metrics",
+                    "description": "執行期指標 (延遲分布、狀態碼、快取命中率)；?format=prometheus 輸出 Prometheus 格式",
+                    "example": "info://metrics"
+                },
+                {
+                    "uri": "info://upstream",
+                    "description": "上游主機狀態 (斷路器、自適應逾時、重試預算)",
+                    "example": "info://upstream"
                 }
             ]
         }
@@ -5,7 +5,9 @@ Main server module integrating Tools, Resources, and Prompts.
 """
 
 import asyncio
+import json
 import logging
+import time
 from typing import Any, Sequence
 
 from mcp.server import Server
@@ -20,14 +22,18 @@ from mcp.types import (
     GetPromptResult,
 )
 
-from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.api.endpoints import close_endpoints, get_endpoints
 from fhl_bible_mcp.resources.handlers import ResourceRouter
 from fhl_bible_mcp.prompts.templates import PromptManager
+from fhl_bible_mcp.utils.errors import InvalidParameterError
+from fhl_bible_mcp.utils.metrics import get_metrics
+from fhl_bible_mcp.utils.output import CURSOR_SCHEMA, decode_cursor, render_result, tool_call
 
 # Import all tool functions
 from fhl_bible_mcp.tools.verse import (
     get_bible_verse,
     get_bible_chapter,
+    get_bible_verses_batch,
     query_verse_citation,
 )
 from fhl_bible_mcp.tools.search import (
@@ -92,7 +98,8 @@ class FHLBibleServer:
     def __init__(self):
         """Initialize FHL Bible MCP Server"""
         self.server = Server("fhl-bible-server")
-        self.endpoints = FHLAPIEndpoints()
+        # 共用的 Endpoints 實例 (tools 與 resources 透過 get_endpoints() 使用同一個連線池)
+        self.endpoints = get_endpoints()
         self.resource_router = ResourceRouter(self.endpoints)
         self.prompt_manager = PromptManager()
         
@@ -113,7 +120,7 @@ class FHLBibleServer:
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List all available tools"""
-            return [
+            tools = [
                 # Verse Query Tools
                 Tool(
                     name="get_bible_verse",
@@ -165,7 +172,7 @@ class FHLBibleServer:
                 ),
                 Tool(
                     name="query_verse_citation",
-                    description="解析並查詢經文引用字串（如：'約 3:16', '太 5:3-10'）。",
+                    description="解析並查詢經文引用字串（如：'約 3:16', '太 5:3-10', '創 1:1-2:3', '約3:16;羅5:8;8:28'）。跨章或多段引用每章只查詢一次。",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -177,6 +184,24 @@ class FHLBibleServer:
                         "required": ["citation"]
                     }
                 ),
+                Tool(
+                    name="get_bible_verses_batch",
+                    description="一次查詢多段經文（如交叉引用、主題串連）。同一章只查詢一次並行取得，結果依輸入順序返回。",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "references": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "經文引用列表（如 ['約 3:16', '羅 8:28-30', '詩 23']）"
+                            },
+                            "version": {"type": "string", "description": "聖經版本代碼（預設：unv）"},
+                            "include_strong": {"type": "boolean", "description": "是否包含 Strong's Number"},
+                            "use_simplified": {"type": "boolean", "description": "是否使用簡體中文"}
+                        },
+                        "required": ["references"]
+                    }
+                ),
                 
                 # Search Tools
                 Tool(
@@ -275,6 +300,7 @@ class FHLBibleServer:
                                 "description": "約別（OT=舊約, NT=新約）。當 number 包含 G/H 前綴時可省略。"
                             },
                             "limit": {"type": "integer", "description": "最多返回筆數"},
+                            "offset": {"type": "integer", "description": "跳過筆數（用於分頁）"},
                             "use_simplified": {"type": "boolean", "description": "是否使用簡體中文"}
                         },
                         "required": ["number"]
@@ -315,7 +341,9 @@ class FHLBibleServer:
                         "properties": {
                             "keyword": {"type": "string", "description": "搜尋關鍵字"},
                             "commentary_id": {"type": "integer", "description": "註釋書編號"},
-                            "use_simplified": {"type": "boolean", "description": "是否使用簡體中文"}
+                            "use_simplified": {"type": "boolean", "description": "是否使用簡體中文"},
+                            "limit": {"type": "integer", "description": "最多返回筆數（不指定則返回全部）"},
+                            "offset": {"type": "integer", "description": "跳過筆數"}
                         },
                         "required": ["keyword"]
                     }
@@ -459,96 +487,122 @@ class FHLBibleServer:
                 )
                 for tool in get_articles_tool_definitions()
             ]
+            
+            # 所有工具都接受 cursor (結果超過 output.max_bytes 時的下一頁)
+            for tool in tools:
+                tool.inputSchema.setdefault("properties", {})["cursor"] = CURSOR_SCHEMA
+            return tools
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Any) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
             """Call a tool by name with arguments"""
+            metrics = get_metrics()
+            started = time.perf_counter() if metrics.enabled else 0.0
+            contents = None
+            error = False
+            
             try:
                 logger.info(f"Calling tool: {name} with arguments: {arguments}")
                 
-                # Route to appropriate tool function
-                if name == "get_bible_verse":
-                    result = await get_bible_verse(**arguments)
-                elif name == "get_bible_chapter":
-                    result = await get_bible_chapter(**arguments)
-                elif name == "query_verse_citation":
-                    result = await query_verse_citation(**arguments)
-                elif name == "search_bible":
-                    result = await search_bible(**arguments)
-                elif name == "search_bible_advanced":
-                    result = await search_bible_advanced(**arguments)
-                elif name == "get_word_analysis":
-                    result = await get_word_analysis(**arguments)
-                elif name == "lookup_strongs":
-                    result = await lookup_strongs(**arguments)
-                elif name == "search_strongs_occurrences":
-                    result = await search_strongs_occurrences(**arguments)
-                elif name == "get_commentary":
-                    result = await get_commentary(**arguments)
-                elif name == "list_commentaries":
-                    result = await list_commentaries(**arguments)
-                elif name == "search_commentary":
-                    result = await search_commentary(**arguments)
-                elif name == "get_topic_study":
-                    result = await get_topic_study(**arguments)
-                elif name == "list_bible_versions":
-                    result = await list_bible_versions(**arguments)
-                elif name == "get_book_list":
-                    result = await get_book_list(**arguments)
-                elif name == "get_book_info":
-                    result = await get_book_info(**arguments)
-                elif name == "search_available_versions":
-                    result = await search_available_versions(**arguments)
-                elif name == "get_audio_bible":
-                    result = await get_audio_bible(**arguments)
-                elif name == "list_audio_versions":
-                    result = await list_audio_versions(**arguments)
-                elif name == "get_audio_chapter_with_text":
-                    result = await get_audio_chapter_with_text(**arguments)
-                # Apocrypha tools
-                elif name == "get_apocrypha_verse":
-                    result = await handle_get_apocrypha_verse(self.endpoints, arguments)
-                    return result
-                elif name == "search_apocrypha":
-                    result = await handle_search_apocrypha(self.endpoints, arguments)
-                    return result
-                elif name == "list_apocrypha_books":
-                    result = await handle_list_apocrypha_books(self.endpoints, arguments)
-                    return result
-                # Apostolic Fathers tools
-                elif name == "get_apostolic_fathers_verse":
-                    result = await handle_get_apostolic_fathers_verse(self.endpoints, arguments)
-                    return result
-                elif name == "search_apostolic_fathers":
-                    result = await handle_search_apostolic_fathers(self.endpoints, arguments)
-                    return result
-                elif name == "list_apostolic_fathers_books":
-                    result = await handle_list_apostolic_fathers_books(self.endpoints, arguments)
-                    return result
-                # Footnotes tools
-                elif name == "get_bible_footnote":
-                    result = await handle_get_bible_footnote(self.endpoints, arguments)
-                    return result
-                # Articles tools
-                elif name == "search_fhl_articles":
-                    result = await handle_search_articles(self.endpoints, arguments)
-                    return result
-                elif name == "list_fhl_article_columns":
-                    result = await handle_list_article_columns(self.endpoints, arguments)
-                    return result
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
+                # 分頁游標：沿用上一頁的參數，從游標的位移繼續
+                arguments = dict(arguments or {})
+                offset = 0
+                cursor = arguments.pop("cursor", None)
+                if cursor:
+                    cursor_tool, arguments, offset = decode_cursor(cursor)
+                    if cursor_tool != name:
+                        raise InvalidParameterError("cursor", cursor, f"游標屬於工具 {cursor_tool}")
                 
-                # Format result as JSON string
-                import json
-                result_text = json.dumps(result, ensure_ascii=False, indent=2)
+                with tool_call(name, arguments, offset):
+                    # Route to appropriate tool function
+                    if name == "get_bible_verse":
+                        result = await get_bible_verse(**arguments)
+                    elif name == "get_bible_chapter":
+                        result = await get_bible_chapter(**arguments)
+                    elif name == "query_verse_citation":
+                        result = await query_verse_citation(**arguments)
+                    elif name == "get_bible_verses_batch":
+                        result = await get_bible_verses_batch(**arguments)
+                    elif name == "search_bible":
+                        result = await search_bible(**arguments)
+                    elif name == "search_bible_advanced":
+                        result = await search_bible_advanced(**arguments)
+                    elif name == "get_word_analysis":
+                        result = await get_word_analysis(**arguments)
+                    elif name == "lookup_strongs":
+                        result = await lookup_strongs(**arguments)
+                    elif name == "search_strongs_occurrences":
+                        result = await search_strongs_occurrences(**arguments)
+                    elif name == "get_commentary":
+                        result = await get_commentary(**arguments)
+                    elif name == "list_commentaries":
+                        result = await list_commentaries(**arguments)
+                    elif name == "search_commentary":
+                        result = await search_commentary(**arguments)
+                    elif name == "get_topic_study":
+                        result = await get_topic_study(**arguments)
+                    elif name == "list_bible_versions":
+                        result = await list_bible_versions(**arguments)
+                    elif name == "get_book_list":
+                        result = await get_book_list(**arguments)
+                    elif name == "get_book_info":
+                        result = await get_book_info(**arguments)
+                    elif name == "search_available_versions":
+                        result = await search_available_versions(**arguments)
+                    elif name == "get_audio_bible":
+                        result = await get_audio_bible(**arguments)
+                    elif name == "list_audio_versions":
+                        result = await list_audio_versions(**arguments)
+                    elif name == "get_audio_chapter_with_text":
+                        result = await get_audio_chapter_with_text(**arguments)
+                    # Apocrypha tools
+                    elif name == "get_apocrypha_verse":
+                        contents = await handle_get_apocrypha_verse(self.endpoints, arguments)
+                    elif name == "search_apocrypha":
+                        contents = await handle_search_apocrypha(self.endpoints, arguments)
+                    elif name == "list_apocrypha_books":
+                        contents = await handle_list_apocrypha_books(self.endpoints, arguments)
+                    # Apostolic Fathers tools
+                    elif name == "get_apostolic_fathers_verse":
+                        contents = await handle_get_apostolic_fathers_verse(self.endpoints, arguments)
+                    elif name == "search_apostolic_fathers":
+                        contents = await handle_search_apostolic_fathers(self.endpoints, arguments)
+                    elif name == "list_apostolic_fathers_books":
+                        contents = await handle_list_apostolic_fathers_books(self.endpoints, arguments)
+                    # Footnotes tools
+                    elif name == "get_bible_footnote":
+                        contents = await handle_get_bible_footnote(self.endpoints, arguments)
+                    # Articles tools
+                    elif name == "search_fhl_articles":
+                        contents = await handle_search_articles(self.endpoints, arguments)
+                    elif name == "list_fhl_article_columns":
+                        contents = await handle_list_article_columns(self.endpoints, arguments)
+                    else:
+                        raise ValueError(f"Unknown tool: {name}")
                 
-                return [TextContent(type="text", text=result_text)]
+                    if contents is None:
+                        # 依 output.mode / output.max_bytes 序列化
+                        result_text = render_result(result)
+                        contents = [TextContent(type="text", text=result_text)]
                 
             except Exception as e:
                 logger.error(f"Error calling tool {name}: {e}", exc_info=True)
                 error_msg = f"錯誤: {str(e)}"
-                return [TextContent(type="text", text=error_msg)]
+                contents = [TextContent(type="text", text=error_msg)]
+                error = True
+            
+            if metrics.enabled:
+                metrics.observe_tool(
+                    name,
+                    time.perf_counter() - started,
+                    bytes_in=len(json.dumps(arguments, ensure_ascii=False, default=str).encode()),
+                    bytes_out=sum(
+                        len(item.text.encode()) for item in contents if isinstance(item, TextContent)
+                    ),
+                    error=error,
+                )
+            
+            return contents
     
     def _register_resources(self):
         """Register all MCP resources"""
@@ -577,8 +631,11 @@ class FHLBibleServer:
                 logger.info(f"Reading resource: {uri}")
                 result = await self.resource_router.handle_resource(uri)
                 
+                # 文字格式資源 (如 info://metrics?format=prometheus) 直接返回
+                if isinstance(result["content"], str):
+                    return result["content"]
+                
                 # Format result as JSON string
-                import json
                 return json.dumps(result["content"], ensure_ascii=False, indent=2)
                 
             except Exception as e:
@@ -648,12 +705,15 @@ class FHLBibleServer:
         logger.info("  - Resources: 7 URI schemes")
         logger.info("  - Prompts: 4 templates")
         
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options()
+                )
+        finally:
+            await close_endpoints()
 
 
 async def main() -> None:
@@ -8,6 +8,7 @@ MCP Tools 模組
 from .verse import (
     get_bible_verse,
     get_bible_chapter,
+    get_bible_verses_batch,
     query_verse_citation,
 )
 
@@ -51,6 +52,7 @@ __all__ = [
     # 經文查詢
     "get_bible_verse",
     "get_bible_chapter",
+    "get_bible_verses_batch",
     "query_verse_citation",
     # 搜尋
     "search_bible",
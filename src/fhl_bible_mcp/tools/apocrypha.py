@@ -8,6 +8,7 @@ import logging
 from typing import Any
 
 from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.utils.output import next_page_cursor, render_json_block
 
 logger = logging.getLogger(__name__)
 
@@ -199,8 +200,7 @@ async def handle_get_apocrypha_verse(
                 "verses": verses
             }
             
-            import json
-            response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+            response = render_json_block(response_data)
             
             return [{"type": "text", "text": response}]
         else:
@@ -277,8 +277,11 @@ async def handle_search_apocrypha(
                 "results": results
             }
             
-            import json
-            response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+            # 還有更多結果時附上下一頁的游標
+            if results and offset + len(results) < (record_count or 0):
+                response_data["next_cursor"] = next_page_cursor(offset=offset + len(results))
+            
+            response = render_json_block(response_data)
             
             return [{"type": "text", "text": response}]
         else:
@@ -333,8 +336,7 @@ async def handle_list_apocrypha_books(
             "books": books_list
         }
         
-        import json
-        response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+        response = render_json_block(response_data)
         return [{"type": "text", "text": response}]
         
     except Exception as e:
@@ -8,6 +8,7 @@ import logging
 from typing import Any
 
 from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.utils.output import next_page_cursor, render_json_block
 
 logger = logging.getLogger(__name__)
 
@@ -200,8 +201,7 @@ async def handle_get_apostolic_fathers_verse(
                 "verses": verses
             }
             
-            import json
-            response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+            response = render_json_block(response_data)
             
             return [{"type": "text", "text": response}]
         else:
@@ -278,8 +278,11 @@ async def handle_search_apostolic_fathers(
                 "results": results
             }
             
-            import json
-            response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+            # 還有更多結果時附上下一頁的游標
+            if results and offset + len(results) < (record_count or 0):
+                response_data["next_cursor"] = next_page_cursor(offset=offset + len(results))
+            
+            response = render_json_block(response_data)
             
             return [{"type": "text", "text": response}]
         else:
@@ -334,8 +337,7 @@ async def handle_list_apostolic_fathers_books(
             "books": books_list
         }
         
-        import json
-        response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+        response = render_json_block(response_data)
         return [{"type": "text", "text": response}]
         
     except Exception as e:
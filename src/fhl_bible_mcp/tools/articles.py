@@ -4,11 +4,12 @@ Article Search Tools
 Tools for searching and browsing Faith Hope Love (信望愛) articles.
 """
 
-import re
 from typing import Any
 from mcp.types import TextContent
 
 from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.utils.article_index import article_preview
+from fhl_bible_mcp.utils.output import render_json_block
 
 
 def get_articles_tool_definitions() -> list[dict[str, Any]]:
@@ -120,6 +121,9 @@ async def handle_search_articles(
     """Handle search_fhl_articles tool call"""
     
     try:
+        # Check if full content is requested
+        include_content = arguments.get("include_content", False)
+        
         result = await endpoints.search_articles(
             title=arguments.get("title"),
             author=arguments.get("author"),
@@ -128,7 +132,8 @@ async def handle_search_articles(
             column=arguments.get("column"),
             pub_date=arguments.get("pub_date"),
             use_simplified=arguments.get("use_simplified", False),
-            limit=arguments.get("limit", 50)
+            limit=arguments.get("limit", 50),
+            include_content=include_content
         )
         
         # Format output as JSON
@@ -141,13 +146,9 @@ async def handle_search_articles(
                     "query_type": "article_search",
                     "message": "未找到符合條件的文章"
                 }
-                import json
-                response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+                response = render_json_block(response_data)
                 return [TextContent(type="text", text=response)]
             
-            # Check if full content is requested
-            include_content = arguments.get("include_content", False)
-            
             # Build article list
             article_list = []
             for article in articles:
@@ -171,19 +172,10 @@ async def handle_search_articles(
                     article_data["content"] = content
                     article_data["content_format"] = "HTML"
                 else:
-                    # Generate content preview (plain text)
-                    preview = ""
-                    if content:
-                        # Simple HTML tag removal
-                        clean_content = re.sub(r'<[^>]+>', '', content)
-                        # Remove extra whitespace
-                        clean_content = re.sub(r'\s+', ' ', clean_content).strip()
-                        
-                        preview_length = 200
-                        if len(clean_content) > preview_length:
-                            preview = clean_content[:preview_length] + "..."
-                        else:
-                            preview = clean_content
+                    # Plain-text preview (already built by search_articles / the local index)
+                    preview = article.get('preview')
+                    if preview is None:
+                        preview = article_preview(content)
                     article_data["content_preview"] = preview
                 
                 article_list.append(article_data)
@@ -198,8 +190,7 @@ async def handle_search_articles(
                 "articles": article_list
             }
             
-            import json
-            response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+            response = render_json_block(response_data)
             
             # Add helpful notes
             if include_content:
@@ -266,8 +257,7 @@ async def handle_search_articles(
                 "query_type": "article_search",
                 "message": "未找到符合條件的文章"
             }
-            import json
-            response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+            response = render_json_block(response_data)
             return [TextContent(type="text", text=response)]
     
     except Exception as e:
@@ -299,8 +289,7 @@ async def handle_list_article_columns(
         ]
     }
     
-    import json
-    response = f"```json\n{json.dumps(response_data, ensure_ascii=False, indent=2)}\n```"
+    response = render_json_block(response_data)
     
     # Add usage examples
     notes = [
@@ -5,9 +5,10 @@
 """
 
 from typing import Optional, Dict, Any, List
-from ..api.endpoints import FHLAPIEndpoints
+from ..api.endpoints import get_endpoints
 from ..utils.booknames import BookNameConverter
 from ..utils.errors import InvalidParameterError
+from ..utils.fanout import gather_legs
 
 
 # 有聲聖經版本對照
@@ -74,12 +75,12 @@ async def get_audio_bible(
     version_id = AUDIO_VERSIONS[audio_version]["id"]
 
     # 呼叫 API
-    async with FHLAPIEndpoints() as api:
-        response = await api.get_audio_bible(
-            book_id=book_id,
-            chapter=chapter,
-            audio_version=version_id,
-        )
+    api = get_endpoints()
+    response = await api.get_audio_bible(
+        book_id=book_id,
+        chapter=chapter,
+        audio_version=version_id,
+    )
 
     # 格式化回應
     result = {
@@ -162,27 +163,35 @@ async def get_audio_chapter_with_text(
         use_simplified: 是否使用簡體中文
 
     Returns:
-        包含音檔與經文的字典
+        包含音檔與經文的字典；兩者並行查詢，timings_ms 為各自耗時，
+        其中一項失敗時該項為 None，錯誤訊息放在 errors
     """
-    # 取得音檔資訊
-    audio_info = await get_audio_bible(
-        book=book,
-        chapter=chapter,
-        audio_version=audio_version,
-        use_simplified=use_simplified,
-    )
-
-    # 取得經文內容
     from .verse import get_bible_chapter
 
-    verse_info = await get_bible_chapter(
-        book=book,
-        chapter=chapter,
-        version=text_version,
-        use_simplified=use_simplified,
+    # 音檔與經文互不相依，並行查詢
+    fanout = await gather_legs(
+        audio=get_audio_bible(
+            book=book,
+            chapter=chapter,
+            audio_version=audio_version,
+            use_simplified=use_simplified,
+        ),
+        text=get_bible_chapter(
+            book=book,
+            chapter=chapter,
+            version=text_version,
+            use_simplified=use_simplified,
+        ),
     )
+    if fanout.all_failed:
+        raise fanout.errors["audio"]
 
-    return {
-        "audio": audio_info,
-        "text": verse_info,
+    result: Dict[str, Any] = {
+        "audio": fanout.results.get("audio"),
+        "text": fanout.results.get("text"),
+        "timings_ms": fanout.timings_ms,
     }
+    if fanout.errors:
+        result["errors"] = fanout.error_messages()
+
+    return result
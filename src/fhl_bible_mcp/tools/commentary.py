@@ -5,9 +5,10 @@
 """
 
 from typing import Optional, Dict, Any, List
-from ..api.endpoints import FHLAPIEndpoints
+from ..api.endpoints import get_endpoints
 from ..utils.booknames import BookNameConverter
 from ..utils.errors import InvalidParameterError
+from ..utils.output import next_page_cursor
 
 
 async def get_commentary(
@@ -39,13 +40,13 @@ async def get_commentary(
         raise InvalidParameterError(f"找不到書卷: {book}")
 
     # 呼叫 API
-    async with FHLAPIEndpoints() as api:
-        response = await api.get_commentary(
-            book=eng_short,
-            chapter=chapter,
-            verse=verse,
-            commentary_id=commentary_id,
-        )
+    api = get_endpoints()
+    response = await api.get_commentary(
+        book=eng_short,
+        chapter=chapter,
+        verse=verse,
+        commentary_id=commentary_id,
+    )
 
     # 格式化結果
     commentaries = []
@@ -100,8 +101,8 @@ async def list_commentaries(
     Returns:
         註釋書列表
     """
-    async with FHLAPIEndpoints() as api:
-        response = await api.list_commentaries()
+    api = get_endpoints()
+    response = await api.list_commentaries()
 
     commentaries = []
     for record in response["record"]:
@@ -122,6 +123,8 @@ async def search_commentary(
     keyword: str,
     commentary_id: Optional[int] = None,
     use_simplified: bool = False,
+    limit: Optional[int] = None,
+    offset: int = 0,
 ) -> Dict[str, Any]:
     """
     在註釋書中搜尋關鍵字
@@ -130,6 +133,8 @@ async def search_commentary(
         keyword: 搜尋關鍵字
         commentary_id: 註釋書編號（可選，不指定則搜尋所有註釋書）
         use_simplified: 是否使用簡體中文
+        limit: 最多返回筆數（不指定則返回全部）
+        offset: 跳過筆數（用於分頁）
 
     Returns:
         搜尋結果字典
@@ -140,11 +145,13 @@ async def search_commentary(
     if not keyword or not keyword.strip():
         raise InvalidParameterError("搜尋關鍵字不能為空")
 
-    async with FHLAPIEndpoints() as api:
-        response = await api.search_commentary(
-            keyword=keyword,
-            commentary_id=commentary_id,
-        )
+    api = get_endpoints()
+    response = await api.search_commentary(
+        keyword=keyword,
+        commentary_id=commentary_id,
+        limit=limit,
+        offset=offset,
+    )
 
     # 格式化結果
     results = []
@@ -164,12 +171,24 @@ async def search_commentary(
                 }
             )
 
-    return {
+    # ssc.php 的 record_count 為全部結果數；缺少時以本頁推算
+    total_count = response.get("record_count")
+    if not isinstance(total_count, int):
+        total_count = offset + len(results)
+
+    result = {
         "keyword": keyword,
-        "total_count": len(results),
+        "total_count": total_count,
         "results": results,
     }
 
+    # 還有更多結果時附上下一頁的游標
+    if results and offset + len(results) < total_count:
+        result["offset"] = offset
+        result["next_cursor"] = next_page_cursor(offset=offset + len(results))
+
+    return result
+
 
 async def get_topic_study(
     keyword: str,
@@ -208,12 +227,12 @@ async def get_topic_study(
             f"無效的資料來源: {source}，應為 'all', 'torrey_en', 'naves_en', 'torrey_zh', 或 'naves_zh'"
         )
 
-    async with FHLAPIEndpoints() as api:
-        response = await api.get_topic_study(
-            keyword=keyword,
-            source=source,
-            count_only=count_only,
-        )
+    api = get_endpoints()
+    response = await api.get_topic_study(
+        keyword=keyword,
+        source=source,
+        count_only=count_only,
+    )
 
     if count_only:
         return {
@@ -5,7 +5,7 @@
 """
 
 from typing import Optional, Dict, Any, List
-from ..api.endpoints import FHLAPIEndpoints
+from ..api.endpoints import get_endpoints
 from ..utils.booknames import BookNameConverter
 
 
@@ -21,8 +21,8 @@ async def list_bible_versions(
     Returns:
         版本列表字典
     """
-    async with FHLAPIEndpoints() as api:
-        response = await api.get_bible_versions()
+    api = get_endpoints()
+    response = await api.get_bible_versions()
 
     versions = []
     for record in response["record"]:
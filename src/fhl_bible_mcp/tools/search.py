@@ -5,9 +5,10 @@
 """
 
 from typing import Optional, Dict, Any, List
-from ..api.endpoints import FHLAPIEndpoints
+from ..api.endpoints import get_endpoints
 from ..utils.booknames import BookNameConverter
 from ..utils.errors import InvalidParameterError
+from ..utils.output import next_page_cursor
 
 
 async def search_bible(
@@ -75,16 +76,16 @@ async def search_bible(
         )
 
     # 呼叫 API
-    async with FHLAPIEndpoints() as api:
-        response = await api.search_bible(
-            query=query,
-            search_type=search_type,
-            scope=scope,
-            version=version,
-            limit=limit,
-            offset=offset,
-            count_only=count_only,
-        )
+    api = get_endpoints()
+    response = await api.search_bible(
+        query=query,
+        search_type=search_type,
+        scope=scope,
+        version=version,
+        limit=limit,
+        offset=offset,
+        count_only=count_only,
+    )
 
     # 如果只要筆數
     if count_only:
@@ -108,7 +109,7 @@ async def search_bible(
             }
         )
 
-    return {
+    result = {
         "total_count": response["record_count"],
         "query": query,
         "search_type": search_type,
@@ -118,6 +119,16 @@ async def search_bible(
         "results": results,
     }
 
+    # 還有更多結果時附上下一頁的游標
+    if offset + len(results) < (response["record_count"] or 0) and results:
+        result["next_cursor"] = next_page_cursor(offset=offset + len(results))
+
+    # 上游無法連線時返回的過期快取
+    if response.get("stale"):
+        result["stale"] = True
+
+    return result
+
 
 async def search_bible_advanced(
     query: str,
@@ -197,17 +208,17 @@ async def search_bible_advanced(
         )
 
     # 呼叫 API
-    async with FHLAPIEndpoints() as api:
-        response = await api.search_bible(
-            query=query,
-            search_type=search_type,
-            scope="range",
-            version=version,
-            limit=limit,
-            offset=offset,
-            range_start=start_id,
-            range_end=end_id,
-        )
+    api = get_endpoints()
+    response = await api.search_bible(
+        query=query,
+        search_type=search_type,
+        scope="range",
+        version=version,
+        limit=limit,
+        offset=offset,
+        range_start=start_id,
+        range_end=end_id,
+    )
 
     # 格式化結果
     results = []
@@ -222,7 +233,7 @@ async def search_bible_advanced(
             }
         )
 
-    return {
+    result = {
         "total_count": response["record_count"],
         "query": query,
         "search_type": search_type,
@@ -234,3 +245,9 @@ async def search_bible_advanced(
         "offset": offset,
         "results": results,
     }
+
+    # 還有更多結果時附上下一頁的游標
+    if offset + len(results) < (response["record_count"] or 0) and results:
+        result["next_cursor"] = next_page_cursor(offset=offset + len(results))
+
+    return result
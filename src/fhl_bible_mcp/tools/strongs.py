@@ -5,9 +5,10 @@
 """
 
 from typing import Optional, Dict, Any, List, Union
-from ..api.endpoints import FHLAPIEndpoints
+from ..api.endpoints import get_endpoints
 from ..utils.booknames import BookNameConverter
 from ..utils.errors import InvalidParameterError
+from ..utils.fanout import gather_legs
 
 
 def _parse_strongs_input(
@@ -141,12 +142,12 @@ async def get_word_analysis(
         raise InvalidParameterError(f"找不到書卷: {book}")
 
     # 呼叫 API
-    async with FHLAPIEndpoints() as api:
-        response = await api.get_word_analysis(
-            book=eng_short,
-            chapter=chapter,
-            verse=verse,
-        )
+    api = get_endpoints()
+    response = await api.get_word_analysis(
+        book=eng_short,
+        chapter=chapter,
+        verse=verse,
+    )
 
     # 判斷新舊約
     testament = "OT" if response["N"] == 1 else "NT"
@@ -236,11 +237,11 @@ async def lookup_strongs(
     parsed_number, parsed_testament = _parse_strongs_input(number, testament)
 
     # 呼叫 API（API 只接受整數）
-    async with FHLAPIEndpoints() as api:
-        response = await api.get_strongs_dictionary(
-            number=parsed_number,
-            testament=parsed_testament.lower(),
-        )
+    api = get_endpoints()
+    response = await api.get_strongs_dictionary(
+        number=parsed_number,
+        testament=parsed_testament.lower(),
+    )
 
     if not response["record"] or len(response["record"]) == 0:
         raise InvalidParameterError(
@@ -281,6 +282,7 @@ async def search_strongs_occurrences(
     testament: Optional[str] = None,
     limit: int = 20,
     use_simplified: bool = False,
+    offset: int = 0,
 ) -> Dict[str, Any]:
     """
     搜尋 Strong's 原文字在聖經中的所有出現位置
@@ -296,9 +298,13 @@ async def search_strongs_occurrences(
         testament: "OT" 或 "NT"，當 number 無前綴時必填
         limit: 最多返回筆數
         use_simplified: 是否使用簡體中文
+        offset: 跳過筆數（用於分頁）
 
     Returns:
-        包含字典定義和出現位置的字典
+        包含字典定義和出現位置的字典；有本地經文彙編時另含
+        distribution（出現次數與書卷分布）與每筆的 positions（字詞位置）。
+        兩者並行查詢，timings_ms 為各自耗時；其中一項失敗時該項為 None，
+        錯誤訊息放在 errors
         
     Examples:
         >>> await search_strongs_occurrences(1344, "NT")  # 整數 + testament
@@ -308,27 +314,74 @@ async def search_strongs_occurrences(
     # 解析輸入格式
     parsed_number, parsed_testament = _parse_strongs_input(number, testament)
     
-    # 先取得字典定義（使用解析後的值）
-    strongs_info = await lookup_strongs(number, testament, use_simplified)
+    api = get_endpoints()
+
+    async def find_occurrences() -> Dict[str, Any]:
+        # 本地經文彙編（python -m fhl_bible_mcp concordance）
+        local = await api.get_strongs_concordance(
+            parsed_number, parsed_testament, limit=limit, offset=offset
+        )
+        if local is not None:
+            results = [
+                {
+                    "book": record["chineses"],
+                    "book_eng": record["engs"],
+                    "chapter": record["chap"],
+                    "verse": record["sec"],
+                    "text": record["bible_text"],
+                    "positions": record["positions"],
+                }
+                for record in local["record"]
+            ]
+            return {
+                "occurrences": {
+                    "total_count": local["verse_count"],
+                    "showing": len(results),
+                    "offset": offset,
+                    "results": results,
+                },
+                "distribution": {
+                    "occurrence_count": local["occurrence_count"],
+                    "verse_count": local["verse_count"],
+                    "books": local["books"],
+                },
+            }
 
-    # 使用純數字（無前綴）搜尋聖經
-    search_type = "hebrew_number" if parsed_testament == "OT" else "greek_number"
+        # 使用純數字（無前綴）搜尋聖經
+        search_type = "hebrew_number" if parsed_testament == "OT" else "greek_number"
 
-    from .search import search_bible
+        from .search import search_bible
 
-    search_results = await search_bible(
-        query=str(parsed_number),  # 使用純數字，不含 G/H 前綴
-        search_type=search_type,
-        scope="ot" if parsed_testament == "OT" else "nt",
-        limit=limit,
-        use_simplified=use_simplified,
+        search_results = await search_bible(
+            query=str(parsed_number),  # 使用純數字，不含 G/H 前綴
+            search_type=search_type,
+            scope="ot" if parsed_testament == "OT" else "nt",
+            limit=limit,
+            offset=offset,
+            use_simplified=use_simplified,
+        )
+        return {
+            "occurrences": {
+                "total_count": search_results["total_count"],
+                "showing": len(search_results["results"]),
+                "results": search_results["results"],
+            },
+        }
+
+    # 字典定義與出現位置互不相依，並行查詢
+    fanout = await gather_legs(
+        strongs_info=lookup_strongs(number, testament, use_simplified),
+        occurrences=find_occurrences(),
     )
+    if fanout.all_failed:
+        raise fanout.errors["strongs_info"]
 
-    return {
-        "strongs_info": strongs_info,
-        "occurrences": {
-            "total_count": search_results["total_count"],
-            "showing": len(search_results["results"]),
-            "results": search_results["results"],
-        },
+    result: Dict[str, Any] = {
+        "strongs_info": fanout.results.get("strongs_info"),
+        **fanout.results.get("occurrences", {"occurrences": None}),
+        "timings_ms": fanout.timings_ms,
     }
+    if fanout.errors:
+        result["errors"] = fanout.error_messages()
+
+    return result
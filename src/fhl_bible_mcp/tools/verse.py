@@ -5,9 +5,10 @@
 """
 
 from typing import Optional, Dict, Any, List
-from ..api.endpoints import FHLAPIEndpoints
+from ..api.endpoints import get_endpoints
 from ..utils.booknames import BookNameConverter
-from ..utils.errors import BookNotFoundError, InvalidParameterError
+from ..utils.citations import chapter_fetches, parse_citations, verse_spec
+from ..utils.errors import BookNotFoundError, FHLAPIError, InvalidParameterError
 
 
 async def get_bible_verse(
@@ -41,14 +42,14 @@ async def get_bible_verse(
         raise BookNotFoundError(book)
 
     # 呼叫 API
-    async with FHLAPIEndpoints() as api:
-        response = await api.get_verse(
-            book=chi_short,
-            chapter=chapter,
-            verse=verse,
-            version=version,
-            include_strong=include_strong,
-        )
+    api = get_endpoints()
+    response = await api.get_verse(
+        book=chi_short,
+        chapter=chapter,
+        verse=verse,
+        version=version,
+        include_strong=include_strong,
+    )
 
     # 格式化回應
     verses = []
@@ -70,6 +71,10 @@ async def get_bible_verse(
         "verses": verses,
     }
 
+    # 上游無法連線時返回的過期快取
+    if response.get("stale"):
+        result["stale"] = True
+
     # 添加導航資訊
     if "prev" in response and response["prev"]:
         result["navigation"] = {
@@ -120,6 +125,71 @@ async def get_bible_chapter(
     )
 
 
+async def get_bible_verses_batch(
+    references: List[str],
+    version: str = "unv",
+    include_strong: bool = False,
+    use_simplified: bool = False,
+) -> Dict[str, Any]:
+    """
+    一次查詢多段經文
+
+    同一章的引用只查詢一次，不同章節並行查詢，結果依輸入順序返回。
+
+    Args:
+        references: 經文引用列表（如 ["約 3:16", "羅 8:28-30", "詩 23"]）
+        version: 聖經版本代碼
+        include_strong: 是否包含 Strong's Number
+        use_simplified: 是否使用簡體中文
+
+    Returns:
+        包含每段引用經文的字典；無法解析或查詢失敗的引用帶有 error 欄位
+
+    Raises:
+        InvalidParameterError: references 不是非空列表
+    """
+    if not isinstance(references, list) or not references:
+        raise InvalidParameterError("references", references, "需要至少一個經文引用")
+
+    api = get_endpoints()
+    items = await api.get_verses_batch(
+        references,
+        version=version,
+        include_strong=include_strong,
+    )
+
+    results = []
+    for item in items:
+        if item.get("status") != "success":
+            results.append({"reference": item["reference"], "error": item.get("error", "")})
+            continue
+
+        results.append(
+            {
+                "reference": item["reference"],
+                "version": item["version"],
+                "version_name": item["v_name"],
+                "record_count": len(item["record"]),
+                "verses": [
+                    {
+                        "book": record["chineses"],
+                        "book_eng": record["engs"],
+                        "chapter": record["chap"],
+                        "verse": record["sec"],
+                        "text": record["bible_text"],
+                    }
+                    for record in item["record"]
+                ],
+            }
+        )
+
+    return {
+        "count": len(results),
+        "error_count": sum(1 for result in results if "error" in result),
+        "results": results,
+    }
+
+
 async def query_verse_citation(
     citation: str,
     version: str = "unv",
@@ -129,8 +199,11 @@ async def query_verse_citation(
     """
     根據經文引用字串查詢經文（如 "約 3:16" 或 "John 3:16"）
 
+    單一章內的引用返回與 get_bible_verse 相同的格式；跨章或多段引用
+    （如 "創 1:1-2:3"、"約3:16;羅5:8;8:28"）每章只查詢一次，經文依引用順序合併。
+
     Args:
-        citation: 經文引用字串（如 "約 3:16", "太 5:3-10"）
+        citation: 經文引用字串（如 "約 3:16", "太 5:3-10", "約3:16;羅5:8"）
         version: 聖經版本代碼
         include_strong: 是否包含 Strong's Number
         use_simplified: 是否使用簡體中文
@@ -140,24 +213,42 @@ async def query_verse_citation(
 
     Raises:
         InvalidParameterError: 引用格式錯誤
+        BookNotFoundError: 找不到書卷
     """
-    # 解析引用字串（簡單實作，可以後續增強）
-    import re
-
-    # 匹配格式：書卷 章:節 或 書卷 章:節-節
-    pattern = r"^(.+?)\s+(\d+):(\d+(?:-\d+|,\d+)*)$"
-    match = re.match(pattern, citation.strip())
-
-    if not match:
-        raise InvalidParameterError("citation", citation, "無效的經文引用格式")
-
-    book_name, chapter, verses = match.groups()
-
-    return await get_bible_verse(
-        book=book_name,
-        chapter=int(chapter),
-        verse=verses,
+    spans = parse_citations(citation.strip())
+    chapters = chapter_fetches(spans)
+
+    if len(chapters) == 1:
+        (book_id, chapter), chapter_spans = next(iter(chapters.items()))
+        verse = verse_spec(chapter_spans)
+        if verse is not None or chapter_spans[0].start is None:
+            return await get_bible_verse(
+                book=str(book_id),
+                chapter=chapter,
+                verse=verse,
+                version=version,
+                include_strong=include_strong,
+                use_simplified=use_simplified,
+            )
+
+    batch = await get_bible_verses_batch(
+        [citation],
         version=version,
         include_strong=include_strong,
         use_simplified=use_simplified,
     )
+    result = batch["results"][0]
+    if "error" in result:
+        raise FHLAPIError(result["error"])
+
+    return {
+        "citation": citation,
+        "version": result["version"],
+        "version_name": result["version_name"],
+        "chapters": [
+            {"book_id": book_id, "chapter": chapter, "verse": verse_spec(chapter_spans)}
+            for (book_id, chapter), chapter_spans in chapters.items()
+        ],
+        "record_count": result["record_count"],
+        "verses": result["verses"],
+    }
@@ -0,0 +1,253 @@
+"""
+Local Article Index for FHL Bible MCP Server
+
+信望愛站文章 API (www.fhl.net/api/json.php) 每次都返回符合條件的所有文章與完整
+HTML 內文，且沒有分頁。本模組把查詢過的文章中繼資料 (標題、作者、摘要、專欄、
+發表日期與內文預覽，不含完整內文) 逐次累積在 SQLite 中，並記錄每個上游查詢
+的完整結果 (文章 id 清單)。
+
+之後的查詢若條件比某個已記錄的查詢更嚴格 (例如先查 author="陳鳳翔"，
+再查 author="陳鳳翔" + title="愛")，結果必然是該查詢結果的子集，
+可直接在本地以中繼資料篩選，不需要重新下載完整內文。
+
+條件比對方式與 API 相同：title / author / abst / txt 為子字串比對，
+ptab / pubtime 為完全相同。內文 (txt) 不保存，因此含有新的 txt 條件的查詢
+無法在本地回答。
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# 子字串比對的欄位與完全比對的欄位 (API 參數名稱)
+SUBSTRING_FIELDS = ("title", "author", "abst", "txt")
+EXACT_FIELDS = ("ptab", "pubtime")
+
+PREVIEW_LENGTH = 200
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+
+
+def article_preview(html: str, length: int = PREVIEW_LENGTH) -> str:
+    """
+    將文章 HTML 內文轉為純文字預覽
+
+    Args:
+        html: 文章內文 (HTML)
+        length: 預覽長度 (字元)，超過時以 "..." 結尾
+    """
+    if not html:
+        return ""
+    text = _SPACE.sub(" ", _TAG.sub("", html)).strip()
+    return text[:length] + "..." if len(text) > length else text
+
+
+def _covers(recorded: Dict[str, str], wanted: Dict[str, str]) -> bool:
+    """已記錄的查詢結果是否包含 wanted 查詢的所有結果 (且可在本地篩選)"""
+    for field, value in recorded.items():
+        target = wanted.get(field)
+        if target is None:
+            return False
+        if field in EXACT_FIELDS:
+            if target != value:
+                return False
+        elif value.casefold() not in target.casefold():
+            return False
+    # 內文不保存：txt 條件必須與已記錄的查詢相同
+    return "txt" not in wanted or recorded.get("txt") == wanted["txt"]
+
+
+def _matches(article: Dict[str, Any], filters: Dict[str, str]) -> bool:
+    """文章中繼資料是否符合條件 (txt 已由 _covers 保證)"""
+    for field, value in filters.items():
+        if field == "txt":
+            continue
+        actual = str(article.get(field) or "")
+        if field in EXACT_FIELDS:
+            if actual != value:
+                return False
+        elif value.casefold() not in actual.casefold():
+            return False
+    return True
+
+
+class ArticleIndex:
+    """信望愛站文章的本地中繼資料索引"""
+
+    FILENAME = "articles.sqlite3"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            gb          INTEGER NOT NULL,
+            id          TEXT NOT NULL,
+            aid         TEXT,
+            ptab        TEXT,
+            column_name TEXT,
+            title       TEXT,
+            author      TEXT,
+            pubtime     TEXT,
+            abst        TEXT,
+            preview     TEXT,
+            PRIMARY KEY (gb, id)
+        );
+        CREATE TABLE IF NOT EXISTS queries (
+            gb          INTEGER NOT NULL,
+            filters     TEXT NOT NULL,
+            ids         TEXT NOT NULL,
+            fetched_at  REAL NOT NULL,
+            PRIMARY KEY (gb, filters)
+        );
+    """
+
+    def __init__(self, path: Path, max_age: float = 24 * 3600):
+        """
+        開啟 (或建立) 文章索引
+
+        Args:
+            path: SQLite 資料庫檔案
+            max_age: 查詢記錄的有效秒數；過期的記錄不再用來回答查詢
+                (新文章每週發表)
+        """
+        self.path = path
+        self.max_age = max_age
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0}
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._SCHEMA)
+
+    @staticmethod
+    def _filters_key(filters: Dict[str, str]) -> str:
+        return json.dumps(filters, sort_keys=True, ensure_ascii=False)
+
+    def record(self, filters: Dict[str, str], gb: int, articles: List[Dict[str, Any]]) -> None:
+        """
+        記錄一次上游查詢的完整結果
+
+        同一查詢在 max_age 內已有記錄時不重複寫入 (例如由快取返回的結果)。
+
+        Args:
+            filters: 查詢條件 (API 參數名稱，已正規化)
+            gb: 0 繁體 / 1 簡體
+            articles: 上游返回的文章 (含 txt，或已轉為 preview)
+        """
+        key = self._filters_key(filters)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at FROM queries WHERE gb = ? AND filters = ?", (gb, key)
+            ).fetchone()
+            if row is not None and now - row[0] < self.max_age:
+                return
+
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO articles "
+                    "(gb, id, aid, ptab, column_name, title, author, pubtime, abst, preview) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            gb,
+                            str(article.get("id", "")),
+                            str(article.get("aid", "")),
+                            article.get("ptab", ""),
+                            article.get("column", ""),
+                            article.get("title", ""),
+                            article.get("author", ""),
+                            article.get("pubtime", ""),
+                            article.get("abst", ""),
+                            article["preview"] if "preview" in article
+                            else article_preview(article.get("txt", "")),
+                        )
+                        for article in articles
+                    ]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO queries (gb, filters, ids, fetched_at) VALUES (?, ?, ?, ?)",
+                    (gb, key, json.dumps([str(a.get("id", "")) for a in articles]), now)
+                )
+                # 清除過期的查詢記錄
+                self._conn.execute("DELETE FROM queries WHERE fetched_at < ?", (now - self.max_age,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self.stats["recorded"] += 1
+
+    def lookup(self, filters: Dict[str, str], gb: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        以已記錄的查詢回答
+
+        Args:
+            filters: 查詢條件 (API 參數名稱，已正規化)
+            gb: 0 繁體 / 1 簡體
+
+        Returns:
+            文章中繼資料列表 (與 API 欄位相同，txt 以 preview 取代)，
+            依上游返回的順序；沒有涵蓋此查詢的記錄時返回 None
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filters, ids FROM queries WHERE gb = ? AND fetched_at >= ?",
+                (gb, time.time() - self.max_age)
+            ).fetchall()
+
+            # 使用結果最少的涵蓋查詢
+            covering = [
+                ids for recorded, ids in rows if _covers(json.loads(recorded), filters)
+            ]
+            if not covering:
+                self.stats["misses"] += 1
+                return None
+            ids = min((json.loads(ids) for ids in covering), key=len)
+
+            by_id: Dict[str, Dict[str, Any]] = {}
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                for row in self._conn.execute(
+                    "SELECT id, aid, ptab, column_name, title, author, pubtime, abst, preview "
+                    f"FROM articles WHERE gb = ? AND id IN ({','.join('?' * len(chunk))})",
+                    (gb, *chunk)
+                ):
+                    by_id[row[0]] = {
+                        "id": row[0],
+                        "aid": row[1],
+                        "ptab": row[2],
+                        "column": row[3],
+                        "title": row[4],
+                        "author": row[5],
+                        "pubtime": row[6],
+                        "abst": row[7],
+                        "preview": row[8],
+                    }
+
+        self.stats["hits"] += 1
+        return [
+            by_id[article_id] for article_id in ids
+            if article_id in by_id and _matches(by_id[article_id], filters)
+        ]
+
+    def get_info(self) -> Dict[str, Any]:
+        """索引統計"""
+        with self._lock:
+            articles = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            queries = self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        return {"articles": articles, "queries": queries, **self.stats}
+
+    def close(self) -> None:
+        """關閉資料庫連線"""
+        with self._lock:
+            self._conn.close()
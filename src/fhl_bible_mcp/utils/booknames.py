@@ -2,10 +2,14 @@
 書卷名稱轉換工具模組
 
 提供聖經書卷的中英文名稱轉換、書卷編號查詢、繁簡轉換、容錯查找等功能。
+
+所有名稱形式 (正式名稱、別名、簡體形式，含次經與使徒教父) 在模組載入時
+預先收錄到同一個查詢表，查找書卷只需一次 dict 查詢；模糊搜尋使用排序的
+後綴索引，不再逐卷比對子字串。
 """
 
-from typing import Dict, Optional, Tuple, List
-import re
+from bisect import bisect_left
+from typing import Dict, NamedTuple, Optional, Tuple, List
 
 
 # 聖經書卷對照表 (編號, 英文縮寫, 英文全名, 中文簡寫, 中文全名)
@@ -296,20 +300,135 @@ BOOK_ALIASES = {
     "rev": "啟", "revelation": "啟",
 }
 
-# 建立各種索引以加速查詢
-_book_id_to_info: Dict[int, Tuple[str, str, str, str]] = {}
-_eng_short_to_info: Dict[str, Tuple[int, str, str, str]] = {}
-_eng_full_to_info: Dict[str, Tuple[int, str, str, str]] = {}
-_chi_short_to_info: Dict[str, Tuple[int, str, str, str]] = {}
-_chi_full_to_info: Dict[str, Tuple[int, str, str, str]] = {}
-
-# 初始化索引
-for book_id, eng_short, eng_full, chi_short, chi_full in BIBLE_BOOKS:
-    _book_id_to_info[book_id] = (eng_short, eng_full, chi_short, chi_full)
-    _eng_short_to_info[eng_short.lower()] = (book_id, eng_full, chi_short, chi_full)
-    _eng_full_to_info[eng_full.lower()] = (book_id, eng_short, chi_short, chi_full)
-    _chi_short_to_info[chi_short] = (book_id, eng_short, eng_full, chi_full)
-    _chi_full_to_info[chi_full] = (book_id, eng_short, eng_full, chi_short)
+class Book(NamedTuple):
+    """書卷記錄"""
+    id: int
+    eng_short: str
+    eng_full: str
+    chi_short: str
+    chi_full: str
+
+
+_S2T = str.maketrans(SIMPLIFIED_TO_TRADITIONAL)
+_T2S = str.maketrans(TRADITIONAL_TO_SIMPLIFIED)
+
+_books: List[Book] = [Book(*entry) for entry in BIBLE_BOOKS]
+_books_by_id: Dict[int, Book] = {book.id: book for book in _books}
+
+# 名稱查詢表：所有已知名稱形式 -> (書卷, 是否為正式名稱)
+# 正式名稱 (英文縮寫/全名、中文簡寫/全名、編號) 供 get_book_id 等使用；
+# 別名與簡體形式只供 normalize_book_name 使用
+_name_table: Dict[str, Tuple[Book, bool]] = {}
+
+# 模糊搜尋的後綴索引：所有名稱欄位的每個後綴排序後以二分搜尋，
+# 子字串 (以及前綴) 查詢即為後綴的前綴查詢
+_suffixes: List[str] = []
+_suffix_owners: List[Tuple[int, int]] = []   # (書卷在 BIBLE_BOOKS 中的位置, 欄位順位)
+
+# 模糊搜尋依序比對的欄位 (先符合者決定分數)
+_FUZZY_FIELDS = (
+    (80, "eng_short_contains"),
+    (70, "eng_full_contains"),
+    (90, "chi_short_contains"),
+    (85, "chi_full_contains"),
+    (85, "chi_short_simplified"),
+    (80, "chi_full_simplified"),
+)
+
+
+def _fold(name: str) -> str:
+    """名稱正規化：英文轉小寫"""
+    return name.lower() if name.isascii() else name
+
+
+def _build_indexes() -> None:
+    """模組載入時一次建立所有索引"""
+    # 正式名稱：依原本的查找順序 (英文縮寫 > 英文全名 > 中文簡寫 > 中文全名)，
+    # 同一欄位重複時後出現的書卷優先，因此由低優先序寫到高優先序
+    for field in ("chi_full", "chi_short", "eng_full", "eng_short"):
+        for book in _books:
+            _name_table[_fold(getattr(book, field))] = (book, True)
+    for book in _books:
+        _name_table[str(book.id)] = (book, True)
+    # 英文名稱的原始大小寫形式 (免去 lower())
+    for field in ("eng_full", "eng_short"):
+        for book in _books:
+            name = getattr(book, field)
+            _name_table[name] = _name_table[name.lower()]
+
+    # 別名 (不覆蓋正式名稱)
+    for alias, target in BOOK_ALIASES.items():
+        entry = _name_table.get(_fold(target))
+        if entry is not None:
+            _name_table.setdefault(alias, (entry[0], False))
+
+    # 簡體形式：簡轉繁後即為已知名稱者直接收錄
+    for name, (book, _) in list(_name_table.items()):
+        simplified = name.translate(_T2S)
+        if simplified != name and simplified.translate(_S2T) == name:
+            _name_table.setdefault(simplified, (book, False))
+
+    suffixes = []
+    for position, book in enumerate(_books):
+        fields = (
+            book.eng_short.lower(),
+            book.eng_full.lower(),
+            book.chi_short,
+            book.chi_full,
+            book.chi_short.translate(_T2S),
+            book.chi_full.translate(_T2S),
+        )
+        for rank, text in enumerate(fields):
+            suffixes.extend((text[start:], position, rank) for start in range(len(text)))
+    suffixes.sort()
+    _suffixes.extend(suffix for suffix, _, _ in suffixes)
+    _suffix_owners.extend((position, rank) for _, position, rank in suffixes)
+
+
+_build_indexes()
+
+
+def _exact(name: str) -> Optional[Book]:
+    """以正式名稱或編號查找書卷"""
+    entry = _name_table.get(name)
+    if entry is None:
+        entry = _name_table.get(_fold(name))
+    if entry is not None and entry[1]:
+        return entry[0]
+    if name.isdigit():
+        return _books_by_id.get(int(name))
+    return None
+
+
+def _resolve(name: str) -> Optional[Book]:
+    """以任何已知名稱形式 (正式名稱、別名、簡體) 查找書卷"""
+    entry = _name_table.get(name)
+    if entry is not None:
+        return entry[0]
+
+    # 非常見形式：去除空白、英文轉小寫、簡轉繁
+    key = _fold(name.strip())
+    entry = _name_table.get(key) or _name_table.get(key.translate(_S2T))
+    if entry is not None:
+        return entry[0]
+    if key.isdigit() and int(key) in _books_by_id:
+        return _books_by_id[int(key)]
+    # 移除開頭數字後查找 (如 "1kings" -> "kings")
+    if key and key[0].isdigit():
+        return _resolve(key[1:].strip())
+    return None
+
+
+def _matching_books(query: str) -> Dict[int, int]:
+    """名稱欄位包含 query 的書卷：{書卷位置: 最先符合的欄位順位}"""
+    matches: Dict[int, int] = {}
+    index = bisect_left(_suffixes, query)
+    while index < len(_suffixes) and _suffixes[index].startswith(query):
+        position, rank = _suffix_owners[index]
+        if rank < matches.get(position, len(_FUZZY_FIELDS)):
+            matches[position] = rank
+        index += 1
+    return matches
 
 
 class BookNameConverter:
@@ -326,38 +445,21 @@ class BookNameConverter:
         Returns:
             書卷編號 (1-88: 1-66聖經, 101-115次經, 201-217使徒教父)，若找不到則返回 None
         """
-        # 如果是數字字符串，直接轉換
-        if isinstance(name, str) and name.isdigit():
-            book_id = int(name)
-            # 驗證是否為有效的書卷 ID
-            if book_id in _book_id_to_info or (101 <= book_id <= 115) or (201 <= book_id <= 217):
-                return book_id
-            return None
-        
         # 如果是整數，直接返回（向後兼容）
         if isinstance(name, int):
-            if name in _book_id_to_info or (101 <= name <= 115) or (201 <= name <= 217):
+            if name in _books_by_id or (101 <= name <= 115) or (201 <= name <= 217):
                 return name
             return None
-        
-        name_lower = name.lower() if name.isascii() else name
-
-        # 嘗試英文縮寫
-        if name_lower in _eng_short_to_info:
-            return _eng_short_to_info[name_lower][0]
 
-        # 嘗試英文全名
-        if name_lower in _eng_full_to_info:
-            return _eng_full_to_info[name_lower][0]
-
-        # 嘗試中文簡寫
-        if name in _chi_short_to_info:
-            return _chi_short_to_info[name][0]
-
-        # 嘗試中文全名
-        if name in _chi_full_to_info:
-            return _chi_full_to_info[name][0]
+        book = _exact(name)
+        if book is not None:
+            return book.id
 
+        # 數字字串：驗證是否為有效的書卷 ID
+        if name.isdigit():
+            book_id = int(name)
+            if (101 <= book_id <= 115) or (201 <= book_id <= 217):
+                return book_id
         return None
 
     @staticmethod
@@ -371,17 +473,8 @@ class BookNameConverter:
         Returns:
             英文縮寫，若找不到則返回 None
         """
-        # 如果是數字字串，嘗試當作編號
-        if name.isdigit():
-            book_id = int(name)
-            if book_id in _book_id_to_info:
-                return _book_id_to_info[book_id][0]
-            return None
-
-        book_id = BookNameConverter.get_book_id(name)
-        if book_id and book_id in _book_id_to_info:
-            return _book_id_to_info[book_id][0]
-        return None
+        book = _exact(name)
+        return book.eng_short if book is not None else None
 
     @staticmethod
     def get_chinese_short(name: str) -> Optional[str]:
@@ -394,17 +487,8 @@ class BookNameConverter:
         Returns:
             中文縮寫，若找不到則返回 None
         """
-        # 如果是數字字串，嘗試當作編號
-        if name.isdigit():
-            book_id = int(name)
-            if book_id in _book_id_to_info:
-                return _book_id_to_info[book_id][2]
-            return None
-
-        book_id = BookNameConverter.get_book_id(name)
-        if book_id and book_id in _book_id_to_info:
-            return _book_id_to_info[book_id][2]
-        return None
+        book = _exact(name)
+        return book.chi_short if book is not None else None
 
     @staticmethod
     def get_chinese_full(name: str) -> Optional[str]:
@@ -417,17 +501,8 @@ class BookNameConverter:
         Returns:
             中文全名，若找不到則返回 None
         """
-        # 如果是數字字串，嘗試當作編號
-        if name.isdigit():
-            book_id = int(name)
-            if book_id in _book_id_to_info:
-                return _book_id_to_info[book_id][3]
-            return None
-
-        book_id = BookNameConverter.get_book_id(name)
-        if book_id and book_id in _book_id_to_info:
-            return _book_id_to_info[book_id][3]
-        return None
+        book = _exact(name)
+        return book.chi_full if book is not None else None
 
     @staticmethod
     def get_english_full(name: str) -> Optional[str]:
@@ -440,17 +515,8 @@ class BookNameConverter:
         Returns:
             英文全名，若找不到則返回 None
         """
-        # 如果是數字字串，嘗試當作編號
-        if name.isdigit():
-            book_id = int(name)
-            if book_id in _book_id_to_info:
-                return _book_id_to_info[book_id][1]
-            return None
-
-        book_id = BookNameConverter.get_book_id(name)
-        if book_id and book_id in _book_id_to_info:
-            return _book_id_to_info[book_id][1]
-        return None
+        book = _exact(name)
+        return book.eng_full if book is not None else None
 
     @staticmethod
     def get_all_books() -> list[Dict[str, any]]:
@@ -528,10 +594,7 @@ class BookNameConverter:
         Returns:
             繁體中文文字
         """
-        result = []
-        for char in text:
-            result.append(SIMPLIFIED_TO_TRADITIONAL.get(char, char))
-        return "".join(result)
+        return text.translate(_S2T)
 
     @staticmethod
     def traditional_to_simplified(text: str) -> str:
@@ -544,10 +607,7 @@ class BookNameConverter:
         Returns:
             簡體中文文字
         """
-        result = []
-        for char in text:
-            result.append(TRADITIONAL_TO_SIMPLIFIED.get(char, char))
-        return "".join(result)
+        return text.translate(_T2S)
 
     @staticmethod
     def normalize_book_name(name: str) -> Optional[str]:
@@ -562,44 +622,25 @@ class BookNameConverter:
         """
         if not name:
             return None
-            
-        # 去除空格並轉小寫 (如果是英文)
-        name = name.strip()
-        name_lower = name.lower() if name.isascii() else name
-        
-        # 1. 嘗試直接查找
-        result = BookNameConverter.get_chinese_short(name)
-        if result:
-            return result
-        
-        # 2. 嘗試從別名表查找
-        if name_lower in BOOK_ALIASES:
-            alias_target = BOOK_ALIASES[name_lower]
-            result = BookNameConverter.get_chinese_short(alias_target)
-            if result:
-                return result
+
+        # 正式名稱、別名與簡體形式都已預先收錄在同一個查詢表
+        book = _resolve(name)
+        return book.chi_short if book is not None else None
+
+    @staticmethod
+    def resolve(name: str) -> Optional[Book]:
+        """
+        以任何已知名稱形式查找書卷 (與 normalize_book_name 相同的規則)
         
-        # 3. 嘗試簡轉繁後查找
-        traditional = BookNameConverter.simplified_to_traditional(name)
-        result = BookNameConverter.get_chinese_short(traditional)
-        if result:
-            return result
+        Args:
+            name: 書卷名稱 (別名、縮寫、英文、簡體或編號)
             
-        # 4. 嘗試從別名表查找 (簡轉繁後)
-        if traditional in BOOK_ALIASES:
-            alias_target = BOOK_ALIASES[traditional]
-            result = BookNameConverter.get_chinese_short(alias_target)
-            if result:
-                return result
-        
-        # 5. 嘗試移除數字後查找 (如 "1kings" -> "kings")
-        if name_lower and name_lower[0].isdigit():
-            without_number = name_lower[1:].strip()
-            result = BookNameConverter.normalize_book_name(without_number)
-            if result:
-                return result
-        
-        return None
+        Returns:
+            書卷記錄 (Book),若找不到則返回 None
+        """
+        if not name:
+            return None
+        return _resolve(name)
 
     @staticmethod
     def fuzzy_search(query: str, limit: int = 5) -> List[Dict[str, any]]:
@@ -617,73 +658,23 @@ class BookNameConverter:
             return []
         
         query = query.strip().lower()
-        results = []
         
         # 先嘗試精確匹配
         exact_match = BookNameConverter.normalize_book_name(query)
         if exact_match:
-            book_id = BookNameConverter.get_book_id(exact_match)
-            if book_id:
-                eng_short, eng_full, chi_short, chi_full = _book_id_to_info[book_id]
-                return [{
-                    "id": book_id,
-                    "eng_short": eng_short,
-                    "eng_full": eng_full,
-                    "chi_short": chi_short,
-                    "chi_full": chi_full,
-                    "score": 100,
-                    "match_type": "exact"
-                }]
+            book = _exact(exact_match)
+            if book is not None:
+                return [{**book._asdict(), "score": 100, "match_type": "exact"}]
         
-        # 模糊匹配
-        for book_id, eng_short, eng_full, chi_short, chi_full in BIBLE_BOOKS:
-            score = 0
-            match_type = "none"
-            
-            # 檢查各種匹配
-            if query in eng_short.lower():
-                score = 80
-                match_type = "eng_short_contains"
-            elif query in eng_full.lower():
-                score = 70
-                match_type = "eng_full_contains"
-            elif query in chi_short:
-                score = 90
-                match_type = "chi_short_contains"
-            elif query in chi_full:
-                score = 85
-                match_type = "chi_full_contains"
-            # 簡體匹配
-            elif query in BookNameConverter.traditional_to_simplified(chi_short):
-                score = 85
-                match_type = "chi_short_simplified"
-            elif query in BookNameConverter.traditional_to_simplified(chi_full):
-                score = 80
-                match_type = "chi_full_simplified"
-            # 開頭匹配
-            elif eng_short.lower().startswith(query):
-                score = 75
-                match_type = "eng_short_starts"
-            elif eng_full.lower().startswith(query):
-                score = 65
-                match_type = "eng_full_starts"
-            elif chi_short.startswith(query):
-                score = 85
-                match_type = "chi_short_starts"
-            elif chi_full.startswith(query):
-                score = 80
-                match_type = "chi_full_starts"
-            
-            if score > 0:
-                results.append({
-                    "id": book_id,
-                    "eng_short": eng_short,
-                    "eng_full": eng_full,
-                    "chi_short": chi_short,
-                    "chi_full": chi_full,
-                    "score": score,
-                    "match_type": match_type
-                })
+        # 模糊匹配：由後綴索引取得名稱包含 query 的書卷
+        results = []
+        for position, rank in sorted(_matching_books(query).items()):
+            score, match_type = _FUZZY_FIELDS[rank]
+            results.append({
+                **_books[position]._asdict(),
+                "score": score,
+                "match_type": match_type
+            })
         
         # 按分數排序
         results.sort(key=lambda x: x["score"], reverse=True)
@@ -701,30 +692,20 @@ class BookNameConverter:
         Returns:
             包含完整書卷資訊的字典,若找不到則返回 None
         """
-        book_id = None
-        
         # 如果是數字,直接當作 ID
         if isinstance(name, int) or (isinstance(name, str) and name.isdigit()):
-            book_id = int(name)
+            book = _books_by_id.get(int(name))
         else:
-            # 先標準化名稱
-            normalized = BookNameConverter.normalize_book_name(name)
-            if normalized:
-                book_id = BookNameConverter.get_book_id(normalized)
-            else:
-                # 嘗試直接查找
-                book_id = BookNameConverter.get_book_id(name)
+            # 先標準化名稱，再以標準化的中文簡寫查找
+            book = _resolve(name)
+            if book is not None:
+                book = _exact(book.chi_short)
         
-        if book_id and book_id in _book_id_to_info:
-            eng_short, eng_full, chi_short, chi_full = _book_id_to_info[book_id]
+        if book is not None:
             return {
-                "id": book_id,
-                "eng_short": eng_short,
-                "eng_full": eng_full,
-                "chi_short": chi_short,
-                "chi_full": chi_full,
-                "testament": "OT" if book_id <= 39 else "NT",
-                "testament_name": "舊約" if book_id <= 39 else "新約"
+                **book._asdict(),
+                "testament": "OT" if book.id <= 39 else "NT",
+                "testament_name": "舊約" if book.id <= 39 else "新約"
             }
         
         return None
@@ -750,39 +731,30 @@ class BookNameConverter:
         if not reference:
             return None
         
+        from .citations import parse_citations
+        from .errors import InvalidParameterError
+        
         reference = reference.strip()
         
-        # 嘗試匹配 "書卷名 章:節" 或 "書卷名 章:節-節" 格式
-        # 支援中英文書卷名
-        pattern = r'^(.+?)\s*(\d+):(\d+)(?:-(\d+))?$'
-        match = re.match(pattern, reference)
+        # 只接受單一章內的一節或一段連續的節 (多段、整章或跨章引用見 parse_citations)
+        try:
+            spans = parse_citations(reference, fuzzy=True)
+        except InvalidParameterError:
+            return None
+        if len(spans) != 1 or spans[0].start is None or spans[0].end is None:
+            return None
         
-        if match:
-            book_name = match.group(1).strip()
-            chapter = int(match.group(2))
-            verse_start = int(match.group(3))
-            verse_end = int(match.group(4)) if match.group(4) else verse_start
-            
-            # 標準化書卷名
-            normalized_book = BookNameConverter.normalize_book_name(book_name)
-            if not normalized_book:
-                # 嘗試模糊搜尋
-                fuzzy_results = BookNameConverter.fuzzy_search(book_name, limit=1)
-                if fuzzy_results:
-                    normalized_book = fuzzy_results[0]["chi_short"]
-                else:
-                    return None
-            
-            book_info = BookNameConverter.get_book_info(normalized_book)
-            if book_info:
-                return {
-                    "book": normalized_book,
-                    "book_id": book_info["id"],
-                    "book_full": book_info["chi_full"],
-                    "chapter": chapter,
-                    "verse_start": verse_start,
-                    "verse_end": verse_end,
-                    "original_input": reference
-                }
+        span = spans[0]
+        book = _books_by_id.get(span.book_id)
+        if book is not None:
+            return {
+                "book": book.chi_short,
+                "book_id": book.id,
+                "book_full": book.chi_full,
+                "chapter": span.chapter,
+                "verse_start": span.start,
+                "verse_end": span.end,
+                "original_input": reference
+            }
         
         return None
@@ -1,20 +1,187 @@
 """
 Cache System for FHL Bible MCP Server
 
-提供檔案快取功能，支援 TTL (Time To Live) 過期策略。
+提供兩層快取功能，支援 TTL (Time To Live) 過期策略：
+- 記憶體層 (MemoryCache): LRU，依項目數與估計位元組數限制大小
+- 持久層 (CacheBackend): 跨程序保存，可選擇
+    - JSONFileBackend: 每個鍵一個 JSON 檔案，依鍵的摘要分散到兩層子目錄 (ab/cd/)
+    - SQLiteBackend: 單一 SQLite 資料庫 (WAL 模式)，命名空間與過期時間有索引
+
+快取鍵由 make_cache_key 從端點與參數計算一次 (blake2b 摘要)，
+持久層直接使用，不再重新雜湊。
 """
 
 import json
 import hashlib
+import os
+import re
+import sqlite3
+import struct
+import threading
 import time
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from fhl_bible_mcp.config import CacheConfig
+
 logger = logging.getLogger(__name__)
 
 
+# 常用端點的參數順序：參數都在清單內時以 tuple 取代排序後的 JSON 計算快取鍵
+_KEY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "qb.php": ("bid", "chap", "version", "strong", "sec"),
+    "se.php": (
+        "VERSION", "orig", "q", "RANGE", "offset", "count_only", "index_only",
+        "limit", "range_bid", "range_eid",
+    ),
+    "sd.php": ("N", "k"),
+}
+
+_KEY_FIELD_SETS = {endpoint: frozenset(fields) for endpoint, fields in _KEY_FIELDS.items()}
+
+_HEX_DIGEST = re.compile(r"^[0-9a-f]{32,128}$")
+_SAFE_NAMESPACE = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+def _digest(raw: str) -> str:
+    """128-bit blake2b 摘要 (32 個十六進位字元)"""
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """
+    由端點與參數計算快取鍵
+
+    qb.php / se.php / sd.php 的參數依固定順序組成 tuple；其他端點 (或含有
+    未知參數時) 使用排序後的 JSON。相同的端點與參數永遠得到相同的鍵。
+
+    Args:
+        endpoint: API 端點
+        params: 請求參數
+
+    Returns:
+        32 個字元的十六進位摘要
+    """
+    fields = _KEY_FIELDS.get(endpoint)
+    if fields is not None and params.keys() <= _KEY_FIELD_SETS[endpoint]:
+        return _digest(repr((endpoint,) + tuple(params.get(field) for field in fields)))
+    return _digest(json.dumps({"endpoint": endpoint, **params}, sort_keys=True, ensure_ascii=False))
+
+
+# 快取檔案格式 (JSONFileBackend)：
+#   標頭 magic (4s) | 格式版本 (B) | flags (B) | cached_at (d) | ttl (d) | 鍵長度 (H)
+#   之後為 UTF-8 鍵 (含命名空間) 與內容 (compact JSON，大型內容以 zlib 壓縮)
+CACHE_FILE_SUFFIX = ".fhc"
+COMPRESS_MIN_BYTES = 1024
+
+_FILE_MAGIC = b"FHLC"
+_FILE_FORMAT = 1
+_FILE_HEADER = struct.Struct("<4sBBddH")
+_FLAG_ZLIB = 0x01
+_FLAG_PERMANENT = 0x02
+
+
+def _cache_files(directory: Path) -> List[Path]:
+    """列出目錄下的快取檔案"""
+    return list(directory.glob(f"*/*/*{CACHE_FILE_SUFFIX}"))
+
+
+def _has_file_cache(directory: Path) -> bool:
+    """目錄下是否有 JSON 檔案持久層的快取檔案 (找到第一個即返回，不掃描整個目錄)"""
+    patterns = (f"*/*/*{CACHE_FILE_SUFFIX}", "*/*/*.json", "*.json")
+    return any(next(iter(directory.glob(pattern)), None) is not None for pattern in patterns)
+
+
+def _legacy_cache_files(directory: Path) -> List[Path]:
+    """列出舊版的 JSON 快取檔案 (分層目錄與單層目錄)"""
+    return list(directory.glob("*/*/*.json")) + list(directory.glob("*.json"))
+
+
+def _encode_body(data: Any) -> Tuple[bytes, bool, int]:
+    """
+    將快取資料編碼為 compact JSON，超過 COMPRESS_MIN_BYTES 且壓縮有效時以 zlib 壓縮
+
+    Returns:
+        (內容, 是否壓縮, 未壓縮的位元組數)
+    """
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            return compressed, True, len(raw)
+    return raw, False, len(raw)
+
+
+def encode_cache_file(entry: "CacheEntry") -> Tuple[bytes, int]:
+    """
+    將快取項目編碼為快取檔案內容
+
+    Returns:
+        (檔案內容, 未壓縮的內容位元組數)
+    """
+    body, compressed, size = _encode_body(entry.data)
+    ttl = entry.strategy.ttl_seconds
+    flags = (_FLAG_ZLIB if compressed else 0) | (_FLAG_PERMANENT if ttl is None else 0)
+    key = entry.key.encode("utf-8")
+    header = _FILE_HEADER.pack(
+        _FILE_MAGIC, _FILE_FORMAT, flags, entry.cached_at, float(ttl or 0), len(key)
+    )
+    return header + key + body, size
+
+
+def read_cache_file(
+    path: Path,
+    max_stale: Optional[float] = None,
+    header_only: bool = False
+) -> Tuple["CacheEntry", int]:
+    """
+    讀取快取檔案 (也接受舊版 JSON 格式)
+
+    Args:
+        path: 快取檔案
+        max_stale: 指定時，過期超過 max_stale 秒的項目不解碼內容
+        header_only: 只讀取標頭
+
+    Returns:
+        (快取項目, 未壓縮的內容位元組數)；未解碼內容時 data 為 None、位元組數為 0
+
+    Raises:
+        FileNotFoundError: 檔案不存在
+        ValueError: 格式無法辨識
+    """
+    with open(path, "rb") as f:
+        head = f.read(_FILE_HEADER.size)
+
+        if not head.startswith(_FILE_MAGIC):
+            # 舊版 JSON 檔案
+            raw = head + f.read()
+            return CacheEntry.from_dict(json.loads(raw)), len(raw)
+
+        _, version, flags, cached_at, ttl, key_length = _FILE_HEADER.unpack(head)
+        if version != _FILE_FORMAT:
+            raise ValueError(f"Unsupported cache file format {version}: {path}")
+
+        entry = CacheEntry(
+            key=f.read(key_length).decode("utf-8"),
+            data=None,
+            cached_at=cached_at,
+            strategy=CacheStrategy(ttl_seconds=None if flags & _FLAG_PERMANENT else int(ttl))
+        )
+        if header_only or (max_stale is not None and not entry.is_servable(max_stale)):
+            return entry, 0
+
+        body = f.read()
+
+    if flags & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+    entry.data = json.loads(body)
+    return entry, len(body)
+
+
 class CacheStrategy:
     """快取策略基類"""
     
@@ -27,12 +194,13 @@ class CacheStrategy:
         """
         self.ttl_seconds = ttl_seconds
     
-    def is_expired(self, cached_time: float) -> bool:
+    def is_expired(self, cached_time: float, grace_seconds: float = 0) -> bool:
         """
         檢查快取是否過期
         
         Args:
             cached_time: 快取建立時間（Unix timestamp）
+            grace_seconds: 過期後仍可使用的秒數（stale-while-revalidate）
             
         Returns:
             True 如果已過期，False 如果仍有效
@@ -41,7 +209,7 @@ class CacheStrategy:
             return False  # 永久快取永不過期
         
         elapsed = time.time() - cached_time
-        return elapsed > self.ttl_seconds
+        return elapsed > self.ttl_seconds + grace_seconds
     
     def get_expiry_time(self, cached_time: float) -> Optional[datetime]:
         """
@@ -87,6 +255,10 @@ class CacheEntry:
         """檢查快取是否仍然有效"""
         return not self.strategy.is_expired(self.cached_at)
     
+    def is_servable(self, max_stale: float = 0) -> bool:
+        """檢查快取是否有效，或過期未超過 max_stale 秒"""
+        return not self.strategy.is_expired(self.cached_at, max_stale)
+    
     def to_dict(self) -> Dict[str, Any]:
         """轉換為字典格式"""
         return {
@@ -108,11 +280,621 @@ class CacheEntry:
         )
 
 
+class MemoryCache:
+    """
+    記憶體 LRU 快取層
+    
+    放在 FileCache 前面，熱門資料（如約翰福音 3 章、詩篇 23 篇）
+    命中時不需讀取檔案。同時以項目數與估計位元組數限制大小，
+    超過上限時淘汰最久未使用的項目。
+    
+    注意：回傳的資料為共用物件，呼叫端應視為唯讀。
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        """
+        初始化記憶體快取
+        
+        Args:
+            max_entries: 最多保存的項目數
+            max_bytes: 最多保存的估計位元組數
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[CacheEntry, int]]" = OrderedDict()
+        self._size_bytes = 0
+        
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @property
+    def size_bytes(self) -> int:
+        """目前保存的估計位元組數"""
+        return self._size_bytes
+    
+    def get(self, cache_key: str, max_stale: float = 0) -> Optional[CacheEntry]:
+        """
+        取得快取項目
+        
+        Args:
+            cache_key: 完整快取鍵（namespace:key）
+            max_stale: 過期後仍可返回的秒數（呼叫端以 entry.is_valid() 判斷是否過期）
+            
+        Returns:
+            可使用的快取項目，如果不存在或已過期則返回 None
+        """
+        item = self._entries.get(cache_key)
+        if item is None:
+            self.stats["misses"] += 1
+            return None
+        
+        entry = item[0]
+        if not entry.is_servable(max_stale):
+            self._remove(cache_key)
+            self.stats["misses"] += 1
+            return None
+        
+        self._entries.move_to_end(cache_key)
+        self.stats["hits"] += 1
+        return entry
+    
+    def set(self, cache_key: str, entry: CacheEntry, size: int) -> None:
+        """
+        設定快取項目
+        
+        Args:
+            cache_key: 完整快取鍵（namespace:key）
+            entry: 快取項目
+            size: 估計位元組數（通常為序列化後的長度）
+        """
+        if size > self.max_bytes or self.max_entries <= 0:
+            # 單一項目超過上限則不放入記憶體層
+            self._remove(cache_key)
+            return
+        
+        self._remove(cache_key)
+        self._entries[cache_key] = (entry, size)
+        self._size_bytes += size
+        
+        while len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes:
+            evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+            self.stats["evictions"] += 1
+            logger.debug(f"Memory cache evicted: {evicted_key}")
+    
+    def delete(self, cache_key: str) -> bool:
+        """
+        刪除快取項目
+        
+        Returns:
+            True 如果項目存在並已刪除
+        """
+        return self._remove(cache_key)
+    
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """
+        清除快取
+        
+        Args:
+            namespace: 命名空間（如果指定則只清除該命名空間）
+            
+        Returns:
+            清除的項目數量
+        """
+        if namespace is None:
+            cleared = len(self._entries)
+            self._entries.clear()
+            self._size_bytes = 0
+            return cleared
+        
+        prefix = f"{namespace}:"
+        keys = [k for k in self._entries if k.startswith(prefix)]
+        for k in keys:
+            self._remove(k)
+        return len(keys)
+    
+    def cleanup_expired(self, grace_seconds: float = 0) -> int:
+        """
+        清理過期項目
+        
+        Args:
+            grace_seconds: 過期未超過此秒數的項目保留
+            
+        Returns:
+            清理的項目數量
+        """
+        expired = [
+            k for k, (entry, _) in self._entries.items() if not entry.is_servable(grace_seconds)
+        ]
+        for k in expired:
+            self._remove(k)
+        return len(expired)
+    
+    def get_info(self) -> Dict[str, Any]:
+        """取得記憶體層統計資訊"""
+        total = self.stats["hits"] + self.stats["misses"]
+        hit_rate = self.stats["hits"] / total * 100 if total > 0 else 0.0
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            **self.stats,
+            "hit_rate_percent": round(hit_rate, 2),
+        }
+    
+    def _remove(self, cache_key: str) -> bool:
+        item = self._entries.pop(cache_key, None)
+        if item is None:
+            return False
+        self._size_bytes -= item[1]
+        return True
+
+
+class CacheBackend:
+    """
+    快取持久層介面
+    
+    FileCache 負責記憶體層、統計與 TTL 判斷，持久層只負責存取資料。
+    read() 會返回已過期的項目，由呼叫端決定是否刪除。
+    """
+    
+    name = "base"
+    
+    def read(
+        self,
+        cache_key: str,
+        max_stale: Optional[float] = None
+    ) -> Optional[Tuple[CacheEntry, int]]:
+        """
+        讀取快取項目
+        
+        Args:
+            cache_key: 完整快取鍵（namespace:key）
+            max_stale: 指定時，過期超過 max_stale 秒的項目可以不解碼內容
+                (返回的項目 data 為 None)
+            
+        Returns:
+            (快取項目, 估計位元組數)，不存在則返回 None
+        """
+        raise NotImplementedError("Subclasses must implement read method")
+    
+    def write(self, cache_key: str, entry: CacheEntry) -> int:
+        """
+        寫入快取項目
+        
+        Returns:
+            內容未壓縮的位元組數 (記憶體層以此估計大小)
+        """
+        raise NotImplementedError("Subclasses must implement write method")
+    
+    def delete(self, cache_key: str) -> bool:
+        """刪除快取項目，返回是否有項目被刪除"""
+        raise NotImplementedError("Subclasses must implement delete method")
+    
+    def clear(self, namespace: Optional[str] = None) -> int:
+        """清除快取（可限定命名空間），返回清除數量"""
+        raise NotImplementedError("Subclasses must implement clear method")
+    
+    def cleanup_expired(self, grace_seconds: float = 0) -> int:
+        """清理過期超過 grace_seconds 秒的項目，返回清理數量"""
+        raise NotImplementedError("Subclasses must implement cleanup_expired method")
+    
+    def get_info(self) -> Dict[str, Any]:
+        """
+        取得持久層統計
+        
+        Returns:
+            包含 total_files, total_size_bytes, expired_count, namespaces 的字典
+        """
+        raise NotImplementedError("Subclasses must implement get_info method")
+    
+    def get_entries(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        """取得快取項目列表（可限定命名空間）"""
+        raise NotImplementedError("Subclasses must implement get_entries method")
+    
+    def close(self) -> None:
+        """釋放資源"""
+
+
+def _entry_info(entry: CacheEntry, size: int) -> Dict[str, Any]:
+    """建立 get_entries 使用的項目資訊"""
+    expiry_time = entry.strategy.get_expiry_time(entry.cached_at)
+    return {
+        "key": entry.key,
+        "cached_at": datetime.fromtimestamp(entry.cached_at).isoformat(),
+        "is_valid": entry.is_valid(),
+        "expiry_time": expiry_time.isoformat() if expiry_time else "never",
+        "file_size": size
+    }
+
+
+class JSONFileBackend(CacheBackend):
+    """
+    檔案持久層
+    
+    每個快取鍵一個檔案，依摘要前四個字元放在兩層子目錄
+    (<cache_dir>/ab/cd/<namespace>-abcd....fhc)，避免單一目錄檔案過多。
+    檔案為固定長度的二進位標頭 (快取時間、TTL、鍵) 加上 compact JSON 內容
+    (見 encode_cache_file)，判斷過期、清理與統計只需讀取標頭。
+    清除、清理與統計需要掃描所有檔案，項目很多時建議改用 SQLiteBackend。
+    """
+    
+    name = "file"
+    
+    def __init__(self, cache_dir: Path):
+        """
+        初始化檔案持久層
+        
+        Args:
+            cache_dir: 快取目錄
+        """
+        self.cache_dir = cache_dir
+        self.errors = 0
+        self._migrate_legacy_files()
+    
+    def get_cache_file(self, cache_key: str) -> Path:
+        """
+        取得快取檔案路徑
+        
+        Args:
+            cache_key: 快取鍵
+            
+        Returns:
+            快取檔案路徑
+        """
+        # 鍵本身已是摘要 (make_cache_key) 時直接使用；
+        # 其他鍵再雜湊一次，避免檔名過長或包含非法字元
+        namespace, _, key = cache_key.partition(":")
+        if _HEX_DIGEST.match(key) and _SAFE_NAMESPACE.match(namespace):
+            digest, name = key, f"{namespace}-{key}"
+        else:
+            digest = name = _digest(cache_key)
+        return self.cache_dir / digest[:2] / digest[2:4] / f"{name}{CACHE_FILE_SUFFIX}"
+    
+    def _migrate_legacy_files(self) -> None:
+        """把舊版 JSON 快取檔案 (單層或分層目錄) 轉為目前的格式"""
+        migrated = 0
+        for cache_file in _legacy_cache_files(self.cache_dir):
+            try:
+                entry, _ = read_cache_file(cache_file)
+                self.write(entry.key, entry)
+                cache_file.unlink()
+                migrated += 1
+            except Exception as e:
+                logger.error(f"Error migrating cache file {cache_file}: {e}")
+                self.errors += 1
+        if migrated:
+            logger.info(f"Converted {migrated} legacy JSON cache files under {self.cache_dir}")
+    
+    def _iter_files(self) -> List[Tuple[Path, CacheEntry]]:
+        """讀取所有快取檔案的標頭 (data 為 None)"""
+        items = []
+        for cache_file in _cache_files(self.cache_dir):
+            try:
+                items.append((cache_file, read_cache_file(cache_file, header_only=True)[0]))
+            except Exception as e:
+                logger.error(f"Error reading cache file {cache_file}: {e}")
+                self.errors += 1
+        return items
+    
+    def read(
+        self,
+        cache_key: str,
+        max_stale: Optional[float] = None
+    ) -> Optional[Tuple[CacheEntry, int]]:
+        try:
+            return read_cache_file(self.get_cache_file(cache_key), max_stale=max_stale)
+        except FileNotFoundError:
+            return None
+    
+    def write(self, cache_key: str, entry: CacheEntry) -> int:
+        raw, size = encode_cache_file(entry)
+        cache_file = self.get_cache_file(cache_key)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # 先寫入暫存檔再取代，讀取端不會讀到寫到一半的檔案
+        tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_file, cache_file)
+        return size
+    
+    def delete(self, cache_key: str) -> bool:
+        cache_file = self.get_cache_file(cache_key)
+        
+        if not cache_file.exists():
+            return False
+        
+        cache_file.unlink()
+        return True
+    
+    def clear(self, namespace: Optional[str] = None) -> int:
+        cleared = 0
+        
+        for cache_file, entry in self._iter_files():
+            # 如果指定了命名空間，檢查是否匹配
+            if namespace is not None and not entry.key.startswith(f"{namespace}:"):
+                continue
+            
+            try:
+                cache_file.unlink()
+                cleared += 1
+            except Exception as e:
+                logger.error(f"Error clearing cache file {cache_file}: {e}")
+                self.errors += 1
+        
+        return cleared
+    
+    def cleanup_expired(self, grace_seconds: float = 0) -> int:
+        cleaned = 0
+        
+        for cache_file, entry in self._iter_files():
+            try:
+                # 過期超過保留期限則刪除
+                if not entry.is_servable(grace_seconds):
+                    cache_file.unlink()
+                    cleaned += 1
+                    logger.debug(f"Cleaned expired cache: {entry.key}")
+                    
+            except Exception as e:
+                logger.error(f"Error cleaning cache file {cache_file}: {e}")
+                self.errors += 1
+        
+        return cleaned
+    
+    def get_info(self) -> Dict[str, Any]:
+        items = self._iter_files()
+        total_size = 0
+        
+        # 統計各命名空間的快取數量
+        namespaces: Dict[str, int] = {}
+        expired_count = 0
+        
+        for cache_file, entry in items:
+            try:
+                total_size += cache_file.stat().st_size
+            except OSError:
+                continue
+            namespace = entry.key.split(":", 1)[0] if ":" in entry.key else "unknown"
+            namespaces[namespace] = namespaces.get(namespace, 0) + 1
+            
+            # 檢查是否過期
+            if not entry.is_valid():
+                expired_count += 1
+        
+        return {
+            "total_files": len(items),
+            "total_size_bytes": total_size,
+            "expired_count": expired_count,
+            "namespaces": namespaces,
+        }
+    
+    def get_entries(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        entries = []
+        
+        for cache_file, entry in self._iter_files():
+            try:
+                # 命名空間篩選
+                if namespace is not None and not entry.key.startswith(f"{namespace}:"):
+                    continue
+                
+                entries.append(_entry_info(entry, cache_file.stat().st_size))
+                
+            except Exception as e:
+                logger.error(f"Error reading cache entry {cache_file}: {e}")
+        
+        return entries
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    SQLite 持久層
+    
+    所有項目存放在單一資料庫 (WAL 模式)，namespace 與 expires_at 欄位
+    皆有索引，因此清除命名空間、清理過期項目與統計都是索引查詢，
+    不需要掃描整個目錄。
+    """
+    
+    name = "sqlite"
+    
+    DB_FILENAME = "cache.sqlite3"
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            cache_key   TEXT PRIMARY KEY,
+            namespace   TEXT NOT NULL,
+            data        TEXT NOT NULL,
+            cached_at   REAL NOT NULL,
+            ttl_seconds REAL,
+            expires_at  REAL,
+            size        INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_cache_namespace ON cache_entries (namespace);
+        CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache_entries (expires_at);
+    """
+    
+    def __init__(self, db_path: Path):
+        """
+        初始化 SQLite 持久層
+        
+        Args:
+            db_path: 資料庫檔案路徑
+        """
+        self.db_path = db_path
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+    
+    def read(
+        self,
+        cache_key: str,
+        max_stale: Optional[float] = None
+    ) -> Optional[Tuple[CacheEntry, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, cached_at, ttl_seconds FROM cache_entries WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        data, cached_at, ttl_seconds = row
+        ttl = int(ttl_seconds) if ttl_seconds is not None else None
+        entry = CacheEntry(
+            key=cache_key,
+            data=None,
+            cached_at=cached_at,
+            strategy=CacheStrategy(ttl_seconds=ttl)
+        )
+        if max_stale is not None and not entry.is_servable(max_stale):
+            return entry, 0
+        
+        # 大型內容以 zlib 壓縮後存成 BLOB，其他為 JSON 文字
+        if isinstance(data, bytes):
+            data = zlib.decompress(data)
+        entry.data = json.loads(data)
+        return entry, len(data)
+    
+    @staticmethod
+    def _encode(data: Any) -> Tuple[Any, int]:
+        """
+        編碼內容：壓縮的內容存成 BLOB，否則存成 JSON 文字
+        
+        Returns:
+            (儲存的內容, 未壓縮的位元組數)
+        """
+        body, compressed, raw_size = _encode_body(data)
+        return (body if compressed else body.decode("utf-8")), raw_size
+    
+    def write(self, cache_key: str, entry: CacheEntry) -> int:
+        raw, raw_size = self._encode(entry.data)
+        size = len(raw)
+        ttl = entry.strategy.ttl_seconds
+        expires_at = entry.cached_at + ttl if ttl is not None else None
+        namespace = cache_key.split(":", 1)[0] if ":" in cache_key else "unknown"
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(cache_key, namespace, data, cached_at, ttl_seconds, expires_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, namespace, raw, entry.cached_at, ttl, expires_at, size)
+            )
+        return raw_size
+    
+    def write_many(self, rows: List[Tuple[str, CacheEntry]]) -> int:
+        """
+        在單一交易中批次寫入（用於遷移）
+        
+        Returns:
+            寫入的項目數量
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for cache_key, entry in rows:
+                    raw, _ = self._encode(entry.data)
+                    ttl = entry.strategy.ttl_seconds
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO cache_entries "
+                        "(cache_key, namespace, data, cached_at, ttl_seconds, expires_at, size) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            cache_key,
+                            cache_key.split(":", 1)[0] if ":" in cache_key else "unknown",
+                            raw,
+                            entry.cached_at,
+                            ttl,
+                            entry.cached_at + ttl if ttl is not None else None,
+                            len(raw),
+                        )
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+    
+    def delete(self, cache_key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE cache_key = ?", (cache_key,)
+            )
+        return cursor.rowcount > 0
+    
+    def clear(self, namespace: Optional[str] = None) -> int:
+        with self._lock:
+            if namespace is None:
+                cursor = self._conn.execute("DELETE FROM cache_entries")
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ?", (namespace,)
+                )
+        return cursor.rowcount
+    
+    def cleanup_expired(self, grace_seconds: float = 0) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at < ?", (time.time() - grace_seconds,)
+            )
+        return cursor.rowcount
+    
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) "
+                "FROM cache_entries GROUP BY namespace"
+            ).fetchall()
+            expired_count = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE expires_at < ?", (time.time(),)
+            ).fetchone()[0]
+        
+        return {
+            "total_files": sum(count for _, count, _ in rows),
+            "total_size_bytes": sum(size for _, _, size in rows),
+            "expired_count": expired_count,
+            "namespaces": {namespace: count for namespace, count, _ in rows},
+        }
+    
+    def get_entries(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = "SELECT cache_key, cached_at, ttl_seconds, size FROM cache_entries"
+        params: Tuple[Any, ...] = ()
+        if namespace is not None:
+            query += " WHERE namespace = ?"
+            params = (namespace,)
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        
+        entries = []
+        for cache_key, cached_at, ttl_seconds, size in rows:
+            ttl = int(ttl_seconds) if ttl_seconds is not None else None
+            entry = CacheEntry(cache_key, None, cached_at, CacheStrategy(ttl_seconds=ttl))
+            entries.append(_entry_info(entry, size))
+        return entries
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 class FileCache:
     """
-    檔案快取系統
+    快取系統
     
-    使用 JSON 格式儲存快取資料到檔案系統。
+    持久層預設為 SQLite (SQLiteBackend，與 CacheConfig.backend 相同)，
+    可改用 JSON 檔案 (JSONFileBackend)。持久層前面有一層記憶體 LRU 快取 (MemoryCache)：
+    讀取時先查記憶體層，未命中才讀持久層，命中後提升到記憶體層。
     """
     
     # 預設的快取策略（單位：秒）
@@ -126,28 +908,73 @@ class FileCache:
         "versions": None,               # 版本列表：永久
         "books": None,                  # 書卷列表：永久
         "commentaries": None,           # 註釋書列表：永久
+        "topics": 7 * 24 * 3600,        # 主題查經：7天
+        "audio": 7 * 24 * 3600,         # 有聲聖經連結：7天
+        "articles": 1 * 24 * 3600,      # 信望愛站文章：1天 (每週更新)
     }
     
-    def __init__(self, cache_dir: str = ".cache"):
+    BACKENDS = ("file", "sqlite")
+    
+    def __init__(
+        self,
+        cache_dir: str = ".cache",
+        memory_max_entries: int = 1024,
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        backend: str = CacheConfig.backend
+    ):
         """
-        初始化檔案快取
+        初始化快取
         
         Args:
             cache_dir: 快取目錄路徑
+            memory_max_entries: 記憶體層最多項目數（0 表示停用記憶體層）
+            memory_max_bytes: 記憶體層最多估計位元組數
+            backend: 持久層類型 "sqlite" 或 "file" (JSON 檔案)
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown cache backend: {backend} (expected one of {self.BACKENDS})")
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # 快取統計
+        # 持久層
+        self.backend: CacheBackend
+        if backend == "sqlite":
+            self.backend = SQLiteBackend(self.cache_dir / SQLiteBackend.DB_FILENAME)
+            if _has_file_cache(self.cache_dir):
+                logger.warning(
+                    f"Found legacy JSON cache files in {self.cache_dir}; "
+                    f"run 'python -m fhl_bible_mcp migrate-cache' to import them"
+                )
+        else:
+            self.backend = JSONFileBackend(self.cache_dir)
+        
+        # 記憶體層
+        self.memory: Optional[MemoryCache] = (
+            MemoryCache(max_entries=memory_max_entries, max_bytes=memory_max_bytes)
+            if memory_max_entries > 0 else None
+        )
+        
+        # 快取統計（兩層合計）
         self.stats = {
             "hits": 0,
             "misses": 0,
             "writes": 0,
             "deletes": 0,
-            "errors": 0
+            "errors": 0,
+            "stale_hits": 0
         }
         
-        logger.info(f"FileCache initialized: cache_dir={self.cache_dir.absolute()}")
+        # 持久層統計
+        self.disk_stats = {
+            "hits": 0,
+            "misses": 0,
+        }
+        
+        logger.info(
+            f"FileCache initialized: cache_dir={self.cache_dir.absolute()}, "
+            f"backend={self.backend.name}, memory_max_entries={memory_max_entries}"
+        )
     
     def _get_cache_key(self, namespace: str, key: str) -> str:
         """
@@ -164,7 +991,7 @@ class FileCache:
     
     def _get_cache_file(self, cache_key: str) -> Path:
         """
-        取得快取檔案路徑
+        取得快取檔案路徑（僅適用於 JSON 檔案持久層），並建立所在的子目錄
         
         Args:
             cache_key: 快取鍵
@@ -172,9 +999,18 @@ class FileCache:
         Returns:
             快取檔案路徑
         """
-        # 使用 hash 避免檔名過長或包含非法字元
-        key_hash = hashlib.md5(cache_key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.json"
+        if not isinstance(self.backend, JSONFileBackend):
+            raise TypeError(f"Cache backend '{self.backend.name}' does not use per-key files")
+        cache_file = self.backend.get_cache_file(cache_key)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        return cache_file
+    
+    def _sync_backend_errors(self) -> None:
+        """將持久層內部的錯誤計數併入統計"""
+        errors = getattr(self.backend, "errors", 0)
+        if errors:
+            self.stats["errors"] += errors
+            self.backend.errors = 0  # type: ignore[attr-defined]
     
     def get(
         self,
@@ -193,37 +1029,79 @@ class FileCache:
         Returns:
             快取的資料，如果不存在或已過期則返回 None
         """
+        entry = self.get_entry(namespace, key)
+        return entry.data if entry is not None else None
+    
+    def get_entry(
+        self,
+        namespace: str,
+        key: str,
+        max_stale: float = 0
+    ) -> Optional[CacheEntry]:
+        """
+        取得快取項目（支援 stale-while-revalidate）
+        
+        過期但未超過 max_stale 秒的項目仍會返回，呼叫端以 ``entry.is_valid()``
+        判斷是否需要背景更新；超過 max_stale 的項目視為未命中，但不會刪除
+        (上游失敗時的備援仍可能需要)，由 cleanup_expired() 清理。
+        
+        Args:
+            namespace: 命名空間
+            key: 鍵值
+            max_stale: 過期後仍可返回的秒數（0 表示不返回過期項目）
+            
+        Returns:
+            快取項目，如果不存在或過期太久則返回 None
+        """
         cache_key = self._get_cache_key(namespace, key)
-        cache_file = self._get_cache_file(cache_key)
         
-        if not cache_file.exists():
-            self.stats["misses"] += 1
-            logger.debug(f"Cache miss: {cache_key}")
-            return None
+        # 先查記憶體層
+        if self.memory is not None:
+            entry = self.memory.get(cache_key, max_stale)
+            if entry is not None:
+                self._count_hit(entry)
+                logger.debug(f"Cache hit (memory): {cache_key}")
+                return entry
         
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cached_data = json.load(f)
+            item = self.backend.read(cache_key, max_stale=max_stale)
             
-            entry = CacheEntry.from_dict(cached_data)
+            if item is None:
+                self.stats["misses"] += 1
+                self.disk_stats["misses"] += 1
+                logger.debug(f"Cache miss: {cache_key}")
+                return None
+            
+            entry, size = item
             
             # 檢查是否過期
-            if not entry.is_valid():
+            if not entry.is_servable(max_stale):
                 self.stats["misses"] += 1
+                self.disk_stats["misses"] += 1
                 logger.debug(f"Cache expired: {cache_key}")
-                # 刪除過期的快取
-                cache_file.unlink()
                 return None
             
-            self.stats["hits"] += 1
-            logger.debug(f"Cache hit: {cache_key}")
-            return entry.data
+            self._count_hit(entry)
+            self.disk_stats["hits"] += 1
+            logger.debug(f"Cache hit ({self.backend.name}): {cache_key}")
+            
+            # 提升到記憶體層（保留原本的快取時間，TTL 不會因此延長）
+            if self.memory is not None:
+                self.memory.set(cache_key, entry, size)
+            
+            return entry
             
         except Exception as e:
             self.stats["errors"] += 1
             logger.error(f"Error reading cache {cache_key}: {e}")
             return None
     
+    def _count_hit(self, entry: CacheEntry) -> None:
+        """更新命中統計（過期項目另計 stale_hits）"""
+        self.stats["hits"] += 1
+        if not entry.is_valid():
+            self.stats["stale_hits"] += 1
+    
     def set(
         self,
         namespace: str,
@@ -244,7 +1122,6 @@ class FileCache:
             True 如果成功，False 如果失敗
         """
         cache_key = self._get_cache_key(namespace, key)
-        cache_file = self._get_cache_file(cache_key)
         
         try:
             # 取得快取策略
@@ -259,9 +1136,12 @@ class FileCache:
                 strategy=strategy
             )
             
-            # 寫入檔案
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(entry.to_dict(), f, ensure_ascii=False, indent=2)
+            # 寫入持久層
+            size = self.backend.write(cache_key, entry)
+            
+            # 同步寫入記憶體層
+            if self.memory is not None:
+                self.memory.set(cache_key, entry, size)
             
             self.stats["writes"] += 1
             logger.debug(f"Cache written: {cache_key} (strategy={strategy_name})")
@@ -284,13 +1164,13 @@ class FileCache:
             True 如果成功刪除，False 如果不存在或刪除失敗
         """
         cache_key = self._get_cache_key(namespace, key)
-        cache_file = self._get_cache_file(cache_key)
         
-        if not cache_file.exists():
-            return False
+        if self.memory is not None:
+            self.memory.delete(cache_key)
         
         try:
-            cache_file.unlink()
+            if not self.backend.delete(cache_key):
+                return False
             self.stats["deletes"] += 1
             logger.debug(f"Cache deleted: {cache_key}")
             return True
@@ -309,72 +1189,44 @@ class FileCache:
         Returns:
             清除的快取項目數量
         """
-        cleared = 0
+        if self.memory is not None:
+            self.memory.clear(namespace)
         
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                try:
-                    # 讀取快取檔案以取得命名空間
-                    with open(cache_file, "r", encoding="utf-8") as f:
-                        cached_data = json.load(f)
-                    
-                    cache_key = cached_data.get("key", "")
-                    
-                    # 如果指定了命名空間，檢查是否匹配
-                    if namespace is not None:
-                        if not cache_key.startswith(f"{namespace}:"):
-                            continue
-                    
-                    # 刪除快取檔案
-                    cache_file.unlink()
-                    cleared += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error clearing cache file {cache_file}: {e}")
-                    self.stats["errors"] += 1
-            
+            cleared = self.backend.clear(namespace)
             logger.info(f"Cache cleared: {cleared} items (namespace={namespace})")
             return cleared
-            
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
             self.stats["errors"] += 1
-            return cleared
+            return 0
+        finally:
+            self._sync_backend_errors()
     
-    def cleanup_expired(self) -> int:
+    def cleanup_expired(self, grace_seconds: float = 0) -> int:
         """
         清理所有過期的快取項目
         
+        Args:
+            grace_seconds: 過期未超過此秒數的項目保留 (如 cache.stale_if_error，
+                上游失敗時仍以過期資料回應)
+            
         Returns:
             清理的項目數量
         """
-        cleaned = 0
+        if self.memory is not None:
+            self.memory.cleanup_expired(grace_seconds)
         
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
-                try:
-                    with open(cache_file, "r", encoding="utf-8") as f:
-                        cached_data = json.load(f)
-                    
-                    entry = CacheEntry.from_dict(cached_data)
-                    
-                    # 如果過期則刪除
-                    if not entry.is_valid():
-                        cache_file.unlink()
-                        cleaned += 1
-                        logger.debug(f"Cleaned expired cache: {entry.key}")
-                    
-                except Exception as e:
-                    logger.error(f"Error cleaning cache file {cache_file}: {e}")
-                    self.stats["errors"] += 1
-            
+            cleaned = self.backend.cleanup_expired(grace_seconds)
             logger.info(f"Cleanup completed: {cleaned} expired items removed")
             return cleaned
-            
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
             self.stats["errors"] += 1
-            return cleaned
+            return 0
+        finally:
+            self._sync_backend_errors()
     
     def get_info(self) -> Dict[str, Any]:
         """
@@ -383,48 +1235,42 @@ class FileCache:
         Returns:
             快取統計資訊
         """
-        total_files = len(list(self.cache_dir.glob("*.json")))
-        total_size = sum(
-            f.stat().st_size for f in self.cache_dir.glob("*.json")
-        )
-        
-        # 統計各命名空間的快取數量
-        namespaces: Dict[str, int] = {}
-        expired_count = 0
-        
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    cached_data = json.load(f)
-                
-                cache_key = cached_data.get("key", "")
-                namespace = cache_key.split(":", 1)[0] if ":" in cache_key else "unknown"
-                namespaces[namespace] = namespaces.get(namespace, 0) + 1
-                
-                # 檢查是否過期
-                entry = CacheEntry.from_dict(cached_data)
-                if not entry.is_valid():
-                    expired_count += 1
-                    
-            except Exception:
-                pass
+        backend_info = self.backend.get_info()
+        self._sync_backend_errors()
+        total_size = backend_info["total_size_bytes"]
         
         hit_rate = 0.0
         total_requests = self.stats["hits"] + self.stats["misses"]
         if total_requests > 0:
             hit_rate = self.stats["hits"] / total_requests * 100
         
+        disk_hit_rate = 0.0
+        disk_requests = self.disk_stats["hits"] + self.disk_stats["misses"]
+        if disk_requests > 0:
+            disk_hit_rate = self.disk_stats["hits"] / disk_requests * 100
+        
+        tiers: Dict[str, Any] = {
+            "disk": {
+                **self.disk_stats,
+                "hit_rate_percent": round(disk_hit_rate, 2)
+            }
+        }
+        if self.memory is not None:
+            tiers["memory"] = self.memory.get_info()
+        
         return {
             "cache_dir": str(self.cache_dir.absolute()),
-            "total_files": total_files,
+            "backend": self.backend.name,
+            "total_files": backend_info["total_files"],
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / 1024 / 1024, 2),
-            "expired_count": expired_count,
-            "namespaces": namespaces,
+            "expired_count": backend_info["expired_count"],
+            "namespaces": backend_info["namespaces"],
             "stats": {
                 **self.stats,
                 "hit_rate_percent": round(hit_rate, 2)
-            }
+            },
+            "tiers": tiers
         }
     
     def get_entries(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -437,50 +1283,94 @@ class FileCache:
         Returns:
             快取項目資訊列表
         """
-        entries = []
+        return self.backend.get_entries(namespace)
+    
+    def close(self) -> None:
+        """關閉持久層（SQLite 連線）"""
+        self.backend.close()
+
+
+def migrate_file_cache(
+    source_dir: str,
+    target: CacheBackend,
+    include_expired: bool = False,
+    delete_source: bool = False
+) -> Dict[str, int]:
+    """
+    將 JSON 檔案快取遷移到其他持久層（離線執行）
+    
+    Args:
+        source_dir: JSON 快取檔案所在目錄
+        target: 目標持久層（通常為 SQLiteBackend）
+        include_expired: 是否一併遷移已過期的項目
+        delete_source: 遷移成功後是否刪除原本的 JSON 檔案
         
-        for cache_file in self.cache_dir.glob("*.json"):
-            try:
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    cached_data = json.load(f)
-                
-                cache_key = cached_data.get("key", "")
-                
-                # 命名空間篩選
-                if namespace is not None:
-                    if not cache_key.startswith(f"{namespace}:"):
-                        continue
-                
-                entry = CacheEntry.from_dict(cached_data)
-                
-                entries.append({
-                    "key": entry.key,
-                    "cached_at": datetime.fromtimestamp(entry.cached_at).isoformat(),
-                    "is_valid": entry.is_valid(),
-                    "expiry_time": (
-                        entry.strategy.get_expiry_time(entry.cached_at).isoformat()
-                        if entry.strategy.get_expiry_time(entry.cached_at)
-                        else "never"
-                    ),
-                    "file_size": cache_file.stat().st_size
-                })
-                
-            except Exception as e:
-                logger.error(f"Error reading cache entry {cache_file}: {e}")
+    Returns:
+        統計字典 {"migrated", "skipped_expired", "errors"}
+    """
+    source = Path(source_dir)
+    result = {"migrated": 0, "skipped_expired": 0, "errors": 0}
+    batch: List[Tuple[str, CacheEntry]] = []
+    batch_files: List[Path] = []
+    
+    def flush() -> None:
+        if not batch:
+            return
+        if isinstance(target, SQLiteBackend):
+            result["migrated"] += target.write_many(batch)
+        else:
+            for cache_key, entry in batch:
+                target.write(cache_key, entry)
+                result["migrated"] += 1
+        if delete_source:
+            for path in batch_files:
+                path.unlink()
+        batch.clear()
+        batch_files.clear()
+    
+    for cache_file in _cache_files(source) + _legacy_cache_files(source):
+        try:
+            entry, _ = read_cache_file(cache_file)
+        except Exception as e:
+            logger.error(f"Error reading cache file {cache_file}: {e}")
+            result["errors"] += 1
+            continue
         
-        return entries
+        if not include_expired and not entry.is_valid():
+            result["skipped_expired"] += 1
+            continue
+        
+        batch.append((entry.key, entry))
+        batch_files.append(cache_file)
+        if len(batch) >= 1000:
+            flush()
+    
+    flush()
+    logger.info(
+        f"Cache migration completed: {result['migrated']} migrated, "
+        f"{result['skipped_expired']} expired skipped, {result['errors']} errors"
+    )
+    return result
 
 
 # 全域快取實例
 _global_cache: Optional[FileCache] = None
 
 
-def get_cache(cache_dir: str = ".cache") -> FileCache:
+def get_cache(
+    cache_dir: str = ".cache",
+    memory_max_entries: int = 1024,
+    memory_max_bytes: int = 32 * 1024 * 1024,
+    backend: str = CacheConfig.backend
+) -> FileCache:
     """
     取得全域快取實例
     
     Args:
         cache_dir: 快取目錄
+        memory_max_entries: 記憶體層最多項目數（0 表示停用）
+        memory_max_bytes: 記憶體層最多估計位元組數
+        backend: 持久層類型 "sqlite" 或 "file"
         
     Returns:
         FileCache 實例
@@ -488,7 +1378,12 @@ def get_cache(cache_dir: str = ".cache") -> FileCache:
     global _global_cache
     
     if _global_cache is None:
-        _global_cache = FileCache(cache_dir=cache_dir)
+        _global_cache = FileCache(
+            cache_dir=cache_dir,
+            memory_max_entries=memory_max_entries,
+            memory_max_bytes=memory_max_bytes,
+            backend=backend
+        )
     
     return _global_cache
 
@@ -496,4 +1391,6 @@ def get_cache(cache_dir: str = ".cache") -> FileCache:
 def reset_cache() -> None:
     """重置全域快取實例（主要用於測試）"""
     global _global_cache
+    if _global_cache is not None:
+        _global_cache.close()
     _global_cache = None
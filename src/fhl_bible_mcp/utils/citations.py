@@ -0,0 +1,284 @@
+"""
+Scripture Citation Parsing for FHL Bible MCP Server
+
+經文引用字串的統一解析器 (query_verse_citation、BookNameConverter.parse_reference
+與批次查詢共用)。支援：
+
+- 單節、節範圍與節列表: "約 3:16"、"太 5:3-10"、"約3:16,18"
+- 整章與章範圍: "詩 23"、"詩 23-24"
+- 跨章範圍: "創 1:1-2:3"
+- 多段引用，以分號或逗號分隔，省略書卷時沿用前一段: "約3:16;羅5:8;8:28"
+- 書卷名稱的各種形式 (見 BookNameConverter.resolve)、全形標點、"John 3.16"
+
+解析結果為 VerseSpan (書卷編號, 章, 起節, 迄節) 序列；chapter_fetches() 依
+(書卷, 章) 分組，每章只需查詢一次。解析結果以輸入字串為鍵快取，
+批次工作中重複出現的引用不需重新解析。
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from fhl_bible_mcp.utils.booknames import BookNameConverter
+from fhl_bible_mcp.utils.errors import BookNotFoundError, InvalidParameterError
+
+
+# 快取的解析結果數量
+PARSE_CACHE_SIZE = 4096
+
+# 詞法單元：書卷名稱中的字詞可含空白、句點、撇號或連字號
+# (如 "Song of Songs"、"但以理補篇-蘇撒納")
+_TOKEN = re.compile(r"""
+    (?P<num>\d+)
+  | (?P<word>[^\W\d_]+(?:(?:[ .'’]+|-)[^\W\d_]+)*)
+  | (?P<colon>[:：])
+  | (?P<dot>\.)
+  | (?P<dash>[-–—~～])
+  | (?P<comma>[,，、])
+  | (?P<semi>[;；])
+  | (?P<space>\s+)
+  | (?P<bad>.)
+""", re.VERBOSE)
+
+# 章與節之間的分隔 ("3:16"、"3.16")
+_VERSE_MARK = ("colon", "dot")
+
+# 最常見的單段引用 "書卷 章:節" / "書卷 章:節-節" 以單一正則式解析
+_SIMPLE = re.compile(
+    r"\s*(\d?\s*[^\W\d_][^\d:：;；,，、\-–—~～]*?)\s*(\d+)\s*[:：.]\s*(\d+)"
+    r"(?:\s*[-–—~～]\s*(\d+))?\s*"
+)
+
+
+class VerseSpan(NamedTuple):
+    """
+    一段經文
+
+    start 為 None 表示整章；end 為 None 表示從 start 到章末 (跨章範圍的第一章)。
+    """
+    book_id: int
+    chapter: int
+    start: Optional[int] = None
+    end: Optional[int] = None
+
+    def contains(self, verse: int) -> bool:
+        """此段經文是否包含第 verse 節"""
+        if self.start is None:
+            return True
+        return self.start <= verse and (self.end is None or verse <= self.end)
+
+
+class _Parser:
+    """以詞法單元列表進行遞迴下降解析"""
+
+    def __init__(self, text: str, fuzzy: bool = False):
+        self.text = text
+        self.fuzzy = fuzzy
+        self.tokens: List[Tuple[str, str, int, int]] = []
+        for match in _TOKEN.finditer(text):
+            kind = match.lastgroup
+            if kind == "space":
+                continue
+            if kind == "bad":
+                self.fail(f"無法辨識的字元 '{match.group()}'")
+            self.tokens.append((kind, match.group(), match.start(), match.end()))
+        self.pos = 0
+        self.book_id: Optional[int] = None
+        self.spans: List[VerseSpan] = []
+
+    def fail(self, reason: str) -> None:
+        raise InvalidParameterError("citation", self.text, reason)
+
+    def peek(self, offset: int = 0) -> Optional[str]:
+        index = self.pos + offset
+        return self.tokens[index][0] if index < len(self.tokens) else None
+
+    def number(self, what: str) -> int:
+        if self.peek() != "num":
+            self.fail(f"缺少{what}")
+        value = int(self.tokens[self.pos][1])
+        self.pos += 1
+        if value < 1:
+            self.fail(f"{what}必須大於 0")
+        return value
+
+    def parse(self) -> Tuple[VerseSpan, ...]:
+        self.item()
+        while self.pos < len(self.tokens):
+            kind = self.peek()
+            if kind in ("semi", "comma"):
+                self.pos += 1
+                # 允許結尾或重複的分隔符號
+                if self.peek() not in (None, "semi", "comma"):
+                    self.item()
+            elif self.at_book():
+                self.item()
+            else:
+                self.fail(f"無法解析 '{self.tokens[self.pos][1]}'")
+        if not self.spans:
+            self.fail("空白的經文引用")
+        return tuple(self.spans)
+
+    def at_book(self) -> bool:
+        kind = self.peek()
+        if kind == "word":
+            return True
+        # "1 John"、"1Cor"、書卷編號 "43 3:16"
+        return kind == "num" and self.peek(1) in ("word", "num")
+
+    def book(self) -> None:
+        first = last = self.tokens[self.pos]
+        while True:
+            kind = self.peek()
+            if kind == "word":
+                last = self.tokens[self.pos]
+            elif not (kind == "dot" and self.pos > 0 and self.tokens[self.pos - 1][0] == "word") \
+                    and not (kind == "num" and self.peek(1) == "word"):
+                break
+            self.pos += 1
+
+        # 以數字結尾的別名 ("cor1 3:16")
+        if last[0] == "word" and self.peek() == "num" and self.peek(1) == "num":
+            if BookNameConverter.resolve(self.text[first[2]:self.tokens[self.pos][3]]) is not None:
+                last = self.tokens[self.pos]
+                self.pos += 1
+
+        if first is last and first[0] == "num":
+            # 書卷編號
+            self.pos += 1
+            book_id = BookNameConverter.get_book_id(first[1])
+            if book_id is None:
+                raise BookNotFoundError(first[1])
+            self.book_id = book_id
+            return
+
+        name = self.text[first[2]:last[3]]
+        book = BookNameConverter.resolve(name)
+        if book is None and self.fuzzy:
+            matches = BookNameConverter.fuzzy_search(name, limit=1)
+            if matches:
+                book = BookNameConverter.resolve(str(matches[0]["id"]))
+        if book is None:
+            raise BookNotFoundError(name)
+        self.book_id = book.id
+
+    def item(self) -> None:
+        if self.at_book():
+            self.book()
+        if self.book_id is None:
+            self.fail("缺少書卷名稱")
+
+        chapter = self.number("章數")
+        if self.peek() in _VERSE_MARK:
+            self.pos += 1
+            self.verses(chapter)
+        elif self.peek() == "dash" and self.peek(1) == "num":
+            self.pos += 1
+            last = self.number("章數")
+            if last < chapter:
+                self.fail(f"章範圍 {chapter}-{last} 的起點大於終點")
+            self.spans.extend(VerseSpan(self.book_id, c) for c in range(chapter, last + 1))
+        else:
+            self.spans.append(VerseSpan(self.book_id, chapter))
+
+    def verses(self, chapter: int) -> None:
+        book_id = self.book_id
+        while True:
+            start = self.number("節數")
+            if self.peek() == "dash":
+                self.pos += 1
+                end = self.number("節數")
+                if self.peek() in _VERSE_MARK:
+                    # 跨章範圍 "1:1-2:3"
+                    self.pos += 1
+                    end_chapter, end = end, self.number("節數")
+                    if end_chapter < chapter or (end_chapter == chapter and end < start):
+                        self.fail(f"範圍 {chapter}:{start}-{end_chapter}:{end} 的起點大於終點")
+                    if end_chapter == chapter:
+                        self.spans.append(VerseSpan(book_id, chapter, start, end))
+                    else:
+                        self.spans.append(VerseSpan(book_id, chapter, start, None))
+                        self.spans.extend(VerseSpan(book_id, c) for c in range(chapter + 1, end_chapter))
+                        self.spans.append(VerseSpan(book_id, end_chapter, 1, end))
+                        chapter = end_chapter
+                else:
+                    if end < start:
+                        self.fail(f"節範圍 {start}-{end} 的起點大於終點")
+                    self.spans.append(VerseSpan(book_id, chapter, start, end))
+            else:
+                self.spans.append(VerseSpan(book_id, chapter, start, start))
+
+            # ",18" 為同一章的下一節；",4:1" 為下一段引用
+            if self.peek() == "comma" and self.peek(1) == "num" and self.peek(2) not in _VERSE_MARK:
+                self.pos += 1
+                continue
+            return
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_citations(text: str, fuzzy: bool = False) -> Tuple[VerseSpan, ...]:
+    """
+    解析經文引用字串
+
+    Args:
+        text: 引用字串，如 "約 3:16"、"創 1:1-2:3"、"約3:16;羅5:8;8:28"
+        fuzzy: 書卷名稱無法辨識時以 fuzzy_search 的第一個結果代替
+
+    Returns:
+        依出現順序的 VerseSpan
+
+    Raises:
+        BookNotFoundError: 找不到書卷
+        InvalidParameterError: 引用格式錯誤
+    """
+    match = _SIMPLE.fullmatch(text)
+    if match:
+        name, chapter, start, end = match.groups()
+        book = BookNameConverter.resolve(name)
+        chapter, start = int(chapter), int(start)
+        end = int(end) if end else start
+        if book is not None and 0 < chapter and 0 < start <= end:
+            return (VerseSpan(book.id, chapter, start, end),)
+    # 其他形式與錯誤訊息由完整的解析器處理
+    return _Parser(text, fuzzy).parse()
+
+
+def verse_spans(book_id: int, chapter: int, spec: str) -> Tuple[VerseSpan, ...]:
+    """
+    解析指定章的節數字串 (如 "16"、"1-5"、"1,3,5")
+
+    Raises:
+        InvalidParameterError: 節數格式錯誤
+    """
+    try:
+        parser = _Parser(str(spec))
+        parser.book_id = book_id
+        parser.verses(chapter)
+    except InvalidParameterError:
+        raise InvalidParameterError("verse", spec, "無效的節數") from None
+    if parser.pos != len(parser.tokens):
+        raise InvalidParameterError("verse", spec, "無效的節數")
+    return tuple(parser.spans)
+
+
+def chapter_fetches(spans: Tuple[VerseSpan, ...]) -> Dict[Tuple[int, int], List[VerseSpan]]:
+    """將經文段落依 (書卷, 章) 分組，依第一次出現的順序；每組只需查詢一次整章"""
+    chapters: Dict[Tuple[int, int], List[VerseSpan]] = {}
+    for span in spans:
+        chapters.setdefault((span.book_id, span.chapter), []).append(span)
+    return chapters
+
+
+def verse_spec(spans: List[VerseSpan]) -> Optional[str]:
+    """
+    同一章的經文段落轉為 API 的節數字串 (如 "16,18-20")
+
+    Returns:
+        節數字串；包含整章或到章末的段落時返回 None (需查詢整章)
+    """
+    parts = []
+    for span in spans:
+        if span.start is None or span.end is None:
+            return None
+        parts.append(str(span.start) if span.start == span.end else f"{span.start}-{span.end}")
+    return ",".join(parts)
@@ -0,0 +1,293 @@
+"""
+Strong's Number Concordance for FHL Bible MCP Server
+
+預先計算的 Strong's 原文編號經文彙編：每個 G/H 編號對應到
+出現的經節與字詞位置，讓出現次數、書卷分布與出現位置列表
+不需要呼叫 se.php。
+
+資料來源 (離線建立)：
+- "tagged": qb.php 的 Strong's 標記經文 (strong=1)，每章一個請求；
+  字詞位置為該節中第幾個 Strong's 標記
+- "qp":     qp.php 逐節原文分析，字詞位置為 wid；需要先有版本快照來列出所有經節
+
+檔案 (<corpus directory>/)：
+- concordance.json: 編號 → [起始位置, 筆數] 的對照表 (查詢為 O(1) 字典查找)
+- concordance.u32:  (經節鍵, 字詞位置) 配對，依編號、經節、位置排序 (uint32 陣列，mmap)
+"""
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .corpus import CorpusSnapshot, make_verse_key, split_verse_key
+
+logger = logging.getLogger(__name__)
+
+
+CONCORDANCE_FORMAT = 1
+CONCORDANCE_HEADER = "concordance.json"
+CONCORDANCE_DATA = "concordance.u32"
+
+# FHL Strong's 標記經文中的編號，如 <WG2316>、<WH430>
+STRONGS_TAG = re.compile(r"<W([GH])0*(\d+)[a-zA-Z]?>")
+
+
+def strongs_key(number: int, testament: str) -> str:
+    """
+    產生編號鍵
+
+    Args:
+        number: Strong's 編號
+        testament: "G"/"NT" (希臘文) 或 "H"/"OT" (希伯來文)
+
+    Returns:
+        如 "G26"、"H430"
+    """
+    prefix = "H" if testament.upper() in ("H", "OT") else "G"
+    return f"{prefix}{int(number)}"
+
+
+def parse_strongs_tags(text: str) -> List[str]:
+    """取出經文中依序出現的 Strong's 編號鍵"""
+    return [f"{prefix}{int(number)}" for prefix, number in STRONGS_TAG.findall(text)]
+
+
+def write_concordance(
+    directory: Path,
+    entries: Iterable[Tuple[str, int, int]],
+    source: str,
+    version: str = ""
+) -> Dict[str, int]:
+    """
+    寫入經文彙編
+
+    Args:
+        directory: 輸出目錄
+        entries: (編號鍵, 經節鍵, 字詞位置)
+        source: 資料來源 ("tagged" 或 "qp")
+        version: 標記經文的版本代碼
+
+    Returns:
+        統計字典 {"numbers", "occurrences"}
+    """
+    rows = sorted(set(entries))
+
+    pairs = array("I")
+    numbers: Dict[str, List[int]] = {}
+    for key, verse_key, position in rows:
+        span = numbers.setdefault(key, [len(pairs) // 2, 0])
+        span[1] += 1
+        pairs.append(verse_key)
+        pairs.append(position)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp_data = directory / (CONCORDANCE_DATA + ".tmp")
+    tmp_header = directory / (CONCORDANCE_HEADER + ".tmp")
+
+    with open(tmp_data, "wb") as f:
+        pairs.tofile(f)
+    with open(tmp_header, "w", encoding="utf-8") as f:
+        json.dump({
+            "format": CONCORDANCE_FORMAT,
+            "byteorder": sys.byteorder,
+            "source": source,
+            "version": version,
+            "numbers": numbers,
+        }, f, separators=(",", ":"))
+
+    os.replace(tmp_data, directory / CONCORDANCE_DATA)
+    os.replace(tmp_header, directory / CONCORDANCE_HEADER)
+
+    return {"numbers": len(numbers), "occurrences": len(rows)}
+
+
+class Concordance:
+    """
+    Strong's 經文彙編 (唯讀)
+
+    編號對照表常駐記憶體，(經節鍵, 位置) 配對以 mmap 讀取。
+    """
+
+    def __init__(self, directory: Path):
+        """
+        開啟經文彙編
+
+        Raises:
+            ValueError: 檔案格式不符
+        """
+        with open(directory / CONCORDANCE_HEADER, "r", encoding="utf-8") as f:
+            header = json.load(f)
+
+        if header.get("format") != CONCORDANCE_FORMAT:
+            raise ValueError(f"Unsupported concordance format in {directory}")
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Concordance in {directory} was built with a different byte order")
+
+        self.source: str = header.get("source", "")
+        self.version: str = header.get("version", "")
+        self.numbers: Dict[str, List[int]] = header["numbers"]
+
+        self._file = open(directory / CONCORDANCE_DATA, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.pairs = memoryview(self._map).cast("I")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.numbers
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def occurrences(self, key: str) -> List[Tuple[int, int]]:
+        """
+        取得編號的所有出現位置
+
+        Returns:
+            [(經節鍵, 字詞位置), ...]，依經節順序
+        """
+        span = self.numbers.get(key)
+        if span is None:
+            return []
+        start, count = span
+        flat = self.pairs[start * 2:(start + count) * 2]
+        return list(zip(flat[0::2], flat[1::2]))
+
+    def count(self, key: str) -> int:
+        """出現次數 (字詞數)"""
+        span = self.numbers.get(key)
+        return span[1] if span else 0
+
+    def verses(
+        self,
+        key: str,
+        start_bid: int = 1,
+        end_bid: int = 66
+    ) -> List[Tuple[int, List[int]]]:
+        """
+        取得出現的經節 (同一節多次出現合併)
+
+        Returns:
+            [(經節鍵, [字詞位置, ...]), ...]
+        """
+        low = make_verse_key(start_bid, 0, 0)
+        high = make_verse_key(end_bid + 1, 0, 0)
+
+        grouped: List[Tuple[int, List[int]]] = []
+        for verse_key, position in self.occurrences(key):
+            if not low <= verse_key < high:
+                continue
+            if grouped and grouped[-1][0] == verse_key:
+                grouped[-1][1].append(position)
+            else:
+                grouped.append((verse_key, [position]))
+        return grouped
+
+    def distribution(self, key: str) -> Dict[int, int]:
+        """各書卷出現次數 {書卷編號: 字詞數}"""
+        books: Dict[int, int] = {}
+        for verse_key, _ in self.occurrences(key):
+            bid = split_verse_key(verse_key)[0]
+            books[bid] = books.get(bid, 0) + 1
+        return books
+
+    def close(self) -> None:
+        """釋放 mmap 與檔案"""
+        self.pairs.release()
+        self._map.close()
+        self._file.close()
+
+
+async def build_concordance(
+    client: Any,
+    directory: str,
+    source: str = "tagged",
+    version: str = "unv",
+    book_ids: Optional[List[int]] = None,
+    concurrency: int = 4,
+    max_chapters: int = 150
+) -> Dict[str, Any]:
+    """
+    從 FHL API 建立 Strong's 經文彙編
+
+    Args:
+        client: 具有 _make_request(endpoint, params) 的 API client
+        directory: 輸出目錄 (通常為 corpus.directory)
+        source: "tagged" (qb.php strong=1) 或 "qp" (qp.php 逐節分析)
+        version: 標記經文 / 列出經節所用的版本
+        book_ids: 要處理的書卷編號 (預設 1-66)
+        concurrency: 同時處理的書卷數
+        max_chapters: 每卷書最多章數 (安全上限)
+
+    Returns:
+        統計字典 {"source", "numbers", "occurrences", "path"}
+
+    Raises:
+        ValueError: 未知的來源，或 source="qp" 但沒有版本快照
+    """
+    if source not in ("tagged", "qp"):
+        raise ValueError(f"Unknown concordance source: {source}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    entries: List[Tuple[str, int, int]] = []
+    books = list(book_ids or range(1, 67))
+
+    async def tagged_book(bid: int) -> None:
+        async with semaphore:
+            for chap in range(1, max_chapters + 1):
+                data = await client._make_request(
+                    "qb.php",
+                    {"bid": bid, "chap": chap, "version": version, "strong": 1}
+                )
+                records = data.get("record") or []
+                if not records:
+                    break
+                for record in records:
+                    verse_key = make_verse_key(bid, int(record["chap"]), int(record["sec"]))
+                    for position, key in enumerate(
+                        parse_strongs_tags(record.get("bible_text", "")), start=1
+                    ):
+                        entries.append((key, verse_key, position))
+
+    snapshot: Optional[CorpusSnapshot] = None
+    if source == "qp":
+        path = Path(directory) / version
+        if not (path / "meta.json").exists():
+            raise ValueError(
+                f"source='qp' needs a '{version}' snapshot to enumerate verses "
+                f"(run: python -m fhl_bible_mcp snapshot {version})"
+            )
+        snapshot = CorpusSnapshot(path)
+
+    async def qp_book(bid: int) -> None:
+        assert snapshot is not None
+        start, end = snapshot.book_range(bid, bid)
+        async with semaphore:
+            for index in range(start, end):
+                verse_key = snapshot.keys[index]
+                _, chap, sec = split_verse_key(verse_key)
+                data = await client._make_request("qp.php", {"bid": bid, "chap": chap, "sec": sec})
+                prefix = "H" if data.get("N") == 1 else "G"
+                for record in data.get("record") or []:
+                    sn = str(record.get("sn") or "").strip()
+                    if record.get("wid", 0) > 0 and sn.isdigit():
+                        entries.append((f"{prefix}{int(sn)}", verse_key, int(record["wid"])))
+
+    try:
+        worker = tagged_book if source == "tagged" else qp_book
+        await asyncio.gather(*(worker(bid) for bid in books))
+    finally:
+        if snapshot is not None:
+            snapshot.close()
+
+    stats = write_concordance(Path(directory), entries, source=source, version=version)
+    logger.info(
+        f"Concordance written: {stats['numbers']} numbers, "
+        f"{stats['occurrences']} occurrences ({source}) -> {directory}"
+    )
+    return {"source": source, **stats, "path": str(Path(directory) / CONCORDANCE_HEADER)}
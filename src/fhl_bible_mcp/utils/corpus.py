@@ -0,0 +1,817 @@
+"""
+Offline Bible Corpus Snapshot for FHL Bible MCP Server
+
+經文內容不會變動，因此可以把整本聖經版本一次下載到本地，
+之後查詢經文直接從本地快照回答，不需要網路。
+
+每個版本一個目錄 (<directory>/<version>/)：
+- meta.json:   版本資訊 (v_name, proc) 與書卷名稱 (engs, chineses)
+- keys.u32:    排序後的經節鍵 bid * 1_000_000 + chap * 1_000 + sec (uint32 陣列)
+- offsets.u32: 每節經文在 text.bin 中的起始位置，共 N + 1 個 (uint32 陣列)
+- text.bin:    所有經文的 UTF-8 文字
+
+- search.idx:  關鍵字搜尋用的倒排索引 (見 utils.search_index)
+
+keys.u32 / offsets.u32 / text.bin 以 mmap 開啟，查詢時以二分搜尋定位章節，
+只解碼需要的經文。
+"""
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import shutil
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .search_index import INDEX_FILENAME, SearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_FORMAT = 1
+
+_BOOK_FACTOR = 1_000_000
+_CHAPTER_FACTOR = 1_000
+
+
+def make_verse_key(bid: int, chap: int, sec: int) -> int:
+    """產生經節鍵 (可排序的整數)"""
+    return bid * _BOOK_FACTOR + chap * _CHAPTER_FACTOR + sec
+
+
+def split_verse_key(key: int) -> Tuple[int, int, int]:
+    """將經節鍵拆回 (bid, chap, sec)"""
+    bid, rest = divmod(key, _BOOK_FACTOR)
+    chap, sec = divmod(rest, _CHAPTER_FACTOR)
+    return bid, chap, sec
+
+
+def parse_verse_spec(spec: str) -> Optional[Set[int]]:
+    """
+    解析節數字串
+
+    Args:
+        spec: 節數，支援 "1", "1-5", "1,3,5", "1-2,5,8-10"
+
+    Returns:
+        節數集合，格式無法解析時返回 None
+    """
+    verses: Set[int] = set()
+
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            return None
+
+        if "-" in part:
+            start, _, end = part.partition("-")
+            if not (start.isdigit() and end.isdigit()):
+                return None
+            first, last = int(start), int(end)
+            if first > last:
+                return None
+            verses.update(range(first, last + 1))
+        elif part.isdigit():
+            verses.add(int(part))
+        else:
+            return None
+
+    return verses
+
+
+def _navigation_of(record: Dict[str, Any]) -> Dict[str, Any]:
+    """由經文記錄建立 prev / next 導航資訊"""
+    return {
+        "chineses": record.get("chineses", ""),
+        "engs": record.get("engs", ""),
+        "chap": record.get("chap"),
+        "sec": record.get("sec"),
+    }
+
+
+def slice_chapter(chapter: Dict[str, Any], wanted: Set[int]) -> Dict[str, Any]:
+    """
+    從整章的 qb.php 回應切出指定的節
+
+    prev / next 重新計算：同一章內取前後一節，切到章首或章尾時沿用整章回應的
+    prev / next (前後章)。不修改傳入的 (可能是快取共用的) 物件。
+
+    Args:
+        chapter: 整章的 qb.php 回應
+        wanted: 節數集合 (見 parse_verse_spec)
+
+    Returns:
+        與直接以 sec 查詢 qb.php 相同格式的回應
+    """
+    records = chapter.get("record") or []
+    indices = [i for i, record in enumerate(records) if int(record.get("sec", 0)) in wanted]
+
+    result = {key: value for key, value in chapter.items() if key not in ("prev", "next")}
+    result["record"] = [records[i] for i in indices]
+    result["record_count"] = len(indices)
+
+    if not indices:
+        return result
+
+    first, last = indices[0], indices[-1]
+    prev_nav = _navigation_of(records[first - 1]) if first > 0 else chapter.get("prev")
+    next_nav = _navigation_of(records[last + 1]) if last + 1 < len(records) else chapter.get("next")
+    if prev_nav:
+        result["prev"] = prev_nav
+    if next_nav:
+        result["next"] = next_nav
+
+    return result
+
+
+class CorpusSnapshot:
+    """
+    單一版本的本地經文快照
+
+    以 mmap 讀取經節鍵、位移與文字；回傳的資料格式與 qb.php 相同。
+    """
+
+    def __init__(self, path: Path):
+        """
+        開啟快照
+
+        Args:
+            path: 版本快照目錄
+
+        Raises:
+            ValueError: 快照格式不符
+        """
+        self.path = path
+
+        with open(path / "meta.json", "r", encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+
+        if self.meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format in {path}")
+        if self.meta.get("byteorder") != sys.byteorder:
+            raise ValueError(f"Snapshot {path} was built with a different byte order")
+
+        self.version: str = self.meta["version"]
+        self.books: Dict[int, Dict[str, str]] = {
+            int(bid): names for bid, names in self.meta["books"].items()
+        }
+
+        self._files = []
+        self._maps: List[mmap.mmap] = []
+        self.keys = self._map_array(path / "keys.u32")
+        self.offsets = self._map_array(path / "offsets.u32")
+        self.text = self._map(path / "text.bin")
+
+        if len(self.offsets) != len(self.keys) + 1:
+            self.close()
+            raise ValueError(f"Corrupted snapshot in {path}: offsets/keys length mismatch")
+
+    def _map(self, file_path: Path) -> mmap.mmap:
+        """以唯讀方式 mmap 檔案"""
+        f = open(file_path, "rb")
+        self._files.append(f)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def _map_array(self, file_path: Path) -> memoryview:
+        """mmap uint32 陣列檔案"""
+        return memoryview(self._map(file_path)).cast("I")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _record(self, index: int) -> Dict[str, Any]:
+        """建立 qb.php 格式的經文記錄"""
+        bid, chap, sec = split_verse_key(self.keys[index])
+        names = self.books.get(bid, {})
+        return {
+            "bid": bid,
+            "engs": names.get("engs", ""),
+            "chineses": names.get("chineses", ""),
+            "chap": chap,
+            "sec": sec,
+            "bible_text": self.text_at(index),
+        }
+
+    def text_at(self, index: int) -> str:
+        """取得第 index 節 (經節序號) 的經文"""
+        return self.text[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def _navigation(self, index: int) -> Optional[Dict[str, Any]]:
+        """建立 prev / next 導航資訊"""
+        if index < 0 or index >= len(self.keys):
+            return None
+        bid, chap, sec = split_verse_key(self.keys[index])
+        names = self.books.get(bid, {})
+        return {
+            "chineses": names.get("chineses", ""),
+            "engs": names.get("engs", ""),
+            "chap": chap,
+            "sec": sec,
+        }
+
+    def _chapter_start(self, index: int) -> int:
+        """取得 index 所在章的第一節位置"""
+        bid, chap, _ = split_verse_key(self.keys[index])
+        return bisect_left(self.keys, make_verse_key(bid, chap, 0))
+
+    def chapter_range(self, bid: int, chap: int) -> Tuple[int, int]:
+        """
+        取得章節在陣列中的範圍
+
+        Returns:
+            (start, end)，該章不存在時 start == end
+        """
+        start = bisect_left(self.keys, make_verse_key(bid, chap, 0))
+        end = bisect_left(self.keys, make_verse_key(bid, chap + 1, 0), start)
+        return start, end
+
+    def index_of(self, verse_key: int) -> Optional[int]:
+        """取得經節鍵對應的經節序號，不存在時返回 None"""
+        index = bisect_left(self.keys, verse_key)
+        if index < len(self.keys) and self.keys[index] == verse_key:
+            return index
+        return None
+
+    def book_range(self, start_bid: int, end_bid: int) -> Tuple[int, int]:
+        """取得書卷範圍 (含 end_bid) 在陣列中的範圍"""
+        start = bisect_left(self.keys, make_verse_key(start_bid, 0, 0))
+        end = bisect_left(self.keys, make_verse_key(end_bid + 1, 0, 0), start)
+        return start, end
+
+    def get_verse(
+        self,
+        bid: int,
+        chap: int,
+        verse: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        查詢經文
+
+        Args:
+            bid: 書卷編號
+            chap: 章
+            verse: 節數字串（None 表示整章）
+
+        Returns:
+            qb.php 格式的回應；章節不在快照中或節數無法解析時返回 None
+        """
+        start, end = self.chapter_range(bid, chap)
+        if start == end:
+            return None
+
+        if verse is None:
+            indices = list(range(start, end))
+        else:
+            wanted = parse_verse_spec(verse)
+            if wanted is None:
+                return None
+            indices = [
+                i for i in range(start, end)
+                if split_verse_key(self.keys[i])[2] in wanted
+            ]
+
+        result: Dict[str, Any] = {
+            "status": "success",
+            "record_count": len(indices),
+            "v_name": self.meta.get("v_name", ""),
+            "version": self.version,
+            "proc": self.meta.get("proc", 0),
+            "record": [self._record(i) for i in indices],
+        }
+
+        if verse is None:
+            # 整章：前後章的第一節
+            prev_index = self._chapter_start(start - 1) if start > 0 else -1
+            next_index = end
+        elif indices:
+            prev_index = indices[0] - 1
+            next_index = indices[-1] + 1
+        else:
+            prev_index = next_index = -1
+
+        prev_nav = self._navigation(prev_index)
+        next_nav = self._navigation(next_index)
+        if prev_nav:
+            result["prev"] = prev_nav
+        if next_nav:
+            result["next"] = next_nav
+
+        return result
+
+    def close(self) -> None:
+        """釋放 mmap 與檔案"""
+        for view in (getattr(self, "keys", None), getattr(self, "offsets", None)):
+            if view is not None:
+                view.release()
+        for mapped in self._maps:
+            mapped.close()
+        for f in self._files:
+            f.close()
+        self._maps.clear()
+        self._files.clear()
+
+
+def write_snapshot(
+    path: Path,
+    version: str,
+    v_name: str,
+    proc: int,
+    books: Dict[int, Dict[str, str]],
+    verses: List[Tuple[int, int, int, str]]
+) -> int:
+    """
+    寫入版本快照（先寫到暫存目錄再替換，避免讀到一半的快照）
+
+    Args:
+        path: 版本快照目錄
+        version: 版本代碼
+        v_name: 版本名稱
+        proc: 特殊字型需求
+        books: {bid: {"engs": ..., "chineses": ...}}
+        verses: [(bid, chap, sec, text), ...]
+
+    Returns:
+        寫入的經節數量
+
+    Raises:
+        ValueError: 沒有任何經文
+    """
+    rows = sorted(
+        {make_verse_key(bid, chap, sec): text for bid, chap, sec, text in verses}.items()
+    )
+    if not rows:
+        raise ValueError(f"No verses to write for version '{version}'")
+
+    keys = array("I")
+    offsets = array("I", [0])
+    blob = bytearray()
+    for key, text in rows:
+        keys.append(key)
+        blob.extend(text.encode("utf-8"))
+        offsets.append(len(blob))
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+
+    with open(tmp_path / "keys.u32", "wb") as f:
+        keys.tofile(f)
+    with open(tmp_path / "offsets.u32", "wb") as f:
+        offsets.tofile(f)
+    with open(tmp_path / "text.bin", "wb") as f:
+        f.write(blob)
+    with open(tmp_path / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "format": SNAPSHOT_FORMAT,
+            "byteorder": sys.byteorder,
+            "version": version,
+            "v_name": v_name,
+            "proc": proc,
+            "verse_count": len(keys),
+            "books": {str(bid): names for bid, names in sorted(books.items())},
+        }, f, ensure_ascii=False, indent=2)
+
+    if path.exists():
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+    return len(keys)
+
+
+async def build_snapshot(
+    client: Any,
+    version: str,
+    directory: str,
+    book_ids: Optional[List[int]] = None,
+    concurrency: int = 4,
+    max_chapters: int = 150
+) -> Dict[str, Any]:
+    """
+    從 qb.php 下載整個版本並寫成本地快照
+
+    每卷書依序下載各章，直到沒有經文為止；多卷書以 concurrency 並行。
+
+    Args:
+        client: 具有 _make_request(endpoint, params) 的 API client
+        version: 版本代碼（如 "unv", "kjv"）
+        directory: 快照根目錄
+        book_ids: 要下載的書卷編號（預設 1-66）
+        concurrency: 同時下載的書卷數
+        max_chapters: 每卷書最多章數（安全上限）
+
+    Returns:
+        統計字典 {"version", "books", "chapters", "verses", "path"}
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    meta: Dict[str, Any] = {"v_name": "", "proc": 0}
+    books: Dict[int, Dict[str, str]] = {}
+    verses: List[Tuple[int, int, int, str]] = []
+    chapter_count = 0
+
+    async def fetch_book(bid: int) -> None:
+        nonlocal chapter_count
+        async with semaphore:
+            for chap in range(1, max_chapters + 1):
+                data = await client._make_request(
+                    "qb.php",
+                    {"bid": bid, "chap": chap, "version": version, "strong": 0}
+                )
+                records = data.get("record") or []
+                if not records:
+                    break
+
+                meta["v_name"] = data.get("v_name") or meta["v_name"]
+                meta["proc"] = data.get("proc", meta["proc"])
+                chapter_count += 1
+
+                for record in records:
+                    books.setdefault(bid, {
+                        "engs": record.get("engs", ""),
+                        "chineses": record.get("chineses", ""),
+                    })
+                    verses.append((
+                        bid,
+                        int(record["chap"]),
+                        int(record["sec"]),
+                        record.get("bible_text", ""),
+                    ))
+
+                # 下一章已經在另一卷書，不必再試
+                next_info = data.get("next") or {}
+                if next_info and next_info.get("engs") != records[0].get("engs"):
+                    break
+
+            logger.info(f"Snapshot {version}: book {bid} done")
+
+    await asyncio.gather(*(fetch_book(bid) for bid in (book_ids or range(1, 67))))
+
+    path = Path(directory) / version
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = write_snapshot(path, version, meta["v_name"], meta["proc"], books, verses)
+    build_search_index(path)
+
+    logger.info(f"Snapshot {version} written: {count} verses in {chapter_count} chapters -> {path}")
+    return {
+        "version": version,
+        "books": len(books),
+        "chapters": chapter_count,
+        "verses": count,
+        "path": str(path),
+    }
+
+
+def build_search_index(path: Path) -> SearchIndex:
+    """
+    為版本快照建立搜尋索引並寫入 search.idx
+
+    Args:
+        path: 版本快照目錄
+
+    Returns:
+        SearchIndex 實例
+    """
+    snapshot = CorpusSnapshot(path)
+    try:
+        index = SearchIndex.build(snapshot.text_at(i) for i in range(len(snapshot)))
+    finally:
+        snapshot.close()
+
+    index.save(path / INDEX_FILENAME)
+    logger.info(f"Search index written: {len(index)} terms -> {path / INDEX_FILENAME}")
+    return index
+
+
+class LocalCorpus:
+    """
+    本地快照集合
+
+    版本快照在第一次查詢時開啟；沒有快照的版本返回 None，
+    由呼叫端改用上游 API。
+    """
+
+    def __init__(self, directory: str = ".corpus"):
+        """
+        初始化本地快照集合
+
+        Args:
+            directory: 快照根目錄
+        """
+        self.directory = Path(directory)
+        self._snapshots: Dict[str, CorpusSnapshot] = {}
+        self._indexes: Dict[str, SearchIndex] = {}
+        self._concordance: Optional[Any] = None
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get_snapshot(self, version: str) -> Optional[CorpusSnapshot]:
+        """取得版本快照（尚未開啟時開啟）"""
+        snapshot = self._snapshots.get(version)
+        if snapshot is not None:
+            return snapshot
+
+        path = self.directory / version
+        if not (path / "meta.json").exists():
+            return None
+
+        try:
+            snapshot = CorpusSnapshot(path)
+        except Exception as e:
+            logger.error(f"Error opening corpus snapshot {path}: {e}")
+            return None
+
+        self._snapshots[version] = snapshot
+        logger.info(f"Corpus snapshot loaded: {version} ({len(snapshot)} verses)")
+        return snapshot
+
+    def has_version(self, version: str) -> bool:
+        """檢查版本是否有本地快照"""
+        return self.get_snapshot(version) is not None
+
+    def list_versions(self) -> List[str]:
+        """列出目錄中所有的版本快照"""
+        if not self.directory.exists():
+            return []
+        return sorted(
+            p.name for p in self.directory.iterdir()
+            if (p / "meta.json").exists()
+        )
+
+    def get_verse(
+        self,
+        version: str,
+        bid: int,
+        chap: int,
+        verse: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        從本地快照查詢經文
+
+        Returns:
+            qb.php 格式的回應；版本或章節不在快照中時返回 None
+        """
+        snapshot = self.get_snapshot(version)
+        result = snapshot.get_verse(bid, chap, verse) if snapshot is not None else None
+
+        if result is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return result
+
+    def get_index(self, version: str) -> Optional[SearchIndex]:
+        """
+        取得版本的搜尋索引
+
+        優先讀取 search.idx；舊的快照沒有索引檔時即時建立並寫回。
+        """
+        index = self._indexes.get(version)
+        if index is not None:
+            return index
+
+        snapshot = self.get_snapshot(version)
+        if snapshot is None:
+            return None
+
+        index_path = snapshot.path / INDEX_FILENAME
+        try:
+            if index_path.exists():
+                index = SearchIndex.load(index_path)
+            else:
+                index = build_search_index(snapshot.path)
+        except Exception as e:
+            logger.error(f"Error loading search index for {version}: {e}")
+            return None
+
+        self._indexes[version] = index
+        return index
+
+    def search(
+        self,
+        version: str,
+        query: str,
+        start_bid: int = 1,
+        end_bid: int = 66,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        count_only: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        以本地索引搜尋關鍵字
+
+        以空白分隔的多個關鍵字須同時出現 (不分大小寫)。
+
+        Args:
+            version: 版本代碼
+            query: 關鍵字
+            start_bid: 起始書卷編號
+            end_bid: 結束書卷編號 (含)
+            limit: 最多返回筆數 (None 表示全部)
+            offset: 跳過筆數
+            count_only: 只返回筆數
+
+        Returns:
+            se.php 格式的回應；版本沒有快照或查詢無法使用索引時返回 None
+        """
+        index = self.get_index(version)
+        if index is None:
+            return None
+
+        candidates = index.candidates(query)
+        if candidates is None:
+            return None
+
+        snapshot = self._snapshots[version]
+        low, high = snapshot.book_range(start_bid, end_bid)
+        parts = [part.lower() for part in query.split()]
+
+        matches = [
+            ordinal for ordinal in candidates
+            if low <= ordinal < high
+            and all(part in snapshot.text_at(ordinal).lower() for part in parts)
+        ]
+        self.stats["hits"] += 1
+
+        result: Dict[str, Any] = {
+            "status": "success",
+            "record_count": len(matches),
+            "orig": 0,
+            "key": query,
+            "record": [],
+        }
+        if count_only:
+            return result
+
+        window = matches[offset:offset + limit] if limit is not None else matches[offset:]
+        for position, ordinal in enumerate(window, start=offset + 1):
+            result["record"].append({"id": position, **snapshot._record(ordinal)})
+
+        return result
+
+    def get_concordance(self) -> Optional[Any]:
+        """
+        取得 Strong's 經文彙編 (utils.concordance.Concordance)
+
+        Returns:
+            Concordance 實例，尚未建立 (python -m fhl_bible_mcp concordance) 時返回 None
+        """
+        if self._concordance is not None:
+            return self._concordance
+
+        from .concordance import CONCORDANCE_HEADER, Concordance
+
+        if not (self.directory / CONCORDANCE_HEADER).exists():
+            return None
+
+        try:
+            self._concordance = Concordance(self.directory)
+        except Exception as e:
+            logger.error(f"Error opening concordance in {self.directory}: {e}")
+            return None
+
+        logger.info(f"Concordance loaded: {len(self._concordance)} Strong's numbers")
+        return self._concordance
+
+    def search_strongs(
+        self,
+        version: str,
+        key: str,
+        start_bid: int = 1,
+        end_bid: int = 66,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        count_only: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        以經文彙編搜尋 Strong's 編號
+
+        Args:
+            version: 經文版本代碼 (用於取得經文)
+            key: 編號鍵，如 "G26"、"H430"
+            start_bid: 起始書卷編號
+            end_bid: 結束書卷編號 (含)
+            limit: 最多返回筆數 (None 表示全部)
+            offset: 跳過筆數
+            count_only: 只返回筆數
+
+        Returns:
+            se.php 格式的回應 (每筆另含 positions 字詞位置)；
+            沒有經文彙編或版本快照時返回 None
+        """
+        concordance = self.get_concordance()
+        snapshot = self.get_snapshot(version)
+        if concordance is None or snapshot is None:
+            return None
+
+        verses = concordance.verses(key, start_bid, end_bid)
+        self.stats["hits"] += 1
+
+        result: Dict[str, Any] = {
+            "status": "success",
+            "record_count": len(verses),
+            "orig": 2 if key.startswith("H") else 1,
+            "key": key[1:],
+            "record": [],
+        }
+        if count_only:
+            return result
+
+        window = verses[offset:offset + limit] if limit is not None else verses[offset:]
+        for position, (verse_key, word_positions) in enumerate(window, start=offset + 1):
+            index = snapshot.index_of(verse_key)
+            if index is None:
+                continue
+            result["record"].append({
+                "id": position,
+                **snapshot._record(index),
+                "positions": word_positions,
+            })
+
+        return result
+
+    def strongs_distribution(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        取得 Strong's 編號的出現統計
+
+        Returns:
+            {"strongs", "occurrence_count", "verse_count", "books"}；
+            沒有經文彙編時返回 None
+        """
+        concordance = self.get_concordance()
+        if concordance is None:
+            return None
+
+        from .booknames import BookNameConverter
+
+        books = []
+        for bid, count in sorted(concordance.distribution(key).items()):
+            info = BookNameConverter.get_book_info(bid) or {}
+            books.append({
+                "book_id": bid,
+                "book": info.get("chi_short", ""),
+                "book_eng": info.get("eng_short", ""),
+                "count": count,
+            })
+
+        return {
+            "strongs": key,
+            "occurrence_count": concordance.count(key),
+            "verse_count": len(concordance.verses(key)),
+            "books": books,
+        }
+
+    def get_info(self) -> Dict[str, Any]:
+        """取得本地快照資訊"""
+        return {
+            "directory": str(self.directory.absolute()),
+            "versions": self.list_versions(),
+            "loaded": sorted(self._snapshots),
+            "indexed": sorted(self._indexes),
+            "concordance": self._concordance is not None,
+            "stats": dict(self.stats),
+        }
+
+    def close(self) -> None:
+        """關閉所有已開啟的快照"""
+        for snapshot in self._snapshots.values():
+            snapshot.close()
+        self._snapshots.clear()
+        self._indexes.clear()
+        if self._concordance is not None:
+            self._concordance.close()
+            self._concordance = None
+
+
+# 全域快照實例
+_global_corpus: Optional[LocalCorpus] = None
+
+
+def get_corpus(directory: str = ".corpus") -> LocalCorpus:
+    """
+    取得全域本地快照實例
+
+    Args:
+        directory: 快照根目錄
+
+    Returns:
+        LocalCorpus 實例
+    """
+    global _global_corpus
+
+    if _global_corpus is None:
+        _global_corpus = LocalCorpus(directory=directory)
+
+    return _global_corpus
+
+
+def reset_corpus() -> None:
+    """重置全域快照實例（主要用於測試）"""
+    global _global_corpus
+    if _global_corpus is not None:
+        _global_corpus.close()
+    _global_corpus = None
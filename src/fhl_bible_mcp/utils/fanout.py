@@ -0,0 +1,68 @@
+"""
+Parallel Fan-out Helper for Composite Tools
+
+組合型工具 (如 search_strongs_occurrences、get_audio_chapter_with_text)
+需要呼叫多個互不相依的上游請求。gather_legs 會並行執行各段 (leg)，
+記錄每段耗時，並在部分失敗時仍返回成功的結果。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict
+
+from .errors import InvalidParameterError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FanoutResult:
+    """並行執行的結果"""
+    results: Dict[str, Any] = field(default_factory=dict)      # 成功的 leg → 結果
+    errors: Dict[str, Exception] = field(default_factory=dict)  # 失敗的 leg → 例外
+    timings_ms: Dict[str, float] = field(default_factory=dict)  # 每個 leg 的耗時 (毫秒)
+
+    @property
+    def all_failed(self) -> bool:
+        """是否所有 leg 都失敗"""
+        return not self.results and bool(self.errors)
+
+    def error_messages(self) -> Dict[str, str]:
+        """失敗 leg 的錯誤訊息"""
+        return {name: str(error) or type(error).__name__ for name, error in self.errors.items()}
+
+
+async def gather_legs(**legs: Awaitable[Any]) -> FanoutResult:
+    """
+    並行執行多個獨立的 awaitable
+
+    Args:
+        **legs: leg 名稱 → awaitable
+
+    Returns:
+        FanoutResult；單一 leg 的上游失敗不影響其他 leg
+
+    Raises:
+        InvalidParameterError: 任一 leg 的參數錯誤 (呼叫端錯誤，不視為部分失敗)
+    """
+    outcome = FanoutResult()
+
+    async def timed(name: str, awaitable: Awaitable[Any]) -> None:
+        start = time.perf_counter()
+        try:
+            outcome.results[name] = await awaitable
+        except Exception as e:
+            outcome.errors[name] = e
+            logger.warning(f"Fan-out leg '{name}' failed: {e}")
+        finally:
+            outcome.timings_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    await asyncio.gather(*(timed(name, awaitable) for name, awaitable in legs.items()))
+
+    for error in outcome.errors.values():
+        if isinstance(error, InvalidParameterError):
+            raise error
+
+    return outcome
@@ -0,0 +1,191 @@
+"""
+Streaming JSON Parsing for FHL Bible MCP Server
+
+FHL API 的回應都是一個 JSON 物件，大量資料集中在其中一個陣列欄位
+(通常是 "record")：
+
+    {"status": "success", "record_count": 1234, "record": [{...}, {...}, ...]}
+
+RecordStream 是增量 (push) 解析器：依序餵入回應的位元組片段，
+每個陣列元素一完整就返回，不需要先緩衝整個回應；其他欄位收集在 meta。
+呼叫端拿到足夠的記錄後即可停止讀取回應。
+
+只使用標準函式庫 (json.JSONDecoder.raw_decode)，每個元素與欄位值仍由
+C 實作的 json 模組解析。
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List
+
+# JSON 允許的空白字元
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# 已消耗的緩衝區超過此長度時丟棄
+_COMPACT_AT = 64 * 1024
+
+_START, _KEY, _COLON, _VALUE, _ARRAY, _DONE = range(6)
+
+
+class RecordStream:
+    """
+    增量解析 ``{..., "<key>": [<record>, ...], ...}`` 形式的 JSON 回應
+
+    Example:
+        >>> stream = RecordStream("record")
+        >>> for chunk in chunks:
+        ...     for record in stream.feed(chunk):
+        ...         handle(record)
+        >>> stream.close()
+        >>> stream.meta["record_count"]
+    """
+
+    def __init__(self, key: str = "record"):
+        """
+        Args:
+            key: 逐筆返回的陣列欄位名稱
+        """
+        self.key = key
+        self.meta: Dict[str, Any] = {}
+        self.count = 0
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._field = ""
+        self._separated = True  # 下一個欄位 / 元素前不需要逗號
+        self._eof = False
+
+    @property
+    def done(self) -> bool:
+        """是否已解析到最外層物件結尾"""
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        餵入下一段位元組
+
+        Returns:
+            此段資料完成的陣列元素 (可能為空)
+
+        Raises:
+            json.JSONDecodeError: 資料不是預期的 JSON 物件
+        """
+        self._buffer += self._utf8.decode(chunk)
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """
+        標示資料結束，返回剩餘的元素
+
+        Raises:
+            json.JSONDecodeError: 資料不完整或格式錯誤
+        """
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._eof = True
+        records = self._parse()
+        if self._state != _DONE:
+            raise json.JSONDecodeError("Unexpected end of JSON data", self._buffer, len(self._buffer))
+        return records
+
+    def _skip(self) -> bool:
+        """跳過空白；返回緩衝區是否還有字元"""
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        return self._pos < len(self._buffer)
+
+    def _decode(self) -> tuple[bool, Any]:
+        """
+        解析目前位置的一個 JSON 值
+
+        Returns:
+            (是否完整, 值)；資料不足時返回 (False, None)
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return False, None
+        # 數字 / true / null 位於緩衝區結尾時可能還沒讀完
+        if end == len(self._buffer) and not self._eof:
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _separator(self, char: str) -> bool:
+        """處理欄位 / 元素之間的逗號；返回是否已消耗該字元"""
+        if char == ",":
+            if self._separated:
+                raise json.JSONDecodeError("Unexpected ','", self._buffer, self._pos)
+            self._pos += 1
+            self._separated = True
+            return True
+        if not self._separated:
+            raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos)
+        return False
+
+    def _expect(self, char: str) -> None:
+        if self._buffer[self._pos] != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _parse(self) -> List[Any]:
+        records: List[Any] = []
+
+        while self._state != _DONE and self._skip():
+            char = self._buffer[self._pos]
+
+            if self._state == _START:
+                self._expect("{")
+                self._state = _KEY
+
+            elif self._state == _KEY:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                elif not self._separator(char):
+                    complete, field = self._decode()
+                    if not complete:
+                        break
+                    if not isinstance(field, str):
+                        raise json.JSONDecodeError("Expecting property name", self._buffer, self._pos)
+                    self._field = field
+                    self._state = _COLON
+                    self._separated = True
+
+            elif self._state == _COLON:
+                self._expect(":")
+                self._state = _VALUE
+
+            elif self._state == _VALUE:
+                if self._field == self.key and char == "[":
+                    self._pos += 1
+                    self._state = _ARRAY
+                    self._separated = True
+                    continue
+                complete, value = self._decode()
+                if not complete:
+                    break
+                self.meta[self._field] = value
+                self._state = _KEY
+                self._separated = False
+
+            elif self._state == _ARRAY:
+                if char == "]":
+                    self._pos += 1
+                    self._state = _KEY
+                    self._separated = False
+                elif not self._separator(char):
+                    complete, record = self._decode()
+                    if not complete:
+                        break
+                    records.append(record)
+                    self.count += 1
+                    self._separated = False
+
+        if self._pos > _COMPACT_AT:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return records
@@ -0,0 +1,319 @@
+"""
+Runtime Metrics for FHL Bible MCP Server
+
+記錄工具呼叫與上游請求的延遲分布、狀態碼、重試次數與傳輸位元組數，
+並提供 info://metrics 資源與 Prometheus 文字格式輸出。
+
+呼叫端先檢查 ``metrics.enabled`` 再計時與記錄；停用時熱路徑只多一次
+屬性讀取。延遲以固定邊界的直方圖累積 (記憶體固定，不保留每筆樣本)，
+百分位數 (p50/p95/p99) 由直方圖內插估計。
+"""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 直方圖邊界 (秒)；最後一格為 +Inf
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+    0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+PERCENTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """固定邊界的延遲直方圖"""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """記錄一筆延遲 (秒)"""
+        index = 0
+        for bound in LATENCY_BUCKETS:
+            if seconds <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        估計百分位數 (秒)
+
+        在落點所在的格子內做線性內插，結果不超過觀測到的最大值。
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = LATENCY_BUCKETS[index - 1] if index > 0 else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else self.max
+                value = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(value, self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """次數、平均與百分位數 (毫秒)"""
+        summary: Dict[str, Any] = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+        for q in PERCENTILES:
+            summary[f"p{int(q * 100)}_ms"] = round(self.percentile(q) * 1000, 3)
+        return summary
+
+
+class Metrics:
+    """
+    執行期指標
+
+    - 每個工具 / 上游端點的延遲直方圖
+    - 上游 HTTP 狀態碼 (或 "timeout" / "network_error") 次數與重試次數
+    - 工具錯誤次數
+    - 傳輸位元組數 (上游收送、工具參數與回應)
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self.tool_latency: Dict[str, Histogram] = {}
+        self.tool_errors: Dict[str, int] = {}
+        self.upstream_latency: Dict[str, Histogram] = {}
+        self.upstream_status: Dict[str, Dict[str, int]] = {}
+        self.upstream_retries: Dict[str, int] = {}
+        self.bytes = {
+            "upstream_in": 0,   # 上游回應內容
+            "upstream_out": 0,  # 上游請求 URL
+            "tool_in": 0,       # 工具參數 (JSON)
+            "tool_out": 0,      # 工具回應文字
+        }
+
+    def observe_tool(
+        self,
+        name: str,
+        seconds: float,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        error: bool = False
+    ) -> None:
+        """記錄一次工具呼叫"""
+        if not self.enabled:
+            return
+        histogram = self.tool_latency.get(name)
+        if histogram is None:
+            histogram = self.tool_latency[name] = Histogram()
+        histogram.observe(seconds)
+        if error:
+            self.tool_errors[name] = self.tool_errors.get(name, 0) + 1
+        self.bytes["tool_in"] += bytes_in
+        self.bytes["tool_out"] += bytes_out
+
+    def observe_upstream(
+        self,
+        endpoint: str,
+        seconds: float,
+        status: Any,
+        bytes_in: int = 0,
+        bytes_out: int = 0
+    ) -> None:
+        """
+        記錄一次上游請求 (每次嘗試各記一筆)
+
+        Args:
+            endpoint: 端點，如 "qb.php"
+            seconds: 耗時
+            status: HTTP 狀態碼，或 "timeout" / "network_error"
+            bytes_in: 回應位元組數
+            bytes_out: 請求位元組數
+        """
+        if not self.enabled:
+            return
+        histogram = self.upstream_latency.get(endpoint)
+        if histogram is None:
+            histogram = self.upstream_latency[endpoint] = Histogram()
+        histogram.observe(seconds)
+        statuses = self.upstream_status.setdefault(endpoint, {})
+        key = str(status)
+        statuses[key] = statuses.get(key, 0) + 1
+        self.bytes["upstream_in"] += bytes_in
+        self.bytes["upstream_out"] += bytes_out
+
+    def count_retry(self, endpoint: str) -> None:
+        """記錄一次上游重試"""
+        if not self.enabled:
+            return
+        self.upstream_retries[endpoint] = self.upstream_retries.get(endpoint, 0) + 1
+
+    def reset(self) -> None:
+        """清除所有已記錄的指標"""
+        self.__init__(enabled=self.enabled)
+
+    def snapshot(
+        self,
+        cache: Any = None,
+        request_stats: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        取得指標快照 (info://metrics 的內容)
+
+        Args:
+            cache: FileCache 實例 (提供各快取層命中率)
+            request_stats: FHLAPIEndpoints.get_request_stats() 的結果
+
+        Returns:
+            指標字典
+        """
+        return {
+            "enabled": self.enabled,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "tools": {
+                name: {**histogram.summary(), "errors": self.tool_errors.get(name, 0)}
+                for name, histogram in sorted(self.tool_latency.items())
+            },
+            "upstream": {
+                endpoint: {
+                    **histogram.summary(),
+                    "status_codes": dict(sorted(self.upstream_status.get(endpoint, {}).items())),
+                    "retries": self.upstream_retries.get(endpoint, 0),
+                }
+                for endpoint, histogram in sorted(self.upstream_latency.items())
+            },
+            "requests": dict(request_stats or {}),
+            "cache": cache_tier_stats(cache),
+            "bytes": dict(self.bytes),
+        }
+
+    def render_prometheus(
+        self,
+        cache: Any = None,
+        request_stats: Optional[Dict[str, int]] = None
+    ) -> str:
+        """
+        以 Prometheus text exposition format 輸出指標
+
+        Args:
+            cache: FileCache 實例
+            request_stats: FHLAPIEndpoints.get_request_stats() 的結果
+
+        Returns:
+            Prometheus 文字格式
+        """
+        lines: List[str] = []
+
+        def histogram_lines(metric: str, label: str, histograms: Dict[str, Histogram]) -> None:
+            lines.append(f"# TYPE {metric} histogram")
+            for value, histogram in sorted(histograms.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{label}="{value}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum{{{label}="{value}"}} {histogram.total:.6f}')
+                lines.append(f'{metric}_count{{{label}="{value}"}} {histogram.count}')
+
+        histogram_lines("fhl_tool_duration_seconds", "tool", self.tool_latency)
+        lines.append("# TYPE fhl_tool_errors_total counter")
+        for name, count in sorted(self.tool_errors.items()):
+            lines.append(f'fhl_tool_errors_total{{tool="{name}"}} {count}')
+
+        histogram_lines("fhl_upstream_duration_seconds", "endpoint", self.upstream_latency)
+        lines.append("# TYPE fhl_upstream_responses_total counter")
+        for endpoint, statuses in sorted(self.upstream_status.items()):
+            for status, count in sorted(statuses.items()):
+                lines.append(
+                    f'fhl_upstream_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+        lines.append("# TYPE fhl_upstream_retries_total counter")
+        for endpoint, count in sorted(self.upstream_retries.items()):
+            lines.append(f'fhl_upstream_retries_total{{endpoint="{endpoint}"}} {count}')
+
+        if request_stats:
+            lines.append("# TYPE fhl_requests gauge")
+            for name, count in sorted(request_stats.items()):
+                lines.append(f'fhl_requests{{kind="{name}"}} {count}')
+
+        tiers = cache_tier_stats(cache)
+        if tiers:
+            lines.append("# TYPE fhl_cache_hits_total counter")
+            for tier, stats in tiers.items():
+                lines.append(f'fhl_cache_hits_total{{tier="{tier}"}} {stats["hits"]}')
+            lines.append("# TYPE fhl_cache_misses_total counter")
+            for tier, stats in tiers.items():
+                lines.append(f'fhl_cache_misses_total{{tier="{tier}"}} {stats["misses"]}')
+
+        lines.append("# TYPE fhl_bytes_total counter")
+        for direction, count in self.bytes.items():
+            lines.append(f'fhl_bytes_total{{direction="{direction}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+def cache_tier_stats(cache: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    各快取層的命中統計 (直接讀取計數器，不查詢持久層)
+
+    Returns:
+        {"all" | "memory" | "disk": {"hits", "misses", "hit_ratio"}}；沒有快取時為空字典
+    """
+    if cache is None:
+        return {}
+
+    tiers = {"all": cache.stats, "disk": cache.disk_stats}
+    if cache.memory is not None:
+        tiers["memory"] = cache.memory.stats
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for tier, stats in tiers.items():
+        hits, misses = stats["hits"], stats["misses"]
+        total = hits + misses
+        result[tier] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+        }
+    return result
+
+
+# 全域指標實例
+_global_metrics: Optional[Metrics] = None
+
+
+def get_metrics(enabled: Optional[bool] = None) -> Metrics:
+    """
+    取得全域指標實例
+
+    Args:
+        enabled: 指定時更新啟用狀態 (來自 config.metrics.enabled)
+
+    Returns:
+        Metrics 實例
+    """
+    global _global_metrics
+
+    if _global_metrics is None:
+        _global_metrics = Metrics(enabled=True if enabled is None else enabled)
+    elif enabled is not None:
+        _global_metrics.enabled = enabled
+
+    return _global_metrics
+
+
+def reset_metrics() -> None:
+    """重置全域指標實例（主要用於測試）"""
+    global _global_metrics
+    _global_metrics = None
@@ -0,0 +1,274 @@
+"""
+Tool Result Output for FHL Bible MCP Server
+
+工具結果的序列化方式 (config.output.mode)：
+
+- "pretty": 縮排 JSON (預設，與先前相同)
+- "compact": 無空白的 JSON，列表項目中重複的欄位名稱改用短鍵，
+  對照表放在 "_keys"
+- "table": 文字表格，主要列表 (最長的物件列表，例如 verses / results)
+  每列一筆、欄位以 tab 分隔，其餘欄位為 "key: value" 行
+
+config.output.max_bytes 為每次工具結果的位元組上限。超過時只返回主要列表
+的前幾筆，並在 "page" 附上 next_cursor；以相同工具、參數 {"cursor": ...}
+再次呼叫即取得下一頁 (結果由快取重新產生，伺服器不保存狀態)。
+
+搜尋工具另外以頂層的 next_cursor 提供下一批查詢結果 (參數中的 offset 前進)。
+兩者同時存在時 page.next_cursor 優先：主要列表尚未返回完畢的頁面不包含
+頂層的 next_cursor (否則會跳過尚未返回的項目)，最後一頁才附上。
+因此每個回應最多只有一個游標可以跟隨。
+"""
+
+import base64
+import binascii
+import contextlib
+import json
+import zlib
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fhl_bible_mcp.utils.errors import InvalidParameterError
+
+
+OUTPUT_MODES = ("pretty", "compact", "table")
+
+# compact 模式的短鍵 (列表項目中最常重複的欄位)
+SHORT_KEYS: Dict[str, str] = {
+    "book": "b",
+    "book_eng": "be",
+    "book_id": "bid",
+    "chapter": "c",
+    "verse": "v",
+    "text": "t",
+    "title": "ti",
+    "author": "au",
+    "abstract": "ab",
+    "content": "ct",
+    "content_preview": "pv",
+    "pub_date": "d",
+    "column": "col",
+    "strongs_number": "sn",
+    "word": "w",
+    "testament": "ts",
+    "name": "n",
+    "code": "cd",
+}
+
+# 工具參數中的分頁游標
+CURSOR_SCHEMA: Dict[str, Any] = {
+    "type": "string",
+    "description": "上一頁結果 page.next_cursor 的值；提供時其他參數沿用上一頁",
+}
+
+
+@dataclass
+class ToolCall:
+    """目前處理中的工具呼叫 (用於產生下一頁的游標)"""
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    offset: int = 0
+
+
+_current_call: ContextVar[Optional[ToolCall]] = ContextVar("fhl_tool_call", default=None)
+
+
+@contextlib.contextmanager
+def tool_call(name: str, arguments: Dict[str, Any], offset: int = 0) -> Iterator[ToolCall]:
+    """在工具執行期間記錄目前的呼叫 (render_result 依此分頁)"""
+    call = ToolCall(name, arguments, offset)
+    token = _current_call.set(call)
+    try:
+        yield call
+    finally:
+        _current_call.reset(token)
+
+
+def encode_cursor(name: str, arguments: Dict[str, Any], offset: int) -> str:
+    """將工具名稱、參數與位移編碼為不透明的游標字串"""
+    payload = json.dumps([name, arguments, offset], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(zlib.compress(payload.encode("utf-8"))).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Dict[str, Any], int]:
+    """
+    解析 encode_cursor 產生的游標
+
+    Returns:
+        (工具名稱, 參數, 位移)
+
+    Raises:
+        InvalidParameterError: 游標無效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, arguments, offset = json.loads(zlib.decompress(base64.urlsafe_b64decode(padded)))
+        if not isinstance(name, str) or not isinstance(arguments, dict) or not isinstance(offset, int):
+            raise ValueError("unexpected cursor payload")
+    except (ValueError, TypeError, binascii.Error, zlib.error):
+        raise InvalidParameterError("cursor", cursor, "無效的分頁游標") from None
+    return name, arguments, offset
+
+
+def next_page_cursor(**overrides: Any) -> Optional[str]:
+    """
+    目前工具呼叫下一頁的游標 (參數以 overrides 覆寫，例如 offset)
+
+    搜尋工具以此返回 next_cursor；伺服器收到游標時以覆寫後的參數呼叫同一工具。
+    不在工具呼叫中 (直接以 Python 呼叫) 時返回 None。
+    """
+    call = _current_call.get()
+    if call is None:
+        return None
+    return encode_cursor(call.name, {**call.arguments, **overrides}, 0)
+
+
+def _settings() -> Tuple[str, int]:
+    from fhl_bible_mcp.config import get_config
+
+    output = get_config().output
+    return output.mode, output.max_bytes
+
+
+def _shorten(value: Any, used: Dict[str, str]) -> Any:
+    """將列表項目中的長鍵換成短鍵"""
+    if isinstance(value, list):
+        return [_shorten(item, used) for item in value]
+    if isinstance(value, dict):
+        shortened = {}
+        for key, item in value.items():
+            short = SHORT_KEYS.get(key)
+            if short is not None and short not in value:
+                used[short] = key
+                key = short
+            shortened[key] = _shorten(item, used)
+        return shortened
+    return value
+
+
+def _cell(value: Any) -> str:
+    """表格儲存格：巢狀值以 compact JSON 表示，不含 tab / 換行"""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return str(value).replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+
+def _primary_list(data: Any) -> Optional[str]:
+    """主要列表的欄位名稱 (最長的物件列表)"""
+    if not isinstance(data, dict):
+        return None
+    best, best_len = None, 0
+    for key, value in data.items():
+        if isinstance(value, list) and len(value) > best_len and all(isinstance(item, dict) for item in value):
+            best, best_len = key, len(value)
+    return best
+
+
+def _render_table(data: Any) -> str:
+    if not isinstance(data, dict):
+        return _cell(data)
+
+    key = _primary_list(data)
+    lines = [f"{name}: {_cell(value)}" for name, value in data.items() if name != key]
+    if key is not None:
+        rows: List[Dict[str, Any]] = data[key]
+        columns: List[str] = []
+        for row in rows:
+            columns.extend(column for column in row if column not in columns)
+        lines.append(f"{key} ({len(rows)}):")
+        lines.append("\t".join(columns))
+        lines.extend("\t".join(_cell(row.get(column)) for column in columns) for row in rows)
+    return "\n".join(lines)
+
+
+def render(data: Any, mode: str = "pretty") -> str:
+    """
+    依輸出模式序列化工具結果
+
+    Args:
+        data: 工具結果
+        mode: "pretty"、"compact" 或 "table" (未知的模式視為 "pretty")
+    """
+    if mode == "compact":
+        used: Dict[str, str] = {}
+        shortened = _shorten(data, used)
+        if used and isinstance(shortened, dict):
+            shortened = {"_keys": used, **shortened}
+        return json.dumps(shortened, ensure_ascii=False, separators=(",", ":"), default=str)
+    if mode == "table":
+        return _render_table(data)
+    return json.dumps(data, ensure_ascii=False, indent=2, default=str)
+
+
+def render_result(data: Any, mode: Optional[str] = None, max_bytes: Optional[int] = None) -> str:
+    """
+    序列化工具結果並套用位元組上限
+
+    結果超過 max_bytes 時，只保留主要列表中放得下的項目 (至少一筆)，
+    並加上 "page": {offset, returned, total, next_cursor}。以游標再次呼叫時
+    (見 tool_call) 從該位移繼續。頁面附有 page.next_cursor 時移除結果中
+    頂層的 next_cursor (搜尋工具的下一批查詢)，最後一頁才保留。
+
+    Args:
+        data: 工具結果
+        mode: 輸出模式 (None = config.output.mode)
+        max_bytes: 位元組上限 (None = config.output.max_bytes，0 = 不限制)
+
+    Raises:
+        InvalidParameterError: 游標的位移大於 0，但結果沒有可分頁的列表
+    """
+    if mode is None or max_bytes is None:
+        default_mode, default_max = _settings()
+        mode = default_mode if mode is None else mode
+        max_bytes = default_max if max_bytes is None else max_bytes
+
+    call = _current_call.get()
+    offset = call.offset if call is not None else 0
+    key = _primary_list(data)
+    if key is None:
+        if offset > 0:
+            raise InvalidParameterError("cursor", offset, "結果沒有可分頁的列表")
+        return render(data, mode)
+    if max_bytes <= 0 and offset == 0:
+        return render(data, mode)
+
+    if offset == 0:
+        text = render(data, mode)
+        if len(text.encode("utf-8")) <= max_bytes:
+            return text
+
+    items = data[key]
+    remaining = items[offset:]
+
+    def page(count: int) -> str:
+        info: Dict[str, Any] = {"offset": offset, "returned": count, "total": len(items)}
+        body = {**data, key: remaining[:count]}
+        if offset + count < len(items) and call is not None:
+            info["next_cursor"] = encode_cursor(call.name, call.arguments, offset + count)
+            body.pop("next_cursor", None)
+        return render({**body, "page": info}, mode)
+
+    text = page(len(remaining))
+    if max_bytes <= 0 or len(text.encode("utf-8")) <= max_bytes or len(remaining) <= 1:
+        return text
+
+    # 二分搜尋放得下的最多項目數 (至少一筆，確保分頁會前進)
+    low, high = 1, len(remaining) - 1
+    best = page(1)
+    while low <= high:
+        middle = (low + high) // 2
+        candidate = page(middle)
+        if len(candidate.encode("utf-8")) <= max_bytes:
+            best, low = candidate, middle + 1
+        else:
+            high = middle - 1
+    return best
+
+
+def render_json_block(data: Any) -> str:
+    """工具自行組成的 markdown 回應中的結果區塊 (依輸出模式與位元組上限)"""
+    mode, _ = _settings()
+    fence = "" if mode == "table" else "json"
+    return f"```{fence}\n{render_result(data, mode=mode)}\n```"
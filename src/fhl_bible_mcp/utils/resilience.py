@@ -0,0 +1,328 @@
+"""
+Upstream Resilience for FHL Bible MCP Server
+
+每個上游主機 (bible.fhl.net、www.fhl.net) 一組保護機制：
+
+- CircuitBreaker: closed → open → half-open 斷路器；連續失敗達門檻後直接拒絕請求，
+  等待 reset_timeout 後放行一個探測請求，成功才恢復
+- AdaptiveTimeout: 依實際延遲 (平滑平均 + 4 倍變異，同 TCP RTO) 調整逾時，
+  介於 min_timeout 與設定的 timeout 之間
+- RetryBudget: 重試預算；每個請求存入 ratio 個 token，每次重試花費 1 個，
+  上游全面故障時重試量不會超過正常流量的固定比例
+- backoff_delay: 帶 jitter 的指數退避
+- RateLimiter: token bucket 限速；收到 429 時依 Retry-After 暫停整個主機的請求
+  (排隊等待而非失敗)，並以 AIMD 降低 / 逐步恢復速率
+
+FHLAPIClient 依主機各保存一組狀態；tools 與 resources 共用同一個 client，
+因此整個程序對同一主機只有一個斷路器。
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+from .errors import NetworkError
+
+
+class CircuitOpenError(NetworkError):
+    """斷路器開啟中，請求未送出"""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(
+            f"Circuit breaker open for {host}; upstream marked unavailable "
+            f"(next probe in {retry_in:.1f}s)"
+        )
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """closed / open / half-open 斷路器"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: 連續失敗幾次後開啟 (0 表示停用)
+            reset_timeout: 開啟後多少秒放行探測請求
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self.stats = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        """是否放行請求 (開啟逾時後轉為 half-open，只放行一個探測請求)"""
+        if self.state == self.CLOSED or self.failure_threshold <= 0:
+            return True
+
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            # 探測請求被取消而沒有回報結果時，逾時後再放行一個
+            now = time.monotonic()
+            if not self._probe_in_flight or now - self._probe_started >= self.reset_timeout:
+                self._probe_in_flight = True
+                self._probe_started = now
+                return True
+
+        self.stats["rejected"] += 1
+        return False
+
+    def retry_in(self) -> float:
+        """距離下一次探測的秒數"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        """上游回應成功 (非 5xx)"""
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """上游逾時、連線失敗或 5xx"""
+        self.consecutive_failures += 1
+        if self.failure_threshold <= 0:
+            return
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.stats["opened"] += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "retry_in": round(self.retry_in(), 3),
+            **self.stats,
+        }
+
+
+class AdaptiveTimeout:
+    """依觀測延遲調整的逾時 (平滑平均 + 4 倍平均偏差)"""
+
+    def __init__(self, max_timeout: float = 30.0, min_timeout: float = 5.0, enabled: bool = True):
+        """
+        Args:
+            max_timeout: 逾時上限 (即設定的 api.timeout)
+            min_timeout: 逾時下限
+            enabled: False 時固定使用 max_timeout
+        """
+        self.max_timeout = max_timeout
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.enabled = enabled
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """記錄一次成功請求的延遲"""
+        if self.srtt is None:
+            self.srtt = seconds
+            self.rttvar = seconds / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - seconds)
+            self.srtt = 0.875 * self.srtt + 0.125 * seconds
+
+    def current(self, attempt: int = 0) -> float:
+        """
+        目前的逾時秒數
+
+        Args:
+            attempt: 重試次數；每次重試逾時加倍 (不超過上限)
+        """
+        if not self.enabled or self.srtt is None:
+            return self.max_timeout
+        timeout = max(self.min_timeout, self.srtt + 4 * self.rttvar) * (2 ** attempt)
+        return min(self.max_timeout, timeout)
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "current": round(self.current(), 3),
+            "min": self.min_timeout,
+            "max": self.max_timeout,
+            "srtt": round(self.srtt, 4) if self.srtt is not None else None,
+            "rttvar": round(self.rttvar, 4),
+        }
+
+
+class RetryBudget:
+    """重試預算 (token bucket)"""
+
+    def __init__(self, ratio: float = 0.2, min_reserve: float = 10.0):
+        """
+        Args:
+            ratio: 每個請求存入的 token 數 (重試量上限約為請求量 × ratio)
+            min_reserve: 初始與最大保留量之外的基本額度
+        """
+        self.ratio = ratio
+        self.capacity = min_reserve + 100 * ratio
+        self.tokens = min_reserve
+        self.stats = {"retries": 0, "exhausted": 0}
+
+    def deposit(self) -> None:
+        """每個新請求 (非重試) 存入 ratio 個 token"""
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """花費一個 token 進行重試；不足時返回 False"""
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.stats["retries"] += 1
+            return True
+        self.stats["exhausted"] += 1
+        return False
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "tokens": round(self.tokens, 2),
+            "capacity": round(self.capacity, 2),
+            **self.stats,
+        }
+
+
+def backoff_delay(retry_count: int, jitter: bool = True) -> float:
+    """
+    指數退避秒數 (2, 4, 8, ...)
+
+    jitter 為 True 時使用 equal jitter：在 [base/2, base] 間隨機，
+    避免大量請求同時重試。
+    """
+    base = float(2 ** retry_count)
+    if not jitter:
+        return base
+    return base / 2 + random.uniform(0, base / 2)
+
+
+class RateLimiter:
+    """
+    Token bucket 限速器 (預約式：每個請求預約下一個 token，依序等待)
+
+    收到 429 時暫停到 Retry-After 之後，並把速率減半；之後每個成功請求
+    把速率加回 max_rate / 50，直到回到設定值 (AIMD)。
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, min_rate: float = 1.0):
+        """
+        Args:
+            rate: 每秒請求數上限 (0 表示不限速)
+            burst: 可瞬間送出的請求數
+            min_rate: 降速後的下限
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate) if rate > 0 else 0.0
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.stats = {"delayed": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """
+        預約一個 token
+
+        Returns:
+            需要等待的秒數 (0 表示可立即送出)
+        """
+        if self.max_rate <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        delay = max(-self.tokens / self.rate if self.tokens < 0 else 0.0, self.paused_until - now)
+        if delay > 0:
+            self.stats["delayed"] += 1
+            self.stats["wait_seconds"] += delay
+        return delay
+
+    async def acquire(self) -> float:
+        """等待直到可以送出請求，返回等待秒數"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """收到 429：暫停 seconds 秒並降低速率"""
+        self.stats["throttled"] += 1
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        if self.max_rate > 0:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def record_success(self) -> None:
+        """成功請求逐步恢復速率"""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "tokens": round(self.tokens, 2),
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()},
+        }
+
+
+class HostGuard:
+    """單一上游主機的斷路器、逾時、重試預算與限速器"""
+
+    def __init__(
+        self,
+        host: str,
+        timeout: float = 30.0,
+        min_timeout: float = 5.0,
+        adaptive_timeout: bool = True,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        retry_budget_ratio: float = 0.2,
+        rate_limit: float = 10.0,
+        rate_burst: int = 20,
+    ):
+        self.host = host
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.timeout = AdaptiveTimeout(timeout, min_timeout, adaptive_timeout)
+        self.budget = RetryBudget(retry_budget_ratio)
+        self.limiter = RateLimiter(rate_limit, rate_burst)
+
+    def check(self) -> None:
+        """
+        請求前檢查斷路器
+
+        Raises:
+            CircuitOpenError: 斷路器開啟中
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.host, self.breaker.retry_in())
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "breaker": self.breaker.get_info(),
+            "timeout": self.timeout.get_info(),
+            "retry_budget": self.budget.get_info(),
+            "rate_limit": self.limiter.get_info(),
+        }
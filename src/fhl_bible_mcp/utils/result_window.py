@@ -0,0 +1,96 @@
+"""
+Search Result Windows for FHL Bible MCP Server
+
+搜尋 API (se.php、sesub.php、seaf.php) 支援 limit / offset，但每一頁都是
+不同的快取鍵與一次上游請求：翻閱 500 筆「愛」的結果需要 10 次請求。
+
+搜尋改為一次向上游取得一整個區塊 (config.cache.result_window_size 筆，
+預設 500)，區塊保存在記憶體中 (ResultWindows)，之後的分頁直接從區塊切片。
+區塊閒置超過 config.cache.result_window_ttl 秒後淘汰；區塊的上游回應同時
+寫入一般的快取 (每個區塊一個快取鍵)，淘汰後再次翻頁仍不需要上游請求。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+# 記憶體中最多保留的區塊數
+MAX_WINDOWS = 64
+
+
+@dataclass
+class ResultWindow:
+    """一個查詢結果區塊：從 start 開始的連續結果"""
+    start: int
+    records: List[Any]
+    meta: Dict[str, Any] = field(default_factory=dict)   # 結果以外的欄位 (record_count 等)
+    complete: bool = False                              # 區塊之後沒有更多結果
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.records)
+
+
+class ResultWindows:
+    """以查詢鍵與區塊起點索引的結果區塊 (LRU + 閒置逾時)"""
+
+    def __init__(self, ttl: float = 600, max_windows: int = MAX_WINDOWS):
+        """
+        Args:
+            ttl: 區塊閒置多久後淘汰 (秒)
+            max_windows: 最多保留的區塊數
+        """
+        self.ttl = ttl
+        self.max_windows = max_windows
+        self._windows: "OrderedDict[str, ResultWindow]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _evict_expired(self, now: float) -> None:
+        while self._windows:
+            key, window = next(iter(self._windows.items()))
+            if now - window.last_used < self.ttl:
+                break
+            del self._windows[key]
+            self.stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[ResultWindow]:
+        """取得區塊 (並延長其閒置期限)"""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            window = self._windows.get(key)
+            if window is None:
+                self.stats["misses"] += 1
+                return None
+            window.last_used = now
+            self._windows.move_to_end(key)
+            self.stats["hits"] += 1
+            return window
+
+    def put(self, key: str, window: ResultWindow) -> ResultWindow:
+        """保存區塊，超過上限時淘汰最久未使用的區塊"""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            window.last_used = now
+            self._windows[key] = window
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.max_windows:
+                self._windows.popitem(last=False)
+                self.stats["evictions"] += 1
+        return window
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+    def get_info(self) -> Dict[str, Any]:
+        """區塊數與命中統計"""
+        with self._lock:
+            records = sum(len(window.records) for window in self._windows.values())
+            return {"windows": len(self._windows), "records": records, "ttl": self.ttl, **self.stats}
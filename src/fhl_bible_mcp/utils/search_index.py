@@ -0,0 +1,245 @@
+"""
+Local Inverted Search Index for FHL Bible MCP Server
+
+從本地經文快照 (utils.corpus) 建立倒排索引，讓關鍵字搜尋不需要呼叫 se.php。
+
+- 中文: 單字與相鄰兩字 (character n-gram, n = 1, 2)
+- 英文/數字: 小寫的單字 token
+- 倒排表 (posting list): 以經節序號 (快照中的排列位置) 遞增，
+  差值後以 varint 壓縮成 bytes
+
+查詢時先取各 n-gram / token 倒排表的交集，再以原文比對排除誤判。
+英文查詢詞展開為詞彙表中包含該字串的所有詞 ("love" → "loved"、"beloved")，
+因此中英文查詢的結果都與 se.php 的子字串搜尋相同；結果依經節序號排列
+(創世記 → 啟示錄)，與 API 的排序一致。
+
+索引檔格式 (search.idx):
+    magic "FHLIDX1\\n"，varint 項目數，
+    每個項目: varint 詞長, UTF-8 詞, varint 倒排表長度, 倒排表 bytes
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_FILENAME = "search.idx"
+INDEX_MAGIC = b"FHLIDX1\n"
+
+# CJK 統一表意文字 (含擴充 A) 與相容表意文字
+_CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+_WORD = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z]+)?")
+
+
+def _cjk_ngrams(run: str) -> Iterable[str]:
+    """產生中文單字與兩字 n-gram"""
+    yield from run
+    for i in range(len(run) - 1):
+        yield run[i:i + 2]
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    將經文切成索引詞
+
+    Args:
+        text: 經文
+
+    Returns:
+        索引詞集合 (中文 n-gram 與小寫英文單字)
+    """
+    terms: Set[str] = set()
+    for run in _CJK_RUN.findall(text):
+        terms.update(_cjk_ngrams(run))
+    terms.update(word.lower() for word in _WORD.findall(text))
+    return terms
+
+
+def query_terms(query: str) -> Set[str]:
+    """
+    將查詢字串切成需要交集的索引詞
+
+    中文只取兩字 n-gram (單字查詢取單字)，英文取單字 token。
+    """
+    terms: Set[str] = set()
+    for run in _CJK_RUN.findall(query):
+        if len(run) == 1:
+            terms.add(run)
+        else:
+            terms.update(run[i:i + 2] for i in range(len(run) - 1))
+    terms.update(word.lower() for word in _WORD.findall(query))
+    return terms
+
+
+def encode_postings(ordinals: List[int]) -> bytes:
+    """以差值 + varint 壓縮遞增的經節序號"""
+    out = bytearray()
+    previous = 0
+    for ordinal in ordinals:
+        delta = ordinal - previous
+        previous = ordinal
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> List[int]:
+    """解壓縮倒排表"""
+    ordinals = []
+    value = 0
+    shift = 0
+    previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        ordinals.append(previous)
+        value = 0
+        shift = 0
+    return ordinals
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class SearchIndex:
+    """
+    單一版本的倒排索引
+
+    postings 以壓縮後的 bytes 保存，查詢時才解壓需要的倒排表。
+    """
+
+    def __init__(self, postings: Dict[str, bytes]):
+        """
+        Args:
+            postings: {索引詞: 壓縮的倒排表}
+        """
+        self.postings = postings
+        self._words: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    @classmethod
+    def build(cls, texts: Iterable[str]) -> "SearchIndex":
+        """
+        從經文建立索引
+
+        Args:
+            texts: 依經節序號排列的經文
+
+        Returns:
+            SearchIndex 實例
+        """
+        lists: Dict[str, List[int]] = {}
+        for ordinal, text in enumerate(texts):
+            for term in tokenize(text):
+                lists.setdefault(term, []).append(ordinal)
+
+        return cls({term: encode_postings(ordinals) for term, ordinals in lists.items()})
+
+    def save(self, path: Path) -> None:
+        """寫入索引檔"""
+        out = bytearray(INDEX_MAGIC)
+        _write_varint(out, len(self.postings))
+        for term, data in sorted(self.postings.items()):
+            encoded = term.encode("utf-8")
+            _write_varint(out, len(encoded))
+            out.extend(encoded)
+            _write_varint(out, len(data))
+            out.extend(data)
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(out)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SearchIndex":
+        """
+        讀取索引檔
+
+        Raises:
+            ValueError: 檔案格式不符
+        """
+        data = path.read_bytes()
+        if not data.startswith(INDEX_MAGIC):
+            raise ValueError(f"Not a search index file: {path}")
+
+        pos = len(INDEX_MAGIC)
+        count, pos = _read_varint(data, pos)
+        postings: Dict[str, bytes] = {}
+        for _ in range(count):
+            length, pos = _read_varint(data, pos)
+            term = data[pos:pos + length].decode("utf-8")
+            pos += length
+            length, pos = _read_varint(data, pos)
+            postings[term] = data[pos:pos + length]
+            pos += length
+
+        return cls(postings)
+
+    def candidates(self, query: str) -> Optional[List[int]]:
+        """
+        取得可能符合查詢的經節序號 (遞增)
+
+        Returns:
+            候選序號；查詢中沒有可索引的詞時返回 None
+        """
+        terms = query_terms(query)
+        if not terms:
+            return None
+
+        lists = []
+        for term in terms:
+            if _CJK_RUN.match(term):
+                data = self.postings.get(term)
+                matched = [data] if data is not None else []
+            else:
+                matched = [self.postings[word] for word in self.words() if term in word]
+            if not matched:
+                return []
+            if len(matched) == 1:
+                lists.append(decode_postings(matched[0]))
+            else:
+                lists.append(sorted(set().union(*map(decode_postings, matched))))
+
+        # 從最短的倒排表開始交集
+        lists.sort(key=len)
+        result = lists[0]
+        for ordinals in lists[1:]:
+            if not result:
+                break
+            other = set(ordinals)
+            result = [ordinal for ordinal in result if ordinal in other]
+
+        return result
+
+    def words(self) -> List[str]:
+        """索引中的英文/數字詞 (排序；第一次查詢英文時才建立)"""
+        if self._words is None:
+            self._words = sorted(term for term in self.postings if not _CJK_RUN.match(term))
+        return self._words
@@ -0,0 +1,244 @@
+"""
+Cache Warm-up for FHL Bible MCP Server
+
+部署或清除快取後，第一批使用者會遇到冷快取的延遲。
+`python -m fhl_bible_mcp warm` 依清單預先查詢常用內容，透過 FHLAPIEndpoints
+寫入一般的快取 (與伺服器共用同一個快取目錄)。
+
+清單 (manifest) 可以是 JSON 檔案，欄位與 build_manifest 的參數相同：
+
+    {
+        "books": true,
+        "bible_versions": true,
+        "commentaries": true,
+        "versions": ["unv", "kjv"],
+        "top_chapters": 50,
+        "strongs": ["G1-500", "H1-500"]
+    }
+
+完成的項目記錄在進度檔 (每行一個項目鍵)，中斷後再次執行會略過已完成的項目；
+全部成功後刪除進度檔。
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+PROGRESS_FILENAME = "warm.progress"
+
+# 最常被閱讀的章節 (bid, chap)，依熱門程度排序
+POPULAR_CHAPTERS: Tuple[Tuple[int, int], ...] = (
+    (43, 3), (19, 23), (46, 13), (45, 8), (40, 5), (43, 1), (1, 1), (23, 53),
+    (43, 14), (40, 6), (19, 1), (50, 4), (58, 11), (49, 2), (42, 15), (19, 91),
+    (45, 12), (20, 3), (40, 7), (19, 51), (43, 15), (48, 5), (23, 40), (24, 29),
+    (19, 139), (62, 4), (1, 3), (2, 20), (42, 2), (44, 2), (49, 6), (50, 2),
+    (45, 3), (46, 15), (47, 5), (59, 1), (60, 1), (51, 3), (58, 12), (43, 17),
+    (40, 28), (66, 21), (66, 22), (19, 103), (19, 119), (21, 3), (20, 31),
+    (23, 55), (41, 16), (62, 1),
+)
+
+_STRONGS_TESTAMENTS = {"G": "nt", "H": "ot"}
+
+
+def parse_strongs_range(spec: str) -> Tuple[str, range]:
+    """
+    解析 Strong's 編號範圍
+
+    Args:
+        spec: "G1-500"、"H1-100" 或單一編號 "G3056"
+
+    Returns:
+        (testament, 編號範圍)，testament 為 "nt" 或 "ot"
+
+    Raises:
+        ValueError: 格式無法解析
+    """
+    spec = spec.strip().upper()
+    testament = _STRONGS_TESTAMENTS.get(spec[:1])
+    start, _, end = spec[1:].partition("-")
+    if testament is None or not start.isdigit() or (end and not end.isdigit()):
+        raise ValueError(f"Invalid Strong's range: {spec} (expected e.g. G1-500 or H430)")
+
+    first, last = int(start), int(end or start)
+    if first < 1 or first > last:
+        raise ValueError(f"Invalid Strong's range: {spec}")
+    return testament, range(first, last + 1)
+
+
+def build_manifest(
+    books: bool = True,
+    bible_versions: bool = True,
+    commentaries: bool = True,
+    versions: Iterable[str] = ("unv",),
+    top_chapters: int = 50,
+    strongs: Iterable[str] = ("G1-100", "H1-100"),
+) -> List[Dict[str, Any]]:
+    """
+    建立預熱項目清單
+
+    Args:
+        books: 書卷列表 (listall.html)
+        bible_versions: 版本列表 (ab.php)
+        commentaries: 註釋書列表
+        versions: 預熱章節的版本
+        top_chapters: 每個版本預熱的熱門章節數 (最多 len(POPULAR_CHAPTERS))
+        strongs: Strong's 字典編號範圍 (見 parse_strongs_range)
+
+    Returns:
+        項目清單，每項含 key (唯一鍵) 與 kind 及其參數
+    """
+    tasks: List[Dict[str, Any]] = []
+
+    if books:
+        tasks.append({"key": "books", "kind": "books"})
+    if bible_versions:
+        tasks.append({"key": "versions", "kind": "versions"})
+    if commentaries:
+        tasks.append({"key": "commentaries", "kind": "commentaries"})
+
+    for version in versions:
+        for bid, chap in POPULAR_CHAPTERS[:max(0, top_chapters)]:
+            tasks.append({
+                "key": f"chapter:{version}:{bid}:{chap}",
+                "kind": "chapter",
+                "version": version,
+                "bid": bid,
+                "chap": chap,
+            })
+
+    for spec in strongs:
+        testament, numbers = parse_strongs_range(spec)
+        for number in numbers:
+            tasks.append({
+                "key": f"strongs:{testament}:{number}",
+                "kind": "strongs",
+                "testament": testament,
+                "number": number,
+            })
+
+    return tasks
+
+
+def load_manifest(path: str, **overrides: Any) -> List[Dict[str, Any]]:
+    """
+    從 JSON 檔案載入清單
+
+    Args:
+        path: 清單檔案路徑
+        **overrides: 覆寫檔案中的欄位 (值為 None 的忽略)
+
+    Raises:
+        ValueError: 檔案含有未知欄位
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        options = json.load(f)
+
+    unknown = set(options) - set(inspect.signature(build_manifest).parameters)
+    if unknown:
+        raise ValueError(f"Unknown manifest fields: {', '.join(sorted(unknown))}")
+
+    options.update({k: v for k, v in overrides.items() if v is not None})
+    return build_manifest(**options)
+
+
+async def _run_task(api: Any, task: Dict[str, Any]) -> None:
+    """執行一個預熱項目 (結果寫入快取，不保留)"""
+    kind = task["kind"]
+    if kind == "books":
+        await api.get_book_list()
+    elif kind == "versions":
+        await api.get_bible_versions()
+    elif kind == "commentaries":
+        await api.list_commentaries()
+    elif kind == "chapter":
+        await api.get_verse(str(task["bid"]), task["chap"], version=task["version"])
+    elif kind == "strongs":
+        await api.get_strongs_dictionary(task["number"], task["testament"])
+    else:
+        raise ValueError(f"Unknown warm-up task: {kind}")
+
+
+def _load_progress(path: Path) -> Set[str]:
+    """讀取已完成的項目鍵"""
+    if not path.exists():
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+async def warm_cache(
+    api: Any,
+    tasks: List[Dict[str, Any]],
+    concurrency: int = 4,
+    progress_path: Optional[Path] = None,
+    on_progress: Optional[Callable[[int, int, Dict[str, Any], Optional[Exception]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    依清單預熱快取
+
+    Args:
+        api: FHLAPIEndpoints 實例 (需啟用快取)
+        tasks: build_manifest 產生的項目
+        concurrency: 同時執行的項目數
+        progress_path: 進度檔；None 表示不記錄 (無法續傳)
+        on_progress: 每完成一項呼叫 on_progress(done, total, task, error)
+
+    Returns:
+        total / skipped (先前已完成) / warmed / failed / seconds
+    """
+    completed = _load_progress(progress_path) if progress_path else set()
+    pending = [task for task in tasks if task["key"] not in completed]
+    result = {
+        "total": len(tasks),
+        "skipped": len(tasks) - len(pending),
+        "warmed": 0,
+        "failed": 0,
+    }
+
+    start = time.perf_counter()
+    queue: asyncio.Queue = asyncio.Queue()
+    for task in pending:
+        queue.put_nowait(task)
+
+    progress_file = None
+    if progress_path:
+        progress_path.parent.mkdir(parents=True, exist_ok=True)
+        progress_file = open(progress_path, "a", encoding="utf-8")
+
+    async def worker() -> None:
+        while not queue.empty():
+            task = queue.get_nowait()
+            error: Optional[Exception] = None
+            try:
+                await _run_task(api, task)
+            except Exception as e:
+                error = e
+                result["failed"] += 1
+                logger.warning(f"Warm-up failed for {task['key']}: {e}")
+            else:
+                result["warmed"] += 1
+                if progress_file:
+                    progress_file.write(task["key"] + "\n")
+                    progress_file.flush()
+            if on_progress:
+                on_progress(result["skipped"] + result["warmed"] + result["failed"], len(tasks), task, error)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(pending))))))
+    finally:
+        if progress_file:
+            progress_file.close()
+
+    # 全部完成後刪除進度檔，下次執行重新預熱 (快取項目可能已過期)
+    if progress_path and result["failed"] == 0 and progress_path.exists():
+        progress_path.unlink()
+
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
@@ -338,7 +338,7 @@ async def test_build_url_with_params():
 @pytest.mark.asyncio
 async def test_retry_request_exponential_backoff():
     """測試重試機制的指數退避"""
-    client = FHLAPIClient(max_retries=2)
+    client = FHLAPIClient(max_retries=2, retry_jitter=False)
     
     mock_response = MagicMock()
     mock_response.status_code = 200
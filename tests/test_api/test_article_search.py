@@ -0,0 +1,119 @@
+"""
+Test Article Search
+
+Tests that article searches go through the pooled client and the cache, that
+narrower metadata queries are answered from the local article index, and that
+the client-side limit never touches cached data.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import ARTICLES_API_URL, FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.utils.article_index import ArticleIndex, article_preview
+from fhl_bible_mcp.utils.cache import reset_cache
+
+
+ARTICLES = [
+    {"id": "1", "aid": "a1", "ptab": "women3", "column": "女人", "title": "愛的真諦",
+     "author": "陳鳳翔", "pubtime": "2025.10.19", "abst": "論愛", "txt": "<p>愛是恆久忍耐</p>"},
+    {"id": "2", "aid": "a2", "ptab": "sunday", "column": "主日", "title": "信心",
+     "author": "陳鳳翔", "pubtime": "2025.10.12", "abst": "論信", "txt": "<p>信心</p>"},
+    {"id": "3", "aid": "a3", "ptab": "women3", "column": "女人", "title": "盼望與愛",
+     "author": "陳鳳翔", "pubtime": "2025.10.05", "abst": "論望", "txt": "<p>盼望</p>"},
+]
+
+
+@pytest.fixture
+async def api(tmp_path):
+    """使用暫存快取目錄、模擬上游的 API 實例"""
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(
+        return_value={"status": 1, "record_count": len(ARTICLES), "record": ARTICLES}
+    )
+    yield api
+    await api.close()
+    reset_cache()
+
+
+@pytest.mark.asyncio
+async def test_search_uses_pooled_client_and_cache(api):
+    """透過 _make_request (共用連線池) 查詢 www.fhl.net，第二次由快取返回"""
+    first = await api.search_articles(author=" 陳鳳翔 ")
+    second = await api.search_articles(author="陳鳳翔")
+
+    assert first == second
+    assert first["record_count"] == 3
+    assert api._make_request.await_count == 1
+    endpoint = api._make_request.call_args.args[0]
+    assert endpoint == ARTICLES_API_URL
+    assert api._make_request.call_args.kwargs["params"] == {"gb": 0, "author": "陳鳳翔"}
+    assert len(api.cache.get_entries(namespace="articles")) == 1
+
+
+@pytest.mark.asyncio
+async def test_article_index_opened_lazily(api):
+    """文章索引在第一次搜尋文章時才開啟，close() 時關閉"""
+    path = api._article_index_path
+    assert api.article_index is None
+    assert not path.exists()
+
+    await api.search_articles(author="陳鳳翔")
+    assert api.article_index is not None
+    assert path.exists()
+
+    await api.close()
+    assert api.article_index is None
+
+
+@pytest.mark.asyncio
+async def test_narrower_query_answered_from_index(api):
+    """較嚴格的條件 (不需內文) 在本地索引篩選，不送出上游請求"""
+    await api.search_articles(author="陳鳳翔")
+
+    result = await api.search_articles(author="陳鳳翔", title="愛", include_content=False)
+    assert api._make_request.await_count == 1
+    assert result["source"] == "index"
+    assert [a["id"] for a in result["record"]] == ["1", "3"]
+    assert result["record"][0]["preview"] == "愛是恆久忍耐"
+    assert "txt" not in result["record"][0]
+
+    result = await api.search_articles(author="陳鳳翔", column="women3", include_content=False)
+    assert [a["id"] for a in result["record"]] == ["1", "3"]
+    assert api._make_request.await_count == 1
+
+    # 新的內文條件或需要完整內文時仍查詢上游
+    await api.search_articles(author="陳鳳翔", content="忍耐", include_content=False)
+    await api.search_articles(author="陳鳳翔", title="愛")
+    assert api._make_request.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_limit_does_not_mutate_cached_response(api):
+    """套用 limit 時不修改快取中的資料"""
+    limited = await api.search_articles(author="陳鳳翔", limit=2)
+    assert limited["limited"] is True
+    assert len(limited["record"]) == limited["record_count"] == 2
+
+    full = await api.search_articles(author="陳鳳翔")
+    assert len(full["record"]) == full["record_count"] == 3
+    assert "limited" not in full
+    assert api._make_request.await_count == 1
+
+
+def test_article_index_expiry_and_preview(tmp_path):
+    """過期的查詢記錄不再用來回答查詢"""
+    index = ArticleIndex(tmp_path / "articles.sqlite3", max_age=0)
+    try:
+        index.record({"author": "陳"}, 0, ARTICLES)
+        assert index.lookup({"author": "陳", "title": "愛"}, 0) is None
+    finally:
+        index.close()
+
+    assert article_preview("<p>a  <br/>b</p>") == "a b"
+    assert article_preview("x" * 300).endswith("...")
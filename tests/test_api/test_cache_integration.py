@@ -12,7 +12,7 @@ from fhl_bible_mcp.utils.cache import reset_cache
 
 
 @pytest.mark.asyncio
-async def test_cache_integration_versions():
+async def test_cache_integration_versions(tmp_path):
     """
     Test 1: 版本列表快取測試
     測試 get_bible_versions 的快取功能
@@ -23,7 +23,7 @@ async def test_cache_integration_versions():
     
     reset_cache()
     
-    async with FHLAPIEndpoints(use_cache=True, cache_dir=".cache/test") as client:
+    async with FHLAPIEndpoints(use_cache=True, cache_dir=str(tmp_path)) as client:
         # 第一次呼叫 - 應該從 API 取得
         start1 = time.time()
         result1 = await client.get_bible_versions()
@@ -57,7 +57,7 @@ async def test_cache_integration_versions():
 
 
 @pytest.mark.asyncio
-async def test_cache_integration_verses():
+async def test_cache_integration_verses(tmp_path):
     """
     Test 2: 經文快取測試
     測試 get_verse 的快取功能
@@ -68,7 +68,7 @@ async def test_cache_integration_verses():
     
     reset_cache()
     
-    async with FHLAPIEndpoints(use_cache=True, cache_dir=".cache/test") as client:
+    async with FHLAPIEndpoints(use_cache=True, cache_dir=str(tmp_path)) as client:
         # 第一次查詢 John 3:16
         start1 = time.time()
         result1 = await client.get_verse("約", 3, "16", version="unv")
@@ -101,7 +101,7 @@ async def test_cache_integration_verses():
 
 
 @pytest.mark.asyncio
-async def test_cache_integration_search():
+async def test_cache_integration_search(tmp_path):
     """
     Test 3: 搜尋快取測試
     測試 search_bible 的快取功能
@@ -112,7 +112,7 @@ async def test_cache_integration_search():
     
     reset_cache()
     
-    async with FHLAPIEndpoints(use_cache=True, cache_dir=".cache/test") as client:
+    async with FHLAPIEndpoints(use_cache=True, cache_dir=str(tmp_path)) as client:
         # 搜尋「愛」
         start1 = time.time()
         result1 = await client.search_bible("愛", limit=5)
@@ -137,7 +137,7 @@ async def test_cache_integration_search():
 
 
 @pytest.mark.asyncio
-async def test_cache_integration_strongs():
+async def test_cache_integration_strongs(tmp_path):
     """
     Test 4: Strong's 字典快取測試
     測試 get_strongs_dictionary 的永久快取
@@ -148,7 +148,7 @@ async def test_cache_integration_strongs():
     
     reset_cache()
     
-    async with FHLAPIEndpoints(use_cache=True, cache_dir=".cache/test") as client:
+    async with FHLAPIEndpoints(use_cache=True, cache_dir=str(tmp_path)) as client:
         # 查詢 Strong's #25 (agapao - 愛)
         result1 = await client.get_strongs_dictionary(25, "nt")
         assert result1["status"] == "success"
@@ -196,7 +196,7 @@ async def test_cache_disabled():
 
 
 @pytest.mark.asyncio
-async def test_cache_cleanup_integration():
+async def test_cache_cleanup_integration(tmp_path):
     """
     Test 6: 快取清理整合測試
     測試在實際使用中的快取清理
@@ -207,7 +207,7 @@ async def test_cache_cleanup_integration():
     
     reset_cache()
     
-    async with FHLAPIEndpoints(use_cache=True, cache_dir=".cache/test") as client:
+    async with FHLAPIEndpoints(use_cache=True, cache_dir=str(tmp_path)) as client:
         # 建立一些快取
         await client.get_bible_versions()  # permanent
         await client.get_verse("John", 3, "16")  # 7 days
@@ -232,7 +232,7 @@ async def test_cache_cleanup_integration():
 
 
 @pytest.mark.asyncio
-async def test_cache_info_integration():
+async def test_cache_info_integration(tmp_path):
     """
     Test 7: 快取資訊整合測試
     測試取得完整的快取統計資訊
@@ -243,7 +243,7 @@ async def test_cache_info_integration():
     
     reset_cache()
     
-    async with FHLAPIEndpoints(use_cache=True, cache_dir=".cache/test") as client:
+    async with FHLAPIEndpoints(use_cache=True, cache_dir=str(tmp_path)) as client:
         # 建立多種類型的快取
         await client.get_bible_versions()
         await client.get_verse("John", 3, "16")
@@ -284,6 +284,8 @@ async def test_cache_info_integration():
 
 if __name__ == "__main__":
     import asyncio
+    import inspect
+    import tempfile
     
     async def run_all_tests():
         """執行所有測試"""
@@ -306,7 +308,10 @@ if __name__ == "__main__":
         
         for name, test_func in tests:
             try:
-                await test_func()
+                if "tmp_path" in inspect.signature(test_func).parameters:
+                    await test_func(Path(tempfile.mkdtemp(prefix="cache_test_")))
+                else:
+                    await test_func()
                 passed += 1
             except AssertionError as e:
                 print(f"\n❌ Test Failed: {name}")
@@ -319,12 +324,6 @@ if __name__ == "__main__":
                 traceback.print_exc()
                 failed += 1
         
-        # 清理測試快取
-        import shutil
-        test_cache_dir = Path(".cache/test")
-        if test_cache_dir.exists():
-            shutil.rmtree(test_cache_dir)
-        
         # 顯示總結
         print("\n" + "="*70)
         print("Test Summary")
@@ -9,17 +9,29 @@ import json
 from pathlib import Path
 from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
 from fhl_bible_mcp.config import Config, reset_config
+from fhl_bible_mcp.utils.cache import reset_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_in_tmp_path(tmp_path, monkeypatch):
+    """全域設定的快取目錄指向 tmp_path，不在工作目錄建立 .cache"""
+    monkeypatch.setenv("FHL_CACHE_DIR", str(tmp_path / "cache"))
+    reset_config()
+    reset_cache()
+    yield
+    reset_config()
+    reset_cache()
 
 
 @pytest.fixture
-def test_config():
+def test_config(tmp_path):
     """建立測試設定"""
     config = Config()
     config.api.base_url = "https://bible.fhl.net/json/"
     config.api.timeout = 45
     config.api.max_retries = 5
     config.cache.enabled = True
-    config.cache.directory = ".test_cache"
+    config.cache.directory = str(tmp_path / "cache")
     config.cache.cleanup_on_start = False
     return config
 
@@ -42,7 +54,7 @@ def temp_config_file(tmp_path):
         },
         "cache": {
             "enabled": True,
-            "directory": ".test_cache_from_file",
+            "directory": str(tmp_path / "cache_from_file"),
             "cleanup_on_start": False
         },
         "logging": {
@@ -163,6 +175,7 @@ def test_api_parameter_priority():
     # 建立自訂 Config
     custom_config = Config()
     custom_config.api.timeout = 60
+    custom_config.cache.directory = global_config.cache.directory
     
     # 顯式參數應該覆蓋 Config
     api = FHLAPIEndpoints(
@@ -213,7 +226,7 @@ def test_api_with_file_config(temp_config_file):
     print(f"   max_retries: {api.max_retries}")
 
 
-def test_cache_cleanup_on_start():
+def test_cache_cleanup_on_start(tmp_path):
     """
     Test 6: 啟動時清理快取
     測試 cleanup_on_start 設定
@@ -226,7 +239,7 @@ def test_cache_cleanup_on_start():
     config = Config()
     config.cache.enabled = True
     config.cache.cleanup_on_start = True
-    config.cache.directory = ".test_cache_cleanup"
+    config.cache.directory = str(tmp_path / "cache")
     
     # 建立 API (應該自動清理)
     api = FHLAPIEndpoints(config=config)
@@ -240,7 +253,7 @@ def test_cache_cleanup_on_start():
     print(f"   Cleanup on start: {config.cache.cleanup_on_start}")
 
 
-def test_api_runtime_config_update():
+def test_api_runtime_config_update(tmp_path):
     """
     Test 7: API 執行時更新設定
     測試在執行時更新 Config 是否影響 API
@@ -252,6 +265,7 @@ def test_api_runtime_config_update():
     # 建立設定
     config = Config()
     config.api.timeout = 30
+    config.cache.directory = str(tmp_path / "cache")
     
     # 建立 API
     api = FHLAPIEndpoints(config=config)
@@ -273,7 +287,7 @@ def test_api_runtime_config_update():
 
 
 @pytest.mark.asyncio
-async def test_api_actual_request_with_config():
+async def test_api_actual_request_with_config(tmp_path):
     """
     Test 8: 實際 API 請求
     測試使用 Config 進行實際 API 請求
@@ -285,7 +299,7 @@ async def test_api_actual_request_with_config():
     # 建立設定
     config = Config()
     config.cache.enabled = True
-    config.cache.directory = ".test_cache_request"
+    config.cache.directory = str(tmp_path / "cache")
     
     # 建立 API
     api = FHLAPIEndpoints(config=config)
@@ -318,6 +332,7 @@ async def test_api_actual_request_with_config():
 if __name__ == "__main__":
     import asyncio
     import tempfile
+    from functools import partial
     
     async def run_all_tests():
         """執行所有測試"""
@@ -333,12 +348,13 @@ if __name__ == "__main__":
         test_config.api.base_url = "https://bible.fhl.net/json/"
         test_config.api.timeout = 45
         test_config.cache.enabled = True
+        test_config.cache.directory = str(temp_dir / "cache")
         
         # 建立臨時設定檔
         config_data = {
             "server": {"name": "test-server", "version": "1.0.0"},
             "api": {"base_url": "https://bible.fhl.net/json/", "timeout": 60, "max_retries": 7},
-            "cache": {"enabled": True, "directory": ".test_cache_from_file", "cleanup_on_start": False}
+            "cache": {"enabled": True, "directory": str(temp_dir / "cache_from_file"), "cleanup_on_start": False}
         }
         temp_config_file = temp_dir / "test_config.json"
         with open(temp_config_file, "w") as f:
@@ -350,9 +366,9 @@ if __name__ == "__main__":
             ("Global Config", test_api_with_global_config),
             ("Parameter Priority", test_api_parameter_priority),
             ("File Config", lambda: test_api_with_file_config(temp_config_file)),
-            ("Cache Cleanup", test_cache_cleanup_on_start),
-            ("Runtime Update", test_api_runtime_config_update),
-            ("Actual Request", test_api_actual_request_with_config),
+            ("Cache Cleanup", partial(test_cache_cleanup_on_start, temp_dir)),
+            ("Runtime Update", partial(test_api_runtime_config_update, temp_dir)),
+            ("Actual Request", partial(test_api_actual_request_with_config, temp_dir)),
         ]
         
         passed = 0
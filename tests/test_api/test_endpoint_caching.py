@@ -0,0 +1,109 @@
+"""
+Test Endpoint Caching
+
+Tests that word analysis, commentary, topic study, audio and citation
+requests go through the cache with their own namespaces, and that verse
+queries share one whole-chapter cache entry.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.utils.cache import reset_cache
+
+
+@pytest.fixture
+async def api(tmp_path):
+    """使用暫存快取目錄、模擬上游的 API 實例"""
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(return_value={"status": "success", "record": [{"id": 1}]})
+    yield api
+    await api.close()
+    reset_cache()
+
+
+CALLS = [
+    ("word_analysis", lambda api: api.get_word_analysis("John", 3, 16)),
+    ("commentaries", lambda api: api.list_commentaries()),
+    ("commentary", lambda api: api.get_commentary("John", 3, 16, 1)),
+    ("search", lambda api: api.search_commentary("愛")),
+    ("topics", lambda api: api.get_topic_study(keyword="faith")),
+    ("audio", lambda api: api.get_audio_bible(43, 3)),
+    ("verses", lambda api: api.query_verse_citation("約 3:16")),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("namespace,call", CALLS, ids=[name for name, _ in CALLS])
+async def test_second_call_served_from_cache(api, namespace, call):
+    """第二次呼叫不送出上游請求，並寫入對應的 namespace"""
+    first = await call(api)
+    second = await call(api)
+
+    assert first == second
+    assert api._make_request.await_count == 1
+    assert len(api.cache.get_entries(namespace=namespace)) == 1
+
+
+@pytest.mark.asyncio
+async def test_different_params_are_cached_separately(api):
+    """註釋書列表與單節註釋共用 sc.php，但快取鍵不同"""
+    await api.list_commentaries()
+    await api.get_commentary("John", 3, 16)
+    await api.get_commentary("John", 3, 17)
+    await api.get_commentary("John", 3, 16)
+
+    assert api._make_request.await_count == 3
+    assert len(api.cache.get_entries(namespace="commentary")) == 2
+
+
+def _chapter(count=10):
+    """模擬 qb.php 整章回應"""
+    def record(sec):
+        return {"bid": 43, "engs": "John", "chineses": "約", "chap": 3, "sec": sec, "bible_text": f"v{sec}"}
+    return {
+        "status": "success",
+        "record_count": count,
+        "v_name": "和合本",
+        "version": "unv",
+        "proc": 0,
+        "prev": {"chineses": "約", "engs": "John", "chap": 2, "sec": 1},
+        "next": {"chineses": "約", "engs": "John", "chap": 4, "sec": 1},
+        "record": [record(sec) for sec in range(1, count + 1)],
+    }
+
+
+@pytest.mark.asyncio
+async def test_verse_queries_share_chapter_cache(api):
+    """不同節數共用整章快取，於本地切出並重新計算 prev / next"""
+    api._make_request = AsyncMock(return_value=_chapter())
+
+    middle = await api.get_verse("約", 3, "1-2,5,8-9")
+    first = await api.get_verse("約", 3, "1")
+    last = await api.get_verse("John", 3, "10")
+    whole = await api.get_verse("約", 3)
+
+    assert api._make_request.await_count == 1
+    assert "sec" not in api._make_request.call_args.kwargs["params"]
+    assert len(api.cache.get_entries(namespace="verses")) == 1
+
+    assert [r["sec"] for r in middle["record"]] == [1, 2, 5, 8, 9]
+    assert middle["record_count"] == 5
+    assert middle["prev"]["chap"] == 2
+    assert middle["next"] == {"chineses": "約", "engs": "John", "chap": 3, "sec": 10}
+
+    assert first["next"]["sec"] == 2 and first["prev"]["chap"] == 2
+    assert last["prev"]["sec"] == 9 and last["next"]["chap"] == 4
+
+    # 快取中的整章資料未被修改
+    assert whole["record_count"] == 10 and whole["prev"]["chap"] == 2
+
+    # 無法解析的節數交給上游
+    await api.get_verse("約", 3, "16a")
+    assert api._make_request.call_args.kwargs["params"]["sec"] == "16a"
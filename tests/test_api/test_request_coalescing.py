@@ -0,0 +1,100 @@
+"""
+Test Request Coalescing
+
+Tests for single-flight deduplication of identical in-flight API requests.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.errors import NetworkError
+
+
+@pytest.fixture
+async def api(tmp_path):
+    """建立使用臨時快取目錄的 API 實例"""
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    api = FHLAPIEndpoints(config=config)
+    yield api
+    await api.close()
+    reset_cache()
+
+
+def _slow_response(data, delay=0.05):
+    """建立延遲回應的 mock"""
+    async def _request(endpoint, params=None):
+        await asyncio.sleep(delay)
+        return data
+    return AsyncMock(side_effect=_request)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_are_coalesced(api):
+    """同時發出的相同請求只應送出一次上游請求"""
+    api._make_request = _slow_response({"status": "success", "record": [1]})
+    
+    results = await asyncio.gather(*[
+        api.get_strongs_dictionary(25, "nt") for _ in range(5)
+    ])
+    
+    assert api._make_request.await_count == 1
+    assert all(r == {"status": "success", "record": [1]} for r in results)
+    
+    stats = api.get_request_stats()
+    assert stats["upstream"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_not_coalesced(api):
+    """不同參數的請求不應合併"""
+    api._make_request = _slow_response({"status": "success", "record": []})
+    
+    await asyncio.gather(
+        api.get_strongs_dictionary(25, "nt"),
+        api.get_strongs_dictionary(26, "nt"),
+    )
+    
+    assert api._make_request.await_count == 2
+    assert api.get_request_stats()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_error_propagates_to_all_callers(api):
+    """上游失敗時所有等待者都應收到相同錯誤,且之後可重新請求"""
+    async def _fail(endpoint, params=None):
+        await asyncio.sleep(0.05)
+        raise NetworkError("upstream down")
+    
+    api._make_request = AsyncMock(side_effect=_fail)
+    
+    results = await asyncio.gather(
+        *[api.get_strongs_dictionary(25, "nt") for _ in range(3)],
+        return_exceptions=True,
+    )
+    
+    assert api._make_request.await_count == 1
+    assert all(isinstance(r, NetworkError) for r in results)
+    assert api.get_request_stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_request(api):
+    """單一呼叫者取消時,其他等待者仍應取得結果"""
+    api._make_request = _slow_response({"status": "success", "record": [2]}, delay=0.1)
+    
+    first = asyncio.ensure_future(api.get_strongs_dictionary(30, "nt"))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(api.get_strongs_dictionary(30, "nt"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    
+    assert await second == {"status": "success", "record": [2]}
+    assert api._make_request.await_count == 1
@@ -0,0 +1,255 @@
+"""
+Test Upstream Resilience
+
+Tests for the per-host circuit breaker, adaptive timeouts, jittered backoff,
+retry budget, rate limiter and per-endpoint concurrency limit in
+FHLAPIClient, and the info://upstream resource.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fhl_bible_mcp.api.client import FHLAPIClient, _parse_retry_after
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.resources.handlers import ResourceRouter
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.errors import NetworkError
+from fhl_bible_mcp.utils.resilience import (
+    AdaptiveTimeout,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    RetryBudget,
+    backoff_delay,
+)
+
+
+def _ok_response():
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {"content-type": "application/json"}
+    response.content = b"{}"
+    response.json.return_value = {"status": "success"}
+    return response
+
+
+def test_circuit_breaker_transitions():
+    """closed → open → half-open → closed / open"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    # 逾時後只放行一個探測請求
+    breaker.opened_at -= 31
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker.opened_at -= 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+    assert breaker.get_info()["opened"] == 2
+
+
+def test_adaptive_timeout():
+    """逾時依延遲調整，介於上下限之間，重試時加倍"""
+    timeout = AdaptiveTimeout(max_timeout=30.0, min_timeout=2.0)
+    assert timeout.current() == 30.0  # 尚無樣本
+
+    for _ in range(20):
+        timeout.observe(0.2)
+    assert timeout.current() == 2.0
+    assert timeout.current(attempt=1) == 4.0
+    assert timeout.current(attempt=10) == 30.0
+
+    for _ in range(20):
+        timeout.observe(5.0)
+    assert 5.0 < timeout.current() <= 30.0
+
+    assert AdaptiveTimeout(30.0, 2.0, enabled=False).current() == 30.0
+
+
+def test_retry_budget_and_jitter():
+    """重試預算用完後不再重試；jitter 落在 [base/2, base]"""
+    budget = RetryBudget(ratio=0.5, min_reserve=1.0)
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert budget.get_info()["exhausted"] == 1
+
+    delays = [backoff_delay(2) for _ in range(100)]
+    assert all(2.0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert backoff_delay(3, jitter=False) == 8.0
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast():
+    """連續失敗後斷路器開啟，之後的請求不送出也不等待"""
+    client = FHLAPIClient(max_retries=3, breaker_failure_threshold=2)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    with patch.object(client._client, "get", side_effect=httpx.ConnectError("down")) as mock_get, \
+         patch("asyncio.sleep", side_effect=fake_sleep):
+        with pytest.raises(NetworkError, match="circuit breaker open"):
+            await client._make_request("qb.php")
+        assert mock_get.call_count == 2
+        assert len(sleeps) == 1
+
+        with pytest.raises(CircuitOpenError):
+            await client._make_request("qb.php")
+        assert mock_get.call_count == 2
+
+    info = client.get_upstream_info()
+    assert info["bible.fhl.net"]["breaker"]["state"] == "open"
+    assert info["bible.fhl.net"]["breaker"]["rejected"] == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_5xx_counts_as_failure_and_probe_recovers():
+    """5xx 計入失敗；half-open 探測成功後恢復"""
+    client = FHLAPIClient(breaker_failure_threshold=1)
+    error_response = MagicMock()
+    error_response.status_code = 503
+    error_response.headers = {}
+    error_response.content = b""
+    error_response.text = "Service Unavailable"
+
+    with patch.object(client._client, "get", AsyncMock(return_value=error_response)):
+        with pytest.raises(Exception):
+            await client._make_request("qb.php")
+    assert client.guard.breaker.state == "open"
+
+    client.guard.breaker.opened_at -= 31
+    with patch.object(client._client, "get", AsyncMock(return_value=_ok_response())) as mock_get:
+        assert (await client._make_request("qb.php"))["status"] == "success"
+        # 使用自適應逾時
+        assert "timeout" in mock_get.call_args.kwargs
+    assert client.guard.breaker.state == "closed"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_limits_retries():
+    """預算用完時不再重試"""
+    client = FHLAPIClient(max_retries=3, retry_budget_ratio=0.0, breaker_failure_threshold=0)
+    client.guard.budget.tokens = 1
+
+    with patch.object(client._client, "get", side_effect=httpx.ReadTimeout("slow")) as mock_get, \
+         patch("asyncio.sleep", new_callable=AsyncMock):
+        with pytest.raises(NetworkError, match="retry budget exhausted"):
+            await client._make_request("qb.php")
+    assert mock_get.call_count == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_upstream_resource(tmp_path):
+    """info://upstream 顯示各主機狀態"""
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    router = ResourceRouter(api)
+
+    try:
+        result = await router.handle_resource("info://upstream")
+        host = result["content"]["bible.fhl.net"]
+        assert host["breaker"]["state"] == "closed"
+        assert host["timeout"]["max"] == config.api.timeout
+        assert "tokens" in host["retry_budget"]
+    finally:
+        await api.close()
+        reset_cache()
+
+
+def test_rate_limiter_reservations():
+    """超過 burst 後依速率排隊；429 暫停並降速，成功後逐步恢復"""
+    limiter = RateLimiter(rate=10.0, burst=2)
+    delays = [limiter.reserve() for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+    limiter.pause(5)
+    assert limiter.rate == 5.0
+    assert limiter.reserve() >= 4.9
+    for _ in range(100):
+        limiter.record_success()
+    assert limiter.rate == 10.0
+
+    assert RateLimiter(rate=0).reserve() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_queued_not_raised():
+    """短 Retry-After 排隊等待後重試；超過上限才拋出 RateLimitError"""
+    client = FHLAPIClient(max_retry_after=30.0)
+    throttled = MagicMock()
+    throttled.status_code = 429
+    throttled.headers = {"Retry-After": "3"}
+    throttled.content = b""
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    with patch.object(client._client, "get", AsyncMock(side_effect=[throttled, _ok_response()])) as mock_get, \
+         patch("asyncio.sleep", side_effect=fake_sleep):
+        assert (await client._make_request("qb.php"))["status"] == "success"
+
+    assert mock_get.call_count == 2
+    assert len(sleeps) == 1 and 2.9 <= sleeps[0] <= 3.0
+    assert client.get_upstream_info()["bible.fhl.net"]["rate_limit"]["throttled"] == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_per_endpoint_concurrency_limit():
+    """同一端點同時進行的請求數有上限"""
+    client = FHLAPIClient(max_concurrency_per_endpoint=2, rate_limit=0)
+    active = {"now": 0, "peak": 0}
+
+    async def slow_get(url, params=None, timeout=None):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return _ok_response()
+
+    with patch.object(client._client, "get", side_effect=slow_get):
+        await asyncio.gather(*(client._make_request("qb.php") for _ in range(6)))
+
+    assert active["peak"] == 2
+    await client.close()
+
+
+def test_parse_retry_after():
+    """Retry-After 支援秒數與 HTTP 日期"""
+    assert _parse_retry_after("5") == 5
+    assert _parse_retry_after(None) == 60
+    assert _parse_retry_after("soon") == 60
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=20), usegmt=True)
+    assert 17 <= _parse_retry_after(future) <= 20
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=20), usegmt=True)
+    assert _parse_retry_after(past) == 0
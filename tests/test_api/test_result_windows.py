@@ -0,0 +1,137 @@
+"""
+Test Search Result Windows
+
+Tests that paged searches fetch one block of results upstream and slice
+later pages from the server-side result window, and that search tools
+return a continuation cursor.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.tools import search as search_tools
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.output import decode_cursor, tool_call
+
+
+TOTAL = 500
+
+
+def _verse(i):
+    return {"chineses": "約", "engs": "John", "chap": 1 + i // 50, "sec": 1 + i % 50, "bible_text": f"愛{i}"}
+
+
+async def _search(endpoint, params=None):
+    """模擬支援 offset / limit 的搜尋 API"""
+    offset, limit = int(params.get("offset", 0)), int(params.get("limit", TOTAL))
+    return {
+        "status": "success",
+        "record_count": TOTAL,
+        "record": [_verse(i) for i in range(offset, min(offset + limit, TOTAL))],
+    }
+
+
+@pytest.fixture
+async def api(tmp_path):
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(side_effect=_search)
+    yield api
+    await api.close()
+    reset_cache()
+
+
+@pytest.mark.asyncio
+async def test_paging_through_results_is_one_upstream_call(api):
+    """翻閱 500 筆結果 (每頁 50 筆) 只查詢上游一次"""
+    seen = []
+    for offset in range(0, TOTAL, 50):
+        page = await api.search_bible("愛", limit=50, offset=offset)
+        assert page["record_count"] == TOTAL
+        seen.extend(record["bible_text"] for record in page["record"])
+
+    assert seen == [f"愛{i}" for i in range(TOTAL)]
+    assert api._make_request.await_count == 1
+    params = api._make_request.call_args.kwargs["params"]
+    assert (params["offset"], params["limit"]) == (0, 500)
+    assert api.result_windows.get_info()["hits"] == 9
+
+
+@pytest.mark.asyncio
+async def test_pages_span_blocks_and_survive_eviction(api):
+    """跨區塊的頁面合併兩個區塊；淘汰的區塊由快取重新載入"""
+    api.config.cache.result_window_size = 20
+
+    page = await api.search_apocrypha("愛", limit=10, offset=15)
+    assert [r["bible_text"] for r in page["record"]] == [f"愛{i}" for i in range(15, 25)]
+    assert [c.kwargs["params"]["offset"] for c in api._make_request.call_args_list] == [0, 20]
+
+    api.result_windows.ttl = 0
+    page = await api.search_apocrypha("愛", limit=5, offset=22)
+    assert [r["bible_text"] for r in page["record"]] == [f"愛{i}" for i in range(22, 27)]
+    assert api._make_request.await_count == 2
+
+    # 最後一頁：結果不足 limit
+    page = await api.search_apostolic_fathers("愛", limit=30, offset=490)
+    assert len(page["record"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_unlimited_search_is_one_unpaged_request(api):
+    """limit=None 時以一次不分頁的請求取得全部結果，不逐區塊查詢"""
+    api.config.cache.result_window_size = 20
+
+    everything = await api.search_bible("愛")
+    rest = await api.search_apocrypha("愛", offset=480)
+
+    assert len(everything["record"]) == TOTAL
+    assert [r["bible_text"] for r in rest["record"]] == [f"愛{i}" for i in range(480, TOTAL)]
+    assert api._make_request.await_count == 2
+    for call in api._make_request.call_args_list:
+        assert "limit" not in call.kwargs["params"]
+    assert [c.kwargs["params"]["offset"] for c in api._make_request.call_args_list] == [0, 480]
+
+
+@pytest.mark.asyncio
+async def test_commentary_search_sliced_from_one_response(api):
+    """ssc.php 沒有分頁：整個回應為一個區塊"""
+    api._make_request = AsyncMock(return_value={
+        "status": "success",
+        "record_count": 7,
+        "record": [{"id": i} for i in range(7)],
+    })
+
+    first = await api.search_commentary("愛", limit=3)
+    rest = await api.search_commentary("愛", limit=10, offset=3)
+    everything = await api.search_commentary("愛")
+
+    assert [r["id"] for r in first["record"]] == [0, 1, 2]
+    assert [r["id"] for r in rest["record"]] == [3, 4, 5, 6]
+    assert len(everything["record"]) == 7
+    assert api._make_request.await_count == 1
+    assert "offset" not in api._make_request.call_args.kwargs["params"]
+
+
+@pytest.mark.asyncio
+async def test_search_tool_returns_next_cursor(api, monkeypatch):
+    """搜尋工具在還有結果時返回下一頁游標 (參數中的 offset 已前進)"""
+    monkeypatch.setattr(search_tools, "get_endpoints", lambda: api)
+    arguments = {"query": "愛", "limit": 50}
+
+    with tool_call("search_bible", arguments):
+        result = await search_tools.search_bible(**arguments)
+    name, next_arguments, _ = decode_cursor(result["next_cursor"])
+    assert (name, next_arguments) == ("search_bible", {"query": "愛", "limit": 50, "offset": 50})
+
+    with tool_call("search_bible", next_arguments):
+        result = await search_tools.search_bible(**next_arguments)
+    assert result["results"][0]["text"] == "愛50"
+
+    last = await search_tools.search_bible("愛", limit=50, offset=450)
+    assert "next_cursor" not in last
+    assert api._make_request.await_count == 1
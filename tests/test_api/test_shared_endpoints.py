@@ -0,0 +1,128 @@
+"""
+Test Shared FHLAPIEndpoints Instance
+
+Tests for the process-wide shared endpoints instance and pooled HTTP client.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import (
+    FHLAPIEndpoints,
+    close_endpoints,
+    get_endpoints,
+    set_endpoints,
+)
+from fhl_bible_mcp.config import Config, reset_config
+from fhl_bible_mcp.tools.verse import get_bible_verse
+from fhl_bible_mcp.utils.cache import reset_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_in_tmp_path(tmp_path, monkeypatch):
+    """全域設定的快取目錄指向 tmp_path，不在工作目錄建立 .cache"""
+    monkeypatch.setenv("FHL_CACHE_DIR", str(tmp_path / "cache"))
+    reset_config()
+    reset_cache()
+    yield
+    reset_config()
+    reset_cache()
+
+
+@pytest.fixture(autouse=True)
+async def reset_shared_endpoints():
+    """每個測試前後重置共用實例"""
+    await close_endpoints()
+    yield
+    await close_endpoints()
+
+
+@pytest.mark.asyncio
+async def test_get_endpoints_returns_same_instance():
+    """同一個 event loop 內應取得同一個實例"""
+    api1 = get_endpoints()
+    api2 = get_endpoints()
+    
+    assert api1 is api2
+    assert not api1.is_closed
+
+
+@pytest.mark.asyncio
+async def test_close_endpoints_recreates_instance():
+    """關閉後再次取得應建立新的實例"""
+    api1 = get_endpoints()
+    await close_endpoints()
+    
+    assert api1.is_closed
+    
+    api2 = get_endpoints()
+    assert api2 is not api1
+    assert not api2.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pool_settings_from_config():
+    """連線池設定應來自 config.api"""
+    config = Config()
+    config.api.max_connections = 5
+    config.api.max_keepalive_connections = 2
+    config.api.http2 = False
+    config.cache.enabled = False
+    
+    api = FHLAPIEndpoints(config=config)
+    try:
+        pool = api._client._transport._pool
+        assert pool._max_connections == 5
+        assert pool._max_keepalive_connections == 2
+        assert api.http2 is False
+    finally:
+        await api.close()
+
+
+@pytest.mark.asyncio
+async def test_tools_use_shared_instance():
+    """Tools 應透過共用實例呼叫 API，而不是每次建立新的 client"""
+    config = Config()
+    config.cache.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    api.get_verse = AsyncMock(return_value={
+        "status": "success",
+        "record_count": 1,
+        "v_name": "FHL和合本",
+        "version": "unv",
+        "record": [{
+            "bid": 43, "engs": "John", "chineses": "約",
+            "chap": 3, "sec": 16, "bible_text": "神愛世人",
+        }],
+    })
+    set_endpoints(api)
+    
+    result = await get_bible_verse("約", 3, "16")
+    result2 = await get_bible_verse("John", 3, "16")
+    
+    assert result["verses"][0]["text"] == "神愛世人"
+    assert result2["record_count"] == 1
+    assert api.get_verse.await_count == 2
+    assert not api.is_closed
+
+
+def test_loop_change_closes_stale_instance():
+    """event loop 改變時建立新實例，並關閉綁定舊 loop 的實例 (釋放連線池)"""
+    import asyncio
+
+    async def first():
+        return get_endpoints()
+
+    async def second():
+        api = get_endpoints()
+        await asyncio.sleep(0.01)  # 讓關閉舊實例的 task 執行
+        return api
+
+    api1 = asyncio.run(first())
+    api2 = asyncio.run(second())
+    try:
+        assert api2 is not api1
+        assert api1.is_closed
+        assert not api2.is_closed
+    finally:
+        asyncio.run(close_endpoints())
@@ -0,0 +1,168 @@
+"""
+Test Stale-While-Revalidate and Serve-Stale-On-Error
+
+Tests that expired cache entries within cache.max_stale are served
+immediately while a bounded number of background tasks refresh them, and
+that older entries (within cache.stale_if_error) are returned with
+"stale": True when the upstream is unavailable.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.errors import APIResponseError, NetworkError
+
+
+def _upstream(delay=0.0):
+    """每次呼叫返回遞增版本號的模擬上游"""
+    calls = {"n": 0}
+
+    async def _request(endpoint, params=None):
+        calls["n"] += 1
+        n = calls["n"]
+        await asyncio.sleep(delay)
+        return {"status": "success", "n": n}
+    return AsyncMock(side_effect=_request)
+
+
+def _age(api, seconds):
+    """把兩層快取所有項目的快取時間往前移"""
+    for entry, _ in api.cache.memory._entries.values():
+        entry.cached_at -= seconds
+    with api.cache.backend._lock:
+        api.cache.backend._conn.execute(
+            "UPDATE cache_entries SET cached_at = cached_at - ?, expires_at = expires_at - ?",
+            (seconds, seconds)
+        )
+
+
+async def _wait_refreshes(api):
+    while api._refreshing:
+        await asyncio.gather(*api._refreshing, return_exceptions=True)
+
+
+@pytest.fixture
+async def api(tmp_path):
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.cache.max_stale = 3600
+    config.cache.max_background_refreshes = 4
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    yield api
+    await api.close()
+    reset_cache()
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing(api):
+    """過期項目立即返回，背景更新後返回新資料"""
+    api._make_request = _upstream(delay=0.2)
+    assert (await api.search_bible("愛"))["n"] == 1
+
+    _age(api, 24 * 3600 + 60)  # 超過 search 的 1 天 TTL
+
+    start = time.perf_counter()
+    stale = await api.search_bible("愛")
+    assert time.perf_counter() - start < 0.1
+    assert stale["n"] == 1
+    assert api.get_request_stats()["refreshes"] == 1
+    assert api.cache.stats["stale_hits"] == 1
+
+    # 更新進行中再次查詢不會重複更新
+    await api.search_bible("愛")
+    assert api.get_request_stats()["refreshes"] == 1
+
+    await _wait_refreshes(api)
+    assert (await api.search_bible("愛"))["n"] == 2
+    assert api._make_request.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_entry_past_max_stale_is_fetched(api):
+    """超過 max_stale 的項目改為同步查詢"""
+    api._make_request = _upstream()
+    await api.search_bible("愛")
+
+    _age(api, 24 * 3600 + 3601)
+
+    assert (await api.search_bible("愛"))["n"] == 2
+    assert api.get_request_stats()["refreshes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_limit(api):
+    """同時進行的背景更新數有上限"""
+    api.config.cache.max_background_refreshes = 1
+    api._make_request = _upstream(delay=0.1)
+    await api.search_bible("愛")
+    await api.search_bible("信")
+
+    _age(api, 24 * 3600 + 60)
+
+    await api.search_bible("愛")
+    await api.search_bible("信")
+
+    stats = api.get_request_stats()
+    assert stats["refreshes"] == 1
+    assert stats["refreshes_skipped"] == 1
+    await _wait_refreshes(api)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_entry(api):
+    """背景更新失敗時繼續提供過期資料"""
+    api._make_request = _upstream()
+    await api.search_bible("愛")
+    _age(api, 24 * 3600 + 60)
+
+    api._make_request = AsyncMock(side_effect=NetworkError("down"))
+    assert (await api.search_bible("愛"))["n"] == 1
+    await _wait_refreshes(api)
+    assert (await api.search_bible("愛"))["n"] == 1
+    assert api.get_request_stats()["refreshes"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [
+    NetworkError("Request timeout after 30s (max retries exceeded)"),
+    APIResponseError("API request failed", status_code=503),
+], ids=["timeout", "5xx"])
+async def test_stale_served_on_upstream_outage(api, error):
+    """超過 max_stale 但在 stale_if_error 內：上游失敗時返回標記 stale 的舊資料"""
+    api._make_request = _upstream()
+    await api.search_bible("愛")
+    _age(api, 24 * 3600 + 7200)
+
+    api._make_request = AsyncMock(side_effect=error)
+    result = await api.search_bible("愛")
+
+    assert result == {"status": "success", "n": 1, "stale": True}
+    assert api.get_request_stats()["stale_on_error"] == 1
+
+    # 快取中的資料不被修改，上游恢復後正常更新
+    api._make_request = _upstream()
+    assert await api.search_bible("愛") == {"status": "success", "n": 1}
+
+
+@pytest.mark.asyncio
+async def test_client_errors_and_missing_fallback_raise(api):
+    """4xx 不使用舊資料；超過 stale_if_error 的項目已不保留"""
+    api._make_request = _upstream()
+    await api.search_bible("愛")
+    _age(api, 24 * 3600 + 7200)
+
+    api._make_request = AsyncMock(side_effect=APIResponseError("API request failed", status_code=404))
+    with pytest.raises(APIResponseError):
+        await api.search_bible("愛")
+
+    _age(api, 7 * 24 * 3600)
+    api._make_request = AsyncMock(side_effect=NetworkError("down"))
+    with pytest.raises(NetworkError):
+        await api.search_bible("愛")
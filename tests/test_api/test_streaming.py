@@ -0,0 +1,167 @@
+"""
+Test Streaming Responses
+
+Tests for FHLAPIClient._stream_records and the opt-in streaming path
+(api.streaming) of FHLAPIEndpoints: incremental records, stopping early at
+the limit, retries before the body and caching of complete responses.
+"""
+
+import json
+import httpx
+import pytest
+
+from fhl_bible_mcp.api.client import FHLAPIClient
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.errors import APIResponseError, DataParseError
+from fhl_bible_mcp.utils.jsonstream import RecordStream
+
+
+ARTICLES = [
+    {"id": str(i), "title": f"第{i}篇", "author": "陳", "ptab": "women3", "txt": "<p>" + "字" * 300 + "</p>"}
+    for i in range(1, 21)
+]
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    """逐段送出回應內容，記錄被讀取的段數"""
+
+    def __init__(self, payload: bytes, size: int = 64):
+        self.chunks = [payload[i:i + size] for i in range(0, len(payload), size)]
+        self.sent = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+def _transport(bodies, statuses=None):
+    """依序返回 statuses 的狀態碼，最後以 ChunkedBody 返回內容"""
+    statuses = list(statuses or [])
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if statuses:
+            return httpx.Response(statuses.pop(0), content=b"")
+        return httpx.Response(200, stream=bodies.pop(0), headers={"content-type": "text/html"})
+
+    transport = httpx.MockTransport(handler)
+    transport.requests = requests
+    return transport
+
+
+def _body(document, size=64):
+    return ChunkedBody(json.dumps(document, ensure_ascii=False).encode("utf-8"), size)
+
+
+@pytest.fixture
+async def api(tmp_path):
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    config.api.streaming = True
+    config.api.retry_jitter = False
+    api = FHLAPIEndpoints(config=config)
+    yield api
+    await api.close()
+    reset_cache()
+
+
+@pytest.mark.asyncio
+async def test_client_streams_records_and_stops_early():
+    """停止迭代後不再讀取剩餘內容"""
+    body = _body({"status": 1, "record_count": 20, "record": ARTICLES})
+    client = FHLAPIClient(base_url="https://example.test/json/")
+    client._client = httpx.AsyncClient(transport=_transport([body]))
+    stream = RecordStream()
+
+    try:
+        generator = client._stream_records("https://www.example.test/api/json.php", {"title": "愛"}, stream)
+        records = []
+        async for record in generator:
+            records.append(record)
+            if len(records) == 2:
+                break
+        await generator.aclose()
+    finally:
+        await client.close()
+
+    assert [r["id"] for r in records] == ["1", "2"]
+    assert stream.meta == {"status": 1, "record_count": 20}
+    assert body.sent < len(body.chunks) // 4
+
+
+@pytest.mark.asyncio
+async def test_client_retries_before_body_and_rejects_invalid_json():
+    """內容開始前的 5xx 依一般規則重試；無效 JSON 拋出 DataParseError"""
+    transport = _transport([_body({"status": "success", "record": [1, 2]})], statuses=[503])
+    client = FHLAPIClient(base_url="https://example.test/json/", retry_jitter=False)
+    client._client = httpx.AsyncClient(transport=transport)
+
+    try:
+        assert [r async for r in client._stream_records("se.php", {"q": "愛"})] == [1, 2]
+        assert len(transport.requests) == 2
+
+        client._client = httpx.AsyncClient(transport=_transport([ChunkedBody(b"<html>oops</html>")]))
+        with pytest.raises(DataParseError):
+            [r async for r in client._stream_records("se.php", {"q": "愛"})]
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_raises_api_response_error_for_persistent_5xx():
+    """重試用盡的 5xx 與 _make_request 相同，拋出帶 status_code 的 APIResponseError"""
+    transport = _transport([], statuses=[503, 503])
+    client = FHLAPIClient(base_url="https://example.test/json/", max_retries=1, retry_jitter=False)
+    client._client = httpx.AsyncClient(transport=transport)
+
+    try:
+        with pytest.raises(APIResponseError) as streamed:
+            [r async for r in client._stream_records("se.php", {"q": "愛"})]
+        assert streamed.value.status_code == 503
+        assert len(transport.requests) == 2
+
+        client._client = httpx.AsyncClient(transport=_transport([], statuses=[503]))
+        client.max_retries = 0
+        with pytest.raises(APIResponseError) as buffered:
+            await client._make_request("se.php", {"q": "愛"})
+        assert buffered.value.status_code == streamed.value.status_code
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_streamed_articles_stop_at_limit(api):
+    """api.streaming: 只讀取 limit 篇文章，截斷的結果不寫入快取"""
+    body = _body({"status": 1, "record_count": 20, "record": ARTICLES})
+    api._client = httpx.AsyncClient(transport=_transport([body]))
+
+    result = await api.search_articles(author="陳", limit=3, include_content=False)
+
+    assert [a["id"] for a in result["record"]] == ["1", "2", "3"]
+    assert result["limited"] is True and result["record_count"] == 3
+    assert "txt" not in result["record"][0] and result["record"][0]["preview"].endswith("...")
+    assert body.sent < len(body.chunks)
+    assert api.cache.get_entries(namespace="articles") == []
+
+
+@pytest.mark.asyncio
+async def test_streamed_complete_response_is_cached(api):
+    """讀到結尾的回應寫入快取並記錄到文章索引；第二次不送出請求"""
+    transport = _transport([_body({"status": 1, "record_count": 2, "record": ARTICLES[:2]})])
+    api._client = httpx.AsyncClient(transport=transport)
+
+    first = await api.search_articles(author="陳", limit=5)
+    second = await api.search_articles(author="陳", limit=5)
+    narrower = await api.search_articles(author="陳", title="第2", include_content=False)
+
+    assert first == second
+    assert [a["id"] for a in first["record"]] == ["1", "2"]
+    assert "limited" not in first
+    assert [a["id"] for a in narrower["record"]] == ["2"]
+    assert len(transport.requests) == 1
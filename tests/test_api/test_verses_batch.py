@@ -0,0 +1,185 @@
+"""
+Test Batch Verse Retrieval
+
+Tests for FHLAPIEndpoints.get_verses_batch and the get_bible_verses_batch tool.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints, set_endpoints, close_endpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.tools.verse import get_bible_verses_batch
+from fhl_bible_mcp.utils.cache import reset_cache
+
+
+def _chapter(params):
+    """模擬 qb.php 整章回應 (每章 20 節)"""
+    return {
+        "status": "success",
+        "record_count": 20,
+        "v_name": "FHL和合本",
+        "version": params["version"],
+        "proc": 0,
+        "record": [
+            {
+                "bid": params["bid"],
+                "engs": "John",
+                "chineses": "約",
+                "chap": params["chap"],
+                "sec": sec,
+                "bible_text": f"{params['bid']}-{params['chap']}:{sec}",
+            }
+            for sec in range(1, 21)
+        ],
+    }
+
+
+def _qb(delay=0.0):
+    async def _request(endpoint, params=None):
+        await asyncio.sleep(delay)
+        return _chapter(params)
+    return AsyncMock(side_effect=_request)
+
+
+@pytest.fixture
+async def api(tmp_path):
+    """建立不使用本地快照的 API 實例"""
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    yield api
+    await api.close()
+    reset_cache()
+
+
+@pytest.mark.asyncio
+async def test_batch_groups_by_chapter_and_keeps_order(api):
+    """同一章只查詢一次，結果依輸入順序"""
+    api._make_request = _qb()
+
+    results = await api.get_verses_batch([
+        "約 3:16",
+        "John 1:1-3",
+        {"book": "約", "chapter": 3, "verse": "1,3"},
+        "約 3",
+    ])
+
+    assert api._make_request.await_count == 2
+    assert [r["status"] for r in results] == ["success"] * 4
+    assert [rec["bible_text"] for rec in results[0]["record"]] == ["43-3:16"]
+    assert [rec["sec"] for rec in results[1]["record"]] == [1, 2, 3]
+    assert [rec["sec"] for rec in results[2]["record"]] == [1, 3]
+    assert len(results[3]["record"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_invalid_references(api):
+    """無法解析的引用回報錯誤，不影響其他引用"""
+    api._make_request = _qb()
+
+    results = await api.get_verses_batch(["不存在 3:16", "約", "約 3:x", "羅 8:18"])
+
+    assert [r["status"] for r in results] == ["error", "error", "error", "success"]
+    assert "Book not found" in results[0]["error"]
+    assert results[3]["record"][0]["sec"] == 18
+    assert api._make_request.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_failed_chapters_and_missing_verses(api):
+    """上游錯誤、沒有 record 的章與找不到經文的引用都回報錯誤，不當成空的成功結果"""
+    async def _request(endpoint, params=None):
+        if params["chap"] == 99:
+            return {"status": "error", "message": "章數超出範圍"}
+        if params["chap"] == 98:
+            return {"status": "success", "record_count": 0}
+        return _chapter(params)
+    api._make_request = AsyncMock(side_effect=_request)
+
+    results = await api.get_verses_batch(["約 99:1", "約 98:1", "約 3:25", "約 3:19-99:1", "約 3:16"])
+
+    assert [r["status"] for r in results] == ["error", "error", "error", "error", "success"]
+    assert "章數超出範圍" in results[0]["error"]
+    assert "98" in results[1]["error"]
+    assert "找不到" in results[2]["error"]
+    assert "查詢失敗" in results[3]["error"]
+    assert "record" not in results[0]
+
+
+@pytest.mark.asyncio
+async def test_batch_fetches_chapters_concurrently(api):
+    """30 個不同章的引用約等於一次往返時間"""
+    api._make_request = _qb(delay=0.1)
+
+    start = time.perf_counter()
+    results = await api.get_verses_batch(
+        [f"詩 {chap}:1" for chap in range(1, 31)], max_concurrency=30
+    )
+    elapsed = time.perf_counter() - start
+
+    assert api._make_request.await_count == 30
+    assert all(r["status"] == "success" for r in results)
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_get_bible_verses_batch_tool(api):
+    """工具層格式化批次結果"""
+    api._make_request = _qb()
+    set_endpoints(api)
+
+    try:
+        result = await get_bible_verses_batch(["約 3:16-17", "xyz"])
+    finally:
+        await close_endpoints()
+
+    assert result["count"] == 2
+    assert result["error_count"] == 1
+    assert result["results"][0]["record_count"] == 2
+    assert result["results"][0]["verses"][0]["text"] == "43-3:16"
+    assert "error" in result["results"][1]
+
+
+@pytest.mark.asyncio
+async def test_batch_multi_chapter_citations(api):
+    """多段與跨章引用每章只查詢一次，經文依引用順序合併"""
+    api._make_request = _qb()
+
+    results = await api.get_verses_batch(["約 3:19-4:2", "約3:16;4:1"])
+
+    assert api._make_request.await_count == 2
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert [(rec["chap"], rec["sec"]) for rec in results[0]["record"]] == [
+        (3, 19), (3, 20), (4, 1), (4, 2)
+    ]
+    assert results[0]["spans"] == [[43, 3, 19, None], [43, 4, 1, 2]]
+    assert [(rec["chap"], rec["sec"]) for rec in results[1]["record"]] == [(3, 16), (4, 1)]
+
+
+@pytest.mark.asyncio
+async def test_query_verse_citation_tool(api):
+    """單章引用沿用 get_bible_verse 格式，多段引用合併經文"""
+    from fhl_bible_mcp.tools.verse import query_verse_citation
+
+    api._make_request = _qb()
+    set_endpoints(api)
+
+    try:
+        single = await query_verse_citation("約3:16-17")
+        multi = await query_verse_citation("約3:16;羅5:8")
+    finally:
+        await close_endpoints()
+
+    assert single["record_count"] == 2
+    assert [v["verse"] for v in single["verses"]] == [16, 17]
+    assert multi["record_count"] == 2
+    assert [v["text"] for v in multi["verses"]] == ["43-3:16", "45-5:8"]
+    assert multi["chapters"] == [
+        {"book_id": 43, "chapter": 3, "verse": "16"},
+        {"book_id": 45, "chapter": 5, "verse": "8"},
+    ]
@@ -143,7 +143,7 @@ async def test_config_cascade_integration():
 
 
 @pytest.mark.asyncio
-async def test_cache_config_integration():
+async def test_cache_config_integration(tmp_path):
     """
     Test 4: 快取與配置整合測試
     """
@@ -158,7 +158,7 @@ async def test_cache_config_integration():
     # config.update("cache", "ttl", 300)
     
     # 2. 創建快取
-    cache = FileCache(cache_dir=".cache/integration_test")
+    cache = FileCache(cache_dir=str(tmp_path / "integration_test"))
     
     # 3. 測試快取策略 (FileCache.set() 參數: namespace, key, data, strategy_name)
     cache.set("test", "test_key", {"data": "test_value"}, strategy_name="ttl")
@@ -296,7 +296,7 @@ if __name__ == "__main__":
     asyncio.run(test_full_verse_query_workflow())
     asyncio.run(test_chinese_support_integration())
     asyncio.run(test_config_cascade_integration())
-    asyncio.run(test_cache_config_integration())
+    asyncio.run(test_cache_config_integration(Path(tempfile.mkdtemp(prefix="cache_test_"))))
     asyncio.run(test_error_recovery_integration())
     asyncio.run(test_multi_component_workflow())
     
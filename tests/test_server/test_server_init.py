@@ -5,7 +5,20 @@ Tests for server initialization and component registration.
 """
 
 import pytest
+from fhl_bible_mcp.config import reset_config
 from fhl_bible_mcp.server import FHLBibleServer
+from fhl_bible_mcp.utils.cache import reset_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_in_tmp_path(tmp_path, monkeypatch):
+    """全域設定的快取目錄指向 tmp_path，不在工作目錄建立 .cache"""
+    monkeypatch.setenv("FHL_CACHE_DIR", str(tmp_path / "cache"))
+    reset_config()
+    reset_cache()
+    yield
+    reset_config()
+    reset_cache()
 
 
 @pytest.mark.asyncio
@@ -33,10 +33,10 @@ async def test_search_bible_keyword():
         ]
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         result = await search_bible(query="愛", search_type="keyword", scope="all")
         
@@ -58,10 +58,10 @@ async def test_search_bible_count_only():
         "record": []
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         result = await search_bible(query="神", count_only=True)
         
@@ -87,10 +87,10 @@ async def test_search_bible_greek_strong():
         ]
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         result = await search_bible(query="G3056", search_type="greek_number", scope="nt")
         
@@ -116,10 +116,10 @@ async def test_search_bible_hebrew_strong():
         ]
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         result = await search_bible(query="H1254", search_type="hebrew_number", scope="ot")
         
@@ -162,10 +162,10 @@ async def test_search_bible_with_pagination():
         ]
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         result = await search_bible(query="神", limit=10, offset=20)
         
@@ -191,10 +191,10 @@ async def test_search_bible_advanced_no_range():
         ]
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         # 不提供範圍
         result = await search_bible_advanced(query="道")
@@ -220,10 +220,10 @@ async def test_search_bible_advanced_with_range():
         ]
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         with patch('src.fhl_bible_mcp.tools.search.BookNameConverter') as mock_converter:
             mock_converter.get_book_id = MagicMock(side_effect=[1, 5])  # 創世記=1, 申命記=5
@@ -305,10 +305,10 @@ async def test_search_bible_result_formatting():
         ]
     }
     
-    with patch('src.fhl_bible_mcp.tools.search.FHLAPIEndpoints') as mock_api_class:
+    with patch('src.fhl_bible_mcp.tools.search.get_endpoints') as mock_get_endpoints:
         mock_api_instance = AsyncMock()
         mock_api_instance.search_bible = AsyncMock(return_value=mock_response)
-        mock_api_class.return_value.__aenter__.return_value = mock_api_instance
+        mock_get_endpoints.return_value = mock_api_instance
         
         result = await search_bible(query="福")
         
@@ -408,6 +408,42 @@ def test_case_insensitive_english():
     print("✅ Case insensitive English works")
 
 
+def test_precomputed_name_table():
+    """
+    Test 13: 預先建立的名稱查詢表
+    測試次經、使徒教父名稱、簡體形式與後綴索引的模糊搜尋
+    """
+    print("\n" + "="*70)
+    print("Test 13: Precomputed Name Table")
+    print("="*70)
+    
+    from fhl_bible_mcp.utils.booknames import _name_table, _matching_books
+    
+    # 次經與使徒教父
+    assert BookNameConverter.get_book_id("Sirach") == 106
+    assert BookNameConverter.get_book_id("十二使徒遺訓") == 207
+    assert BookNameConverter.get_english_short("革利免前書") == "1Clem"
+    assert BookNameConverter.normalize_book_name("十二使徒遺訓") == "十訓"
+    
+    # 簡體形式預先收錄，但不是正式名稱
+    assert "约翰福音" in _name_table
+    assert BookNameConverter.normalize_book_name("约翰福音") == "約"
+    assert BookNameConverter.get_book_id("约翰福音") is None
+    
+    # 別名不覆蓋正式名稱 ("雅" 為雅各書的簡寫)
+    assert BookNameConverter.normalize_book_name("雅") == "雅"
+    
+    # 子字串比對：同一書卷只取最先符合的欄位
+    matches = _matching_books("macc")
+    assert len(matches) == 2
+    assert all(rank == 0 for rank in matches.values())
+    results = BookNameConverter.fuzzy_search("maccabees")
+    assert [r["id"] for r in results] == [103, 104]
+    assert results[0]["match_type"] == "eng_full_contains"
+    
+    print("✅ Precomputed name table works")
+
+
 # ============================================================================
 # Test Runner
 # ============================================================================
@@ -431,6 +467,7 @@ if __name__ == "__main__":
         ("All Books List", test_all_books_list),
         ("Edge Cases", test_edge_cases),
         ("Case Insensitive", test_case_insensitive_english),
+        ("Precomputed Name Table", test_precomputed_name_table),
     ]
     
     passed = 0
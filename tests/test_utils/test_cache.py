@@ -8,10 +8,15 @@ import pytest
 import time
 import json
 from pathlib import Path
+from fhl_bible_mcp.config import CacheConfig
 from fhl_bible_mcp.utils.cache import (
     FileCache,
+    MemoryCache,
     CacheStrategy,
     CacheEntry,
+    SQLiteBackend,
+    make_cache_key,
+    migrate_file_cache,
     get_cache,
     reset_cache
 )
@@ -27,9 +32,9 @@ def temp_cache_dir(tmp_path):
 
 @pytest.fixture
 def cache(temp_cache_dir):
-    """建立測試用的快取實例"""
+    """建立測試用的快取實例 (JSON 檔案持久層)"""
     reset_cache()  # 重置全域快取
-    return FileCache(cache_dir=str(temp_cache_dir))
+    return FileCache(cache_dir=str(temp_cache_dir), backend="file")
 
 
 def test_cache_strategy_permanent():
@@ -183,8 +188,10 @@ def test_file_cache_expiry(cache):
     data = cache.get("test", "expiring_key", strategy_name="search")
     assert data is None, "Expired cache should return None"
     
-    # 檔案應該被刪除
-    assert not cache_file.exists(), "Expired cache file should be deleted"
+    # 讀取不刪除檔案 (上游失敗時的備援)，由 cleanup_expired 清理
+    assert cache_file.exists(), "Expired cache file should be kept until cleanup"
+    assert cache.cleanup_expired() == 1
+    assert not cache_file.exists()
     
     print("✅ Cache expiry works correctly")
 
@@ -345,7 +352,7 @@ def test_cache_entries(cache):
     print(f"✅ Cache entries list works")
 
 
-def test_global_cache():
+def test_global_cache(temp_cache_dir):
     """
     Test 11: 全域快取實例
     測試全域快取取得函數
@@ -356,14 +363,381 @@ def test_global_cache():
     
     reset_cache()
     
-    cache1 = get_cache()
-    cache2 = get_cache()
+    cache1 = get_cache(cache_dir=str(temp_cache_dir))
+    cache2 = get_cache(cache_dir=str(temp_cache_dir))
     
     assert cache1 is cache2, "Should return same instance"
     
     print("✅ Global cache instance works")
 
 
+def test_memory_cache_lru_eviction():
+    """
+    Test 12: 記憶體層 LRU 淘汰
+    測試超過項目數上限時淘汰最久未使用的項目
+    """
+    memory = MemoryCache(max_entries=2, max_bytes=1024)
+    strategy = CacheStrategy(ttl_seconds=None)
+    
+    for name in ("a", "b"):
+        memory.set(f"ns:{name}", CacheEntry(f"ns:{name}", name, time.time(), strategy), 10)
+    
+    # 讀取 a 讓它變成最近使用
+    assert memory.get("ns:a") is not None
+    
+    memory.set("ns:c", CacheEntry("ns:c", "c", time.time(), strategy), 10)
+    
+    assert memory.get("ns:b") is None, "Least recently used entry should be evicted"
+    assert memory.get("ns:a") is not None
+    assert memory.get("ns:c") is not None
+    assert memory.stats["evictions"] == 1
+    
+    print("✅ Memory cache LRU eviction works")
+
+
+def test_memory_cache_byte_limit():
+    """
+    Test 13: 記憶體層位元組上限
+    測試依估計位元組數淘汰，以及過大的項目不放入記憶體層
+    """
+    memory = MemoryCache(max_entries=100, max_bytes=100)
+    strategy = CacheStrategy(ttl_seconds=None)
+    
+    memory.set("ns:a", CacheEntry("ns:a", "a", time.time(), strategy), 60)
+    memory.set("ns:b", CacheEntry("ns:b", "b", time.time(), strategy), 60)
+    
+    assert len(memory) == 1
+    assert memory.size_bytes == 60
+    assert memory.get("ns:b") is not None
+    
+    memory.set("ns:big", CacheEntry("ns:big", "x", time.time(), strategy), 500)
+    assert memory.get("ns:big") is None, "Oversized entry should not be kept in memory"
+    
+    print("✅ Memory cache byte limit works")
+
+
+def test_memory_cache_respects_ttl():
+    """
+    Test 14: 記憶體層 TTL
+    測試記憶體層中的過期項目不會被返回
+    """
+    memory = MemoryCache()
+    entry = CacheEntry("ns:old", "old", time.time() - 100, CacheStrategy(ttl_seconds=1))
+    memory.set("ns:old", entry, 10)
+    
+    assert memory.get("ns:old") is None
+    assert len(memory) == 0
+    
+    print("✅ Memory cache respects TTL")
+
+
+def test_two_tier_memory_hit(cache):
+    """
+    Test 15: 兩層快取 - 記憶體命中
+    測試寫入後的讀取不需要讀檔
+    """
+    cache.set("verses", "john3", {"text": "神愛世人"}, "verses")
+    
+    # 移除檔案，確認資料由記憶體層提供
+    cache_file = cache._get_cache_file(cache._get_cache_key("verses", "john3"))
+    cache_file.unlink()
+    
+    assert cache.get("verses", "john3", "verses") == {"text": "神愛世人"}
+    
+    info = cache.get_info()
+    assert info["tiers"]["memory"]["hits"] == 1
+    assert info["tiers"]["disk"]["hits"] == 0
+    
+    print("✅ Memory tier serves hot entries without touching the filesystem")
+
+
+def test_two_tier_promotion(temp_cache_dir):
+    """
+    Test 16: 兩層快取 - 從檔案層提升
+    測試檔案層命中後提升到記憶體層
+    """
+    FileCache(cache_dir=str(temp_cache_dir)).set("verses", "ps23", {"text": "耶和華是我的牧者"}, "verses")
+    
+    # 新實例的記憶體層是空的
+    cache = FileCache(cache_dir=str(temp_cache_dir))
+    assert cache.get("verses", "ps23", "verses") is not None
+    assert cache.get("verses", "ps23", "verses") is not None
+    
+    info = cache.get_info()
+    assert info["tiers"]["disk"]["hits"] == 1
+    assert info["tiers"]["memory"]["hits"] == 1
+    assert info["stats"]["hits"] == 2
+    
+    # 清除命名空間也會清除記憶體層
+    cache.clear(namespace="verses")
+    assert cache.get("verses", "ps23", "verses") is None
+    
+    print("✅ Disk hits are promoted to the memory tier")
+
+
+def test_memory_tier_disabled(temp_cache_dir):
+    """
+    Test 17: 停用記憶體層
+    """
+    cache = FileCache(cache_dir=str(temp_cache_dir), memory_max_entries=0)
+    assert cache.memory is None
+    
+    cache.set("test", "key", {"value": 1})
+    assert cache.get("test", "key") == {"value": 1}
+    assert "memory" not in cache.get_info()["tiers"]
+    
+    print("✅ Memory tier can be disabled")
+
+@pytest.fixture
+def sqlite_cache(temp_cache_dir):
+    """建立使用 SQLite 持久層的快取實例（停用記憶體層以直接測試持久層）"""
+    cache = FileCache(cache_dir=str(temp_cache_dir), memory_max_entries=0, backend="sqlite")
+    yield cache
+    cache.close()
+
+
+def test_sqlite_backend_basic(sqlite_cache):
+    """
+    Test 18: SQLite 持久層 - 基本操作
+    """
+    sqlite_cache.set("verses", "john3:16", {"text": "神愛世人"}, "verses")
+    
+    assert (Path(sqlite_cache.cache_dir) / SQLiteBackend.DB_FILENAME).exists()
+    assert not list(Path(sqlite_cache.cache_dir).glob("*.json"))
+    assert sqlite_cache.get("verses", "john3:16", "verses") == {"text": "神愛世人"}
+    assert sqlite_cache.get("verses", "missing", "verses") is None
+    
+    assert sqlite_cache.delete("verses", "john3:16")
+    assert not sqlite_cache.delete("verses", "john3:16")
+    assert sqlite_cache.get("verses", "john3:16", "verses") is None
+    
+    print("✅ SQLite backend basic operations work")
+
+
+def test_sqlite_backend_expiry_and_cleanup(sqlite_cache):
+    """
+    Test 19: SQLite 持久層 - 過期與清理
+    """
+    sqlite_cache.STRATEGIES = {**FileCache.STRATEGIES, "short": 1}
+    sqlite_cache.set("search", "old1", {"value": 1}, "short")
+    sqlite_cache.set("search", "old2", {"value": 2}, "short")
+    sqlite_cache.set("strongs", "G26", {"value": 3}, "strongs")
+    
+    time.sleep(1.1)
+    
+    assert sqlite_cache.get_info()["expired_count"] == 2
+    assert sqlite_cache.get("search", "old1", "short") is None
+    assert sqlite_cache.cleanup_expired(grace_seconds=3600) == 0
+    assert sqlite_cache.cleanup_expired() == 2
+    assert sqlite_cache.get("strongs", "G26", "strongs") == {"value": 3}
+    
+    info = sqlite_cache.get_info()
+    assert info["backend"] == "sqlite"
+    assert info["total_files"] == 1
+    assert info["expired_count"] == 0
+    
+    print("✅ SQLite backend expiry and cleanup work")
+
+
+def test_sqlite_backend_clear_and_info(sqlite_cache):
+    """
+    Test 20: SQLite 持久層 - 依命名空間清除與統計
+    """
+    for i in range(3):
+        sqlite_cache.set("verses", f"v{i}", {"value": i}, "verses")
+    sqlite_cache.set("search", "love", {"value": "love"}, "search")
+    
+    info = sqlite_cache.get_info()
+    assert info["namespaces"] == {"verses": 3, "search": 1}
+    assert info["total_size_bytes"] > 0
+    assert len(sqlite_cache.get_entries(namespace="verses")) == 3
+    
+    assert sqlite_cache.clear(namespace="verses") == 3
+    assert sqlite_cache.get_info()["namespaces"] == {"search": 1}
+    assert sqlite_cache.clear() == 1
+    
+    print("✅ SQLite backend namespace clear and info work")
+
+
+def test_migrate_file_cache(temp_cache_dir):
+    """
+    Test 21: JSON 檔案快取遷移到 SQLite
+    """
+    file_cache = FileCache(cache_dir=str(temp_cache_dir), backend="file")
+    file_cache.set("verses", "john3:16", {"text": "神愛世人"}, "verses")
+    file_cache.set("strongs", "G26", {"word": "agape"}, "strongs")
+    
+    # 手動寫入一個過期項目
+    expired = CacheEntry("search", {"value": 1}, time.time() - 10, CacheStrategy(ttl_seconds=1))
+    expired.key = "search:old"
+    with open(file_cache._get_cache_file("search:old"), "w", encoding="utf-8") as f:
+        json.dump(expired.to_dict(), f)
+    
+    backend = SQLiteBackend(temp_cache_dir / SQLiteBackend.DB_FILENAME)
+    result = migrate_file_cache(str(temp_cache_dir), backend, delete_source=True)
+    backend.close()
+    
+    assert result == {"migrated": 2, "skipped_expired": 1, "errors": 0}
+    assert len(list(temp_cache_dir.rglob("*.fhc"))) == 1  # 過期項目保留不動
+    
+    sqlite_cache = FileCache(cache_dir=str(temp_cache_dir), backend="sqlite")
+    assert sqlite_cache.get("verses", "john3:16", "verses") == {"text": "神愛世人"}
+    assert sqlite_cache.get("strongs", "G26", "strongs") == {"word": "agape"}
+    sqlite_cache.close()
+    
+    print("✅ JSON file cache migrates to SQLite")
+
+
+def test_sqlite_backend_warns_about_file_cache(temp_cache_dir, caplog):
+    """
+    Test 21b: 使用 SQLite 持久層時，目錄下有 JSON 檔案快取則提示遷移
+    """
+    sqlite_cache = FileCache(cache_dir=str(temp_cache_dir), backend="sqlite")
+    sqlite_cache.close()
+    assert "migrate-cache" not in caplog.text
+
+    file_cache = FileCache(cache_dir=str(temp_cache_dir), backend="file")
+    file_cache.set("verses", "john3:16", {"text": "神愛世人"}, "verses")
+    sqlite_cache = FileCache(cache_dir=str(temp_cache_dir), backend="sqlite")
+    sqlite_cache.close()
+    assert "migrate-cache" in caplog.text
+
+
+def test_default_backend_matches_config(temp_cache_dir):
+    """
+    Test 21c: FileCache 與 get_cache 的預設持久層與 CacheConfig.backend 相同
+    """
+    reset_cache()
+    cache = FileCache(cache_dir=str(temp_cache_dir / "direct"))
+    assert cache.backend.name == CacheConfig().backend
+    cache.close()
+
+    assert get_cache(cache_dir=str(temp_cache_dir / "global")).backend.name == CacheConfig().backend
+    reset_cache()
+
+
+def test_unknown_backend(temp_cache_dir):
+    """
+    Test 22: 未知的持久層類型
+    """
+    with pytest.raises(ValueError):
+        FileCache(cache_dir=str(temp_cache_dir), backend="redis")
+
+
+def test_get_entry_max_stale(sqlite_cache):
+    """
+    Test 23: 過期但在 max_stale 內的項目仍可取得 (stale-while-revalidate)
+    """
+    sqlite_cache.STRATEGIES = {**FileCache.STRATEGIES, "short": 1}
+    sqlite_cache.set("search", "love", {"n": 1}, "short")
+    time.sleep(1.1)
+
+    entry = sqlite_cache.get_entry("search", "love", max_stale=60)
+    assert entry is not None and not entry.is_valid()
+    assert entry.data == {"n": 1}
+    assert sqlite_cache.stats["stale_hits"] == 1
+
+    # 一般讀取視為未命中，但不刪除 (stale_if_error 備援仍可使用)
+    assert sqlite_cache.get("search", "love", "short") is None
+    assert sqlite_cache.get_entry("search", "love", max_stale=60).data == {"n": 1}
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_cleanup_expired_keeps_stale_if_error_window(temp_cache_dir, backend):
+    """
+    Test 23b: cleanup_expired 只清理過期超過保留期限 (stale_if_error) 的項目
+    """
+    cache = FileCache(cache_dir=str(temp_cache_dir), backend=backend)
+    for key, age in (("recent", 2 * 3600), ("old", 9 * 24 * 3600)):
+        entry = CacheEntry(f"search:{key}", {"key": key}, time.time() - age,
+                           CacheStrategy(ttl_seconds=3600))
+        cache.backend.write(entry.key, entry)
+        cache.memory.set(entry.key, entry, 10)
+
+    assert cache.cleanup_expired(grace_seconds=7 * 24 * 3600) == 1
+    assert cache.get_entry("search", "recent", max_stale=7 * 24 * 3600).data == {"key": "recent"}
+    assert cache.get_entry("search", "old", max_stale=7 * 24 * 3600) is None
+    assert cache.backend.read("search:old") is None
+
+    assert cache.cleanup_expired() == 1
+    assert cache.backend.read("search:recent") is None
+    cache.close()
+
+
+def test_make_cache_key():
+    """
+    Test 24: 快取鍵 - 常用端點走 tuple 路徑，其他端點走排序 JSON
+    """
+    key = make_cache_key("qb.php", {"bid": 43, "chap": 3, "version": "unv", "strong": 0})
+    assert len(key) == 32 and int(key, 16) >= 0
+    assert key == make_cache_key("qb.php", {"strong": 0, "version": "unv", "chap": 3, "bid": 43})
+    assert key != make_cache_key("qb.php", {"bid": 43, "chap": 4, "version": "unv", "strong": 0})
+    assert key != make_cache_key("qb.php", {"bid": 43, "chap": 3, "version": "unv", "strong": 0, "sec": "16"})
+
+    # 未知參數與其他端點
+    assert make_cache_key("qb.php", {"bid": 43, "extra": 1}) == make_cache_key("qb.php", {"extra": 1, "bid": 43})
+    assert make_cache_key("sc.php", {"a": 1, "b": 2}) == make_cache_key("sc.php", {"b": 2, "a": 1})
+    assert make_cache_key("sd.php", {"N": "0", "k": 26}) != make_cache_key("sc.php", {"N": "0", "k": 26})
+
+
+def test_sharded_file_layout(temp_cache_dir):
+    """
+    Test 25: JSON 檔案分散到兩層子目錄；舊的單層檔案自動搬移
+    """
+    cache = FileCache(cache_dir=str(temp_cache_dir), memory_max_entries=0, backend="file")
+    key = make_cache_key("sd.php", {"N": "0", "k": 26})
+    cache.set("strongs", key, {"word": "agape"}, "strongs")
+    cache.set("verses", "john3:16", {"text": "神愛世人"}, "verses")
+
+    # 摘要鍵直接作為檔名，不再雜湊
+    path = cache._get_cache_file(cache._get_cache_key("strongs", key))
+    assert path == temp_cache_dir / key[:2] / key[2:4] / f"strongs-{key}.fhc"
+    assert path.exists()
+    assert len(list(temp_cache_dir.glob("*/*/*.fhc"))) == 2
+    assert not list(temp_cache_dir.glob("*.fhc"))
+    assert cache.get_info()["total_files"] == 2
+
+    # 模擬舊版單層目錄的 JSON 檔案
+    legacy = temp_cache_dir / "0123456789abcdef0123456789abcdef.json"
+    legacy.write_text(json.dumps(CacheEntry.from_dict({
+        "key": f"strongs:{key}", "data": {"word": "agape"}, "cached_at": time.time(), "ttl_seconds": None
+    }).to_dict()))
+    path.unlink()
+    cache = FileCache(cache_dir=str(temp_cache_dir), memory_max_entries=0, backend="file")
+    assert not legacy.exists() and path.exists()
+    assert cache.get("strongs", key, "strongs") == {"word": "agape"}
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_compact_binary_format(temp_cache_dir, backend):
+    """
+    Test 26: 二進位標頭 + compact JSON；大型內容壓縮，過期太久的項目不解碼內容
+    """
+    cache = FileCache(cache_dir=str(temp_cache_dir), memory_max_entries=0, backend=backend)
+    large = {"record": [{"com_text": "神愛世人，甚至將他的獨生子賜給他們。" * 20, "sec": i} for i in range(20)]}
+    raw_size = len(json.dumps(large, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    cache.set("commentary", "john3", large, "commentary")
+    cache.set("verses", "john3:16", {"text": "神愛世人"}, "verses")
+    assert cache.get("commentary", "john3", "commentary") == large
+    assert cache.get("verses", "john3:16", "verses") == {"text": "神愛世人"}
+    assert cache.get_info()["total_size_bytes"] < raw_size / 4
+
+    if backend == "file":
+        path = cache._get_cache_file(cache._get_cache_key("commentary", "john3"))
+        assert path.read_bytes()[:4] == b"FHLC"
+
+    # 過期超過 max_stale：只讀標頭就判斷，不解碼內容
+    entry, _ = cache.backend.read(cache._get_cache_key("verses", "john3:16"), max_stale=0)
+    assert entry.data == {"text": "神愛世人"}
+    entry.cached_at -= 8 * 24 * 3600
+    cache.backend.write(entry.key, entry)
+    stale, size = cache.backend.read(entry.key, max_stale=3600)
+    assert stale.data is None and size == 0
+    assert cache.get_entry("verses", "john3:16", max_stale=3600) is None
+    cache.close()
+
+
 # ============================================================================
 # Test Runner
 # ============================================================================
@@ -383,7 +757,7 @@ if __name__ == "__main__":
         cache_dir = temp_dir / "test_cache"
         cache_dir.mkdir()
         
-        cache = FileCache(cache_dir=str(cache_dir))
+        cache = FileCache(cache_dir=str(cache_dir), backend="file")
         
         tests = [
             ("Cache Strategy - Permanent", test_cache_strategy_permanent),
@@ -396,7 +770,10 @@ if __name__ == "__main__":
             ("Cleanup Expired", lambda: test_cleanup_expired(cache)),
             ("Cache Info", lambda: test_cache_info(cache)),
             ("Cache Entries", lambda: test_cache_entries(cache)),
-            ("Global Cache", test_global_cache),
+            ("Global Cache", lambda: test_global_cache(cache_dir)),
+            ("Memory LRU Eviction", test_memory_cache_lru_eviction),
+            ("Memory Byte Limit", test_memory_cache_byte_limit),
+            ("Memory TTL", test_memory_cache_respects_ttl),
         ]
         
         passed = 0
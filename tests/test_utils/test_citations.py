@@ -0,0 +1,96 @@
+"""
+Test Citation Parsing
+
+Tests for the shared scripture citation parser: single references, verse
+lists, chapter and cross-chapter ranges, multi-reference strings, and error
+reporting.
+"""
+
+import pytest
+
+from fhl_bible_mcp.utils.citations import (
+    VerseSpan,
+    chapter_fetches,
+    parse_citations,
+    verse_spans,
+    verse_spec,
+)
+from fhl_bible_mcp.utils.errors import BookNotFoundError, InvalidParameterError
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("約 3:16", [(43, 3, 16, 16)]),
+    ("約3:16", [(43, 3, 16, 16)]),
+    ("John 3.16", [(43, 3, 16, 16)]),
+    ("1 Cor. 13:4-7", [(46, 13, 4, 7)]),
+    ("1John 1:9", [(62, 1, 9, 9)]),
+    ("cor1 3:16", [(46, 3, 16, 16)]),
+    ("约翰福音 3:16", [(43, 3, 16, 16)]),
+    ("43 3:16", [(43, 3, 16, 16)]),
+    ("太 5：3～10", [(40, 5, 3, 10)]),
+    ("詩 23", [(19, 23, None, None)]),
+    ("詩 23-24", [(19, 23, None, None), (19, 24, None, None)]),
+])
+def test_single_references(text, expected):
+    """單段引用：書卷名稱各種形式、全形標點、整章與章範圍"""
+    assert parse_citations(text) == tuple(VerseSpan(*span) for span in expected)
+
+
+def test_verse_lists_and_multiple_references():
+    """節列表、分號/逗號分隔的多段引用，省略書卷時沿用前一段"""
+    assert parse_citations("約3:16;羅5:8;8:28") == (
+        VerseSpan(43, 3, 16, 16),
+        VerseSpan(45, 5, 8, 8),
+        VerseSpan(45, 8, 28, 28),
+    )
+    assert parse_citations("約3:16,18-20, 4:1") == (
+        VerseSpan(43, 3, 16, 16),
+        VerseSpan(43, 3, 18, 20),
+        VerseSpan(43, 4, 1, 1),
+    )
+    assert parse_citations("約3:16，羅5:8；") == (
+        VerseSpan(43, 3, 16, 16),
+        VerseSpan(45, 5, 8, 8),
+    )
+
+
+def test_cross_chapter_ranges():
+    """跨章範圍拆成每章一段，中間的章為整章"""
+    spans = parse_citations("創 1:26-3:5")
+    assert spans == (
+        VerseSpan(1, 1, 26, None),
+        VerseSpan(1, 2),
+        VerseSpan(1, 3, 1, 5),
+    )
+    assert spans[0].contains(31) and not spans[0].contains(25)
+    assert spans[1].contains(1)
+    assert parse_citations("創 1:1-1:5") == (VerseSpan(1, 1, 1, 5),)
+
+
+@pytest.mark.parametrize("text, error", [
+    ("", InvalidParameterError),
+    ("約", InvalidParameterError),
+    ("3:16", InvalidParameterError),
+    ("約 3:x", InvalidParameterError),
+    ("約 3:18-16", InvalidParameterError),
+    ("約 0:1", InvalidParameterError),
+    ("約 3:16 @", InvalidParameterError),
+    ("Book 3:16", BookNotFoundError),
+])
+def test_invalid_citations(text, error):
+    """格式錯誤與找不到書卷分別回報"""
+    with pytest.raises(error):
+        parse_citations(text)
+
+
+def test_chapter_fetches_and_verse_spec():
+    """依 (書卷, 章) 分組，每章一次查詢"""
+    chapters = chapter_fetches(parse_citations("約3:16,18;4:1-5:2;3:1"))
+    assert list(chapters) == [(43, 3), (43, 4), (43, 5)]
+    assert verse_spec(chapters[(43, 3)]) == "16,18,1"
+    assert verse_spec(chapters[(43, 4)]) is None      # 到章末需要整章
+    assert verse_spec(chapters[(43, 5)]) == "1-2"
+
+    assert verse_spans(43, 3, "1, 3-5") == (VerseSpan(43, 3, 1, 1), VerseSpan(43, 3, 3, 5))
+    with pytest.raises(InvalidParameterError):
+        verse_spans(43, 3, "1-x")
@@ -0,0 +1,171 @@
+"""
+Test Strong's Concordance
+
+Tests for building the local Strong's number concordance (tagged text and
+qp.php sources) and serving occurrence lookups from it.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints, set_endpoints, close_endpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.tools.strongs import search_strongs_occurrences
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.concordance import (
+    STRONGS_TAG,
+    Concordance,
+    build_concordance,
+    parse_strongs_tags,
+)
+from fhl_bible_mcp.utils.corpus import LocalCorpus, build_snapshot, make_verse_key, reset_corpus
+
+
+# 約翰福音 1 章 (新約，希臘文) 與 創世記 1 章 (舊約，希伯來文)，各三節
+TAGGED = {
+    (43, 1, 1): "太初<WG1722>有道<WG3056>，道<WG3056>與神<WG2316>同在",
+    (43, 1, 2): "這道<WG3778>太初與神<WG2316>同在",
+    (43, 1, 3): "萬物是藉著他造的",
+    (1, 1, 1): "起初<WH7225>神<WH430>創造<WH1254>天地",
+    (1, 1, 2): "地是空虛混沌",
+    (1, 1, 3): "神<WH430>說",
+}
+BOOKS = {43: ("John", "約"), 1: ("Gen", "創")}
+
+
+class FakeClient:
+    """模擬 qb.php (含 strong=1 標記經文) 與 qp.php"""
+
+    async def _make_request(self, endpoint, params=None):
+        if endpoint == "qp.php":
+            key = (params["bid"], params["chap"], params["sec"])
+            tags = parse_strongs_tags(TAGGED[key])
+            return {
+                "N": 1 if params["bid"] <= 39 else 0,
+                "record": [{"wid": 0}] + [
+                    {"wid": i, "sn": tag[1:].zfill(5)} for i, tag in enumerate(tags, start=1)
+                ],
+            }
+
+        bid, chap = params["bid"], params["chap"]
+        if bid not in BOOKS or chap > 1:
+            return {"status": "success", "record": []}
+        engs, chineses = BOOKS[bid]
+        return {
+            "status": "success",
+            "v_name": "測試本",
+            "proc": 0,
+            "record": [
+                {
+                    "engs": engs,
+                    "chineses": chineses,
+                    "chap": 1,
+                    "sec": sec,
+                    "bible_text": (
+                        TAGGED[(bid, 1, sec)] if params["strong"]
+                        else STRONGS_TAG.sub("", TAGGED[(bid, 1, sec)])
+                    ),
+                }
+                for sec in (1, 2, 3)
+            ],
+        }
+
+
+@pytest.fixture
+async def corpus_dir(tmp_path):
+    """建立 "unv" 快照與 tagged 經文彙編"""
+    directory = tmp_path / "corpus"
+    await build_snapshot(FakeClient(), "unv", str(directory), book_ids=[1, 43])
+    await build_concordance(FakeClient(), str(directory), book_ids=[1, 43])
+    yield directory
+    reset_corpus()
+
+
+def test_parse_strongs_tags():
+    """取出標記經文中的 Strong's 編號"""
+    assert parse_strongs_tags("神<WG2316>愛<WG0025>世人") == ["G2316", "G25"]
+    assert parse_strongs_tags("起初<WH7225>") == ["H7225"]
+    assert parse_strongs_tags("沒有標記") == []
+
+
+def test_concordance_lookup(corpus_dir):
+    """出現次數、經節 (含字詞位置) 與書卷分布"""
+    concordance = Concordance(corpus_dir)
+
+    assert concordance.count("G3056") == 2
+    assert concordance.verses("G3056") == [(make_verse_key(43, 1, 1), [2, 3])]
+    assert concordance.verses("G2316") == [
+        (make_verse_key(43, 1, 1), [4]),
+        (make_verse_key(43, 1, 2), [2]),
+    ]
+    assert concordance.distribution("H430") == {1: 2}
+    assert concordance.count("G9999") == 0
+    assert concordance.verses("H430", 40, 66) == []
+
+    concordance.close()
+
+
+@pytest.mark.asyncio
+async def test_concordance_from_word_analysis(corpus_dir, tmp_path):
+    """qp.php 來源產生與標記經文相同的彙編"""
+    qp_dir = tmp_path / "qp"
+    await build_snapshot(FakeClient(), "unv", str(qp_dir), book_ids=[1, 43])
+    result = await build_concordance(FakeClient(), str(qp_dir), source="qp", book_ids=[1, 43])
+
+    tagged = Concordance(corpus_dir)
+    qp = Concordance(qp_dir)
+    assert result["source"] == "qp"
+    assert qp.numbers == tagged.numbers
+    assert qp.occurrences("G2316") == tagged.occurrences("G2316")
+    tagged.close()
+    qp.close()
+
+
+def test_local_corpus_search_strongs(corpus_dir):
+    """se.php 格式的原文編號搜尋與分頁"""
+    corpus = LocalCorpus(str(corpus_dir))
+
+    result = corpus.search_strongs("unv", "G2316", 40, 66, limit=1, offset=1)
+    assert result["record_count"] == 2
+    assert [(r["id"], r["sec"], r["positions"]) for r in result["record"]] == [(2, 2, [2])]
+    assert result["record"][0]["bible_text"] == "這道太初與神同在"
+
+    # 沒有該版本快照時交給 API
+    assert corpus.search_strongs("kjv", "G2316") is None
+
+    distribution = corpus.strongs_distribution("H430")
+    assert distribution["occurrence_count"] == 2
+    assert distribution["books"] == [{"book_id": 1, "book": "創", "book_eng": "Gen", "count": 2}]
+    corpus.close()
+
+
+@pytest.mark.asyncio
+async def test_search_strongs_occurrences_served_locally(corpus_dir, tmp_path):
+    """search_strongs_occurrences 與 search_bible(greek_number) 不呼叫 se.php"""
+    reset_cache()
+    reset_corpus()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.directory = str(corpus_dir)
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(return_value={"status": "success", "record": []})
+    set_endpoints(api)
+
+    try:
+        searched = await api.search_bible("2316", search_type="greek_number", scope="nt")
+        assert searched["record_count"] == 2
+
+        with patch(
+            "fhl_bible_mcp.tools.strongs.lookup_strongs",
+            AsyncMock(return_value={"number": "G2316"}),
+        ):
+            result = await search_strongs_occurrences("G2316", limit=10)
+
+        api._make_request.assert_not_awaited()
+        assert result["occurrences"]["total_count"] == 2
+        assert result["occurrences"]["results"][0]["positions"] == [4]
+        assert result["distribution"]["occurrence_count"] == 2
+        assert result["distribution"]["books"][0]["book"] == "約"
+    finally:
+        await close_endpoints()
+        reset_cache()
@@ -0,0 +1,253 @@
+"""
+Test Offline Corpus Snapshot
+
+Tests for the local Bible corpus snapshot (build, lookup, navigation)
+and its integration with FHLAPIEndpoints.get_verse.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints, set_endpoints, close_endpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.tools.verse import get_bible_verse
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.corpus import (
+    CorpusSnapshot,
+    LocalCorpus,
+    build_snapshot,
+    parse_verse_spec,
+    reset_corpus,
+)
+
+
+# 兩卷書、每卷兩章、每章三節的迷你版本
+BOOKS = {43: ("John", "約"), 44: ("Acts", "徒"), 101: ("Tob", "多"), 201: ("1Clem", "革")}
+
+
+class FakeClient:
+    """模擬 qb.php 的 API client"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def _make_request(self, endpoint, params=None):
+        self.calls.append((endpoint, dict(params)))
+        bid, chap = params["bid"], params["chap"]
+        if bid not in BOOKS or chap > 2:
+            return {"status": "success", "record_count": 0, "record": []}
+        engs, chineses = BOOKS[bid]
+        return {
+            "status": "success",
+            "record_count": 3,
+            "v_name": "測試本",
+            "version": params["version"],
+            "proc": 0,
+            "record": [
+                {
+                    "bid": bid,
+                    "engs": engs,
+                    "chineses": chineses,
+                    "chap": chap,
+                    "sec": sec,
+                    "bible_text": f"{chineses}{chap}:{sec} 經文",
+                }
+                for sec in (1, 2, 3)
+            ],
+        }
+
+
+@pytest.fixture
+async def corpus_dir(tmp_path):
+    """建立包含 "test" 版本快照的目錄"""
+    directory = tmp_path / "corpus"
+    await build_snapshot(FakeClient(), "test", str(directory), book_ids=[43, 44])
+    yield directory
+    reset_corpus()
+
+
+@pytest.fixture
+def snapshot(corpus_dir):
+    """開啟 "test" 版本快照"""
+    snapshot = CorpusSnapshot(corpus_dir / "test")
+    yield snapshot
+    snapshot.close()
+
+
+def test_parse_verse_spec():
+    """測試節數字串解析"""
+    assert parse_verse_spec("16") == {16}
+    assert parse_verse_spec("1-3") == {1, 2, 3}
+    assert parse_verse_spec("1-2,5,8-9") == {1, 2, 5, 8, 9}
+    assert parse_verse_spec("3-1") is None
+    assert parse_verse_spec("a") is None
+    assert parse_verse_spec("1,,2") is None
+
+
+@pytest.mark.asyncio
+async def test_build_snapshot_stops_after_last_chapter(tmp_path):
+    """每卷書下載到沒有經文的章為止"""
+    client = FakeClient()
+    result = await build_snapshot(client, "test", str(tmp_path), book_ids=[43])
+
+    assert result["verses"] == 6
+    assert result["chapters"] == 2
+    assert [params["chap"] for _, params in client.calls] == [1, 2, 3]
+
+
+def test_snapshot_chapter_lookup(snapshot):
+    """整章查詢與前後章導航"""
+    result = snapshot.get_verse(43, 2)
+
+    assert result["status"] == "success"
+    assert result["version"] == "test"
+    assert result["v_name"] == "測試本"
+    assert result["record_count"] == 3
+    assert [r["sec"] for r in result["record"]] == [1, 2, 3]
+    assert result["record"][0]["bible_text"] == "約2:1 經文"
+    assert result["prev"] == {"chineses": "約", "engs": "John", "chap": 1, "sec": 1}
+    assert result["next"] == {"chineses": "徒", "engs": "Acts", "chap": 1, "sec": 1}
+
+
+def test_snapshot_verse_lookup(snapshot):
+    """節數查詢與前後節導航"""
+    result = snapshot.get_verse(43, 1, "2-3")
+
+    assert [r["sec"] for r in result["record"]] == [2, 3]
+    assert result["prev"]["sec"] == 1
+    assert result["next"] == {"chineses": "約", "engs": "John", "chap": 2, "sec": 1}
+
+    first = snapshot.get_verse(43, 1, "1")
+    assert "prev" not in first
+
+    assert snapshot.get_verse(43, 5) is None
+    assert snapshot.get_verse(43, 1, "x") is None
+
+
+def test_local_corpus_missing_version(corpus_dir):
+    """沒有快照的版本返回 None"""
+    corpus = LocalCorpus(str(corpus_dir))
+
+    assert corpus.list_versions() == ["test"]
+    assert corpus.get_verse("kjv", 43, 1) is None
+    assert corpus.get_verse("test", 43, 1, "1")["record_count"] == 1
+    assert corpus.stats == {"hits": 1, "misses": 1}
+
+    corpus.close()
+
+
+@pytest.mark.asyncio
+async def test_endpoints_get_verse_uses_corpus(corpus_dir, tmp_path):
+    """有快照的版本不呼叫上游 API；Strong's 與其他版本仍走 API"""
+    reset_cache()
+    reset_corpus()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.directory = str(corpus_dir)
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(return_value={"status": "success", "record": []})
+
+    try:
+        result = await api.get_verse("約", 1, "2", version="test")
+        assert result["record"][0]["bible_text"] == "約1:2 經文"
+        api._make_request.assert_not_awaited()
+
+        await api.get_verse("約", 1, "2", version="test", include_strong=True)
+        await api.get_verse("約", 1, "2", version="kjv")
+        assert api._make_request.await_count == 2
+
+        # 工具層也直接從快照回答
+        set_endpoints(api)
+        verse = await get_bible_verse("John", 1, "3", version="test")
+        assert verse["verses"][0]["text"] == "約1:3 經文"
+        assert verse["navigation"]["next"]["chapter"] == 2
+    finally:
+        await close_endpoints()
+        await api.close()
+        reset_cache()
+
+
+async def test_apocrypha_and_apostolic_fathers_use_fixed_corpus_version(tmp_path):
+    """次經與使徒教父經文以固定版本 (c1933 / afhuang) 查詢本地快照"""
+    from fhl_bible_mcp.api.endpoints import APOCRYPHA_VERSION, APOSTOLIC_FATHERS_VERSION
+
+    reset_cache()
+    reset_corpus()
+    directory = tmp_path / "corpus"
+    await build_snapshot(FakeClient(), APOCRYPHA_VERSION, str(directory), book_ids=[101])
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.directory = str(directory)
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(return_value={"status": "success", "record": []})
+
+    try:
+        result = await api.get_apocrypha_verse("101", 1, "1")
+        assert result["record"][0]["bible_text"] == "多1:1 經文"
+        api._make_request.assert_not_awaited()
+
+        # 沒有 afhuang 快照時查詢 qaf.php
+        await api.get_apostolic_fathers_verse("201", 1, "1")
+        assert api._make_request.await_count == 1
+        assert api._make_request.call_args.args[0] == "qaf.php"
+
+        await build_snapshot(FakeClient(), APOSTOLIC_FATHERS_VERSION, str(directory), book_ids=[201])
+        reset_corpus()
+        api.corpus = LocalCorpus(directory)
+        result = await api.get_apostolic_fathers_verse("201", 1, "2")
+        assert result["record"][0]["bible_text"] == "革1:2 經文"
+        assert api._make_request.await_count == 1
+    finally:
+        await api.close()
+        reset_corpus()
+        reset_cache()
+
+
+def test_local_search_scope_and_paging(corpus_dir):
+    """本地搜尋支援範圍、分頁與只取筆數"""
+    corpus = LocalCorpus(str(corpus_dir))
+
+    result = corpus.search("test", "經文", limit=2, offset=1)
+    assert result["record_count"] == 12
+    assert [(r["id"], r["chineses"], r["chap"], r["sec"]) for r in result["record"]] == [
+        (2, "約", 1, 2),
+        (3, "約", 1, 3),
+    ]
+
+    assert corpus.search("test", "經文", 1, 39)["record_count"] == 0
+    acts = corpus.search("test", "經文", 44, 44, count_only=True)
+    assert acts["record_count"] == 6
+    assert acts["record"] == []
+
+    # 沒有快照的版本交給 API
+    assert corpus.search("kjv", "經文") is None
+    corpus.close()
+
+
+@pytest.mark.asyncio
+async def test_endpoints_search_bible_uses_index(corpus_dir, tmp_path):
+    """關鍵字搜尋從本地索引回答，原文編號搜尋仍走 API"""
+    reset_cache()
+    reset_corpus()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.directory = str(corpus_dir)
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(return_value={"status": "success", "record_count": 0, "record": []})
+
+    try:
+        result = await api.search_bible("約", scope="nt", version="test", limit=10)
+        assert result["record_count"] == 6
+        assert result["record"][0]["bible_text"] == "約1:1 經文"
+
+        ranged = await api.search_bible(
+            "經文", scope="range", version="test", range_start=44, range_end=44, count_only=True
+        )
+        assert ranged["record_count"] == 6
+        api._make_request.assert_not_awaited()
+
+        await api.search_bible("G25", search_type="greek_number", version="test")
+        assert api._make_request.await_count == 1
+    finally:
+        await api.close()
+        reset_cache()
@@ -0,0 +1,105 @@
+"""
+Test Parallel Fan-out
+
+Tests for gather_legs and the composite tools that use it
+(search_strongs_occurrences, get_audio_chapter_with_text).
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fhl_bible_mcp.tools.audio import get_audio_chapter_with_text
+from fhl_bible_mcp.tools.strongs import search_strongs_occurrences
+from fhl_bible_mcp.utils.errors import InvalidParameterError, NetworkError
+from fhl_bible_mcp.utils.fanout import gather_legs
+
+
+def _slow(value=None, delay=0.1, error=None):
+    """建立延遲後返回 (或拋出例外) 的 AsyncMock"""
+    async def _call(*args, **kwargs):
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return value
+    return AsyncMock(side_effect=_call)
+
+
+@pytest.mark.asyncio
+async def test_gather_legs_runs_in_parallel():
+    """各 leg 並行執行並記錄耗時"""
+    start = time.perf_counter()
+    outcome = await gather_legs(a=_slow(1)(), b=_slow(2)())
+    elapsed = time.perf_counter() - start
+
+    assert outcome.results == {"a": 1, "b": 2}
+    assert outcome.errors == {}
+    assert set(outcome.timings_ms) == {"a", "b"}
+    assert all(ms >= 90 for ms in outcome.timings_ms.values())
+    assert elapsed < 0.18
+
+
+@pytest.mark.asyncio
+async def test_gather_legs_partial_failure_and_invalid_input():
+    """上游失敗只影響該 leg；參數錯誤直接拋出"""
+    outcome = await gather_legs(ok=_slow("x", 0)(), bad=_slow(delay=0, error=NetworkError("down"))())
+    assert outcome.results == {"ok": "x"}
+    assert list(outcome.errors) == ["bad"]
+    assert "down" in outcome.error_messages()["bad"]
+    assert not outcome.all_failed
+
+    with pytest.raises(InvalidParameterError):
+        await gather_legs(ok=_slow("x", 0)(), bad=_slow(delay=0, error=InvalidParameterError("p", 1))())
+
+
+@pytest.mark.asyncio
+async def test_audio_chapter_with_text_parallel_and_partial():
+    """音檔與經文並行，音檔失敗時仍返回經文"""
+    with patch("fhl_bible_mcp.tools.audio.get_audio_bible", _slow({"url": "a.mp3"})), \
+         patch("fhl_bible_mcp.tools.verse.get_bible_chapter", _slow({"verses": []})):
+        start = time.perf_counter()
+        result = await get_audio_chapter_with_text("約", 3)
+        elapsed = time.perf_counter() - start
+
+    assert result["audio"] == {"url": "a.mp3"}
+    assert result["text"] == {"verses": []}
+    assert set(result["timings_ms"]) == {"audio", "text"}
+    assert "errors" not in result
+    assert elapsed < 0.18
+
+    with patch("fhl_bible_mcp.tools.audio.get_audio_bible", _slow(delay=0, error=NetworkError("timeout"))), \
+         patch("fhl_bible_mcp.tools.verse.get_bible_chapter", _slow({"verses": []}, 0)):
+        result = await get_audio_chapter_with_text("約", 3)
+
+    assert result["audio"] is None
+    assert result["text"] == {"verses": []}
+    assert "audio" in result["errors"]
+
+
+@pytest.mark.asyncio
+async def test_strongs_occurrences_parallel_and_partial():
+    """字典與出現位置並行，字典失敗時仍返回出現位置"""
+    api = MagicMock()
+    api.get_strongs_concordance = AsyncMock(return_value=None)
+    search = _slow({"total_count": 1, "results": [{"book": "約"}]})
+
+    with patch("fhl_bible_mcp.tools.strongs.get_endpoints", return_value=api), \
+         patch("fhl_bible_mcp.tools.strongs.lookup_strongs", _slow({"number": "G26"})), \
+         patch("fhl_bible_mcp.tools.search.search_bible", search):
+        start = time.perf_counter()
+        result = await search_strongs_occurrences("G26")
+        elapsed = time.perf_counter() - start
+
+    assert result["strongs_info"] == {"number": "G26"}
+    assert result["occurrences"]["total_count"] == 1
+    assert elapsed < 0.18
+
+    with patch("fhl_bible_mcp.tools.strongs.get_endpoints", return_value=api), \
+         patch("fhl_bible_mcp.tools.strongs.lookup_strongs", _slow(delay=0, error=NetworkError("x"))), \
+         patch("fhl_bible_mcp.tools.search.search_bible", _slow({"total_count": 0, "results": []}, 0)):
+        result = await search_strongs_occurrences("G26")
+
+    assert result["strongs_info"] is None
+    assert result["occurrences"]["total_count"] == 0
+    assert list(result["errors"]) == ["strongs_info"]
@@ -0,0 +1,79 @@
+"""
+Test Streaming JSON Parsing
+
+Tests that RecordStream yields the same records and fields as json.loads
+regardless of how the response is split into chunks.
+"""
+
+import json
+import pytest
+
+from fhl_bible_mcp.utils.jsonstream import RecordStream
+
+
+DOCUMENT = {
+    "status": "success",
+    "record_count": 3,
+    "v_name": "和合本",
+    "record": [
+        {"bid": 43, "chap": 3, "sec": 16, "bible_text": "神愛世人，甚至將他的獨生子賜給他們"},
+        {"bid": 43, "chap": 3, "sec": 17, "bible_text": "因為神差他的兒子降世，\"不是\"要定世人的罪"},
+        {"bid": 43, "chap": 3, "sec": 18, "bible_text": "信他的人不被定罪", "n": [1.5, True, None]},
+    ],
+    "prev": {"chineses": "約", "chap": 3, "sec": 15},
+    "total": 12345,
+}
+
+
+def _parse(payload: bytes, size: int) -> RecordStream:
+    stream = RecordStream("record")
+    records = []
+    for start in range(0, len(payload), size):
+        records.extend(stream.feed(payload[start:start + size]))
+    records.extend(stream.close())
+    stream.records = records
+    return stream
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_records_match_json_loads(size):
+    """任意切割 (含 UTF-8 字元與數字被切斷) 都得到相同結果"""
+    payload = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode("utf-8")
+    stream = _parse(payload, size)
+
+    assert stream.records == DOCUMENT["record"]
+    assert stream.meta == {k: v for k, v in DOCUMENT.items() if k != "record"}
+    assert stream.count == 3
+    assert stream.done
+
+
+def test_records_available_before_end():
+    """陣列元素一完整就返回，不等整個回應"""
+    stream = RecordStream()
+    assert stream.feed(b'{"status": "success", "record": [{"a": 1}, {"a"') == [{"a": 1}]
+    assert stream.meta == {"status": "success"}
+    assert stream.feed(b': 2}]') == [{"a": 2}]
+    assert not stream.done
+    assert stream.feed(b'}') == []
+    assert stream.done
+    assert stream.close() == []
+
+
+def test_missing_or_null_record_array():
+    """沒有 (或為 null 的) 陣列欄位時只收集 meta"""
+    stream = RecordStream()
+    stream.feed(b'{"status": "error", "record": null, "message": "x"}')
+    assert stream.close() == []
+    assert stream.meta == {"status": "error", "record": None, "message": "x"}
+
+
+@pytest.mark.parametrize("payload", [
+    b'[1, 2]', b'{"record": [1, 2', b'{"record": [1 2]}', b'{"record": [1,, 2]}',
+    b'{"a": 1 "b": 2}', b'{1: 2}',
+])
+def test_invalid_or_truncated_json(payload):
+    """格式錯誤或不完整時拋出 JSONDecodeError"""
+    stream = RecordStream()
+    with pytest.raises(json.JSONDecodeError):
+        stream.feed(payload)
+        stream.close()
@@ -0,0 +1,173 @@
+"""
+Test Runtime Metrics
+
+Tests for latency histograms, upstream instrumentation in FHLAPIClient,
+the info://metrics resource and the Prometheus text dump.
+"""
+
+import time
+import httpx
+import pytest
+
+from fhl_bible_mcp.api.client import FHLAPIClient
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.resources.handlers import ResourceRouter
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.metrics import Histogram, Metrics, get_metrics, reset_metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    """每個測試使用新的全域指標實例"""
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+def _transport(status=200, body=b'{"status": "success", "record": []}'):
+    def handler(request):
+        return httpx.Response(status, content=body, headers={"content-type": "application/json"})
+    return httpx.MockTransport(handler)
+
+
+def test_histogram_percentiles():
+    """百分位數由直方圖內插估計，不超過最大值"""
+    histogram = Histogram()
+    for _ in range(90):
+        histogram.observe(0.004)
+    for _ in range(10):
+        histogram.observe(0.2)
+
+    assert histogram.count == 100
+    assert 0.0025 < histogram.percentile(0.5) <= 0.005
+    assert 0.1 < histogram.percentile(0.95) <= 0.2
+    assert histogram.percentile(0.99) <= 0.2
+
+    summary = histogram.summary()
+    assert set(summary) == {"count", "mean_ms", "max_ms", "p50_ms", "p95_ms", "p99_ms"}
+    assert summary["max_ms"] == 200.0
+    assert Histogram().percentile(0.5) == 0.0
+
+
+def test_observe_and_snapshot():
+    """工具、上游、位元組數與快取命中率"""
+    metrics = Metrics()
+    metrics.observe_tool("get_bible_verse", 0.01, bytes_in=20, bytes_out=300)
+    metrics.observe_tool("get_bible_verse", 0.02, error=True)
+    metrics.observe_upstream("qb.php", 0.05, 200, bytes_in=1000, bytes_out=80)
+    metrics.observe_upstream("qb.php", 0.5, "timeout")
+    metrics.count_retry("qb.php")
+
+    class FakeCache:
+        stats = {"hits": 3, "misses": 1}
+        disk_stats = {"hits": 1, "misses": 1}
+        memory = None
+
+    snapshot = metrics.snapshot(FakeCache(), {"upstream": 2, "coalesced": 0, "inflight": 0})
+
+    assert snapshot["tools"]["get_bible_verse"]["count"] == 2
+    assert snapshot["tools"]["get_bible_verse"]["errors"] == 1
+    assert snapshot["upstream"]["qb.php"]["status_codes"] == {"200": 1, "timeout": 1}
+    assert snapshot["upstream"]["qb.php"]["retries"] == 1
+    assert snapshot["bytes"] == {"upstream_in": 1000, "upstream_out": 80, "tool_in": 20, "tool_out": 300}
+    assert snapshot["cache"]["all"]["hit_ratio"] == 0.75
+    assert snapshot["cache"]["disk"]["hit_ratio"] == 0.5
+    assert snapshot["requests"]["upstream"] == 2
+
+
+def test_disabled_metrics_are_noop_and_cheap():
+    """停用時不記錄，每次呼叫低於 1 微秒"""
+    metrics = Metrics(enabled=False)
+    metrics.observe_tool("x", 0.1)
+    metrics.observe_upstream("qb.php", 0.1, 200)
+    metrics.count_retry("qb.php")
+    assert metrics.tool_latency == {} and metrics.upstream_latency == {}
+
+    calls = 100_000
+    start = time.perf_counter()
+    for _ in range(calls):
+        if metrics.enabled:
+            metrics.observe_tool("x", 0.1)
+    per_call = (time.perf_counter() - start) / calls
+    assert per_call < 1e-6
+
+
+def test_render_prometheus():
+    """Prometheus text exposition format"""
+    metrics = Metrics()
+    metrics.observe_tool("search_bible", 0.03)
+    metrics.observe_upstream("se.php", 0.03, 429)
+
+    text = metrics.render_prometheus()
+
+    assert "# TYPE fhl_tool_duration_seconds histogram" in text
+    assert 'fhl_tool_duration_seconds_bucket{tool="search_bible",le="0.05"} 1' in text
+    assert 'fhl_tool_duration_seconds_bucket{tool="search_bible",le="0.025"} 0' in text
+    assert 'fhl_tool_duration_seconds_count{tool="search_bible"} 1' in text
+    assert 'fhl_upstream_responses_total{endpoint="se.php",status="429"} 1' in text
+    assert 'fhl_bytes_total{direction="upstream_in"} 0' in text
+    assert text.endswith("\n")
+
+
+@pytest.mark.asyncio
+async def test_client_records_upstream_requests():
+    """FHLAPIClient 記錄每次上游請求的延遲、狀態碼與位元組數"""
+    client = FHLAPIClient(base_url="https://example.test/json/")
+    client._client = httpx.AsyncClient(transport=_transport())
+
+    try:
+        await client._make_request("qb.php", {"bid": 43, "chap": 3})
+    finally:
+        await client.close()
+
+    snapshot = get_metrics().snapshot()
+    assert snapshot["upstream"]["qb.php"]["count"] == 1
+    assert snapshot["upstream"]["qb.php"]["status_codes"] == {"200": 1}
+    assert snapshot["bytes"]["upstream_in"] == len(b'{"status": "success", "record": []}')
+    assert snapshot["bytes"]["upstream_out"] > len("https://example.test/json/qb.php")
+
+
+@pytest.mark.asyncio
+async def test_client_skips_recording_when_disabled():
+    """config.metrics.enabled = False 時不記錄"""
+    get_metrics(enabled=False)
+    client = FHLAPIClient(base_url="https://example.test/json/")
+    client._client = httpx.AsyncClient(transport=_transport())
+
+    try:
+        await client._make_request("qb.php", {"bid": 43, "chap": 3})
+    finally:
+        await client.close()
+
+    assert get_metrics().upstream_latency == {}
+
+
+@pytest.mark.asyncio
+async def test_metrics_resource(tmp_path):
+    """info://metrics 與 info://metrics?format=prometheus"""
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    api._client = httpx.AsyncClient(transport=_transport())
+    router = ResourceRouter(api)
+
+    try:
+        await api.get_verse("約", 3, "16")
+        await api.get_verse("約", 3, "16")
+
+        result = await router.handle_resource("info://metrics")
+        content = result["content"]
+        assert content["upstream"]["qb.php"]["count"] == 1
+        assert content["requests"]["upstream"] == 1
+        assert content["cache"]["all"]["hits"] == 1
+
+        result = await router.handle_resource("info://metrics?format=prometheus")
+        assert result["mimeType"].startswith("text/plain")
+        assert 'fhl_upstream_duration_seconds_count{endpoint="qb.php"} 1' in result["content"]
+        assert 'fhl_cache_hits_total{tier="all"} 1' in result["content"]
+    finally:
+        await api.close()
+        reset_cache()
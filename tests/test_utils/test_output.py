@@ -0,0 +1,133 @@
+"""
+Test Tool Result Output
+
+Tests for the pretty / compact / table output modes, the per-call byte
+budget and continuation cursors.
+"""
+
+import json
+import pytest
+
+from fhl_bible_mcp.config import get_config, reset_config
+from fhl_bible_mcp.utils.errors import InvalidParameterError
+from fhl_bible_mcp.utils.output import (
+    decode_cursor,
+    encode_cursor,
+    render,
+    render_json_block,
+    render_result,
+    tool_call,
+)
+
+
+RESULT = {
+    "book": "約翰福音",
+    "chapter": 3,
+    "version": {"code": "unv", "name": "和合本"},
+    "verses": [{"verse": i, "text": f"第{i}節\t經文" + "字" * 40} for i in range(1, 37)],
+}
+
+
+def test_compact_mode_uses_short_keys():
+    """compact: 無空白、短鍵與對照表，內容可還原"""
+    pretty = render(RESULT, "pretty")
+    compact = render(RESULT, "compact")
+    assert json.loads(pretty) == RESULT
+    assert len(compact.encode()) < len(pretty.encode()) * 0.85
+
+    data = json.loads(compact)
+    keys = data.pop("_keys")
+    assert keys["v"] == "verse" and keys["t"] == "text"
+    assert data["verses"][0] == {"v": 1, "t": RESULT["verses"][0]["text"]}
+
+
+def test_table_mode():
+    """table: 主要列表每列一筆，tab 分隔，值中的 tab 換成空白"""
+    lines = render(RESULT, "table").splitlines()
+    assert lines[:3] == ["book: 約翰福音", "chapter: 3", 'version: {"code":"unv","name":"和合本"}']
+    assert lines[3:5] == ["verses (36):", "verse\ttext"]
+    assert lines[5].split("\t") == ["1", RESULT["verses"][0]["text"].replace("\t", " ")]
+    assert len(lines) == 5 + 36
+
+
+@pytest.mark.parametrize("mode", ["pretty", "compact", "table"])
+def test_budget_pages_through_primary_list(mode):
+    """超過上限時分頁；依序以游標取得所有項目且每頁不超過上限"""
+    seen = []
+    offset, pages = 0, 0
+    while True:
+        with tool_call("get_bible_chapter", {"book": "約", "chapter": 3}, offset):
+            text = render_result(RESULT, mode=mode, max_bytes=1500)
+        assert len(text.encode()) <= 1500
+        pages += 1
+
+        if mode == "table":
+            page = dict(line.split(": ", 1) for line in text.splitlines() if line.startswith("page: "))
+            info = json.loads(page["page"])
+            rows = [line for line in text.splitlines()[6:]]
+            seen.extend(int(row.split("\t")[0]) for row in rows)
+        else:
+            data = json.loads(text)
+            info = data["page"]
+            seen.extend(item["verse" if mode == "pretty" else "v"] for item in data["verses"])
+
+        assert info["offset"] == offset and info["total"] == 36
+        if "next_cursor" not in info:
+            break
+        name, arguments, offset = decode_cursor(info["next_cursor"])
+        assert (name, arguments) == ("get_bible_chapter", {"book": "約", "chapter": 3})
+
+    assert seen == list(range(1, 37))
+    assert pages > 2
+
+
+def test_small_results_and_invalid_cursor():
+    """放得下的結果不加 page；無效游標拋出 InvalidParameterError"""
+    assert render_result(RESULT, mode="pretty", max_bytes=100000) == render(RESULT, "pretty")
+    assert render_result({"status": "ok"}, mode="compact", max_bytes=5) == '{"status":"ok"}'
+
+    assert decode_cursor(encode_cursor("t", {"q": "愛"}, 50)) == ("t", {"q": "愛"}, 50)
+    for cursor in ("not-a-cursor", encode_cursor("t", {}, 1)[:-3]):
+        with pytest.raises(InvalidParameterError):
+            decode_cursor(cursor)
+
+
+def test_cursor_offset_without_primary_list():
+    """沒有可分頁列表的結果收到位移大於 0 的游標時拋出錯誤，而不是返回第一頁"""
+    with tool_call("get_book_info", {"book": "約"}, 5):
+        with pytest.raises(InvalidParameterError):
+            render_result({"status": "ok", "book": "約翰福音"}, mode="pretty", max_bytes=5)
+    with tool_call("get_book_info", {"book": "約"}, 0):
+        assert render_result({"status": "ok"}, mode="compact", max_bytes=5) == '{"status":"ok"}'
+
+
+def test_budget_cursor_wins_over_search_cursor():
+    """搜尋結果被位元組上限分頁時，先依 page.next_cursor 讀完本批，最後一頁才有搜尋的 next_cursor"""
+    arguments = {"query": "愛", "limit": 36}
+    search_cursor = encode_cursor("search_bible", {**arguments, "offset": 36}, 0)
+    result = {"query": "愛", "results": RESULT["verses"], "next_cursor": search_cursor}
+
+    seen, offset = [], 0
+    while True:
+        with tool_call("search_bible", arguments, offset):
+            data = json.loads(render_result(result, mode="pretty", max_bytes=1500))
+        seen.extend(item["verse"] for item in data["results"])
+        if "next_cursor" in data["page"]:
+            assert "next_cursor" not in data
+            _, _, offset = decode_cursor(data["page"]["next_cursor"])
+            continue
+        assert data["next_cursor"] == search_cursor
+        break
+
+    assert seen == list(range(1, 37))
+
+
+def test_json_block_follows_config():
+    """工具自行組成的回應區塊依 config.output.mode 輸出"""
+    reset_config()
+    try:
+        assert render_json_block({"a": 1}) == '```json\n{\n  "a": 1\n}\n```'
+        get_config().output.mode = "compact"
+        assert render_json_block({"a": 1}) == '```json\n{"a":1}\n```'
+    finally:
+        reset_config()
@@ -0,0 +1,72 @@
+"""
+Test Local Search Index
+
+Tests for the inverted index tokenizer, posting-list codec and persistence.
+"""
+
+from fhl_bible_mcp.utils.search_index import (
+    SearchIndex,
+    decode_postings,
+    encode_postings,
+    query_terms,
+    tokenize,
+)
+
+
+def test_tokenize_chinese_and_english():
+    """中文取單字與兩字 n-gram，英文取小寫單字"""
+    assert tokenize("神愛世人") == {"神", "愛", "世", "人", "神愛", "愛世", "世人"}
+    assert tokenize("For God so loved") == {"for", "god", "so", "loved"}
+    assert query_terms("愛") == {"愛"}
+    assert query_terms("世人 God") == {"世人", "god"}
+    assert query_terms("，。") == set()
+
+
+def test_posting_codec_roundtrip():
+    """倒排表差值 + varint 壓縮可還原"""
+    ordinals = [0, 1, 5, 127, 128, 300, 31101]
+    encoded = encode_postings(ordinals)
+
+    assert decode_postings(encoded) == ordinals
+    assert len(encoded) < len(ordinals) * 4
+
+
+def test_index_candidates_and_persistence(tmp_path):
+    """交集候選與索引檔讀寫"""
+    index = SearchIndex.build(["神愛世人", "世人都犯了罪", "愛是恆久忍耐", "God is love"])
+
+    assert index.candidates("世人") == [0, 1]
+    assert index.candidates("愛") == [0, 2]
+    assert index.candidates("LOVE") == [3]
+    assert index.candidates("天使") == []
+    assert index.candidates("，") is None
+
+    path = tmp_path / "search.idx"
+    index.save(path)
+    loaded = SearchIndex.load(path)
+    assert loaded.postings == index.postings
+
+
+def test_english_query_matches_substrings_like_upstream():
+    """英文查詢與 se.php 一樣以子字串比對：love 也找到 loved、beloved"""
+    texts = [
+        "For God so loved the world",
+        "Beloved, let us love one another",
+        "God is love",
+        "Lo, I am with you alway",
+        "The LORD is my shepherd",
+    ]
+    index = SearchIndex.build(texts)
+
+    def upstream(query):
+        # se.php 的語意：所有關鍵字都是經文的子字串 (不分大小寫)
+        parts = query.lower().split()
+        return [i for i, text in enumerate(texts) if all(part in text.lower() for part in parts)]
+
+    def local(query):
+        parts = query.lower().split()
+        return [i for i in index.candidates(query) if all(part in texts[i].lower() for part in parts)]
+
+    for query in ("love", "LOVED", "god love", "lo", "ord", "shepherds"):
+        assert local(query) == upstream(query), query
+    assert local("love") == [0, 1, 2]
@@ -0,0 +1,126 @@
+"""
+Test Cache Warm-up
+
+Tests for the warm-up manifest, the bounded concurrent warm-up run and
+resuming an interrupted run from the progress file.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock
+
+from fhl_bible_mcp.api.endpoints import FHLAPIEndpoints
+from fhl_bible_mcp.config import Config
+from fhl_bible_mcp.utils.cache import reset_cache
+from fhl_bible_mcp.utils.errors import NetworkError
+from fhl_bible_mcp.utils.warmup import (
+    build_manifest,
+    load_manifest,
+    parse_strongs_range,
+    warm_cache,
+)
+
+
+@pytest.fixture
+async def api(tmp_path):
+    reset_cache()
+    config = Config()
+    config.cache.directory = str(tmp_path / "cache")
+    config.corpus.enabled = False
+    api = FHLAPIEndpoints(config=config)
+    api._make_request = AsyncMock(return_value={"status": "success", "record": []})
+    yield api
+    await api.close()
+    reset_cache()
+
+
+def test_build_manifest():
+    """清單包含列表、各版本熱門章節與 Strong's 範圍"""
+    tasks = build_manifest(versions=["unv", "kjv"], top_chapters=3, strongs=["G1-5", "H430"])
+    keys = [task["key"] for task in tasks]
+
+    assert keys[:3] == ["books", "versions", "commentaries"]
+    assert "chapter:unv:43:3" in keys and "chapter:kjv:43:3" in keys
+    assert sum(key.startswith("chapter:") for key in keys) == 6
+    assert "strongs:nt:5" in keys and "strongs:ot:430" in keys
+    assert len(keys) == len(set(keys)) == 3 + 6 + 6
+
+    assert parse_strongs_range("g1-3") == ("nt", range(1, 4))
+    for spec in ("X1-3", "G5-1", "G", "G1-a"):
+        with pytest.raises(ValueError):
+            parse_strongs_range(spec)
+
+
+def test_load_manifest(tmp_path):
+    """清單檔案的欄位可被命令列參數覆寫；未知欄位報錯"""
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"commentaries": False, "top_chapters": 2, "strongs": []}))
+
+    tasks = load_manifest(str(path), versions=["kjv"], top_chapters=None)
+    keys = [task["key"] for task in tasks]
+    assert keys == ["books", "versions", "chapter:kjv:43:3", "chapter:kjv:19:23"]
+
+    path.write_text(json.dumps({"chapters": 5}))
+    with pytest.raises(ValueError, match="chapters"):
+        load_manifest(str(path))
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_fills_cache_with_bounded_concurrency(api, tmp_path):
+    """預熱寫入快取，同時執行的請求數不超過 concurrency"""
+    active = {"now": 0, "peak": 0}
+
+    async def slow_request(endpoint, params=None):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return {"status": "success", "record": []}
+
+    api._make_request = AsyncMock(side_effect=slow_request)
+    tasks = build_manifest(top_chapters=5, strongs=["G1-5"])
+    progress = []
+
+    result = await warm_cache(
+        api, tasks, concurrency=3,
+        progress_path=tmp_path / "warm.progress",
+        on_progress=lambda done, total, task, error: progress.append(done),
+    )
+
+    assert result["warmed"] == len(tasks) == 13
+    assert result["failed"] == 0
+    assert active["peak"] == 3
+    assert progress == list(range(1, 14))
+    assert len(api.cache.get_entries(namespace="verses")) == 5
+    assert len(api.cache.get_entries(namespace="strongs")) == 5
+    assert len(api.cache.get_entries(namespace="books")) == 1
+
+    # 全部成功後刪除進度檔；再次執行全部命中快取
+    assert not (tmp_path / "warm.progress").exists()
+    await warm_cache(api, tasks)
+    assert api._make_request.await_count == 13
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_resumes_after_failures(api, tmp_path):
+    """失敗的項目保留進度檔，再次執行只處理未完成的項目"""
+    progress_path = tmp_path / "warm.progress"
+    tasks = build_manifest(books=False, bible_versions=False, commentaries=False,
+                           top_chapters=0, strongs=["G1-4"])
+
+    async def flaky(endpoint, params=None):
+        if params["k"] in (2, 4):
+            raise NetworkError("down")
+        return {"status": "success", "record": []}
+
+    api._make_request = AsyncMock(side_effect=flaky)
+    result = await warm_cache(api, tasks, progress_path=progress_path)
+    assert (result["warmed"], result["failed"]) == (2, 2)
+    assert set(progress_path.read_text().split()) == {"strongs:nt:1", "strongs:nt:3"}
+
+    api._make_request = AsyncMock(return_value={"status": "success", "record": []})
+    result = await warm_cache(api, tasks, progress_path=progress_path)
+    assert (result["skipped"], result["warmed"], result["failed"]) == (2, 2, 0)
+    assert api._make_request.await_count == 2
+    assert not progress_path.exists()